@@ -15,6 +15,7 @@ import yaml
 import logging
 from collections.abc import Mapping
 from contextlib import nullcontext
+from contextvars import ContextVar
 from dataclasses import dataclass, field, fields
 from ocs_ci.ocs import constants
 from ocs_ci.ocs.exceptions import ClusterNotFoundException
@@ -29,6 +30,9 @@ DEFAULT_CONFIG_PATH = os.path.join(THIS_DIR, "conf/default_config.yaml")
 logger = logging.getLogger(__name__)
 
 config_lock = RLock()
+# Index of the cluster used by the asyncio task (see ocs_ci.utility.aio), it
+# takes precedence over the index of the thread and the current index
+config_index_var = ContextVar("config_index", default=None)
 
 
 @dataclass
@@ -143,13 +147,13 @@ class MultiClusterConfig:
     # This class wraps Config() objects so that we can handle
     # multiple cluster contexts
     def __init__(self):
-        # Holds all cluster's Config() object
+        # Snapshot of the list with all cluster's Config() objects and index
+        # of the current cluster in context. The whole tuple is replaced on
+        # every change, the list in it is never mutated in place
+        self._snapshot = (list(), 0)
+        # Index of the cluster used by the thread (see ConfigSafeThread)
         self.thread_local_data = local()
-        self.clusters = list()
-        # This member always points to current cluster's Config() object
         self.nclusters = 1
-        # Index for current cluster in context
-        self.cur_index = 0
         self.multicluster = False
         # A list of lists which holds CLI args clusterwise
         self.multicluster_args = list()
@@ -161,16 +165,46 @@ class MultiClusterConfig:
         self._single_cluster_init_cluster_configs()
 
     def __getattr__(self, attr):
+        # config_lock isn't needed, one read of the snapshot gives consistent
+        # clusters and current index even if other thread changes them
+        clusters, cur_index = self._snapshot
+        config_index = config_index_var.get()
+        if config_index is None:
+            config_index = getattr(self.thread_local_data, "config_index", cur_index)
+        return getattr(clusters[config_index], attr)
+
+    @property
+    def clusters(self):
+        """
+        list: Config() objects of all the clusters, modify it only via
+            methods of MultiClusterConfig or by assigning a new list
+        """
+        return self._snapshot[0]
+
+    @clusters.setter
+    def clusters(self, clusters):
         with config_lock:
-            config_index = getattr(
-                self.thread_local_data, "config_index", self.cur_index
-            )
-            return getattr(self.clusters[config_index], attr)
+            self._snapshot = (clusters, self._snapshot[1])
+
+    @property
+    def cur_index(self):
+        """
+        int: Index of the current cluster in context
+        """
+        return self._snapshot[1]
+
+    @cur_index.setter
+    def cur_index(self, index):
+        with config_lock:
+            self._snapshot = (self._snapshot[0], index)
 
     @property
     def cluster_ctx(self):
-        config_index = getattr(self.thread_local_data, "config_index", self.cur_index)
-        return self.clusters[config_index]
+        clusters, cur_index = self._snapshot
+        config_index = config_index_var.get()
+        if config_index is None:
+            config_index = getattr(self.thread_local_data, "config_index", cur_index)
+        return clusters[config_index]
 
     @property
     def default_cluster_ctx(self):
@@ -200,15 +234,16 @@ class MultiClusterConfig:
         return self.ENV_DATA.get("default_cluster_context_index", 0)
 
     def _single_cluster_init_cluster_configs(self):
-        self.clusters.insert(0, Config())
+        self.clusters = [Config()] + self.clusters
 
     def init_cluster_configs(self):
         if self.nclusters > 1:
-            # reset if any single cluster object is present from init
-            self.clusters.clear()
+            # replace any single cluster object present from init
+            clusters = list()
             for i in range(self.nclusters):
-                self.clusters.insert(i, Config())
-                self.clusters[i].MULTICLUSTER["multicluster_index"] = i
+                clusters.append(Config())
+                clusters[i].MULTICLUSTER["multicluster_index"] = i
+            self.clusters = clusters
             self.single_cluster_default = False
 
     def update(self, user_dict):
@@ -226,6 +261,8 @@ class MultiClusterConfig:
             thread_id = get_ident()
             logger.info(f"Thread ID: {thread_id} is using config index: {index}")
             config.thread_local_data.config_index = index
+        if config_index_var.get() is not None:
+            config_index_var.set(index)
         # Log the switch after changing the current index
         logger.info(f"Switched to cluster: {self.current_cluster_name()}")
 
@@ -665,8 +702,11 @@ class MultiClusterConfig:
             new_config (Config): The new configuration to insert
 
         """
-        self.clusters.insert(index, new_config)
-        self.nclusters += 1
+        with config_lock:
+            clusters = list(self.clusters)
+            clusters.insert(index, new_config)
+            self.clusters = clusters
+            self.nclusters += 1
 
     def remove_cluster(self, index):
         """
@@ -675,8 +715,11 @@ class MultiClusterConfig:
         Args:
             index (int): The index of the cluster to remove
         """
-        self.clusters.pop(index)
-        self.nclusters -= 1
+        with config_lock:
+            clusters = list(self.clusters)
+            clusters.pop(index)
+            self.clusters = clusters
+            self.nclusters -= 1
 
     def remove_cluster_by_name(self, cluster_name):
         """
@@ -725,7 +768,7 @@ class ConfigSafeThread(Thread):
         try:
             super(ConfigSafeThread, self).run()
         finally:
-            if hasattr(self.thread_local_data, "config_index"):
+            if hasattr(config.thread_local_data, "config_index"):
                 del config.thread_local_data.config_index
 
 
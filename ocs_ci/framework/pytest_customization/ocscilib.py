@@ -8,6 +8,7 @@ pytest which proccess config and passes all params to pytest.
 """
 
 import datetime
+import json
 import logging
 import os
 import shutil
@@ -23,7 +24,7 @@ from ocs_ci.framework.exceptions import (
     ClusterNameNotProvidedError,
     ClusterPathNotProvidedError,
 )
-from ocs_ci.ocs import defaults
+from ocs_ci.ocs import ceph_commands, defaults
 from ocs_ci.ocs.constants import (
     CLUSTER_NAME_MAX_CHARACTERS,
     CLUSTER_NAME_MIN_CHARACTERS,
@@ -37,6 +38,7 @@ from ocs_ci.ocs.exceptions import (
 from ocs_ci.ocs.cluster import check_clusters
 from ocs_ci.ocs.resources.ocs import get_version_info
 from ocs_ci.ocs import utils
+from ocs_ci.utility import command_telemetry
 from ocs_ci.utility.utils import (
     dump_config_to_file,
     get_ceph_version,
@@ -1222,10 +1224,24 @@ def pytest_runtest_setup(item):
         log.debug(f"Test start time (UTC): {test_start_time.isoformat()}Z")
     except Exception:
         log.exception("Got exception while start to monitor memory")
+    if ocsci_config.RUN.get("ceph_command_cache"):
+        ceph_commands.cache_stats.reset()
+    command_telemetry.test_recorder.reset()
 
 
 @pytest.hookimpl(trylast=True)
 def pytest_runtest_teardown(item):
+    recorder = command_telemetry.test_recorder
+    if recorder.shapes:
+        top = ocsci_config.RUN.get("command_telemetry_top", 10)
+        log.info(f"Hottest commands of {item.nodeid}:\n{recorder.format_table(top)}")
+        item.user_properties.append(
+            ("command_telemetry", json.dumps(recorder.summary(top)))
+        )
+    if ocsci_config.RUN.get("ceph_command_cache"):
+        summary = ceph_commands.cache_stats.summary()
+        log.info(f"Ceph command cache during {item.nodeid}: {summary}")
+        item.user_properties.append(("ceph_command_cache", summary))
     try:
         _, peak_rss_table, peak_vms_table = stop_monitor_memory(save_csv=False)
         log.info(
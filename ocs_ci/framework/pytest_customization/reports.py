@@ -2,6 +2,7 @@ import os
 import pytest
 import logging
 from py.xml import html
+from ocs_ci.utility import command_telemetry
 from ocs_ci.utility.utils import (
     dump_config_to_file,
     email_reports,
@@ -117,6 +118,18 @@ def pytest_sessionfinish(session, exitstatus):
             f"Failed to save Test Time report to logs directory with exception. {e}"
         )
 
+    recorder = command_telemetry.session_recorder
+    if recorder.shapes:
+        top = ocsci_config.RUN.get("command_telemetry_top", 10)
+        log.info(f"Hottest commands of the session:\n{recorder.format_table(top)}")
+        try:
+            json_file, csv_file = command_telemetry.save_report(
+                recorder, ocsci_log_path(), top
+            )
+            log.info(f"Command telemetry saved to '{json_file}' and '{csv_file}'")
+        except Exception as e:
+            log.warning(f"Failed to save command telemetry report. {e}")
+
     for i in range(ocsci_config.nclusters):
         ocsci_config.switch_ctx(i)
         if not (
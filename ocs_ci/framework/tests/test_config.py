@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+
 from pytest import fixture
 
 from ocs_ci import framework
 
+log = logging.getLogger(__name__)
+
 
 class TestConfig(object):
     @fixture(autouse=True)
@@ -101,6 +107,75 @@ class TestConfig(object):
         framework.config.reset_ctx()
 
 
+class TestLockFreeReads(object):
+    @fixture(autouse=True)
+    def multicluster_config(self):
+        framework.config.nclusters = 2
+        framework.config.init_cluster_configs()
+        for i in range(framework.config.nclusters):
+            framework.config.clusters[i].ENV_DATA["cluster_name"] = f"cluster{i}"
+        yield
+        framework.config.reset_ctx()
+
+    def test_reads_do_not_take_config_lock(self):
+        names = []
+        with framework.config_lock:
+            reader = framework.ConfigSafeThread(
+                1,
+                target=lambda: names.append(framework.config.ENV_DATA["cluster_name"]),
+            )
+            reader.start()
+            reader.join(timeout=10)
+        assert names == ["cluster1"]
+        assert framework.config.ENV_DATA["cluster_name"] == "cluster0"
+
+    def test_cluster_list_changes(self):
+        framework.config.insert_cluster_config(2, framework.Config())
+        assert framework.config.nclusters == 3
+        clusters = framework.config.clusters
+        framework.config.switch_ctx(1)
+        framework.config.remove_cluster(0)
+        # the list fetched before is not modified
+        assert len(clusters) == 3
+        assert framework.config.nclusters == 2
+        framework.config.switch_ctx(0)
+        assert framework.config.ENV_DATA["cluster_name"] == "cluster1"
+
+    def test_read_throughput(self):
+        """
+        Read throughput of 1 and 64 threads, the reads run while config_lock
+        is held so they would never finish if they took it
+        """
+        reads = 20000
+
+        def read(index, barrier):
+            framework.config.thread_local_data.config_index = index
+            barrier.wait()
+            for _ in range(reads):
+                framework.config.ENV_DATA
+
+        throughput = {}
+        with framework.config_lock:
+            for nthreads in (1, 64):
+                barrier = threading.Barrier(nthreads + 1)
+                threads = [
+                    threading.Thread(target=read, args=(i % 2, barrier))
+                    for i in range(nthreads)
+                ]
+                for thread in threads:
+                    thread.start()
+                barrier.wait()
+                start = time.perf_counter()
+                for thread in threads:
+                    thread.join(timeout=60)
+                    assert not thread.is_alive()
+                throughput[nthreads] = nthreads * reads / (time.perf_counter() - start)
+        log.info(
+            f"Config reads per second: 1 thread {throughput[1]:.0f}, "
+            f"64 threads {throughput[64]:.0f}"
+        )
+
+
 class TestMergeDict:
     def test_merge_dict(self):
         objA = dict(
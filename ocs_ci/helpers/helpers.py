@@ -3,7 +3,9 @@ Helper functions file for OCS QE
 """
 
 import base64
+import copy
 import random
+import shutil
 import datetime
 import hashlib
 import json
@@ -45,15 +47,23 @@ from ocs_ci.ocs.exceptions import (
     CommandFailed,
     NoRunningCephToolBoxException,
     ResourceNotFoundError,
+    ResourcesNotReadyError,
     ResourceWrongStatusException,
     TimeoutExpiredError,
     UnavailableBuildException,
     UnexpectedBehaviour,
 )
 from ocs_ci.ocs.ocp import OCP
-from ocs_ci.ocs.resources import pod, pvc
+from ocs_ci.ocs.resources import bulk, pod, pvc
 from ocs_ci.ocs.resources.ocs import OCS
 from ocs_ci.utility import templating, version
+from ocs_ci.utility.artifact_writer import read_artifact
+from ocs_ci.utility.log_scanner import (
+    LogScanner,
+    node_log_source,
+    pod_log_source,
+    raise_for_error,
+)
 from ocs_ci.utility.vsphere import VSPHERE
 from ocs_ci.utility.operators import NMStateOperator
 from ocs_ci.utility.retry import retry
@@ -262,10 +272,9 @@ def create_scc(scc_name=None, scc_dict=None, scc_dict_path=None):
     return scc_obj
 
 
-def create_pod(
+def get_pod_data(
     interface_type=None,
     pvc_name=None,
-    do_reload=True,
     namespace=None,
     node_name=None,
     pod_dict_path=None,
@@ -288,12 +297,11 @@ def create_pod(
     host_users=None,
 ):
     """
-    Create a pod
+    Render the dictionary of a pod (or deployment) without creating it
 
     Args:
         interface_type (str): The interface type (CephFS, RBD, etc.)
         pvc_name (str): The PVC that should be attached to the newly created pod
-        do_reload (bool): True for reloading the object after creation, False otherwise
         namespace (str): The namespace for the new resource creation
         node_name (str): The name of specific node to schedule the pod
         pod_dict_path (str): YAML path for the pod
@@ -317,10 +325,7 @@ def create_pod(
             (False enables user namespaces)
 
     Returns:
-        Pod: A Pod instance
-
-    Raises:
-        AssertionError: In case of any failure
+        dict: Dictionary of the pod
 
     """
     namespace = namespace or config.ENV_DATA["cluster_namespace"]
@@ -491,6 +496,96 @@ def create_pod(
     # configure http[s]_proxy env variable, if required
     update_container_with_proxy_env(pod_data)
 
+    return pod_data
+
+
+def create_pod(
+    interface_type=None,
+    pvc_name=None,
+    do_reload=True,
+    namespace=None,
+    node_name=None,
+    pod_dict_path=None,
+    sa_name=None,
+    security_context=None,
+    raw_block_pv=False,
+    raw_block_device=constants.RAW_BLOCK_DEVICE,
+    replica_count=1,
+    pod_name=None,
+    node_selector=None,
+    command=None,
+    command_args=None,
+    ports=None,
+    subpath=None,
+    deployment=False,
+    scc=None,
+    volumemounts=None,
+    pvc_read_only_mode=None,
+    priorityClassName=None,
+    host_users=None,
+):
+    """
+    Create a pod
+
+    Args:
+        interface_type (str): The interface type (CephFS, RBD, etc.)
+        pvc_name (str): The PVC that should be attached to the newly created pod
+        do_reload (bool): True for reloading the object after creation, False otherwise
+        namespace (str): The namespace for the new resource creation
+        node_name (str): The name of specific node to schedule the pod
+        pod_dict_path (str): YAML path for the pod
+        sa_name (str): Serviceaccount name
+        security_context (dict): Set security context on container in the form of dictionary
+        raw_block_pv (bool): True for creating raw block pv based pod, False otherwise
+        raw_block_device (str): raw block device for the pod
+        replica_count (int): Replica count for deployment config
+        pod_name (str): Name of the pod to create
+        node_selector (dict): dict of key-value pair to be used for nodeSelector field
+            eg: {'nodetype': 'app-pod'}
+        command (list): The command to be executed on the pod
+        command_args (list): The arguments to be sent to the command running
+            on the pod
+        ports (dict): Service ports
+        subpath (str): Value of subPath parameter in pod yaml
+        deployment (bool): True for Deployment creation, False otherwise
+        scc (dict): Set security context on pod like fsGroup, runAsUer, runAsGroup
+        volumemounts (list): Value of mountPath parameter in pod yaml
+        host_users (bool): Set spec.hostUsers on the pod
+            (False enables user namespaces)
+
+    Returns:
+        Pod: A Pod instance
+
+    Raises:
+        AssertionError: In case of any failure
+
+    """
+    namespace = namespace or config.ENV_DATA["cluster_namespace"]
+    pod_data = get_pod_data(
+        interface_type=interface_type,
+        pvc_name=pvc_name,
+        namespace=namespace,
+        node_name=node_name,
+        pod_dict_path=pod_dict_path,
+        sa_name=sa_name,
+        security_context=security_context,
+        raw_block_pv=raw_block_pv,
+        raw_block_device=raw_block_device,
+        replica_count=replica_count,
+        pod_name=pod_name,
+        node_selector=node_selector,
+        command=command,
+        command_args=command_args,
+        ports=ports,
+        subpath=subpath,
+        deployment=deployment,
+        scc=scc,
+        volumemounts=volumemounts,
+        pvc_read_only_mode=pvc_read_only_mode,
+        priorityClassName=priorityClassName,
+        host_users=host_users,
+    )
+
     if deployment:
         deployment_obj = create_resource(**pod_data)
         logger.info(deployment_obj.name)
@@ -1168,6 +1263,7 @@ def create_multiple_pvcs(
     Returns:
          ocs_objs (list): List of PVC objects
          tmpdir (str): The full path of the directory in which the yamls for pvc objects creation reside
+            (None if burst is False)
 
     """
     if not burst:
@@ -1195,34 +1291,21 @@ def create_multiple_pvcs(
         pvc_data["spec"]["resources"]["requests"]["storage"] = size
     if access_mode == "ReadWriteMany" and "rbd" in sc_name:
         pvc_data["spec"]["volumeMode"] = "Block"
-    else:
-        pvc_data["spec"]["volumeMode"] = None
 
-    # Creating tem directory to hold the files for the PVC creation
-    tmpdir = tempfile.mkdtemp()
-    logger.info("Creating the PVC yaml files for creation in bulk")
-    ocs_objs = []
+    pvcs_data = []
     for _ in range(number_of_pvc):
         name = create_unique_resource_name("test", "pvc")
         logger.info(f"Adding PVC with name {name}")
         pvc_data["metadata"]["name"] = name
-        templating.dump_data_to_temp_yaml(pvc_data, f"{tmpdir}/{name}.yaml")
-        ocs_objs.append(pvc.PVC(**pvc_data))
+        pvcs_data.append(copy.deepcopy(pvc_data))
 
-    logger.info("Creating all PVCs as bulk")
-    oc = OCP(kind="pod", namespace=namespace)
-    cmd = f"create -f {tmpdir}/"
-    oc.exec_oc_cmd(command=cmd, out_yaml_format=False)
-
-    # Letting the system 1 sec for each PVC to create.
-    # this will prevent any other command from running in the system in this
-    # period of time.
-    logger.info(
-        f"Going to sleep for {number_of_pvc} sec. "
-        "until starting verify that PVCs was created."
+    # Creating temp directory to hold the files for the PVC creation, it is
+    # used for the bulk deletion by delete_bulk_pvcs
+    tmpdir = tempfile.mkdtemp()
+    logger.info(f"Creating {number_of_pvc} PVCs in bulk")
+    ocs_objs = bulk.bulk_create(
+        pvcs_data, factory=pvc.PVC, do_reload=do_reload, yaml_dir=tmpdir
     )
-    time.sleep(number_of_pvc)
-
     return ocs_objs, tmpdir
 
 
@@ -2649,7 +2732,7 @@ def create_multiple_pvc_parallel(sc_obj, namespace, number_of_pvc, size, access_
     Returns:
         pvc_objs_list (list): List of pvc objs created in function
     """
-    obj_status_list, result_lists = ([] for i in range(2))
+    result_lists = []
     with ThreadPoolExecutor() as executor:
         for mode in access_modes:
             result_lists.append(
@@ -2664,21 +2747,27 @@ def create_multiple_pvc_parallel(sc_obj, namespace, number_of_pvc, size, access_
             )
     result_list = [result.result() for result in result_lists]
     pvc_objs_list = converge_lists(result_list)
-    # Check for all the pvcs in Bound state
-    with ThreadPoolExecutor() as executor:
-        for objs in pvc_objs_list:
-            if objs is not None:
-                if type(objs) is list:
-                    for obj in objs:
-                        obj_status_list.append(
-                            executor.submit(wait_for_resource_state, obj, "Bound", 90)
-                        )
-                else:
-                    obj_status_list.append(
-                        executor.submit(wait_for_resource_state, objs, "Bound", 90)
-                    )
-    if False in [obj.result() for obj in obj_status_list]:
-        raise TimeoutExpiredError("Not all PVC are in bound state")
+    # Check for all the pvcs in Bound state, all of them from one list
+    pvc_names = []
+    for objs in pvc_objs_list:
+        if objs is not None:
+            if type(objs) is list:
+                pvc_names.extend(obj.name for obj in objs)
+            else:
+                pvc_names.append(objs.name)
+    if pvc_names:
+        try:
+            ocp.wait_for_many(
+                constants.PVC,
+                names=pvc_names,
+                predicate=constants.STATUS_BOUND,
+                namespace=namespace,
+                timeout=90,
+            )
+        except ResourcesNotReadyError as ex:
+            raise ResourceWrongStatusException(
+                ", ".join(ex.missed), column="STATUS", expected=constants.STATUS_BOUND
+            )
     return pvc_objs_list
 
 
@@ -2716,54 +2805,52 @@ def create_pods_parallel(
     wait_time = 300
     if raw_block_pv and not pod_dict_path:
         pod_dict_path = constants.CSI_RBD_RAW_BLOCK_POD_YAML
-    with ThreadPoolExecutor() as executor:
-        for pvc_obj in pvc_list:
-            if pvc_obj is not None:
-                if type(pvc_obj) is list:
-                    for pvc_ in pvc_obj:
-                        future_pod_objs.append(
-                            executor.submit(
-                                create_pod,
-                                interface_type=interface,
-                                pvc_name=pvc_.name,
-                                do_reload=False,
-                                namespace=namespace,
-                                raw_block_pv=raw_block_pv,
-                                pod_dict_path=pod_dict_path,
-                                sa_name=sa_name,
-                                deployment=deployment,
-                                node_selector=node_selector,
-                            )
-                        )
-                else:
-                    future_pod_objs.append(
-                        executor.submit(
-                            create_pod,
-                            interface_type=interface,
-                            pvc_name=pvc_obj.name,
-                            do_reload=False,
-                            namespace=namespace,
-                            raw_block_pv=raw_block_pv,
-                            pod_dict_path=pod_dict_path,
-                            sa_name=sa_name,
-                            deployment=deployment,
-                            node_selector=node_selector,
-                        )
+    pvc_names = []
+    for pvc_obj in pvc_list:
+        if pvc_obj is not None:
+            if type(pvc_obj) is list:
+                pvc_names.extend(pvc_.name for pvc_ in pvc_obj)
+            else:
+                pvc_names.append(pvc_obj.name)
+    pod_kwargs = dict(
+        interface_type=interface,
+        namespace=namespace,
+        raw_block_pv=raw_block_pv,
+        pod_dict_path=pod_dict_path,
+        sa_name=sa_name,
+        deployment=deployment,
+        node_selector=node_selector,
+    )
+    if deployment:
+        # create_pod waits for the pods of each deployment
+        with ThreadPoolExecutor() as executor:
+            for pvc_name in pvc_names:
+                future_pod_objs.append(
+                    executor.submit(
+                        create_pod, pvc_name=pvc_name, do_reload=False, **pod_kwargs
                     )
-
-    pod_objs = [pvc_obj.result() for pvc_obj in future_pod_objs]
-    # Check for all the pods are in Running state
-    # In above pod creation not waiting for the pod to be created because of threads usage
-    with ThreadPoolExecutor() as executor:
-        for obj in pod_objs:
-            future_pod_objs.append(
-                executor.submit(
-                    wait_for_resource_state, obj, "Running", timeout=wait_time
                 )
+        pod_objs = [pod_obj.result() for pod_obj in future_pod_objs]
+    else:
+        pods_data = [
+            get_pod_data(pvc_name=pvc_name, **pod_kwargs) for pvc_name in pvc_names
+        ]
+        pod_objs = bulk.bulk_create(pods_data, factory=pod.Pod)
+    # Check for all the pods are in Running state, all of them from one list
+    # In above pod creation not waiting for the pod to be created
+    if pod_objs:
+        try:
+            ocp.wait_for_many(
+                constants.POD,
+                names=[obj.name for obj in pod_objs],
+                predicate=constants.STATUS_RUNNING,
+                namespace=namespace,
+                timeout=wait_time,
+            )
+        except ResourcesNotReadyError as ex:
+            raise ResourceWrongStatusException(
+                ", ".join(ex.missed), column="STATUS", expected=constants.STATUS_RUNNING
             )
-    # If pods not up raise exception/failure
-    if False in [obj.result() for obj in future_pod_objs]:
-        raise TimeoutExpiredError("Not all pods are in running state")
     return pod_objs
 
 
@@ -3085,31 +3172,55 @@ def remove_label_from_worker_node(node_list, label_key):
     logger.info(out)
 
 
-def get_pods_nodes_logs():
+def _pods_nodes_log_sources():
     """
-    Get logs from all pods and nodes
+    Sources of the logs of all the nodes and of all the pods of the cluster
+    namespace
 
     Returns:
-        dict: node/pod name as key, logs content as value (string)
+        list: Sources of the logs (log_scanner.LogSource)
+
     """
-    all_logs = {}
-    all_pods = pod.get_all_pods()
-    all_nodes = node.get_node_objs()
+    pods = pod.get_all_pods(namespace=config.ENV_DATA["cluster_namespace"])
+    return [node_log_source(node_obj.name) for node_obj in node.get_node_objs()] + [
+        pod_log_source(pod_obj.name) for pod_obj in pods
+    ]
 
-    for node_obj in all_nodes:
-        node_name = node_obj.name
-        log_content = node.get_node_logs(node_name)
-        all_logs.update({node_name: log_content})
 
-    for pod_obj in all_pods:
-        try:
-            pod_name = pod_obj.name
-            log_content = pod.get_pod_logs(pod_name)
-            all_logs.update({pod_name: log_content})
-        except CommandFailed:
-            pass
+def _check_node_logs(results):
+    """
+    Raise for the node log which failed, the failed pod logs are skipped
+
+    Args:
+        results (dict): Results of LogScanner.scan
+
+    Raises:
+        CommandFailed: In case a node log could not be fetched
+
+    """
+    for result in results.values():
+        if result.source.kind == "node":
+            raise_for_error(result)
 
-    return all_logs
+
+def get_pods_nodes_logs(log_dir=None):
+    """
+    Get logs from all pods and nodes, the logs are fetched concurrently
+
+    Args:
+        log_dir (str): Directory to dump the logs to as <node/pod name>.log,
+            compressed when REPORTING['compress_artifacts'] is set
+
+    Returns:
+        dict: node/pod name as key, logs content as value (string)
+    """
+    results = LogScanner([]).scan(
+        _pods_nodes_log_sources(), dump_dir=log_dir, keep_content=True
+    )
+    _check_node_logs(results)
+    return {
+        name: result.content for name, result in results.items() if not result.error
+    }
 
 
 def get_logs_with_errors(errors=None):
@@ -3117,13 +3228,15 @@ def get_logs_with_errors(errors=None):
     From logs of all pods and nodes, get only logs
     containing any of specified errors
 
+    The logs are streamed to the log directory and scanned for all the errors
+    in one pass, only the logs with errors are kept and loaded.
+
     Args:
         errors (list): List of errors to look for
 
     Returns:
         dict: node/pod name as key, logs content as value; may be empty
     """
-    all_logs = get_pods_nodes_logs()
     output_logs = {}
 
     errors_list = constants.CRITICAL_ERRORS
@@ -3131,15 +3244,24 @@ def get_logs_with_errors(errors=None):
     if errors:
         errors_list = errors_list + errors
 
-    for name, log_content in all_logs.items():
-        for error_msg in errors_list:
-            if error_msg in log_content:
+    log_path = ocsci_log_path()
+    dump_dir = tempfile.mkdtemp(prefix="scanned_logs_", dir=log_path)
+    try:
+        results = LogScanner(errors_list, regex=False).scan(
+            _pods_nodes_log_sources(), dump_dir=dump_dir
+        )
+        _check_node_logs(results)
+        for name, result in results.items():
+            if result.error or not result.hits:
+                continue
+            found = {error_msg for hit in result.hits for error_msg in hit.patterns}
+            for error_msg in sorted(found):
                 logger.debug(f"Found '{error_msg}' in log of {name}")
-                output_logs.update({name: log_content})
-
-                log_path = f"{ocsci_log_path()}/{name}.log"
-                with open(log_path, "w") as fh:
-                    fh.write(log_content)
+            dump_path = os.path.join(log_path, os.path.basename(result.dump_path))
+            os.replace(result.dump_path, dump_path)
+            output_logs.update({name: read_artifact(dump_path)})
+    finally:
+        shutil.rmtree(dump_dir, ignore_errors=True)
 
     return output_logs
 
@@ -3,12 +3,14 @@ import os
 import logging
 import subprocess
 import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import re
 
 from ocs_ci.ocs.resources import pod
-from ocs_ci.framework import config
+from ocs_ci.framework import config, config_index_var
 from ocs_ci.ocs import constants
 from ocs_ci.utility.retry import retry
 from ocs_ci.utility.utils import TimeoutSampler
@@ -17,6 +19,8 @@ from ocs_ci.utility import version
 
 logger = logging.getLogger(__name__)
 DATE_TIME_FORMAT = "%Y I%m%d %H:%M:%S.%f"
+# number of the logs read at the same time
+LOG_READ_WORKERS = 16
 
 interface_data = {
     constants.CEPHBLOCKPOOL: {
@@ -197,9 +201,37 @@ def get_logfile_names(interface, provisioning=True):
     return log_names
 
 
+def run_oc_commands(cmds, namespace=None):
+    """
+    Running 'oc' commands concurrently, in the cluster context of the caller
+
+    Args:
+        cmds (list): the commands to run
+        namespace (str): the namespace where to run the commands. If None
+            is provided then value from config will be used.
+
+    Returns:
+        list : the results of the commands (lists of lines), in their order
+
+    """
+    config_index = config_index_var.get()
+    if config_index is None:
+        config_index = getattr(config.thread_local_data, "config_index", None)
+
+    def run(cmd):
+        if config_index is not None:
+            config_index_var.set(config_index)
+        return run_oc_command(cmd, namespace)
+
+    workers = max(min(len(cmds), LOG_READ_WORKERS), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, cmds))
+
+
 def read_csi_logs(log_names, container_name, start_time):
     """
-    Reading specific CSI logs starting on a specific time
+    Reading specific CSI logs starting on a specific time, the logs are read
+    concurrently
 
     Args:
         log_names (list): list of pods to read log from them
@@ -211,15 +243,10 @@ def read_csi_logs(log_names, container_name, start_time):
 
     """
     ns_name = config.ENV_DATA["cluster_namespace"]
-    logs = []
-    for l in log_names:
-        logs.append(
-            run_oc_command(
-                f"logs {l} -c {container_name} --since-time={start_time}",
-                ns_name,
-            )
-        )
-    return logs
+    return run_oc_commands(
+        [f"logs {l} -c {container_name} --since-time={start_time}" for l in log_names],
+        ns_name,
+    )
 
 
 # Sometimes, the logs are not available due to the connection issues, retry added
@@ -612,6 +639,264 @@ def calculate_operation_time(name, times):
     return total_time
 
 
+class CsiLogTimeline(object):
+    """
+    Timeline of the PVC operations in the provisioner and CSI logs
+
+    Every log line is parsed once: the PVC / PV names and the CSI request ids
+    of the start and end messages are indexed with the first occurrence of
+    each, so the creation and deletion times of any set of PVCs are answered
+    by dictionary lookups instead of matching every line for every PVC.
+    The names are matched as whole identifiers of the line (eg. 'pvc-name' of
+    PVC="ns/pvc-name"), not as substrings of the longer names.
+    """
+
+    # the line positions and the timestamps ('I0517 10:00:00.123456') of the
+    # events are kept as (position, mon_day) tuples
+    _identifier = re.compile(r"[\w.-]+")
+    _req_id = re.compile(r"Req-ID: (\S+) GRPC (call|response):")
+    _pvc_path = re.compile(r'PVC="[^"]*/([^"]*)"')
+    _pv = re.compile(r'PV="([^"]*)"')
+    _legacy_delete_started = re.compile(r'delete "([^"]*)": started')
+    _legacy_delete_succeeded = re.compile(r'delete "([^"]*)": succeeded')
+    _succeeded = re.compile("succeeded", re.IGNORECASE)
+    _generated_volume_id = re.compile("generated volume id", re.IGNORECASE)
+
+    def __init__(self, prov_logs=None, csi_logs=None, ocs_version=None):
+        """
+        Args:
+            prov_logs (list): Logs (lists of lines) of the csi-provisioner
+                containers, see read_csi_logs
+            csi_logs (list): Logs (lists of lines) of the CSI plugin
+                containers of the provisioner pods
+            ocs_version (str): OCS version of the log format, defaults to the
+                version from the config
+
+        """
+        if ocs_version is None:
+            ocs_version = version.get_semantic_ocs_version_from_config()
+        else:
+            ocs_version = version.get_semantic_version(ocs_version, True)
+        self.legacy_format = ocs_version <= version.VERSION_4_16
+        self.legacy_delete_end = ocs_version <= version.VERSION_4_13
+        self.lines = 0
+        self.create_start = {}
+        self.create_end = {}
+        self.create_end_nocase = {}
+        self.delete_start = {}
+        self.delete_end = {}
+        self.calls = {}
+        self.responses = {}
+        self.volume_ids = {}
+        for sublog in prov_logs or []:
+            for line in sublog:
+                self._add_prov_line(line)
+        for sublog in csi_logs or []:
+            for line in sublog:
+                self._add_csi_line(line)
+        logger.info(
+            f"Indexed {self.lines} log lines: {len(self.create_start)} "
+            f"provisioning, {len(self.delete_start)} deletion starts and "
+            f"{len(self.calls)} CSI requests"
+        )
+
+    @staticmethod
+    def _first(events, keys, event):
+        """
+        Record the event of the keys which have no event yet
+        """
+        for key in keys:
+            if key not in events:
+                events[key] = event
+
+    def _add_prov_line(self, line):
+        """
+        Index the provisioning and deletion messages of provisioner log line
+        """
+        position = self.lines
+        self.lines += 1
+        event = None
+        if self.legacy_format and "provision" in line:
+            # provision "<namespace>/<pvc name>" class "<sc>": started
+            begin = line.find("provision") + len("provision")
+            for status, events in (
+                ("started", self.create_start),
+                ("succeeded", self.create_end),
+            ):
+                end = line.rfind(status)
+                if end > begin:
+                    event = event or (position, " ".join(line.split(" ")[0:2]))
+                    self._first(
+                        events, self._identifier.findall(line, begin, end), event
+                    )
+        if "Started" in line:
+            # "Started" PVC="<namespace>/<pvc name>"
+            names = self._pvc_path.findall(line, line.find("Started"))
+            if names:
+                event = event or (position, " ".join(line.split(" ")[0:2]))
+                self._first(self.create_start, names, event)
+        succeeded = self._succeeded.search(line)
+        if succeeded:
+            event = event or (position, " ".join(line.split(" ")[0:2]))
+            self._first(
+                self.create_end_nocase,
+                [
+                    name.lower()
+                    for name in self._identifier.findall(line, succeeded.end())
+                ],
+                event,
+            )
+            if "deleted succeeded" in line:
+                self._first(
+                    self.delete_end,
+                    self._pv.findall(line, line.find("deleted succeeded")),
+                    event,
+                )
+        if '"shouldDelete is true"' in line:
+            event = event or (position, " ".join(line.split(" ")[0:2]))
+            self._first(
+                self.delete_start,
+                self._pv.findall(line, line.find('"shouldDelete is true"')),
+                event,
+            )
+        if self.legacy_format and 'delete "' in line:
+            event = event or (position, " ".join(line.split(" ")[0:2]))
+            self._first(
+                self.delete_start, self._legacy_delete_started.findall(line), event
+            )
+            if self.legacy_delete_end:
+                self._first(
+                    self.delete_end,
+                    self._legacy_delete_succeeded.findall(line),
+                    event,
+                )
+
+    def _add_csi_line(self, line):
+        """
+        Index the generated volume ids and the GRPC calls and responses of
+        CSI log line
+        """
+        position = self.lines
+        self.lines += 1
+        if "(" in line and self._generated_volume_id.search(line):
+            # the PV names of the line get the volume id of the first
+            # parentheses, deletion requests are made with this id
+            volume_id = line.split("(")[1].split(")")[0]
+            for name in set(self._identifier.findall(line)):
+                self.volume_ids.setdefault(name, []).append((position, volume_id))
+        if "Req-ID: " in line:
+            event = (position, " ".join(line.split(" ")[0:2]))
+            for req_id, kind in self._req_id.findall(line):
+                events = self.calls if kind == "call" else self.responses
+                events.setdefault(req_id, []).append(event)
+
+    @staticmethod
+    def _first_of(*events):
+        """
+        Returns:
+            tuple: The earliest of the events, None if there is none
+
+        """
+        found = [event for event in events if event is not None]
+        return min(found) if found else None
+
+    def _first_delete_request(self, events, pv_name):
+        """
+        Returns:
+            tuple: First event of the deletion request of the PV: the request
+                with the volume id generated for the PV by the time of the line
+
+        """
+        generated = self.volume_ids.get(pv_name, [])
+        for i, (position, volume_id) in enumerate(generated):
+            if not volume_id:
+                continue
+            until = generated[i + 1][0] if i + 1 < len(generated) else self.lines
+            requests = events.get(volume_id, [])
+            index = bisect_left(requests, (position,))
+            if index < len(requests) and requests[index][0] < until:
+                return requests[index]
+        return None
+
+    @staticmethod
+    def _operation_times(name, start, end, year):
+        """
+        Returns:
+            dict: Start and end timestamps of the operation and its time, the
+                time is calculated when the end is found
+
+        """
+        times = {"start": None, "end": None, "time": None}
+        if start is not None:
+            times["start"] = f"{year} {start[1]}"
+        if end is not None:
+            if start is None or start[0] > end[0]:
+                # the end was logged before the start
+                times["start"] = None
+            times["end"] = f"{year} {end[1]}"
+            times["time"] = calculate_operation_time(name, times)
+        return times
+
+    def pvc_times(self, pvc_objs, op="all"):
+        """
+        Creation and deletion times of the PVCs
+
+        Args:
+            pvc_objs (list): PVC objects (with name and backed_pv) to get the
+                times of
+            op (str) : the operation to mesure : create / delete / all (create
+                & delete)
+
+        Returns:
+            dict: Start and end timestamps and the time of 'create', 'delete',
+                'csi_create' and 'csi_delete' operation of every PVC by its
+                name, see get_pvc_provision_times
+
+        """
+        year = str(datetime.now().year)
+        results = {}
+        for pvc_obj in pvc_objs:
+            name = pvc_obj.name
+            pv_name = pvc_obj.backed_pv
+            empty = {"start": None, "end": None, "time": None}
+            results[name] = {
+                "create": dict(empty),
+                "delete": dict(empty),
+                "csi_create": dict(empty),
+                "csi_delete": dict(empty),
+            }
+            if op in ["all", "create"]:
+                results[name]["create"] = self._operation_times(
+                    name,
+                    self.create_start.get(name),
+                    self._first_of(
+                        self.create_end.get(name),
+                        self.create_end_nocase.get(name.lower()),
+                    ),
+                    year,
+                )
+                results[name]["csi_create"] = self._operation_times(
+                    name,
+                    self.calls.get(pv_name, [None])[0],
+                    self.responses.get(pv_name, [None])[0],
+                    year,
+                )
+            if op in ["all", "delete"]:
+                results[name]["delete"] = self._operation_times(
+                    name,
+                    self.delete_start.get(pv_name),
+                    self.delete_end.get(pv_name),
+                    year,
+                )
+                results[name]["csi_delete"] = self._operation_times(
+                    name,
+                    self._first_delete_request(self.calls, pv_name),
+                    self._first_delete_request(self.responses, pv_name),
+                    year,
+                )
+        return results
+
+
 def get_pvc_provision_times(interface, pvc_name, start_time, time_type="all", op="all"):
     """
     Get the starting/ending creation time of a PVC based on provisioner logs
@@ -630,142 +915,34 @@ def get_pvc_provision_times(interface, pvc_name, start_time, time_type="all", op
     """
 
     log_names = get_logfile_names(interface)
+    ns_name = config.ENV_DATA["cluster_namespace"]
 
+    containers = []
     if time_type.lower() in ["all", "total"]:
         logger.info("Reading the Provisioner logs")
-        prov_logs = read_csi_logs(log_names, "csi-provisioner", start_time)
+        containers.append("csi-provisioner")
     if time_type.lower() in ["all", "csi"]:
         logger.info("Reading the CSI only logs")
-        csi_logs = read_csi_logs(
-            log_names, interface_data[interface]["csi_cnt"], start_time
-        )
+        containers.append(interface_data[interface]["csi_cnt"])
+    logs = run_oc_commands(
+        [
+            f"logs {l} -c {container} --since-time={start_time}"
+            for container in containers
+            for l in log_names
+        ],
+        ns_name,
+    )
+    logs = {
+        container: logs[i * len(log_names) : (i + 1) * len(log_names)]
+        for i, container in enumerate(containers)
+    }
 
-    # Initializing the results dictionary
-    results = {}
-    for i in range(0, len(pvc_name)):
-        results[pvc_name[i].name] = {
-            "create": {"start": None, "end": None, "time": None},
-            "delete": {"start": None, "end": None, "time": None},
-            "csi_create": {"start": None, "end": None, "time": None},
-            "csi_delete": {"start": None, "end": None, "time": None},
-        }
-    # Getting times from Provisioner log - if needed
-    if prov_logs:
-        for sublog in prov_logs:
-            for line in sublog:
-                for i in range(0, len(pvc_name)):
-                    name = pvc_name[i].name
-                    pv_name = pvc_name[i].backed_pv
-                    if op in ["all", "create"]:
-                        if (
-                            re.search(f"provision.*{name}.*started", line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_16
-                            )
-                        ) or re.search(f'Started.*PVC="[^"]*/{re.escape(name)}"', line):
-                            if results[name]["create"]["start"] is None:
-                                results[name]["create"]["start"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                        if (
-                            re.search(f"provision.*{name}.*succeeded", line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_16
-                            )
-                        ) or re.search(
-                            f"Succeeded.*{re.escape(name)}", line, re.IGNORECASE
-                        ):
-                            if results[name]["create"]["end"] is None:
-                                results[name]["create"]["end"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                                results[name]["create"]["time"] = (
-                                    calculate_operation_time(
-                                        name, results[name]["create"]
-                                    )
-                                )
-                    if op in ["all", "delete"]:
-                        if (
-                            re.search(f'delete "{pv_name}": started', line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_16
-                            )
-                        ) or re.search(
-                            f'"shouldDelete is true".*PV="{re.escape(pv_name)}"', line
-                        ):
-                            if results[name]["delete"]["start"] is None:
-                                results[name]["delete"]["start"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                        if (
-                            re.search(f'delete "{pv_name}": succeeded', line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_13
-                            )
-                        ) or re.search(
-                            f'deleted succeeded.*PV="{re.escape(pv_name)}"', line
-                        ):
-                            if results[name]["delete"]["end"] is None:
-                                results[name]["delete"]["end"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                                results[name]["delete"]["time"] = (
-                                    calculate_operation_time(
-                                        name, results[name]["delete"]
-                                    )
-                                )
-
-    # Getting times from CSI log - if needed
-    del_pv_names = []
-    for i in range(0, len(pvc_name)):
-        del_pv_names.append("")
-
-    if csi_logs:
-        for sublog in csi_logs:
-            for line in sublog:
-                for i in range(0, len(pvc_name)):
-                    name = pvc_name[i].name
-                    pv_name = pvc_name[i].backed_pv
-
-                    if "generated volume id" in line.lower() and pv_name in line:
-                        del_pv_names[i] = line.split("(")[1].split(")")[0]
-                    if op in ["all", "create"]:
-                        if f"Req-ID: {pv_name} GRPC call:" in line:
-                            if results[name]["csi_create"]["start"] is None:
-                                results[name]["csi_create"]["start"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                        if f"Req-ID: {pv_name} GRPC response:" in line:
-                            if results[name]["csi_create"]["end"] is None:
-                                results[name]["csi_create"]["end"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                                results[name]["csi_create"]["time"] = (
-                                    calculate_operation_time(
-                                        name, results[name]["csi_create"]
-                                    )
-                                )
-                    if op in ["all", "delete"]:
-                        if del_pv_names[i]:
-                            if f"Req-ID: {del_pv_names[i]} GRPC call:" in line:
-                                if results[name]["csi_delete"]["start"] is None:
-                                    results[name]["csi_delete"]["start"] = (
-                                        extruct_timestamp_from_log(line)
-                                    )
-                            if f"Req-ID: {del_pv_names[i]} GRPC response:" in line:
-                                if results[name]["csi_delete"]["end"] is None:
-                                    results[name]["csi_delete"]["end"] = (
-                                        extruct_timestamp_from_log(line)
-                                    )
-                                    results[name]["csi_delete"]["time"] = (
-                                        calculate_operation_time(
-                                            name, results[name]["csi_delete"]
-                                        )
-                                    )
+    timeline = CsiLogTimeline(
+        prov_logs=logs.get("csi-provisioner"),
+        csi_logs=logs.get(interface_data[interface]["csi_cnt"]),
+    )
+    del logs
+    results = timeline.pvc_times(pvc_name, op)
 
     logger.debug(f"All results are : {json.dumps(results, indent=3)}")
     return results
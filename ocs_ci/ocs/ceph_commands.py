@@ -0,0 +1,331 @@
+"""
+Ceph command service of the toolbox pod
+
+CephCluster, CephHealthMonitor and many helpers run 'ceph health', 'ceph osd
+tree', 'ceph df detail' or 'ceph pg dump' again and again, each time by a new
+exec to the toolbox pod and with pretty printed JSON output. The service
+executes the commands in one persistent exec session to the toolbox, requests
+compact JSON when the output is loaded anyway, and caches the output of the
+read-only commands keyed by the epochs of the cluster maps the output depends
+on. One 'ceph status' probe tells whether the cached output is still valid.
+
+The service is opt-in by RUN['ceph_command_cache'], when the cache is
+disabled the commands are executed without the probe.
+"""
+
+import json
+import logging
+import threading
+import time
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import PodExecSessionUnavailable
+from ocs_ci.ocs.ocp import load_yaml_output
+from ocs_ci.utility.json import loads as json_loads
+
+log = logging.getLogger(__name__)
+
+STATUS_COMMAND = "ceph status"
+
+# fields of the pgmap summary in 'ceph status' which change only with the PGs,
+# pools or stored data, unlike the IO and recovery rates reported there too
+PGMAP_KEY_FIELDS = (
+    "num_pgs",
+    "pgs_by_state",
+    "num_pools",
+    "num_objects",
+    "data_bytes",
+    "bytes_used",
+    "bytes_avail",
+    "bytes_total",
+)
+
+# read-only commands (matched by the leading words) and the cluster maps
+# their output depends on
+EPOCH_KEYED_COMMANDS = (
+    ("ceph osd tree", ("osdmap",)),
+    ("ceph osd dump", ("osdmap",)),
+    ("ceph osd ls", ("osdmap",)),
+    ("ceph osd pool ls", ("osdmap",)),
+    ("ceph osd crush dump", ("osdmap",)),
+    ("ceph osd crush tree", ("osdmap",)),
+    ("ceph osd crush rule ls", ("osdmap",)),
+    ("ceph osd crush rule dump", ("osdmap",)),
+    ("ceph osd df", ("osdmap", "pgmap")),
+    ("ceph df", ("osdmap", "pgmap")),
+    ("ceph pg dump", ("osdmap", "pgmap")),
+    ("ceph mon dump", ("monmap",)),
+    ("ceph fs ls", ("fsmap", "osdmap")),
+    ("ceph fs dump", ("fsmap",)),
+)
+
+
+def cached_maps(ceph_cmd):
+    """
+    Get cluster maps the output of the command depends on
+
+    Args:
+        ceph_cmd (str): Ceph command without the format option
+
+    Returns:
+        tuple: Names of the maps, empty if the command can't be cached
+
+    """
+    words = ceph_cmd.split()
+    for prefix, maps in EPOCH_KEYED_COMMANDS:
+        prefix_words = prefix.split()
+        if words[: len(prefix_words)] == prefix_words:
+            return maps
+    return ()
+
+
+def status_epochs(status):
+    """
+    Get epochs of the cluster maps from 'ceph status' output
+
+    The pgmap has no epoch in 'ceph status', the PG states, object and byte
+    counters of its summary (PGMAP_KEY_FIELDS) are used instead, so a change
+    of the stored data invalidates the cached output while the IO and
+    recovery rates don't.
+
+    Args:
+        status (dict): Loaded 'ceph status --format json' output
+
+    Returns:
+        dict: Epoch (or summary) of the map by the map name
+
+    """
+    osdmap = status.get("osdmap") or {}
+    # older releases nest the osdmap summary
+    osdmap = osdmap.get("osdmap", osdmap)
+    pgmap = {
+        field: value
+        for field, value in (status.get("pgmap") or {}).items()
+        if field in PGMAP_KEY_FIELDS
+    }
+    return {
+        "osdmap": osdmap.get("epoch"),
+        "monmap": (status.get("monmap") or {}).get("epoch"),
+        "fsmap": (status.get("fsmap") or {}).get("epoch"),
+        "pgmap": json.dumps(pgmap, sort_keys=True) if pgmap else None,
+    }
+
+
+def load_output(out):
+    """
+    Load output of the ceph command
+
+    Args:
+        out (str): Output of the command
+
+    Returns:
+        object: Loaded output
+
+    """
+    try:
+        return json_loads(out)
+    except ValueError:
+        # e.g. plain text output or 'nan' values
+        return load_yaml_output(out)
+
+
+class CephCommandCacheStats(object):
+    """
+    Hits, misses and exec time saved by the ceph command cache
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the counters, e.g. at the start of the test
+        """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.probes = 0
+            self.saved_time = 0.0
+
+    def record(self, hit, saved_time=0.0):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.saved_time += max(saved_time, 0.0)
+            else:
+                self.misses += 1
+
+    def record_probe(self):
+        with self._lock:
+            self.probes += 1
+
+    @property
+    def hit_ratio(self):
+        """
+        float: Ratio of the cacheable commands answered from the cache
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self):
+        """
+        Get summary of the counters
+
+        Returns:
+            str: Human readable summary
+
+        """
+        return (
+            f"hits={self.hits} misses={self.misses} probes={self.probes} "
+            f"hit_ratio={self.hit_ratio:.0%} saved_exec_time={self.saved_time:.1f}s"
+        )
+
+
+cache_stats = CephCommandCacheStats()
+
+
+class CephCommandService(object):
+    """
+    Executes ceph commands in the toolbox pod and caches the output of the
+    read-only commands by the cluster map epochs
+    """
+
+    def __init__(self, toolbox, clock=time.monotonic):
+        """
+        Args:
+            toolbox (Pod): Ceph toolbox pod
+            clock (callable): Monotonic clock used to measure the exec time
+
+        """
+        self.toolbox = toolbox
+        self._clock = clock
+        self._lock = threading.Lock()
+        # command: (epochs, output, exec time)
+        self._cache = dict()
+        self._session_available = True
+
+    def _exec(self, command, timeout):
+        """
+        Execute the command in the exec session, by 'oc rsh' if the session
+        can't be opened
+
+        Returns:
+            str: Output of the command
+
+        """
+        if self._session_available:
+            try:
+                return self.toolbox.exec_cmd_in_session(
+                    command, out_yaml_format=False, timeout=timeout
+                )
+            except PodExecSessionUnavailable as ex:
+                log.info(f"Ceph commands are executed by oc client: {ex}")
+                self._session_available = False
+        return self.toolbox.exec_cmd_on_pod(
+            command, out_yaml_format=False, timeout=timeout
+        )
+
+    def probe(self, timeout=600):
+        """
+        Get current epochs of the cluster maps
+
+        Args:
+            timeout (int): Timeout for the command
+
+        Returns:
+            tuple: Epochs by the map name (dict) and loaded 'ceph status'
+                output (dict)
+
+        """
+        status = load_output(self._exec(f"{STATUS_COMMAND} --format json", timeout))
+        cache_stats.record_probe()
+        return status_epochs(status), status
+
+    def exec_ceph_cmd(
+        self, ceph_cmd, format="json-pretty", out_yaml_format=True, timeout=600
+    ):
+        """
+        Execute the ceph command, the output of the read-only commands is
+        served from the cache while the cluster maps it depends on didn't
+        change
+
+        Args:
+            ceph_cmd (str): The Ceph command to execute on the Ceph tools pod
+            format (str): The returning output format of the Ceph command
+            out_yaml_format (bool): whether to return loaded python object OR
+                to return raw output
+            timeout (int): timeout for the command, defaults to 600 seconds
+
+        Returns:
+            dict: Loaded output if out_yaml_format is True
+            str: Raw output otherwise
+
+        """
+        if out_yaml_format and format in ("json", "json-pretty"):
+            # the output is loaded, pretty printing is waste of bytes
+            format = "json"
+        command = f"{ceph_cmd} --format {format}" if format else ceph_cmd
+        maps = cached_maps(ceph_cmd) if config.RUN.get("ceph_command_cache") else ()
+        if ceph_cmd.strip() == STATUS_COMMAND and format == "json":
+            # 'ceph status' is the probe itself
+            _, out = self.probe(timeout)
+            return out if out_yaml_format else json.dumps(out)
+        if maps:
+            out = self._exec_cached(command, maps, timeout)
+        else:
+            out = self._exec(command, timeout)
+        return load_output(out) if out_yaml_format else out
+
+    def _exec_cached(self, command, maps, timeout):
+        start = self._clock()
+        epochs, _ = self.probe(timeout)
+        probe_time = self._clock() - start
+        key = tuple(epochs.get(name) for name in maps)
+        if None in key:
+            # the epoch is unknown, the output can't be validated
+            return self._exec(command, timeout)
+        with self._lock:
+            cached = self._cache.get(command)
+        if cached and cached[0] == key:
+            log.debug(f"Output of '{command}' served from the cache")
+            cache_stats.record(True, cached[2] - probe_time)
+            return cached[1]
+        start = self._clock()
+        out = self._exec(command, timeout)
+        exec_time = self._clock() - start
+        # the output is at least as new as the epochs probed before
+        with self._lock:
+            self._cache[command] = (key, out, exec_time)
+        cache_stats.record(False)
+        return out
+
+    def invalidate(self):
+        """
+        Drop all the cached output
+        """
+        with self._lock:
+            self._cache.clear()
+
+
+_services = dict()
+_services_lock = threading.Lock()
+
+
+def get_service(toolbox):
+    """
+    Get the ceph command service of the toolbox pod
+
+    Args:
+        toolbox (Pod): Ceph toolbox pod
+
+    Returns:
+        CephCommandService: Service shared by all the objects of the same pod
+
+    """
+    key = (toolbox.ocp.get_kubeconfig(), toolbox.namespace, toolbox.name)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = CephCommandService(toolbox)
+        return service
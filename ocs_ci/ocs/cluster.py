@@ -211,28 +211,67 @@ class CephCluster(object):
     def pods(self):
         return self._ceph_pods
 
+    @property
+    def role_selectors(self):
+        """
+        dict: Attribute with the list of the pods of the role (e.g. 'mons')
+            to the label of the pods
+        """
+        return {
+            "mons": self.mon_selector,
+            "mdss": self.mds_selector,
+            "mgrs": self.mgr_selector,
+            "osds": self.osd_selector,
+            "noobaas": self.noobaa_selector,
+            "rgws": constant.RGW_APP_LABEL,
+        }
+
+    def _set_role_pods(self, role, pods):
+        """
+        Set the list of the pods of the role and its count
+
+        Args:
+            role (str): The role attribute, e.g. 'mons'
+            pods (list): Pod objects of the role
+
+        """
+        if role == "mons":
+            # TODO: Workaround for BZ1748325:
+            pods = [
+                self.set_port(mon)
+                for mon in pods
+                if pod.get_pod_status_from_data(mon.data) == constant.STATUS_RUNNING
+            ]
+            # TODO: End of workaround for BZ1748325
+        setattr(self, role, pods)
+        setattr(self, f"{role[:-1]}_count", len(set([p.name for p in pods])))
+
+    def refresh_pods(self, role):
+        """
+        Refresh only the list of the pods of one role with one oc call
+
+        Args:
+            role (str): The role attribute, one of role_selectors (e.g. 'osds')
+
+        """
+        pods = pod.get_pods_having_label(self.role_selectors[role], self.namespace)
+        self._set_role_pods(role, [pod.Pod(**pod_data) for pod_data in pods])
+
     @retry(CommandFailed, tries=3, delay=10, backoff=1)
     def scan_cluster(self):
         """
-        Get accurate info on current state of pods
+        Get accurate info on current state of pods. All the pod lists and
+        statuses are derived from one snapshot of the pods in the namespace.
         """
         self._ceph_pods = pod.get_all_pods(self._namespace)
-        # TODO: Workaround for BZ1748325:
-        mons = pod.get_mon_pods(self.mon_selector, self.namespace)
-        self.mons = []
-        for mon in mons:
-            if mon.ocp.get_resource_status(mon.name) == constant.STATUS_RUNNING:
-                self.mons.append(mon)
-        # TODO: End of workaround for BZ1748325
-        self.mdss = pod.get_mds_pods(self.mds_selector, self.namespace)
-        self.mgrs = pod.get_mgr_pods(self.mgr_selector, self.namespace)
-        self.osds = pod.get_osd_pods(self.osd_selector, self.namespace)
-        self.noobaas = pod.get_noobaa_pods(self.noobaa_selector, self.namespace)
-        self.rgws = pod.get_rgw_pods()
-        self.toolbox = pod.get_ceph_tools_pod()
-
-        # set port attrib on mon pods
-        self.mons = list(map(self.set_port, self.mons))
+        for role, selector in self.role_selectors.items():
+            self._set_role_pods(
+                role, pod.filter_pods_having_label(self._ceph_pods, selector)
+            )
+        self.toolbox = pod.get_ceph_tools_pod(
+            pod_snapshot=[pod_obj.data for pod_obj in self._ceph_pods]
+        )
+
         self.cluster.reload()
         if self.cephfs:
             self.cephfs.reload()
@@ -245,13 +284,6 @@ class CephCluster(object):
                 logger.warning(e)
                 logger.warning("No CephFS found")
 
-        self.mon_count = len(set([mon.name for mon in self.mons]))
-        self.mds_count = len(set([mds.name for mds in self.mdss]))
-        self.mgr_count = len(set([mgr.name for mgr in self.mgrs]))
-        self.osd_count = len(set([osd.name for osd in self.osds]))
-        self.noobaa_count = len(set([noobaa.name for noobaa in self.noobaas]))
-        self.rgw_count = len(set([rgw.name for rgw in self.rgws]))
-
     @staticmethod
     def set_port(pod):
         """
@@ -631,6 +663,10 @@ class CephCluster(object):
         if detail:
             ceph_health_cmd = f"{ceph_health_cmd} detail"
 
+        if config.RUN.get("ceph_command_cache"):
+            return self.toolbox.exec_ceph_cmd(
+                ceph_health_cmd, format=None, out_yaml_format=False
+            )
         return self.toolbox.exec_cmd_on_pod(
             ceph_health_cmd,
             out_yaml_format=False,
@@ -647,6 +683,10 @@ class CephCluster(object):
             str: Output of the ceph status command.
 
         """
+        if config.RUN.get("ceph_command_cache"):
+            return self.toolbox.exec_ceph_cmd(
+                "ceph status", format=format, out_yaml_format=False
+            )
         cmd = "ceph status"
         if format:
             cmd += f" -f {format}"
@@ -65,6 +65,22 @@ class TimeoutExpiredError(Exception):
         return self.message
 
 
+class ResourcesNotReadyError(TimeoutExpiredError):
+    """
+    Some of the resources waited for together didn't get ready in time
+    """
+
+    def __init__(self, kind, missed, ready=None, timeout=None):
+        self.kind = kind
+        self.missed = missed
+        self.ready = ready or dict()
+        super().__init__(
+            timeout,
+            f"{len(missed)} {kind} resource(s) didn't get ready in {timeout}s: "
+            f"{', '.join(missed)}",
+        )
+
+
 class TimeoutException(Exception):
     pass
 
@@ -852,3 +868,30 @@ class NodeBMCUnreachableError(Exception):
     """
 
     pass
+
+
+class KubeAPIUnsupportedOperation(Exception):
+    """
+    Raised when the native Kubernetes API backend can't serve the oc command
+    and the command has to be executed by the 'oc' client instead.
+    """
+
+    pass
+
+
+class KubeAPIWatchExpired(Exception):
+    """
+    Raised when the watch can't continue from the requested resourceVersion
+    (410 Gone) and the objects have to be listed again.
+    """
+
+    pass
+
+
+class PodExecSessionUnavailable(Exception):
+    """
+    Raised when the persistent exec session to the pod can't be opened and
+    the command has to be executed by 'oc rsh'/'oc exec' instead.
+    """
+
+    pass
@@ -0,0 +1,458 @@
+"""
+Watch backed informer cache for OCP objects
+
+Polling helpers like OCP.get, OCP.get_resource and OCP.wait_for_resource list
+the whole namespace on every iteration and many fixtures poll the same kinds
+at the same time. The Informer keeps one list+watch stream per (cluster, kind,
+namespace) and an in-memory store indexed by name and labels, so all the
+OCP objects of the same kind can be answered from memory while the store is
+synced with the API server.
+
+The cache is opt-in, the kinds served from the cache are configured per
+cluster context in RUN['informer_kinds'].
+"""
+
+import atexit
+import copy
+import logging
+import threading
+from collections import defaultdict
+
+from ocs_ci.ocs.exceptions import (
+    CommandFailed,
+    KubeAPIUnsupportedOperation,
+    KubeAPIWatchExpired,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SYNC_TIMEOUT = 30
+DEFAULT_WATCH_TIMEOUT = 300
+# maximal delay between relists after repeated failures
+MAX_RETRY_DELAY = 60
+
+_informers = dict()
+_informers_lock = threading.Lock()
+
+
+def parse_selector(selector):
+    """
+    Parse equality based label selector
+
+    Args:
+        selector (str): Label selector (e.g. 'app=foo,tier!=db,env,!debug')
+
+    Returns:
+        list: Requirements as tuples (key, operator, value) where operator is
+            one of '=', '!=', 'exists', '!exists'. None if the selector uses
+            set based requirements which are not supported by the cache.
+
+    """
+    requirements = []
+    if not selector:
+        return requirements
+    for requirement in selector.split(","):
+        requirement = requirement.strip()
+        if not requirement:
+            continue
+        if "(" in requirement or " " in requirement:
+            # set based requirements like 'env in (a, b)'
+            return None
+        if "!=" in requirement:
+            key, value = requirement.split("!=", 1)
+            requirements.append((key, "!=", value))
+        elif "=" in requirement:
+            key, value = requirement.replace("==", "=").split("=", 1)
+            requirements.append((key, "=", value))
+        elif requirement.startswith("!"):
+            requirements.append((requirement[1:], "!exists", None))
+        else:
+            requirements.append((requirement, "exists", None))
+    return requirements
+
+
+def _labels(obj):
+    return obj.get("metadata", {}).get("labels") or {}
+
+
+def match_labels(obj, requirements):
+    """
+    Check the labels of the object match the requirements of the selector
+
+    Args:
+        obj (dict): Object to check
+        requirements (list): Requirements as returned by parse_selector
+
+    Returns:
+        bool: True if the object matches all the requirements
+
+    """
+    labels = _labels(obj)
+    return all(
+        (op == "=" and labels.get(k) == v)
+        or (op == "!=" and labels.get(k) != v)
+        or (op == "exists" and k in labels)
+        or (op == "!exists" and k not in labels)
+        for k, op, v in requirements
+    )
+
+
+def _key(obj):
+    metadata = obj.get("metadata", {})
+    return metadata.get("namespace"), metadata["name"]
+
+
+class Informer(object):
+    """
+    List+watch stream of one kind in one namespace with in-memory store
+    """
+
+    def __init__(
+        self,
+        client,
+        kind,
+        namespace=None,
+        watch_timeout=DEFAULT_WATCH_TIMEOUT,
+        retry_delay=1,
+    ):
+        """
+        Args:
+            client (KubeAPIClient): Client of the cluster
+            kind (str): Resource kind
+            namespace (str): Namespace, None for all namespaces
+            watch_timeout (int): Server side timeout of one watch request
+            retry_delay (int): Seconds to wait before relist after failure,
+                doubled with every following failure up to MAX_RETRY_DELAY
+
+        """
+        self.client = client
+        self.resource = client.resolve(kind)
+        self.namespace = namespace if self.resource.namespaced else None
+        self.watch_timeout = watch_timeout
+        self.retry_delay = retry_delay
+        self.resource_version = None
+        self.stats = defaultdict(int)
+        self._objects = dict()
+        self._label_index = defaultdict(set)
+        self._lock = threading.RLock()
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __repr__(self):
+        return (
+            f"Informer({self.resource.kind}, namespace={self.namespace}, "
+            f"server={self.client.server})"
+        )
+
+    @property
+    def _kind(self):
+        if self.resource.group:
+            return f"{self.resource.name}.{self.resource.group}"
+        return self.resource.name
+
+    @property
+    def synced(self):
+        """
+        bool: True when the store reflects the state of the API server
+        """
+        return (
+            self._synced.is_set()
+            and not self._stopped.is_set()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def start(self):
+        """
+        Start the list+watch loop in background thread
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=repr(self), daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the informer, the store is not used for queries anymore
+        """
+        self._stopped.set()
+        self._synced.clear()
+
+    def wait_for_sync(self, timeout=DEFAULT_SYNC_TIMEOUT):
+        """
+        Wait for the initial list of the objects
+
+        Args:
+            timeout (int): Timeout in seconds
+
+        Returns:
+            bool: True if the informer is synced
+
+        """
+        self._synced.wait(timeout)
+        return self.synced
+
+    def _run(self):
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self._list()
+                self.stats["watches"] += 1
+                for event in self.client.watch(
+                    self._kind,
+                    namespace=self.namespace,
+                    all_namespaces=self.namespace is None,
+                    resource_version=self.resource_version,
+                    timeout_seconds=self.watch_timeout,
+                ):
+                    if self._stopped.is_set():
+                        return
+                    self.handle_event(event)
+                    failures = 0
+                # watch ended by the server side timeout
+                failures = 0
+            except KubeAPIWatchExpired as ex:
+                # resourceVersion gap, the events were compacted on the
+                # server, we have to list all the objects again
+                log.debug(f"{self}: watch expired, relisting: {ex}")
+                self.stats["expired"] += 1
+                self._synced.clear()
+                self.resource_version = None
+            except (CommandFailed, KubeAPIUnsupportedOperation, ValueError) as ex:
+                log.warning(f"{self}: list/watch failed, cache disabled: {ex}")
+                failures += 1
+                self._relist_after_failure(failures)
+            except Exception:
+                # e.g. connection error while streaming or malformed event,
+                # the store can't be trusted anymore but the thread has to
+                # keep running, otherwise the store would never be updated
+                log.exception(f"{self}: list/watch failed, cache disabled")
+                self.stats["errors"] += 1
+                failures += 1
+                self._relist_after_failure(failures)
+
+    def _relist_after_failure(self, failures):
+        """
+        Mark the store as not synced and wait before the relist
+
+        Args:
+            failures (int): Number of the consecutive failures
+
+        """
+        self._synced.clear()
+        self.resource_version = None
+        delay = min(self.retry_delay * 2 ** (failures - 1), MAX_RETRY_DELAY)
+        self._stopped.wait(delay)
+
+    def _list(self):
+        """
+        List all the objects and replace the content of the store
+        """
+        object_list = self.client.list_objects(
+            self._kind,
+            namespace=self.namespace,
+            all_namespaces=self.namespace is None,
+        )
+        self.stats["lists"] += 1
+        objects = dict()
+        label_index = defaultdict(set)
+        for obj in object_list.get("items") or []:
+            self._set_type(obj)
+            key = _key(obj)
+            objects[key] = obj
+            for label in _labels(obj).items():
+                label_index[label].add(key)
+        with self._lock:
+            self._objects = objects
+            self._label_index = label_index
+            self.resource_version = object_list["metadata"].get("resourceVersion")
+        self._synced.set()
+
+    def _set_type(self, obj):
+        obj.setdefault("apiVersion", self.client.api_version(self.resource))
+        obj.setdefault("kind", self.resource.kind)
+
+    def handle_event(self, event):
+        """
+        Apply the watch event to the store
+
+        Args:
+            event (dict): Watch event
+
+        """
+        obj = event["object"]
+        self.stats["events"] += 1
+        with self._lock:
+            if event["type"] in ("ADDED", "MODIFIED", "DELETED"):
+                self._set_type(obj)
+                key = _key(obj)
+                old = self._objects.pop(key, None)
+                if old is not None:
+                    for label in _labels(old).items():
+                        self._label_index[label].discard(key)
+                if event["type"] != "DELETED":
+                    self._objects[key] = obj
+                    for label in _labels(obj).items():
+                        self._label_index[label].add(key)
+            self.resource_version = obj.get("metadata", {}).get(
+                "resourceVersion", self.resource_version
+            )
+
+    def get(self, name, namespace=None):
+        """
+        Get object from the store
+
+        Args:
+            name (str): Name of the object
+            namespace (str): Namespace of the object, the namespace of the
+                informer is used by default
+
+        Returns:
+            dict: Copy of the object, None if it is not in the store
+
+        """
+        if self.resource.namespaced:
+            namespace = namespace or self.namespace
+        else:
+            namespace = None
+        with self._lock:
+            obj = self._objects.get((namespace, name))
+            self.stats["hits"] += 1
+            return copy.deepcopy(obj) if obj is not None else None
+
+    def list(self, selector=None, namespace=None):
+        """
+        List objects from the store
+
+        Args:
+            selector (str): Label selector
+            namespace (str): Return only objects of this namespace
+
+        Returns:
+            list: Copies of the matching objects sorted by namespace and name,
+                None if the selector is not supported by the store
+
+        """
+        requirements = parse_selector(selector)
+        if requirements is None:
+            return None
+        with self._lock:
+            keys = None
+            for key, operator, value in requirements:
+                if operator == "=":
+                    matching = self._label_index.get((key, value), set())
+                    keys = matching if keys is None else keys & matching
+            if keys is None:
+                keys = self._objects.keys()
+            items = []
+            for obj_key in sorted(keys):
+                if namespace and obj_key[0] != namespace:
+                    continue
+                if match_labels(self._objects[obj_key], requirements):
+                    items.append(copy.deepcopy(self._objects[obj_key]))
+            self.stats["hits"] += 1
+            return items
+
+
+def get_informer(client, kind, namespace=None, sync_timeout=DEFAULT_SYNC_TIMEOUT):
+    """
+    Get the shared informer of the kind in the namespace, the informer is
+    started on the first use
+
+    Args:
+        client (KubeAPIClient): Client of the cluster
+        kind (str): Resource kind
+        namespace (str): Namespace, None for all namespaces
+        sync_timeout (int): How long to wait for the initial sync
+
+    Returns:
+        Informer: Informer which is synced, None if it didn't sync in time
+
+    """
+    resource = client.resolve(kind)
+    if not resource.namespaced:
+        namespace = None
+    key = (client.kubeconfig.path, resource.group, resource.name, namespace)
+    with _informers_lock:
+        informer = _informers.get(key)
+        if informer is not None and informer.client is not client:
+            # kubeconfig changed and the client was re-created
+            informer.stop()
+            informer = None
+        if informer is None:
+            informer = Informer(client, kind, namespace).start()
+            _informers[key] = informer
+    if informer.wait_for_sync(sync_timeout):
+        return informer
+    return None
+
+
+def stop_informers():
+    """
+    Stop all shared informers
+    """
+    with _informers_lock:
+        for informer in _informers.values():
+            informer.stop()
+        _informers.clear()
+
+
+def lookup(client, oc_request, kinds):
+    """
+    Answer the parsed 'oc get' request from the informer cache
+
+    Args:
+        client (KubeAPIClient): Client of the cluster
+        oc_request (OcRequest): Parsed oc command
+        kinds (list): Kinds which are served from the cache
+
+    Returns:
+        dict: Object or List in the same format as 'oc get -o yaml' returns
+            it. None if the request can't be answered from the cache.
+
+    """
+    if (
+        oc_request.verb != "get"
+        or not oc_request.output
+        or oc_request.field_selector
+        or oc_request.skip_tls_verify
+    ):
+        return None
+    resource = client.resolve(oc_request.kind)
+    cached = False
+    for kind in kinds:
+        try:
+            cached = client.resolve(kind) == resource
+        except KubeAPIUnsupportedOperation:
+            continue
+        if cached:
+            break
+    if not cached:
+        return None
+    if oc_request.all_namespaces:
+        namespace = None
+    else:
+        namespace = oc_request.namespace or client.kubeconfig.namespace
+    informer = get_informer(client, oc_request.kind, namespace)
+    if informer is None:
+        return None
+    if oc_request.name:
+        # not cached objects are fetched from the API to get authoritative
+        # NotFound and to read own writes which weren't delivered yet
+        return informer.get(oc_request.name)
+    items = informer.list(oc_request.selector)
+    if items is None:
+        return None
+    return {
+        "apiVersion": "v1",
+        "items": items,
+        "kind": "List",
+        "metadata": {"resourceVersion": ""},
+    }
+
+
+atexit.register(stop_informers)
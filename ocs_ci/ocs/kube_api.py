@@ -0,0 +1,1049 @@
+"""
+Native Kubernetes API backend for OCP objects
+
+Every OCP.exec_oc_cmd call forks an 'oc' process which has to parse the
+kubeconfig, do the TLS handshake and serialize the output to YAML again.
+This module serves the most frequent verbs (get/list, create, patch and
+delete) directly via the Kubernetes REST API, using a persistent, connection
+pooled requests.Session built from the very same kubeconfig.
+
+The backend understands only the command shapes generated by the OCP class,
+anything else raises KubeAPIUnsupportedOperation and the caller falls back to
+the 'oc' subprocess path. The backend is enabled per cluster context by
+setting RUN['oc_backend'] to 'kube_api' in the cluster configuration.
+"""
+
+import atexit
+import base64
+import json
+import logging
+import os
+import shlex
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import quote
+
+import requests
+import urllib3
+import yaml
+from requests.adapters import HTTPAdapter
+
+from ocs_ci.ocs.exceptions import (
+    CommandFailed,
+    KubeAPIUnsupportedOperation,
+    KubeAPIWatchExpired,
+)
+
+log = logging.getLogger(__name__)
+
+OC_BACKEND = "oc"
+KUBE_API_BACKEND = "kube_api"
+
+DEFAULT_POOL_MAXSIZE = 32
+
+# Server side printed table, the columns are the same as printed by 'oc get'
+TABLE_ACCEPT = "application/json;as=Table;v=v1;g=meta.k8s.io,application/json"
+# Metadata of the listed objects only
+METADATA_ACCEPT = (
+    "application/json;as=PartialObjectMetadataList;v=v1;g=meta.k8s.io,"
+    "application/json"
+)
+
+PATCH_CONTENT_TYPES = {
+    "strategic": "application/strategic-merge-patch+json",
+    "merge": "application/merge-patch+json",
+    "json": "application/json-patch+json",
+}
+
+# Resource as described by the API discovery endpoints
+APIResource = namedtuple(
+    "APIResource",
+    ["group", "version", "name", "singular", "kind", "namespaced"],
+)
+
+# Parsed representation of the oc command line handled by the backend
+OcRequest = namedtuple(
+    "OcRequest",
+    [
+        "verb",
+        "kind",
+        "name",
+        "namespace",
+        "all_namespaces",
+        "selector",
+        "field_selector",
+        "output",
+        "filename",
+        "patch",
+        "patch_type",
+        "wait",
+        "force",
+        "skip_tls_verify",
+    ],
+)
+
+_clients = dict()
+# clients replaced after the kubeconfig change, they may still be used by
+# other threads so they are closed only by close_clients()
+_replaced_clients = list()
+_clients_lock = threading.Lock()
+
+
+class KubeConfig(object):
+    """
+    Connection parameters of the current context in a kubeconfig file
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path to the kubeconfig file
+
+        Raises:
+            KubeAPIUnsupportedOperation: When the kubeconfig uses authentication
+                which can't be handled by the backend (e.g. exec plugins)
+
+        """
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self._tmp_files = []
+        with open(path) as fd:
+            data = yaml.safe_load(fd) or {}
+        base_dir = os.path.dirname(os.path.abspath(path))
+        current_context = data.get("current-context")
+        context = self._find(data.get("contexts"), current_context)
+        cluster = self._find(data.get("clusters"), context.get("cluster"))
+        user = self._find(data.get("users"), context.get("user"))
+
+        self.namespace = context.get("namespace") or "default"
+        self.server = cluster.get("server", "").rstrip("/")
+        if not self.server:
+            raise KubeAPIUnsupportedOperation(
+                f"No API server found in kubeconfig {path}"
+            )
+        self.proxy_url = cluster.get("proxy-url")
+        self.verify = True
+        if cluster.get("insecure-skip-tls-verify"):
+            self.verify = False
+        elif cluster.get("certificate-authority-data"):
+            self.verify = self._data_to_file(cluster["certificate-authority-data"])
+        elif cluster.get("certificate-authority"):
+            self.verify = os.path.join(base_dir, cluster["certificate-authority"])
+
+        self.token = user.get("token")
+        if not self.token and user.get("tokenFile"):
+            with open(os.path.join(base_dir, user["tokenFile"])) as fd:
+                self.token = fd.read().strip()
+        self.cert = None
+        if user.get("client-certificate-data") and user.get("client-key-data"):
+            self.cert = (
+                self._data_to_file(user["client-certificate-data"]),
+                self._data_to_file(user["client-key-data"]),
+            )
+        elif user.get("client-certificate") and user.get("client-key"):
+            self.cert = (
+                os.path.join(base_dir, user["client-certificate"]),
+                os.path.join(base_dir, user["client-key"]),
+            )
+        if not (self.token or self.cert):
+            raise KubeAPIUnsupportedOperation(
+                f"Authentication method of user '{context.get('user')}' in "
+                f"kubeconfig {path} is not supported by the kube_api backend"
+            )
+
+    @staticmethod
+    def _find(items, name):
+        """
+        Find the named entry in the list of kubeconfig clusters/users/contexts
+        """
+        for item in items or []:
+            if item.get("name") == name:
+                return next(
+                    (v for k, v in item.items() if k != "name" and v is not None),
+                    {},
+                )
+        return {}
+
+    def _data_to_file(self, data):
+        """
+        Store base64 encoded certificate data into temporary file, because
+        requests accepts only paths to the certificates and keys.
+        """
+        fd, path = tempfile.mkstemp(prefix="ocs-ci-kube-api-", suffix=".pem")
+        with os.fdopen(fd, "wb") as f:
+            f.write(base64.b64decode(data))
+        self._tmp_files.append(path)
+        return path
+
+    def cleanup(self):
+        """
+        Remove temporary files created for certificates and keys
+        """
+        for path in self._tmp_files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._tmp_files = []
+
+
+class KubeAPIClient(object):
+    """
+    Kubernetes REST API client with persistent pooled connections
+    """
+
+    def __init__(self, kubeconfig, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+        """
+        Args:
+            kubeconfig (str): Path to the kubeconfig file
+            pool_maxsize (int): Maximum number of connections kept in the pool
+
+        """
+        self.kubeconfig = KubeConfig(kubeconfig)
+        self.server = self.kubeconfig.server
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.verify = self.kubeconfig.verify
+        if self.kubeconfig.verify is False:
+            # the same as 'oc', don't warn about the insecure connection
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.session.cert = self.kubeconfig.cert
+        self.session.headers["Accept"] = "application/json"
+        self.session.headers["User-Agent"] = "ocs-ci/kube-api"
+        if self.kubeconfig.token:
+            self.session.headers["Authorization"] = f"Bearer {self.kubeconfig.token}"
+        if self.kubeconfig.proxy_url:
+            self.session.proxies = {
+                "http": self.kubeconfig.proxy_url,
+                "https": self.kubeconfig.proxy_url,
+            }
+        self.request_count = 0
+        self._request_count_lock = threading.Lock()
+        self._resources = None
+        self._group_resources_loaded = False
+        self._discovery_lock = threading.Lock()
+
+    def _count_request(self):
+        """
+        Increase the number of the requests sent, the client is shared by
+        threads
+        """
+        with self._request_count_lock:
+            self.request_count += 1
+
+    def close(self):
+        """
+        Close pooled connections and remove temporary credential files
+        """
+        self.session.close()
+        self.kubeconfig.cleanup()
+
+    def request(
+        self,
+        method,
+        path,
+        params=None,
+        body=None,
+        content_type="application/json",
+        timeout=600,
+        verify=None,
+        accept=None,
+    ):
+        """
+        Send request to the API server
+
+        Args:
+            method (str): HTTP method
+            path (str): API path (e.g. /api/v1/namespaces/default/pods)
+            params (dict): Query parameters
+            body (dict or list): Request body which will be JSON encoded
+            content_type (str): Content type of the body
+            timeout (int): Timeout of the request in seconds
+            verify (bool): Override TLS verification of the session
+            accept (str): Override Accept header of the session
+
+        Returns:
+            dict: Decoded JSON response
+
+        Raises:
+            CommandFailed: When the API server returns an error. The message
+                matches the format of 'oc' errors (e.g. 'Error from server
+                (NotFound): pods "foo" not found')
+
+        """
+        kwargs = {"params": params, "timeout": timeout, "headers": {}}
+        if body is not None:
+            kwargs["data"] = json.dumps(body)
+            kwargs["headers"]["Content-Type"] = content_type
+        if accept:
+            kwargs["headers"]["Accept"] = accept
+        if verify is False:
+            kwargs["verify"] = False
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self._count_request()
+        log.debug(f"API request: {method} {path} {params or ''}")
+        try:
+            response = self.session.request(method, f"{self.server}{path}", **kwargs)
+        except requests.exceptions.RequestException as ex:
+            raise CommandFailed(f"Unable to connect to the server: {ex}")
+        if response.status_code >= 400:
+            raise CommandFailed(self._format_error(response))
+        if not response.content:
+            return {}
+        return response.json()
+
+    @staticmethod
+    def _format_error(response):
+        """
+        Format error returned from API server the same way as 'oc' does
+
+        Args:
+            response (requests.Response): Failed response
+
+        Returns:
+            str: Error message
+
+        """
+        try:
+            status = response.json()
+        except ValueError:
+            return f"Error from server ({response.reason}): {response.text.strip()}"
+        reason = status.get("reason") or response.reason
+        return f"Error from server ({reason}): {status.get('message', '')}"
+
+    def _load_resources(self, path, group, version):
+        """
+        Load resources of one group version from discovery endpoint
+
+        Args:
+            path (str): Discovery path of the group version
+            group (str): API group ('' for core group)
+            version (str): API version
+
+        """
+        try:
+            resource_list = self.request("GET", path)
+        except CommandFailed as ex:
+            # Aggregated API services might be unavailable, which should not
+            # break the discovery of the other groups
+            log.debug(f"Discovery of {path} failed: {ex}")
+            return
+        for res in resource_list.get("resources", []):
+            if "/" in res["name"]:
+                # subresources like pods/log
+                continue
+            api_resource = APIResource(
+                group=group,
+                version=version,
+                name=res["name"],
+                singular=res.get("singularName") or res["kind"].lower(),
+                kind=res["kind"],
+                namespaced=res.get("namespaced", False),
+            )
+            keys = [
+                res["kind"].lower(),
+                res["name"],
+                api_resource.singular,
+            ] + res.get("shortNames", [])
+            if group:
+                keys += [
+                    f"{res['name']}.{group}",
+                    f"{api_resource.singular}.{group}",
+                    f"{res['kind'].lower()}.{group}",
+                    f"{res['name']}.{version}.{group}",
+                    f"{res['kind'].lower()}.{version}.{group}",
+                ]
+            for key in keys:
+                # The first registered resource wins, the core group is loaded
+                # first and the rest of groups in the preference order of the
+                # API server, which is the same behaviour as 'oc' has
+                self._resources.setdefault(key.lower(), api_resource)
+
+    def resolve(self, kind):
+        """
+        Resolve kind, plural, singular or short name to the API resource
+
+        Args:
+            kind (str): Resource kind as used in oc command (e.g. pvc, Pod,
+                cephblockpools.ceph.rook.io)
+
+        Returns:
+            APIResource: Resolved resource
+
+        Raises:
+            KubeAPIUnsupportedOperation: When the resource can't be resolved
+
+        """
+        key = kind.lower()
+        with self._discovery_lock:
+            if self._resources is None:
+                self._resources = dict()
+                self._load_resources("/api/v1", "", "v1")
+            if key not in self._resources and not self._group_resources_loaded:
+                self._group_resources_loaded = True
+                groups = self.request("GET", "/apis").get("groups", [])
+                for group in groups:
+                    preferred = group.get("preferredVersion") or group["versions"][0]
+                    self._load_resources(
+                        f"/apis/{preferred['groupVersion']}",
+                        group["name"],
+                        preferred["version"],
+                    )
+        try:
+            return self._resources[key]
+        except KeyError:
+            raise KubeAPIUnsupportedOperation(
+                f"Resource type '{kind}' is not known to the API server"
+            )
+
+    def resolve_object(self, body):
+        """
+        Resolve the API resource of the object definition, the group and
+        version are taken from the apiVersion of the object
+
+        Args:
+            body (dict): Object definition
+
+        Returns:
+            APIResource: Resolved resource
+
+        """
+        group, _, version = body.get("apiVersion", "v1").rpartition("/")
+        kind = body["kind"].lower()
+        resource = self.resolve(f"{kind}.{group}" if group else kind)
+        return resource._replace(group=group, version=version)
+
+    @staticmethod
+    def resource_path(resource, namespace=None, name=None):
+        """
+        Build API path for the resource
+
+        Args:
+            resource (APIResource): API resource
+            namespace (str): Namespace, ignored for cluster scoped resources
+            name (str): Name of the object
+
+        Returns:
+            str: Path of the collection or of the object
+
+        """
+        if resource.group:
+            path = f"/apis/{resource.group}/{resource.version}"
+        else:
+            path = f"/api/{resource.version}"
+        if resource.namespaced and namespace:
+            path += f"/namespaces/{quote(namespace)}"
+        path += f"/{resource.name}"
+        if name:
+            path += f"/{quote(name)}"
+        return path
+
+    @staticmethod
+    def api_version(resource):
+        """
+        Args:
+            resource (APIResource): API resource
+
+        Returns:
+            str: apiVersion of the resource (e.g. v1 or ceph.rook.io/v1)
+
+        """
+        if resource.group:
+            return f"{resource.group}/{resource.version}"
+        return resource.version
+
+    def _namespace(self, resource, namespace):
+        if not resource.namespaced:
+            return None
+        return namespace or self.kubeconfig.namespace
+
+    def get(
+        self,
+        kind,
+        name="",
+        namespace=None,
+        all_namespaces=False,
+        selector=None,
+        field_selector=None,
+        timeout=600,
+        verify=None,
+    ):
+        """
+        Get single object or list of objects, equivalent of
+        'oc get <kind> [<name>] -o yaml'
+
+        Args:
+            kind (str): Resource kind
+            name (str): Name of the object, if not specified list is returned
+            namespace (str): Namespace
+            all_namespaces (bool): List objects across all namespaces
+            selector (str): Label selector
+            field_selector (str): Field selector
+            timeout (int): Timeout of the request in seconds
+            verify (bool): Override TLS verification
+
+        Returns:
+            dict: The object or the List of objects in the same format as oc
+                returns it
+
+        """
+        resource = self.resolve(kind)
+        namespace = None if all_namespaces else self._namespace(resource, namespace)
+        if name:
+            return self.request(
+                "GET",
+                self.resource_path(resource, namespace, name),
+                timeout=timeout,
+                verify=verify,
+            )
+        object_list = self.list_objects(
+            kind,
+            namespace=namespace,
+            all_namespaces=all_namespaces,
+            selector=selector,
+            field_selector=field_selector,
+            timeout=timeout,
+            verify=verify,
+        )
+        return self.to_oc_list(object_list, resource)
+
+    def list_objects(
+        self,
+        kind,
+        namespace=None,
+        all_namespaces=False,
+        selector=None,
+        field_selector=None,
+        timeout=600,
+        verify=None,
+        as_table=False,
+        as_metadata=False,
+    ):
+        """
+        List objects as returned by the API server, including the
+        resourceVersion of the list which can be used to start a watch
+
+        Args:
+            kind (str): Resource kind
+            namespace (str): Namespace
+            all_namespaces (bool): List objects across all namespaces
+            selector (str): Label selector
+            field_selector (str): Field selector
+            timeout (int): Timeout of the request in seconds
+            verify (bool): Override TLS verification
+            as_table (bool): Get Table with the columns printed by 'oc get'
+                and metadata of the objects instead of the objects
+            as_metadata (bool): Get only metadata of the objects
+                (PartialObjectMetadataList)
+
+        Returns:
+            dict: Typed list (e.g. PodList), Table or PartialObjectMetadataList
+
+        """
+        resource = self.resolve(kind)
+        namespace = None if all_namespaces else self._namespace(resource, namespace)
+        params = dict()
+        if selector:
+            params["labelSelector"] = selector
+        if field_selector:
+            params["fieldSelector"] = field_selector
+        accept = None
+        if as_table:
+            accept = TABLE_ACCEPT
+        elif as_metadata:
+            accept = METADATA_ACCEPT
+        return self.request(
+            "GET",
+            self.resource_path(resource, namespace),
+            params=params,
+            timeout=timeout,
+            verify=verify,
+            accept=accept,
+        )
+
+    def watch(
+        self,
+        kind,
+        namespace=None,
+        all_namespaces=False,
+        resource_version=None,
+        selector=None,
+        field_selector=None,
+        timeout_seconds=300,
+        as_table=False,
+    ):
+        """
+        Watch changes of the objects, equivalent of 'oc get <kind> --watch'
+
+        Args:
+            kind (str): Resource kind
+            namespace (str): Namespace
+            all_namespaces (bool): Watch objects across all namespaces
+            resource_version (str): Stream events newer than this version,
+                usually the resourceVersion of the list
+            selector (str): Label selector
+            field_selector (str): Field selector
+            timeout_seconds (int): Server side timeout of the watch, the
+                generator is exhausted when the watch times out
+            as_table (bool): Objects of the events are Tables with one row
+                (see list_objects)
+
+        Yields:
+            dict: Watch event with 'type' (ADDED, MODIFIED, DELETED, BOOKMARK)
+                and 'object' keys
+
+        Raises:
+            KubeAPIWatchExpired: When the resource_version is too old (410 Gone)
+            CommandFailed: When the API server returns an error
+
+        """
+        resource = self.resolve(kind)
+        namespace = None if all_namespaces else self._namespace(resource, namespace)
+        params = {
+            "watch": "true",
+            "allowWatchBookmarks": "true",
+            "timeoutSeconds": str(timeout_seconds),
+        }
+        if resource_version:
+            params["resourceVersion"] = resource_version
+        if selector:
+            params["labelSelector"] = selector
+        if field_selector:
+            params["fieldSelector"] = field_selector
+        path = self.resource_path(resource, namespace)
+        self._count_request()
+        log.debug(f"API watch: {path} {params}")
+        try:
+            response = self.session.get(
+                f"{self.server}{path}",
+                params=params,
+                stream=True,
+                timeout=(30, timeout_seconds + 30),
+                headers={"Accept": TABLE_ACCEPT} if as_table else None,
+            )
+        except requests.exceptions.RequestException as ex:
+            raise CommandFailed(f"Unable to connect to the server: {ex}")
+        with response:
+            if response.status_code == 410:
+                raise KubeAPIWatchExpired(self._format_error(response))
+            if response.status_code >= 400:
+                raise CommandFailed(self._format_error(response))
+            try:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if event.get("type") == "ERROR":
+                        status = event.get("object") or {}
+                        message = (
+                            f"Error from server ({status.get('reason')}): "
+                            f"{status.get('message', '')}"
+                        )
+                        if status.get("code") == 410:
+                            raise KubeAPIWatchExpired(message)
+                        raise CommandFailed(message)
+                    yield event
+            except requests.exceptions.RequestException as ex:
+                # watch connection was interrupted, the caller re-watches
+                log.debug(f"Watch of {path} interrupted: {ex}")
+
+    def to_oc_list(self, object_list, resource):
+        """
+        Convert typed list returned from API (e.g. PodList) to the generic
+        List returned by 'oc get'
+
+        Args:
+            object_list (dict): List returned from API server
+            resource (APIResource): API resource of the items
+
+        Returns:
+            dict: List with apiVersion and kind filled for each item
+
+        """
+        api_version = object_list.get("apiVersion") or self.api_version(resource)
+        items = object_list.get("items") or []
+        for item in items:
+            item.setdefault("apiVersion", api_version)
+            item.setdefault("kind", resource.kind)
+        return {
+            "apiVersion": "v1",
+            "items": items,
+            "kind": "List",
+            "metadata": {"resourceVersion": ""},
+        }
+
+    def create(self, body, namespace=None, timeout=600, verify=None):
+        """
+        Create object, equivalent of 'oc create -f <file>'
+
+        Args:
+            body (dict): Object definition
+            namespace (str): Namespace used when not specified in the body
+            timeout (int): Timeout of the request in seconds
+            verify (bool): Override TLS verification
+
+        Returns:
+            dict: Created object
+
+        """
+        resource = self.resolve_object(body)
+        namespace = self._namespace(
+            resource, body.get("metadata", {}).get("namespace") or namespace
+        )
+        return self.request(
+            "POST",
+            self.resource_path(resource, namespace),
+            body=body,
+            timeout=timeout,
+            verify=verify,
+        )
+
+    def patch(
+        self,
+        kind,
+        name,
+        patch,
+        namespace=None,
+        patch_type="strategic",
+        timeout=600,
+        verify=None,
+    ):
+        """
+        Patch object, equivalent of 'oc patch <kind> <name> -p <patch>'
+
+        Args:
+            kind (str): Resource kind
+            name (str): Name of the object
+            patch (dict or list): The patch
+            namespace (str): Namespace
+            patch_type (str): One of strategic, merge or json
+            timeout (int): Timeout of the request in seconds
+            verify (bool): Override TLS verification
+
+        Returns:
+            dict: Patched object
+
+        """
+        resource = self.resolve(kind)
+        return self.request(
+            "PATCH",
+            self.resource_path(resource, self._namespace(resource, namespace), name),
+            body=patch,
+            content_type=PATCH_CONTENT_TYPES[patch_type],
+            timeout=timeout,
+            verify=verify,
+        )
+
+    def delete(
+        self,
+        kind,
+        name,
+        namespace=None,
+        wait=True,
+        force=False,
+        timeout=600,
+        verify=None,
+    ):
+        """
+        Delete object, equivalent of 'oc delete <kind> <name>'
+
+        Args:
+            kind (str): Resource kind
+            name (str): Name of the object
+            namespace (str): Namespace
+            wait (bool): Wait for the object to be gone (finalizers processed)
+            force (bool): Delete immediately with grace period 0
+            timeout (int): Timeout in seconds
+            verify (bool): Override TLS verification
+
+        Returns:
+            dict: Response of the API server
+
+        Raises:
+            CommandFailed: When the object is still present after timeout
+
+        """
+        resource = self.resolve(kind)
+        path = self.resource_path(resource, self._namespace(resource, namespace), name)
+        body = {"kind": "DeleteOptions", "apiVersion": "v1"}
+        # oc uses background propagation by default
+        body["propagationPolicy"] = "Background"
+        if force:
+            body["gracePeriodSeconds"] = 0
+        response = self.request(
+            "DELETE", path, body=body, timeout=timeout, verify=verify
+        )
+        if wait:
+            deadline = time.time() + timeout
+            while True:
+                try:
+                    self.request("GET", path, timeout=timeout, verify=verify)
+                except CommandFailed as ex:
+                    if "(NotFound)" in str(ex):
+                        break
+                    raise
+                if time.time() > deadline:
+                    raise CommandFailed(
+                        f"timed out waiting for the condition on {resource.name}/{name}"
+                    )
+                time.sleep(1)
+        return response
+
+    def execute(self, oc_request, out_yaml_format=True, timeout=600):
+        """
+        Execute request parsed from oc command line
+
+        Args:
+            oc_request (OcRequest): Parsed oc command
+            out_yaml_format (bool): Whether the caller expects python object
+            timeout (int): Timeout in seconds
+
+        Returns:
+            dict or str: Loaded object for get/create with output format, the
+                same message as 'oc' prints otherwise
+
+        Raises:
+            KubeAPIUnsupportedOperation: When the request can't be served
+
+        """
+        verify = False if oc_request.skip_tls_verify else None
+        if oc_request.output and not out_yaml_format:
+            # raw YAML text is expected, keep the 'oc' formatting
+            raise KubeAPIUnsupportedOperation("Raw output requested")
+        if oc_request.verb == "get":
+            return self.get(
+                oc_request.kind,
+                name=oc_request.name,
+                namespace=oc_request.namespace,
+                all_namespaces=oc_request.all_namespaces,
+                selector=oc_request.selector,
+                field_selector=oc_request.field_selector,
+                timeout=timeout,
+                verify=verify,
+            )
+        if oc_request.verb == "create":
+            with open(oc_request.filename) as fd:
+                docs = [doc for doc in yaml.safe_load_all(fd) if doc]
+            objects = []
+            for doc in docs:
+                if doc.get("kind", "").endswith("List"):
+                    objects.extend(doc.get("items") or [])
+                else:
+                    objects.append(doc)
+            if oc_request.output and len(objects) != 1:
+                raise KubeAPIUnsupportedOperation(
+                    "Output of multiple objects is not supported"
+                )
+            # like oc, try to create all the objects and report all failures
+            messages, errors = [], []
+            for obj in objects:
+                try:
+                    created = self.create(
+                        obj,
+                        namespace=oc_request.namespace,
+                        timeout=timeout,
+                        verify=verify,
+                    )
+                except CommandFailed as ex:
+                    errors.append(str(ex))
+                    continue
+                if oc_request.output:
+                    return created
+                resource = self.resolve_object(created)
+                messages.append(
+                    f"{self._display_name(resource)}/"
+                    f"{created['metadata']['name']} created"
+                )
+            if errors:
+                raise CommandFailed("\n".join(errors))
+            return "\n".join(messages)
+        if oc_request.verb == "patch":
+            resource = self.resolve(oc_request.kind)
+            self.patch(
+                oc_request.kind,
+                oc_request.name,
+                oc_request.patch,
+                namespace=oc_request.namespace,
+                patch_type=oc_request.patch_type,
+                timeout=timeout,
+                verify=verify,
+            )
+            return f"{self._display_name(resource)}/{oc_request.name} patched"
+        if oc_request.verb == "delete":
+            resource = self.resolve(oc_request.kind)
+            self.delete(
+                oc_request.kind,
+                oc_request.name,
+                namespace=oc_request.namespace,
+                wait=oc_request.wait,
+                force=oc_request.force,
+                timeout=timeout,
+                verify=verify,
+            )
+            deleted = "force deleted" if oc_request.force else "deleted"
+            return f'{self._display_name(resource)} "{oc_request.name}" {deleted}'
+        raise KubeAPIUnsupportedOperation(f"Verb {oc_request.verb} is not supported")
+
+    @staticmethod
+    def _display_name(resource):
+        if resource.group:
+            return f"{resource.singular}.{resource.group}"
+        return resource.singular
+
+
+def parse_oc_command(command):
+    """
+    Parse the oc command line (without leading 'oc') to the request which can
+    be served by KubeAPIClient
+
+    Args:
+        command (str or list): oc command, e.g. 'get pods -n foo -o yaml'
+
+    Returns:
+        OcRequest: Parsed request
+
+    Raises:
+        KubeAPIUnsupportedOperation: When the command contains verb or option
+            which is not supported by the backend
+
+    """
+    args = shlex.split(command) if isinstance(command, str) else list(command)
+    if not args or args[0] not in ("get", "create", "patch", "delete"):
+        raise KubeAPIUnsupportedOperation(f"Unsupported command: {command}")
+    values = {field: None for field in OcRequest._fields}
+    values.update(
+        verb=args[0],
+        all_namespaces=False,
+        wait=True,
+        force=False,
+        skip_tls_verify=False,
+        patch_type="strategic",
+    )
+    option_map = {
+        "-n": "namespace",
+        "--namespace": "namespace",
+        "-l": "selector",
+        "--selector": "selector",
+        "--field-selector": "field_selector",
+        "-o": "output",
+        "--output": "output",
+        "-f": "filename",
+        "--filename": "filename",
+        "-p": "patch",
+        "--patch": "patch",
+        "--type": "patch_type",
+    }
+    positional = []
+    i = 1
+    while i < len(args):
+        arg = args[i]
+        option, _, value = arg.partition("=")
+        if option in option_map:
+            if not _:
+                i += 1
+                if i >= len(args):
+                    raise KubeAPIUnsupportedOperation(f"Missing value of {arg}")
+                value = args[i]
+            values[option_map[option]] = value
+        elif arg.startswith("-o") and len(arg) > 2:
+            values["output"] = arg[2:]
+        elif arg in ("-A", "--all-namespaces"):
+            values["all_namespaces"] = True
+        elif arg == "--insecure-skip-tls-verify":
+            values["skip_tls_verify"] = True
+        elif option == "--wait" and values["verb"] == "delete":
+            values["wait"] = value.lower() != "false"
+        elif arg == "--force" and values["verb"] == "delete":
+            values["force"] = True
+        elif option == "--grace-period" and value == "0" and values["verb"] == "delete":
+            values["force"] = True
+        elif arg.startswith("-"):
+            raise KubeAPIUnsupportedOperation(f"Unsupported option: {arg}")
+        else:
+            positional.append(arg)
+        i += 1
+
+    if values["output"] not in (None, "yaml", "json"):
+        raise KubeAPIUnsupportedOperation(f"Unsupported output: {values['output']}")
+    if values["patch_type"] not in PATCH_CONTENT_TYPES:
+        raise KubeAPIUnsupportedOperation(f"Unsupported type: {values['patch_type']}")
+    if values["verb"] == "create":
+        if positional or not values["filename"] or values["filename"] == "-":
+            raise KubeAPIUnsupportedOperation(f"Unsupported command: {command}")
+        return OcRequest(**values)
+    if values["verb"] == "get" and not values["output"]:
+        # tabular output
+        raise KubeAPIUnsupportedOperation(f"Unsupported command: {command}")
+    if values["filename"] or not positional or len(positional) > 2:
+        raise KubeAPIUnsupportedOperation(f"Unsupported command: {command}")
+    kind = positional[0]
+    name = positional[1] if len(positional) == 2 else ""
+    if "/" in kind:
+        if name:
+            raise KubeAPIUnsupportedOperation(f"Unsupported command: {command}")
+        kind, name = kind.split("/", 1)
+    if "," in kind or kind == "all":
+        raise KubeAPIUnsupportedOperation(f"Unsupported command: {command}")
+    if values["verb"] in ("patch", "delete") and not name:
+        raise KubeAPIUnsupportedOperation(f"Unsupported command: {command}")
+    if values["verb"] == "patch":
+        if values["patch"] is None:
+            raise KubeAPIUnsupportedOperation(f"Unsupported command: {command}")
+        try:
+            values["patch"] = json.loads(values["patch"])
+        except ValueError:
+            # oc accepts the patch in YAML format as well
+            values["patch"] = yaml.safe_load(values["patch"])
+    values["kind"] = kind
+    values["name"] = name
+    return OcRequest(**values)
+
+
+def get_client(kubeconfig):
+    """
+    Get the shared client for the kubeconfig. The client is re-created when
+    the kubeconfig file was modified (e.g. after 'oc login'), the replaced
+    client is not closed before close_clients() as other threads may still
+    use it.
+
+    Args:
+        kubeconfig (str): Path to the kubeconfig
+
+    Returns:
+        KubeAPIClient: Client with pooled connections
+
+    Raises:
+        KubeAPIUnsupportedOperation: When the kubeconfig can't be used by
+            the backend
+
+    """
+    if not kubeconfig or not os.path.exists(kubeconfig):
+        raise KubeAPIUnsupportedOperation(f"Kubeconfig {kubeconfig} doesn't exist")
+    kubeconfig = os.path.abspath(kubeconfig)
+    with _clients_lock:
+        client = _clients.get(kubeconfig)
+        if client and client.kubeconfig.mtime != os.path.getmtime(kubeconfig):
+            _replaced_clients.append(client)
+            client = None
+        if not client:
+            client = KubeAPIClient(kubeconfig)
+            _clients[kubeconfig] = client
+        return client
+
+
+def close_clients():
+    """
+    Close all shared clients
+    """
+    with _clients_lock:
+        for client in list(_clients.values()) + _replaced_clients:
+            client.close()
+        _clients.clear()
+        del _replaced_clients[:]
+
+
+atexit.register(close_clients)
@@ -14,7 +14,14 @@ from ocs_ci.ocs.must_gather.const_must_gather import (
     GATHER_COMMANDS_VERSION,
     GATHER_COMMANDS_LOG,
 )
+from ocs_ci.ocs.must_gather.path_index import (
+    TARBALL_SUFFIX,
+    PathIndex,
+    build_path_index,
+    tarball_members,
+)
 from ocs_ci.utility import version
+from ocs_ci.utility.artifact_writer import GZIP_SUFFIX, ZSTD_SUFFIX, open_artifact
 from ocs_ci.ocs.constants import DEFAULT_CEPHBLOCKPOOL, MANAGED_SERVICE_PLATFORMS
 
 
@@ -36,6 +43,7 @@ class MustGather(object):
         self.files_content_issue = list()
         self.ocs_version = version.get_semantic_ocs_version_from_config()
         self.full_paths = list()
+        self.path_index = None
 
     @property
     def log_type(self):
@@ -117,29 +125,57 @@ class MustGather(object):
                 f"pool name as fallback for must-gather file matching"
             )
 
-        self.get_all_paths()
-        basenames = {}
-        for p in self.full_paths:
-            bn = os.path.basename(p)
-            if bn not in basenames or os.path.isfile(p):
-                basenames[bn] = p
+        index = self.get_path_index()
         for file in files:
-            if file in basenames:
-                self.files_path[file] = basenames[file]
+            file_path = self._find_file_path(index, file)
+            if file_path:
+                self.files_path[file] = file_path
             elif (
                 ec_pool
                 and DEFAULT_CEPHBLOCKPOOL in file
-                and file.replace(DEFAULT_CEPHBLOCKPOOL, ec_pool) in basenames
+                and self._find_file_path(
+                    index, file.replace(DEFAULT_CEPHBLOCKPOOL, ec_pool)
+                )
             ):
                 ec_file = file.replace(DEFAULT_CEPHBLOCKPOOL, ec_pool)
                 logger.info(
                     f"Must-gather file '{file}' not found, matched EC "
                     f"variant '{ec_file}'"
                 )
-                self.files_path[file] = basenames[ec_file]
+                self.files_path[file] = self._find_file_path(index, ec_file)
             else:
                 self.files_not_exist.append(file)
 
+    @staticmethod
+    def _find_file_path(index, name):
+        """
+        Find the path of the must-gather file by its basename
+
+        Args:
+            index (PathIndex): Index of the must-gather paths
+            name (str): Basename of the file
+
+        Returns:
+            str: The last file of the directory tree with the basename (or
+                its compressed variant), the first path with the basename
+                (e.g. tarball member) if there is no such file, None if the
+                basename is not found
+
+        """
+        paths = index.find_basename(name)
+        files = [path for path in paths if index.is_file(path)]
+        if not files:
+            # the file compressed in place, see REPORTING['compress_artifacts']
+            files = [
+                path
+                for suffix in (ZSTD_SUFFIX, GZIP_SUFFIX)
+                for path in index.find_basename(name + suffix)
+                if index.is_file(path)
+            ]
+        if files:
+            return files[-1]
+        return paths[0] if paths else None
+
     def validate_file_size(self):
         """
         Validate the file is not empty
@@ -147,15 +183,14 @@ class MustGather(object):
         """
         if self.type_log != "OTHERS":
             return
-        for path, subdirs, files in os.walk(self.root):
-            for file in files:
-                file_path = os.path.join(path, file)
-                if (
-                    Path(file_path).stat().st_size == 0
-                    and "noobaa-db-pg-0-init.log" not in file_path
-                ):
-                    logger.error(f"log file {file} empty!")
-                    self.empty_files.append(file)
+        for file_path in self.get_path_index().files():
+            if (
+                Path(file_path).stat().st_size == 0
+                and "noobaa-db-pg-0-init.log" not in file_path
+            ):
+                file = os.path.basename(file_path)
+                logger.error(f"log file {file} empty!")
+                self.empty_files.append(file)
 
     def validate_expected_files(self):
         """
@@ -172,7 +207,7 @@ class MustGather(object):
             if not Path(file_path).is_file():
                 self.files_not_exist.append(file)
             elif re.search(r"\.yaml$", file):
-                with open(file_path, "r") as f:
+                with open_artifact(file_path) as f:
                     if "kind" not in f.read().lower():
                         self.files_content_issue.append(file)
 
@@ -186,20 +221,22 @@ class MustGather(object):
         if self.type_log != "CEPH" or self.ocs_version < version.VERSION_4_9:
             return
         pattern = re.compile("exit code [1-9]+")
-        for root, dirs, files in os.walk(self.root):
-            for file in files:
-                try:
-                    with open(os.path.join(root, file), "r") as f:
-                        data_file = f.read()
-                    exit_code_error = pattern.findall(data_file.lower())
-                    if len(exit_code_error) > 0 and "gather-debug" not in file:
-                        self.files_content_issue.append(os.path.join(root, file))
-                except Exception as e:
-                    logger.error(f"There is no option to read {file}, error: {e}")
+        for file_path in self.get_path_index().files():
+            file = os.path.basename(file_path)
+            if file.endswith(TARBALL_SUFFIX):
+                continue
+            try:
+                with open_artifact(file_path) as f:
+                    data_file = f.read()
+                exit_code_error = pattern.findall(data_file.lower())
+                if len(exit_code_error) > 0 and "gather-debug" not in file:
+                    self.files_content_issue.append(file_path)
+            except Exception as e:
+                logger.error(f"There is no option to read {file}, error: {e}")
 
     def print_must_gather_debug(self) -> None:
         try:
-            with open(os.path.join(self.root, GATHER_COMMANDS_LOG), "r") as f:
+            with open_artifact(os.path.join(self.root, GATHER_COMMANDS_LOG)) as f:
                 logger.info("Printing must-gather internal log file")
                 logger.info(f.readlines())
         except FileNotFoundError:
@@ -220,29 +257,25 @@ class MustGather(object):
             if pattern is False:
                 pod_names.append(pod.name)
 
-        pod_path = None
-        for dir_name, subdir_list, files_list in os.walk(self.root):
-            if re.search("openshift-storage/pods$", dir_name):
-                pod_path = dir_name
-                break
+        index = self.get_path_index()
+        pod_dirs = [
+            path
+            for path in index.find_suffix("openshift-storage/pods")
+            if index.is_dir(path)
+        ]
+        # directory of the tree takes precedence over the tarball members
+        tree_pod_dirs = [path for path in pod_dirs if os.path.isabs(path)]
+        if tree_pod_dirs:
+            pod_dirs = tree_pod_dirs[:1]
 
         pod_files = []
         logger.info("Get pod names on openshift-storage/pods directory")
-        if pod_path:
-            for pod_file in os.listdir(pod_path):
+        for pod_dir in pod_dirs:
+            for pod_path in index.children(pod_dir):
+                pod_file = os.path.basename(pod_path)
                 pattern = self.check_pod_name_pattern(pod_file)
-                if pattern is False:
+                if pattern is False and pod_file not in pod_files:
                     pod_files.append(pod_file)
-        else:
-            pods_pattern = re.compile(r"openshift-storage/pods/([^/]+)")
-            seen = set()
-            for full_path in self.full_paths:
-                match = pods_pattern.search(full_path)
-                if match and match.group(1) not in seen:
-                    seen.add(match.group(1))
-                    pattern = self.check_pod_name_pattern(match.group(1))
-                    if pattern is False:
-                        pod_files.append(match.group(1))
 
         diff = list(set(pod_files) - set(pod_names)) + list(
             set(pod_names) - set(pod_files)
@@ -308,16 +341,18 @@ class MustGather(object):
         if self.type_log == "OTHERS" and ocs_version >= version.VERSION_4_6:
             flag = False
             logger.info("Verify noobaa_diagnostics folder exist")
-            self.get_all_paths()
-            for full_path in self.full_paths:
-                if re.search(
-                    r"noobaa_diagnostics_.*.tar.gz", os.path.basename(full_path)
-                ):
+            index = self.get_path_index()
+            pattern = re.compile(r"noobaa_diagnostics_.*.tar.gz")
+            for name in index.by_basename:
+                if pattern.search(name):
+                    full_path = index.by_basename[name][0]
                     flag = True
                     if os.path.isabs(full_path):
                         logger.info(f"Extract noobaa_diagnostics: {full_path}")
                         with tarfile.open(full_path) as f:
                             f.extractall(os.path.dirname(full_path))
+                        # the extracted files are validated too
+                        self.path_index = None
                     else:
                         logger.info(f"Found noobaa_diagnostics in tarball: {full_path}")
                     break
@@ -336,22 +371,9 @@ class MustGather(object):
             list: paths of all members (files and dirs) in the archive
 
         """
-        paths = []
-        try:
-            with tarfile.open(tarball_path, "r:*") as tar:
-                for member in tar.getmembers():
-                    # Add the member path (files and dirs)
-                    paths.append(member.name)
-                    # Ensure parent directory paths are included for substring
-                    # matching in verify_paths_in_dir / verify_paths_not_in_dir
-                    parts = member.name.replace("\\", "/").split("/")
-                    for i in range(1, len(parts)):
-                        parent = "/".join(parts[:i])
-                        if parent and parent not in paths:
-                            paths.append(parent)
-        except (tarfile.TarError, OSError) as e:
-            logger.warning(f"Could not read tarball {tarball_path}: {e}")
-        return paths
+        index = PathIndex()
+        index.add_members(tarball_members(tarball_path))
+        return index.paths
 
     def get_all_paths(self):
         """
@@ -359,20 +381,24 @@ class MustGather(object):
 
         When REPORTING["tarball_mg_logs"] is used, must-gather may be packed
         into a .tar.gz; this method collects paths from both directory trees
-        and from inside such tarballs.
+        and from inside such tarballs. The paths are indexed (see
+        path_index.PathIndex), the index is rebuilt by every call.
 
         """
-        self.full_paths = []
+        self.path_index = build_path_index(self.root)
+        self.full_paths = self.path_index.paths
 
-        for root_dir, dirs, files in os.walk(self.root):
-            for name in files + dirs:
-                full_path = os.path.join(root_dir, name)
-                self.full_paths.append(full_path)
-            # Collect paths from must-gather tarballs found under root
-            for name in files:
-                if name.endswith(".tar.gz"):
-                    tarball_path = os.path.join(root_dir, name)
-                    self.full_paths.extend(self._get_paths_from_tarball(tarball_path))
+    def get_path_index(self):
+        """
+        Index of the must gather paths, built once per must gather dir
+
+        Returns:
+            PathIndex: Index of the paths in must gather dir
+
+        """
+        if self.path_index is None or self.path_index.root != self.root:
+            self.get_all_paths()
+        return self.path_index
 
     def verify_paths_in_dir(self, paths):
         """
@@ -386,15 +412,8 @@ class MustGather(object):
             list: the paths do not exist in mg dir
 
         """
-        paths_exist = []
-        for path in paths:
-            status = False
-            for full_path in self.full_paths:
-                if path in full_path:
-                    status = True
-            if not status:
-                paths_exist.append(path)
-        return paths_exist
+        index = self.get_path_index()
+        return [path for path in paths if not index.contains_substring(path)]
 
     def verify_paths_not_in_dir(self, paths):
         """
@@ -408,15 +427,8 @@ class MustGather(object):
             list: the paths exist in mg dir
 
         """
-        paths_not_exist = []
-        for path in paths:
-            status = True
-            for full_path in self.full_paths:
-                if path in full_path:
-                    status = False
-            if not status:
-                paths_not_exist.append(path)
-        return paths_not_exist
+        index = self.get_path_index()
+        return [path for path in paths if index.contains_substring(path)]
 
     def validate_must_gather(self):
         """
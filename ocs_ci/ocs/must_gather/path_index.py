@@ -0,0 +1,253 @@
+"""
+Index of the paths of must-gather directory and its tarballs
+
+Must-gathers of big clusters have 100k+ entries. The index is built by one
+walk of the directory (and one read of the member list of every tarball)
+and answers the lookups of the validations without rescanning: exact path,
+children of directory, paths by basename, glob, suffix and substring.
+
+The paths of the directory tree are absolute, the members of the tarballs
+are relative to the tarball, like their names in the archive.
+"""
+
+import fnmatch
+import logging
+import os
+import tarfile
+from collections import defaultdict
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+TARBALL_SUFFIX = ".tar.gz"
+GLOB_CHARS = frozenset("*?[")
+
+
+class PathIndex(object):
+    """
+    Paths of must-gather indexed by directory and by basename
+    """
+
+    def __init__(self, root=None):
+        """
+        Args:
+            root (str): Root directory of the indexed must-gather
+
+        """
+        self.root = root
+        # path: (on disk, is dir), in the order of the walk
+        self._paths = dict()
+        self.by_dir = defaultdict(list)
+        self.by_basename = defaultdict(list)
+        self._joined = None
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, path):
+        return path in self._paths
+
+    @property
+    def paths(self):
+        """
+        Returns:
+            list: All the indexed paths, in the order of the walk
+
+        """
+        return list(self._paths)
+
+    def add(self, path, is_dir=False, on_disk=True):
+        """
+        Add the path to the index, already indexed path is ignored
+
+        Args:
+            path (str): Path of the entry
+            is_dir (bool): True for directory
+            on_disk (bool): False for tarball member
+
+        """
+        if path in self._paths:
+            return
+        self._paths[path] = (on_disk, is_dir)
+        parent, _, name = path.rpartition("/")
+        self.by_dir[parent].append(path)
+        self.by_basename[name].append(path)
+        self._joined = None
+
+    def add_members(self, names):
+        """
+        Add the tarball members and their parent directories
+
+        Args:
+            names (iterable): Tuples of the member name and True for directory
+
+        """
+        for name, is_dir in names:
+            self.add(name, is_dir=is_dir, on_disk=False)
+            # parents for substring matching in verify_paths_in_dir, the
+            # parents of indexed parent are indexed already
+            missing = []
+            parent = name.rpartition("/")[0]
+            while parent and parent not in self._paths:
+                missing.append(parent)
+                parent = parent.rpartition("/")[0]
+            for parent in reversed(missing):
+                self.add(parent, is_dir=True, on_disk=False)
+
+    def is_file(self, path):
+        """
+        Returns:
+            bool: True for the file of the directory tree (not a member)
+
+        """
+        on_disk, is_dir = self._paths.get(path, (False, True))
+        return on_disk and not is_dir
+
+    def is_dir(self, path):
+        """
+        Returns:
+            bool: True for directory of the tree or of tarball
+
+        """
+        return self._paths.get(path, (False, False))[1]
+
+    def files(self):
+        """
+        Returns:
+            list: Files of the directory tree
+
+        """
+        return [path for path, flags in self._paths.items() if flags == (True, False)]
+
+    def children(self, dir_path):
+        """
+        Args:
+            dir_path (str): Indexed directory
+
+        Returns:
+            list: Paths of the entries in the directory
+
+        """
+        return list(self.by_dir.get(dir_path.rstrip("/"), []))
+
+    def find_basename(self, name):
+        """
+        Args:
+            name (str): Basename of the entry
+
+        Returns:
+            list: Paths with the basename
+
+        """
+        return list(self.by_basename.get(name, []))
+
+    def glob(self, pattern):
+        """
+        Paths matching the fnmatch pattern, the pattern without a directory
+        part matches the basenames
+
+        Args:
+            pattern (str): Pattern eg. 'noobaa_diagnostics_*.tar.gz' or
+                '*/openshift-storage/pods/*'
+
+        Returns:
+            list: Matching paths, in the order of the walk
+
+        """
+        if "/" not in pattern:
+            names = fnmatch.filter(self.by_basename, pattern)
+            if len(names) == 1:
+                return self.find_basename(names[0])
+            names = set(names)
+            return [path for path in self._paths if path.rpartition("/")[2] in names]
+        name = pattern.rpartition("/")[2]
+        if not GLOB_CHARS.intersection(name):
+            candidates = self.by_basename.get(name, [])
+        else:
+            candidates = self._paths
+        return [path for path in candidates if fnmatch.fnmatchcase(path, pattern)]
+
+    def find_suffix(self, suffix):
+        """
+        Args:
+            suffix (str): End of the path, eg. 'openshift-storage/pods'
+
+        Returns:
+            list: Paths ending with the suffix, in the order of the walk
+
+        """
+        head, _, name = suffix.rpartition("/")
+        if head:
+            return [
+                path for path in self.by_basename.get(name, []) if path.endswith(suffix)
+            ]
+        return self.glob(f"*{suffix}") if suffix else self.paths
+
+    def contains_substring(self, substring):
+        """
+        Args:
+            substring (str): Part of path, eg. '/ceph_logs/journal_'
+
+        Returns:
+            bool: True if any indexed path contains the substring
+
+        """
+        if self._joined is None:
+            # paths don't contain new lines, a match doesn't span two paths
+            self._joined = "\n".join(self._paths)
+        return "\n" not in substring and substring in self._joined
+
+
+@lru_cache(maxsize=16)
+def _tarball_members(tarball_path, mtime_ns, size):
+    """
+    Member names of the tarball, cached until the tarball changes
+
+    Returns:
+        tuple: Tuples of the member name and True for directory
+
+    """
+    with tarfile.open(tarball_path, "r:*") as tar:
+        return tuple((member.name.replace("\\", "/"), member.isdir()) for member in tar)
+
+
+def tarball_members(tarball_path):
+    """
+    Args:
+        tarball_path (str): Path of the tarball
+
+    Returns:
+        tuple: Tuples of the member name and True for directory, empty for
+            unreadable tarball
+
+    """
+    try:
+        stat = os.stat(tarball_path)
+        return _tarball_members(tarball_path, stat.st_mtime_ns, stat.st_size)
+    except (tarfile.TarError, OSError) as e:
+        logger.warning(f"Could not read tarball {tarball_path}: {e}")
+        return ()
+
+
+def build_path_index(root):
+    """
+    Index the directory tree and the must-gather tarballs in it
+
+    Args:
+        root (str): Must-gather directory
+
+    Returns:
+        PathIndex: Index of the paths
+
+    """
+    index = PathIndex(root)
+    for root_dir, dirs, files in os.walk(root):
+        for name in files:
+            index.add(os.path.join(root_dir, name))
+        for name in dirs:
+            index.add(os.path.join(root_dir, name), is_dir=True)
+        for name in files:
+            if name.endswith(TARBALL_SUFFIX):
+                index.add_members(tarball_members(os.path.join(root_dir, name)))
+    logger.info(f"Indexed {len(index)} must-gather paths of {root}")
+    return index
@@ -8,6 +8,7 @@ from collections import defaultdict
 from operator import itemgetter
 import random
 import json
+import threading
 import unicodedata
 from ocs_ci.ocs.ocp import exec_cmd
 import base64
@@ -66,6 +67,13 @@ from ocs_ci.utility.vsphere import VSPHERE
 
 log = logging.getLogger(__name__)
 
+NODE_ROLE_LABEL_PREFIX = "node-role.kubernetes.io/"
+NODE_ROLE_LABEL = "kubernetes.io/role"
+
+# multicluster index -> (monotonic time of the listing, node dicts)
+_node_index = dict()
+_node_index_lock = threading.Lock()
+
 
 class Node(OCP):
     """
@@ -214,20 +222,129 @@ class Node(OCP):
         return self.run_cmd(upload_cmd, namespace, use_root, timeout)
 
 
-def get_node_objs(node_names=None):
+def list_node_dicts(use_index=True, retry=0):
+    """
+    List the nodes of the cluster in the current context with one oc call.
+    If RUN['node_index_ttl'] is set, the list is shared by the node helpers
+    for that number of seconds.
+
+    Args:
+        use_index (bool): Use the shared node index, False to always list
+            the current state of the nodes (e.g. when waiting for a change)
+        retry (int): Number of attempts to retry to list the nodes
+
+    Returns:
+        list: Node dicts
+
+    """
+    ttl = config.RUN.get("node_index_ttl", 0)
+    key = config.cluster_ctx.MULTICLUSTER.get("multicluster_index")
+    if ttl and use_index:
+        with _node_index_lock:
+            listed = _node_index.get(key)
+        if listed and time.monotonic() - listed[0] < ttl:
+            return copy.deepcopy(listed[1])
+    listing_time = time.monotonic()
+    node_dicts = OCP(kind=constants.NODE).get(retry=retry)["items"]
+    if ttl:
+        with _node_index_lock:
+            _node_index[key] = (listing_time, copy.deepcopy(node_dicts))
+    return node_dicts
+
+
+def invalidate_node_index():
+    """
+    Drop the shared node index, the next node helper lists the nodes again
+    """
+    with _node_index_lock:
+        _node_index.clear()
+
+
+def get_node_roles(node_data):
+    """
+    Get the roles of the node from its labels, the same way as printed in
+    the ROLES column of 'oc get node'
+
+    Args:
+        node_data (dict): The node dict
+
+    Returns:
+        str: Comma separated sorted roles (e.g. 'infra,worker'), '<none>'
+            when the node has no role
+
+    """
+    roles = set()
+    labels = node_data.get("metadata", {}).get("labels") or {}
+    for key, value in labels.items():
+        if key.startswith(NODE_ROLE_LABEL_PREFIX):
+            role = key[len(NODE_ROLE_LABEL_PREFIX) :]
+            if role:
+                roles.add(role)
+        elif key == NODE_ROLE_LABEL and value:
+            roles.add(value)
+    return ",".join(sorted(roles)) or "<none>"
+
+
+def get_node_status_from_data(node_data):
+    """
+    Get the status of the node from its Ready condition, the same way as
+    printed in the STATUS column of 'oc get node'
+
+    Args:
+        node_data (dict): The node dict
+
+    Returns:
+        str: The node status (e.g. 'Ready', 'NotReady',
+            'Ready,SchedulingDisabled', 'Unknown')
+
+    """
+    ready = next(
+        (
+            condition
+            for condition in node_data.get("status", {}).get("conditions") or []
+            if condition.get("type") == "Ready"
+        ),
+        None,
+    )
+    if ready is None:
+        statuses = ["Unknown"]
+    elif ready.get("status") == "True":
+        statuses = ["Ready"]
+    else:
+        statuses = ["NotReady"]
+    if node_data.get("spec", {}).get("unschedulable"):
+        statuses.append("SchedulingDisabled")
+    return ",".join(statuses)
+
+
+def get_node_taints(node_data):
+    """
+    Get the taints of the node
+
+    Args:
+        node_data (dict): The node dict
+
+    Returns:
+        list: The taint dicts with 'key', 'value' and 'effect'
+
+    """
+    return node_data.get("spec", {}).get("taints") or []
+
+
+def get_node_objs(node_names=None, retry=0):
     """
     Get node objects by node names
 
     Args:
         node_names (list): The node names to get their objects for.
             If None, will return all cluster nodes
+        retry (int): Number of attempts to retry to list the nodes
 
     Returns:
         list: Cluster node OCP objects
 
     """
-    nodes_obj = OCP(kind="node")
-    node_dicts = nodes_obj.get()["items"]
+    node_dicts = list_node_dicts(retry=retry)
     if not node_names:
         nodes = [OCS(**node_obj) for node_obj in node_dicts]
     else:
@@ -258,39 +375,27 @@ def get_nodes(node_type=constants.WORKER_MACHINE, num_of_nodes=None, retry=3):
     """
     from ocs_ci.ocs.cluster import is_hci_provider_cluster
 
+    # the roles are derived from the labels of the listed nodes, the same way
+    # as 'oc get node' prints them in the ROLES column
+    typed_nodes = [
+        node
+        for node in get_node_objs(retry=retry)
+        if node_type in get_node_roles(node.data)
+    ]
     if (
         config.ENV_DATA["platform"].lower() in constants.MANAGED_SERVICE_PLATFORMS
         and node_type == constants.WORKER_MACHINE
     ):
         typed_nodes = [
             node
-            for node in get_node_objs()
-            if node_type
-            in node.ocp.get_resource(
-                resource_name=node.name, column="ROLES", retry=retry
-            )
-            and constants.INFRA_MACHINE
-            not in node.ocp.get_resource(
-                resource_name=node.name, column="ROLES", retry=retry
-            )
-        ]
-    else:
-        typed_nodes = [
-            node
-            for node in get_node_objs()
-            if node_type
-            in node.ocp.get_resource(
-                resource_name=node.name, column="ROLES", retry=retry
-            )
+            for node in typed_nodes
+            if constants.INFRA_MACHINE not in get_node_roles(node.data)
         ]
     if is_hci_provider_cluster() and node_type == constants.WORKER_MACHINE:
         typed_nodes = [
             node
             for node in typed_nodes
-            if constants.MASTER_MACHINE
-            not in node.ocp.get_resource(
-                resource_name=node.name, column="ROLES", retry=retry
-            )
+            if constants.MASTER_MACHINE not in get_node_roles(node.data)
         ]
 
     if num_of_nodes:
@@ -322,9 +427,7 @@ def get_all_nodes():
         list: List of node name
 
     """
-    ocp_node_obj = ocp.OCP(kind=constants.NODE)
-    node_items = ocp_node_obj.get().get("items")
-    return [node["metadata"]["name"] for node in node_items]
+    return [node["metadata"]["name"] for node in list_node_dicts()]
 
 
 def wait_for_nodes_status(
@@ -355,15 +458,15 @@ def wait_for_nodes_status(
                     break
         nodes_not_in_state = copy.deepcopy(node_names)
         log.info(f"Waiting for nodes {node_names} to reach status {status}")
-        for sample in TimeoutSampler(timeout, sleep, get_node_objs, nodes_not_in_state):
-            for node in sample:
-                try:
-                    if node.ocp.get_resource_status(node.name) == status:
-                        log.info(f"Node {node.name} reached status {status}")
-                        nodes_not_in_state.remove(node.name)
-                except CommandFailed as ex:
-                    log.info(f"failed to get the node status by error {ex}")
-                    continue
+        for sample in TimeoutSampler(timeout, sleep, list_node_dicts, False):
+            for node_data in sample:
+                node_name = node_data["metadata"]["name"]
+                if (
+                    node_name in nodes_not_in_state
+                    and get_node_status_from_data(node_data) == status
+                ):
+                    log.info(f"Node {node_name} reached status {status}")
+                    nodes_not_in_state.remove(node_name)
             if not nodes_not_in_state:
                 break
         log.info(f"The following nodes reached status {status}: {node_names}")
@@ -390,6 +493,7 @@ def unschedule_nodes(node_names):
     node_names_str = " ".join(node_names)
     log.info(f"Unscheduling nodes {node_names_str}")
     ocp.exec_oc_cmd(f"adm cordon {node_names_str}")
+    invalidate_node_index()
 
     wait_for_nodes_status(node_names, status=constants.NODE_READY_SCHEDULING_DISABLED)
 
@@ -405,6 +509,7 @@ def schedule_nodes(node_names):
     ocp = OCP(kind="node")
     node_names_str = " ".join(node_names)
     ocp.exec_oc_cmd(f"adm uncordon {node_names_str}")
+    invalidate_node_index()
     log.info(f"Scheduling nodes {node_names_str}")
     wait_for_nodes_status(node_names)
 
@@ -1512,6 +1617,7 @@ def label_nodes(nodes, label=constants.OPERATOR_NODE_LABEL):
         log.info(
             f"Successfully labeled {new_node_to_label.name} " f"with OCS storage label"
         )
+    invalidate_node_index()
 
 
 def get_master_nodes():
@@ -1523,9 +1629,11 @@ def get_master_nodes():
 
     """
     label = "node-role.kubernetes.io/master"
-    ocp_node_obj = ocp.OCP(kind=constants.NODE)
-    nodes = ocp_node_obj.get(selector=label).get("items")
-    master_nodes_list = [node.get("metadata").get("name") for node in nodes]
+    master_nodes_list = [
+        node["metadata"]["name"]
+        for node in list_node_dicts()
+        if label in (node["metadata"].get("labels") or {})
+    ]
     return master_nodes_list
 
 
@@ -1547,18 +1655,17 @@ def get_worker_nodes(skip_master_nodes=None):
     from ocs_ci.ocs.cluster import is_hci_provider_cluster
 
     label = "node-role.kubernetes.io/worker"
-    ocp_node_obj = ocp.OCP(kind=constants.NODE)
-    nodes = ocp_node_obj.get(selector=label).get("items")
+    node_dicts = list_node_dicts()
+    nodes = [
+        node for node in node_dicts if label in (node["metadata"].get("labels") or {})
+    ]
     # Eliminate infra nodes from worker nodes in case of openshift dedicated
     if config.ENV_DATA["platform"].lower() in constants.MANAGED_SERVICE_PLATFORMS:
-        infra_nodes = ocp_node_obj.get(selector=constants.INFRA_NODE_LABEL).get("items")
-        infra_node_ids = [
-            infra_node.get("metadata").get("name") for infra_node in infra_nodes
-        ]
+        infra_label = f"{NODE_ROLE_LABEL_PREFIX}{constants.INFRA_MACHINE}"
         nodes = [
             node
             for node in nodes
-            if node.get("metadata").get("name") not in infra_node_ids
+            if (node["metadata"].get("labels") or {}).get(infra_label) != ""
         ]
     worker_nodes_list = [node.get("metadata").get("name") for node in nodes]
 
@@ -1571,8 +1678,7 @@ def get_worker_nodes(skip_master_nodes=None):
     if should_skip_masters:
         master_node_list = get_master_nodes()
         if not (
-            len(get_all_nodes()) == 3
-            and set(worker_nodes_list) == set(master_node_list)
+            len(node_dicts) == 3 and set(worker_nodes_list) == set(master_node_list)
         ):
             worker_nodes_list = list(set(worker_nodes_list) - set(master_node_list))
     return worker_nodes_list
@@ -1787,6 +1893,7 @@ def taint_nodes(nodes, taint_label=None):
         except Exception as e:
             log.warning(f"{node} was not tainted - {e}")
             all_succeeded = False
+    invalidate_node_index()
     return all_succeeded
 
 
@@ -1802,8 +1909,7 @@ def has_taint(node_obj, taint):
         bool: True if the node has the taint, False otherwise.
 
     """
-    taints = node_obj.get().get("spec", {}).get("taints", [])
-    return any(t.get("key") in taint for t in taints)
+    return any(t.get("key") in taint for t in get_node_taints(node_obj.get()))
 
 
 def check_taint_on_nodes(taint=None):
@@ -1821,7 +1927,8 @@ def check_taint_on_nodes(taint=None):
     nodes = get_nodes()
 
     for node_obj in nodes:
-        if has_taint(node_obj, taint):
+        # taints of the listed nodes, no oc call per node
+        if any(t.get("key") in taint for t in get_node_taints(node_obj.data)):
             log.info(f"Node {node_obj.name} has taint {taint}")
             return True
 
@@ -1855,6 +1962,7 @@ def untaint_nodes(taint_label=None, nodes_to_untaint=None):
         else:
             log.info(f"Node {node.name} does not have the taint {taint}")
 
+    invalidate_node_index()
     return result
 
 
@@ -2269,21 +2377,19 @@ def get_nodes_in_statuses(statuses, node_objs=None):
         list: OCP objects representing the nodes in the specific statuses
 
     """
+    try:
+        node_dicts = list_node_dicts(use_index=False)
+    except CommandFailed as e:
+        log.warning(f"Failed to get the node status due to the error: {str(e)}")
+        return []
+    node_statuses = {
+        node_data["metadata"]["name"]: get_node_status_from_data(node_data)
+        for node_data in node_dicts
+    }
     if not node_objs:
-        node_objs = get_node_objs()
-
-    nodes_in_statuses = []
-    for n in node_objs:
-        try:
-            node_status = get_node_status(n)
-        except CommandFailed as e:
-            log.warning(f"Failed to get the node status due to the error: {str(e)}")
-            continue
-
-        if node_status in statuses:
-            nodes_in_statuses.append(n)
+        node_objs = [OCS(**node_data) for node_data in node_dicts]
 
-    return nodes_in_statuses
+    return [n for n in node_objs if node_statuses.get(n.name) in statuses]
 
 
 def get_node_osd_ids(node_name):
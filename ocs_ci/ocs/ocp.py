@@ -15,8 +15,10 @@ import copy
 
 from ocs_ci.ocs.exceptions import (
     CommandFailed,
+    KubeAPIUnsupportedOperation,
     NotSupportedFunctionError,
     NonUpgradedImagesFoundError,
+    ResourcesNotReadyError,
     ResourceWrongStatusException,
     ResourceNameNotSpecifiedException,
     TimeoutExpiredError,
@@ -24,15 +26,213 @@ from ocs_ci.ocs.exceptions import (
 from ocs_ci.utility.proxy import update_kubeconfig_with_proxy_url_for_client
 from ocs_ci.utility.retry import retry, catch_exceptions
 from ocs_ci.utility.utils import TimeoutSampler
-from ocs_ci.utility.utils import exec_cmd, run_cmd, update_container_with_mirrored_image
+from ocs_ci.utility.utils import (
+    exec_cmd,
+    mask_secrets,
+    run_cmd,
+    update_container_with_mirrored_image,
+)
 from ocs_ci.utility.templating import dump_data_to_temp_yaml, load_yaml
-from ocs_ci.utility import version
-from ocs_ci.ocs import constants
+from ocs_ci.utility import command_telemetry, version
+from ocs_ci.utility.json import loads as json_loads
+from ocs_ci.ocs import constants, informer, kube_api, table_watch
 from ocs_ci.framework import config
 
 
 log = logging.getLogger(__name__)
 
+YAML_OUTPUT_RE = re.compile(r"(?<!\S)(-o|--output)(\s+|=)?yaml(?!\S)")
+
+# Metadata fields of the objects returned by OCP.get_metadata
+METADATA_FIELDS = (
+    "namespace",
+    "name",
+    "generateName",
+    "uid",
+    "creationTimestamp",
+    "labels",
+    "ownerReferences",
+)
+# Fields printed as JSON by the jsonpath output
+METADATA_JSON_FIELDS = ("labels", "ownerReferences")
+
+
+def metadata_jsonpath(fields=()):
+    """
+    Build the jsonpath template printing the kind, the metadata fields and
+    the additional fields of the listed objects, one object per line with
+    the fields separated by tabs
+
+    Args:
+        fields (list): Additional dotted paths (e.g. spec.claimRef.namespace)
+
+    Returns:
+        str: jsonpath template for 'oc get -o jsonpath=...'
+
+    """
+    paths = ["kind"] + [f"metadata.{field}" for field in METADATA_FIELDS]
+    paths += list(fields)
+    columns = '{"\\t"}'.join(f"{{.{path}}}" for path in paths)
+    return f'{{range .items[*]}}{columns}{{"\\n"}}{{end}}'
+
+
+def parse_metadata_jsonpath(output, kind, fields=()):
+    """
+    Parse the output of 'oc get' printed by the metadata_jsonpath template
+
+    Args:
+        output (str): Output of the command
+        kind (str): Kind of the objects used when the output doesn't contain it
+        fields (list): Additional dotted paths included in the template
+
+    Returns:
+        list: Objects with kind, metadata and the additional fields, the
+            fields which aren't set on the object are omitted
+
+    """
+    items = []
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        values = line.split("\t")
+        item = {"kind": values[0] or kind, "metadata": {}}
+        for field, value in zip(METADATA_FIELDS, values[1:]):
+            if not value:
+                continue
+            if field in METADATA_JSON_FIELDS:
+                value = json.loads(value)
+            item["metadata"][field] = value
+        for path, value in zip(fields, values[1 + len(METADATA_FIELDS) :]):
+            if not value:
+                continue
+            if value[0] in "{[":
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
+            *parents, leaf = path.split(".")
+            current = item
+            for parent in parents:
+                current = current.setdefault(parent, {})
+            current[leaf] = value
+        items.append(item)
+    return items
+
+
+def json_output_command(command):
+    """
+    Replace yaml output format of 'oc get' command with json which is much
+    faster to load and results in the same python object
+
+    Args:
+        command (str): oc command without the initial 'oc'
+
+    Returns:
+        tuple: (command, True if the output format was changed to json)
+
+    """
+    args = command.split(maxsplit=1)
+    if not args or args[0] != "get":
+        return command, False
+    new_command, count = YAML_OUTPUT_RE.subn("-o json", command)
+    return new_command, count == 1
+
+
+def load_yaml_output(out):
+    """
+    Load yaml output of oc command
+
+    Args:
+        out (str): Output of oc command
+
+    Returns:
+        object: Loaded python object
+
+    """
+    return yaml.load(out, Loader=yaml.CSafeLoader)
+
+
+# kubeconfig files known to exist, kubeconfig of a cluster isn't removed
+# during the run, so only the existing paths are remembered
+_existing_kubeconfigs = set()
+
+
+def kubeconfig_exists(path):
+    """
+    Check if the kubeconfig exists without checking the filesystem again
+    once it was found
+
+    Args:
+        path (str): Path to the kubeconfig
+
+    Returns:
+        bool: True if the kubeconfig exists
+
+    """
+    if path in _existing_kubeconfigs:
+        return True
+    if path and os.path.exists(path):
+        _existing_kubeconfigs.add(path)
+        return True
+    return False
+
+
+def command_output(completed_process, out_yaml_format=True, secrets=None):
+    """
+    Get output of the executed oc command
+
+    Args:
+        completed_process (CompletedProcess): Result of the command, with
+            stdout_data attribute if out_yaml_format is True
+        out_yaml_format (bool): whether to return yaml loaded python object
+            or raw output
+        secrets (list): A list of secrets to be masked with asterisks
+
+    Returns:
+        dict: Dictionary represents a returned yaml file.
+        str: If out_yaml_format is False.
+
+    """
+    data = completed_process.stdout_data if out_yaml_format else None
+    out = mask_secrets(completed_process.stdout.decode(), secrets)
+    try:
+        if out.startswith("hints = "):
+            out = out[out.index("{") :]
+            data = None
+    except ValueError:
+        pass
+
+    if out_yaml_format:
+        return data if data is not None else load_yaml_output(out)
+    return out
+
+
+# kind of the resource: key in RUN['RESOURCE_DICT_TEST'] used by resource checker
+RESOURCE_CHECKER_KINDS = {
+    "PersistentVolume": "pv",
+    "Pod": "pod",
+    "StorageClass": "sc",
+    "PersistentVolumeClaim": "pvc",
+    "Namespace": "namespace",
+    "volumesnapshot": "vs",
+    "CephFileSystem": "cephfs",
+    "CephBlockPool": "cephbp",
+}
+
+
+def record_created_resource(resource_dict):
+    """
+    Record the created resource in RUN['RESOURCE_DICT_TEST'] to be checked
+    by the resource checker in teardown
+
+    Args:
+        resource_dict (dict): Dictionary of the created resource
+
+    """
+    key = RESOURCE_CHECKER_KINDS.get(resource_dict["kind"])
+    if key:
+        config.RUN["RESOURCE_DICT_TEST"][key].append(resource_dict["metadata"]["name"])
+
 
 class OCP(object):
     """
@@ -198,25 +398,51 @@ class OCP(object):
         if not cluster_config:
             cluster_config = config
             env_kubeconfig = os.getenv("KUBECONFIG")
-        kubeconfig_path = (
-            self.cluster_kubeconfig if os.path.exists(self.cluster_kubeconfig) else None
-        )
-
-        if kubeconfig_path or not env_kubeconfig or not os.path.exists(env_kubeconfig):
-            cluster_dir_kubeconfig = kubeconfig_path or os.path.join(
-                cluster_config.ENV_DATA["cluster_path"],
-                cluster_config.RUN.get("kubeconfig_location"),
-            )
-            if os.path.exists(cluster_dir_kubeconfig):
-                oc_cmd += f"--kubeconfig {cluster_dir_kubeconfig} "
+        used_kubeconfig = self._cluster_dir_kubeconfig(cluster_config, env_kubeconfig)
+        if used_kubeconfig:
+            oc_cmd += f"--kubeconfig {used_kubeconfig} "
 
         if self.namespace:
             oc_cmd += f"-n {self.namespace} "
         if skip_tls_verify or self.skip_tls_verify:
             command += " --insecure-skip-tls-verify"
+        json_output = False
+        if out_yaml_format and cluster_config.RUN.get("oc_json_output", True):
+            command, json_output = json_output_command(command)
+
+        use_kube_api = (
+            cluster_config.RUN.get("oc_backend", kube_api.OC_BACKEND)
+            == kube_api.KUBE_API_BACKEND
+        )
+        informer_kinds = cluster_config.RUN.get("informer_kinds")
+        # output_file is written by exec_cmd, such commands are executed by oc
+        if (use_kube_api or informer_kinds) and not (kwargs or output_file):
+            kubeconfig = self._api_kubeconfig(
+                cluster_config, env_kubeconfig, used_kubeconfig
+            )
+            try:
+                out = self._exec_kube_api_cmd(
+                    command,
+                    kubeconfig,
+                    out_yaml_format=out_yaml_format,
+                    secrets=secrets,
+                    timeout=timeout,
+                    ignore_error=ignore_error,
+                    silent=silent,
+                    use_kube_api=use_kube_api,
+                    informer_kinds=informer_kinds,
+                )
+                if original_context is not None:
+                    config.switch_ctx(original_context)
+                return out
+            except KubeAPIUnsupportedOperation as ex:
+                log.debug(f"Command is executed by oc client: {ex}")
 
         oc_cmd += command
-        out = run_cmd(
+        stdout_loader = None
+        if out_yaml_format:
+            stdout_loader = json_loads if json_output else load_yaml_output
+        completed_process = exec_cmd(
             cmd=oc_cmd,
             secrets=secrets,
             timeout=timeout,
@@ -225,21 +451,173 @@ class OCP(object):
             silent=silent,
             cluster_config=cluster_config,
             output_file=output_file,
+            stdout_loader=stdout_loader,
             **kwargs,
         )
 
-        try:
-            if out.startswith("hints = "):
-                out = out[out.index("{") :]
-        except ValueError:
-            pass
-
         if original_context is not None:
             config.switch_ctx(original_context)
 
-        if out_yaml_format:
-            return yaml.load(out, Loader=yaml.CSafeLoader)
-        return out
+        return command_output(completed_process, out_yaml_format, secrets)
+
+    def _cluster_dir_kubeconfig(self, cluster_config, env_kubeconfig=None):
+        """
+        Kubeconfig passed to oc commands by '--kubeconfig'
+
+        Args:
+            cluster_config (MultiClusterConfig): Config of the cluster
+            env_kubeconfig (str): Kubeconfig from the KUBECONFIG env variable
+
+        Returns:
+            str: Path to the kubeconfig, None if oc uses the KUBECONFIG env
+
+        """
+        kubeconfig_path = (
+            self.cluster_kubeconfig
+            if kubeconfig_exists(self.cluster_kubeconfig)
+            else None
+        )
+        if (
+            kubeconfig_path
+            or not env_kubeconfig
+            or not kubeconfig_exists(env_kubeconfig)
+        ):
+            cluster_dir_kubeconfig = kubeconfig_path or os.path.join(
+                cluster_config.ENV_DATA["cluster_path"],
+                cluster_config.RUN.get("kubeconfig_location"),
+            )
+            if kubeconfig_exists(cluster_dir_kubeconfig):
+                return cluster_dir_kubeconfig
+        return None
+
+    @staticmethod
+    def _api_kubeconfig(cluster_config, env_kubeconfig, used_kubeconfig):
+        return (
+            used_kubeconfig
+            or cluster_config.RUN.get("kubeconfig")
+            or env_kubeconfig
+            or os.path.expanduser("~/.kube/config")
+        )
+
+    def get_kubeconfig(self, cluster_config=None):
+        """
+        Get kubeconfig used by the commands of this object for clients which
+        talk to the API directly (e.g. the kube_api backend or pod exec
+        sessions)
+
+        Args:
+            cluster_config (MultiClusterConfig): Config of the cluster, config
+                of the cluster context of this object is used by default
+
+        Returns:
+            str: Path to the kubeconfig
+
+        """
+        env_kubeconfig = None
+        if not cluster_config:
+            cluster_config = config
+            if self.cluster_context is not None and self.cluster_context < len(
+                config.clusters
+            ):
+                cluster_config = config.clusters[self.cluster_context]
+            env_kubeconfig = os.getenv("KUBECONFIG")
+        return self._api_kubeconfig(
+            cluster_config,
+            env_kubeconfig,
+            self._cluster_dir_kubeconfig(cluster_config, env_kubeconfig),
+        )
+
+    def _exec_kube_api_cmd(
+        self,
+        command,
+        kubeconfig,
+        out_yaml_format=True,
+        secrets=None,
+        timeout=600,
+        ignore_error=False,
+        silent=False,
+        use_kube_api=True,
+        informer_kinds=None,
+    ):
+        """
+        Execute 'oc' command via the native Kubernetes API backend or answer
+        it from the informer cache
+
+        Args:
+            command (str): The command to execute without the initial 'oc'
+            kubeconfig (str): Path to the kubeconfig of the cluster
+            out_yaml_format (bool): whether to return loaded python object
+            secrets (list): A list of secrets to be masked in the log
+            timeout (int): timeout for the request, defaults to 600 seconds
+            ignore_error (bool): True if ignore error returned from the API
+                server and do not raise the exception.
+            silent (bool): If True will silent errors from the server
+            use_kube_api (bool): Execute the command via the API, if False
+                only the informer cache is queried
+            informer_kinds (list): Kinds which are served from informer cache
+
+        Returns:
+            dict: Object returned by the API in the same format as oc returns it
+            str: Message in the same format as oc prints it for verbs which
+                don't return object
+
+        Raises:
+            KubeAPIUnsupportedOperation: In case the command has to be executed
+                by 'oc' client
+            CommandFailed: In case the API server returned error
+
+        """
+        oc_request = kube_api.parse_oc_command(command)
+        if oc_request.namespace is None:
+            oc_request = oc_request._replace(namespace=self.namespace)
+        client = kube_api.get_client(kubeconfig)
+        # shape of the call recorded by the command telemetry
+        shape_cmd = ["oc", oc_request.verb, oc_request.kind or ""]
+        start = time.perf_counter()
+        if informer_kinds and out_yaml_format:
+            out = informer.lookup(client, oc_request, informer_kinds)
+            if out is not None:
+                command_telemetry.record_command(
+                    shape_cmd, subprocess_time=time.perf_counter() - start
+                )
+                return out
+        if not use_kube_api:
+            raise KubeAPIUnsupportedOperation("Not served from informer cache")
+        masked_cmd = mask_secrets(f"oc {command}", secrets)
+        log.debug(f"Executing command via {kube_api.KUBE_API_BACKEND}: {masked_cmd}")
+        lock_wait = 0.0
+        if self.threading_lock:
+            self.threading_lock.acquire(timeout=7200)
+            lock_wait = time.perf_counter() - start
+        out = None
+        failed = True
+        try:
+            out = client.execute(
+                oc_request, out_yaml_format=out_yaml_format, timeout=timeout
+            )
+            failed = False
+            return out
+        except CommandFailed as ex:
+            error = mask_secrets(str(ex), secrets)
+            if not silent:
+                log.warning(f"Command stderr: {error}")
+            if ignore_error:
+                return None if out_yaml_format else ""
+            raise CommandFailed(
+                f"Error during execution of command: {masked_cmd}.\nError is {error}"
+            )
+        finally:
+            if self.threading_lock:
+                self.threading_lock.release()
+            # the object is returned by the API already loaded, only the size
+            # of the text output is known
+            command_telemetry.record_command(
+                shape_cmd,
+                lock_wait=lock_wait,
+                subprocess_time=time.perf_counter() - start - lock_wait,
+                output_bytes=len(out) if isinstance(out, str) else 0,
+                error=failed,
+            )
 
     @retry(CommandFailed, tries=3, delay=30, backoff=1)
     def exec_oc_debug_cmd(
@@ -386,6 +764,61 @@ class OCP(object):
                     )
                     time.sleep(wait if wait else 1)
 
+    def get_metadata(self, all_namespaces=False, selector=None, fields=None):
+        """
+        Get only the metadata of the resources (namespace, name,
+        generateName, uid, creationTimestamp, labels and ownerReferences)
+        instead of the whole objects. With the kube_api backend the API
+        server sends only the metadata, with oc the fields are printed by
+        jsonpath, so the whole objects aren't transferred and parsed.
+
+        Args:
+            all_namespaces (bool): Equal to oc get <resource> -A
+            selector (str): The label selector to look for
+            fields (list): Additional dotted paths of the fields to get (e.g.
+                ['spec.claimRef.namespace']), printed by oc even with the
+                kube_api backend
+
+        Returns:
+            list: Objects with kind, metadata and the additional fields, the
+                fields which aren't set on the object are omitted
+
+        """
+        fields = list(fields or [])
+        selector = selector or self.selector
+        client = None if fields else self._watch_client()
+        if client is not None:
+            try:
+                resource = client.resolve(self.kind)
+                object_list = client.list_objects(
+                    self.kind,
+                    namespace=self.namespace,
+                    all_namespaces=all_namespaces and not self.namespace,
+                    selector=selector,
+                    as_metadata=True,
+                )
+                return [
+                    {
+                        "kind": resource.kind,
+                        "metadata": {
+                            field: item["metadata"][field]
+                            for field in METADATA_FIELDS
+                            if item["metadata"].get(field)
+                        },
+                    }
+                    for item in object_list.get("items") or []
+                ]
+            except KubeAPIUnsupportedOperation as ex:
+                log.debug(f"Metadata can't be listed via API: {ex}")
+        command = f"get {self.kind}"
+        if all_namespaces and not self.namespace:
+            command += " -A"
+        if selector:
+            command += f" --selector={selector}"
+        command += f" -o jsonpath='{metadata_jsonpath(fields)}'"
+        out = self.exec_oc_cmd(command, out_yaml_format=False)
+        return parse_metadata_jsonpath(out, self.kind, fields)
+
     def describe(self, resource_name="", selector=None, all_namespaces=False):
         """
         Get command - 'oc describe <resource>'
@@ -430,40 +863,7 @@ class OCP(object):
         if yaml_file:
             command += f"-f {yaml_file}"
             if config.RUN.get("resource_checker"):
-                yaml_dct = load_yaml(yaml_file)
-                kind = yaml_dct["kind"]
-                if kind == "PersistentVolume":
-                    config.RUN["RESOURCE_DICT_TEST"]["pv"].append(
-                        yaml_dct["metadata"]["name"]
-                    )
-                if kind == "Pod":
-                    config.RUN["RESOURCE_DICT_TEST"]["pod"].append(
-                        yaml_dct["metadata"]["name"]
-                    )
-                if kind == "StorageClass":
-                    config.RUN["RESOURCE_DICT_TEST"]["sc"].append(
-                        yaml_dct["metadata"]["name"]
-                    )
-                if kind == "PersistentVolumeClaim":
-                    config.RUN["RESOURCE_DICT_TEST"]["pvc"].append(
-                        yaml_dct["metadata"]["name"]
-                    )
-                if kind == "Namespace":
-                    config.RUN["RESOURCE_DICT_TEST"]["namespace"].append(
-                        yaml_dct["metadata"]["name"]
-                    )
-                if kind == "volumesnapshot":
-                    config.RUN["RESOURCE_DICT_TEST"]["vs"].append(
-                        yaml_dct["metadata"]["name"]
-                    )
-                if kind == "CephFileSystem":
-                    config.RUN["RESOURCE_DICT_TEST"]["cephfs"].append(
-                        yaml_dct["metadata"]["name"]
-                    )
-                if kind == "CephBlockPool":
-                    config.RUN["RESOURCE_DICT_TEST"]["cephbp"].append(
-                        yaml_dct["metadata"]["name"]
-                    )
+                record_created_resource(load_yaml(yaml_file))
 
         elif resource_name:
             # e.g "oc namespace my-project"
@@ -1088,6 +1488,25 @@ class OCP(object):
                 " which describes unexpected error state."
             )
 
+        watch_client = self._watch_client()
+        if watch_client:
+            start_time = time.monotonic()
+            try:
+                return self._wait_for_resource_watch(
+                    watch_client,
+                    condition,
+                    resource_name=resource_name or self.resource_name,
+                    column=column,
+                    selector=selector or self.selector,
+                    resource_count=resource_count,
+                    timeout=timeout,
+                    dont_allow_other_resources=dont_allow_other_resources,
+                    error_condition=error_condition,
+                )
+            except KubeAPIUnsupportedOperation as ex:
+                log.info(f"Unable to watch {self._kind}, polling instead: {ex}")
+                timeout = max(timeout - (time.monotonic() - start_time), 1)
+
         # if dont_allow_other_resources or resource_count or error_condition are used, don't try build command with
         # oc wait, but use the old way with oc get and TimeoutSampler
         if not (dont_allow_other_resources or resource_count or error_condition):
@@ -1263,6 +1682,184 @@ class OCP(object):
 
         return False
 
+    def _watch_client(self):
+        """
+        Client for watching the resources of this object, available only
+        with the kube_api backend
+
+        Returns:
+            KubeAPIClient: Client of the cluster, None if the resources
+                can't be watched
+
+        """
+        cluster_config = config
+        if self.cluster_context is not None and self.cluster_context < len(
+            config.clusters
+        ):
+            cluster_config = config.clusters[self.cluster_context]
+        if (
+            cluster_config.RUN.get("oc_backend", kube_api.OC_BACKEND)
+            != kube_api.KUBE_API_BACKEND
+        ):
+            return None
+        try:
+            return kube_api.get_client(self.get_kubeconfig())
+        except KubeAPIUnsupportedOperation as ex:
+            log.debug(f"Resources can't be watched: {ex}")
+            return None
+
+    def _rows_reached_condition(
+        self,
+        rows,
+        condition,
+        column,
+        resource_count=0,
+        dont_allow_other_resources=False,
+        error_condition=None,
+    ):
+        """
+        Evaluate the condition of wait_for_resource on the printed rows of
+        the listed resources
+
+        Args:
+            rows (dict): Name of the resource to its printed columns
+            condition (str): The desired state of the resources
+            column (str): The name of the column to compare with
+            resource_count (int): How many resources expected to be
+            dont_allow_other_resources (bool): Don't allow other resources in
+                different state
+            error_condition (str): State of the resource which fails the wait
+
+        Returns:
+            bool: True if the resources reached the condition
+
+        Raises:
+            ResourceWrongStatusException: When a resource is in error_condition
+
+        """
+        in_condition_len = 0
+        for name, values in rows.items():
+            status = values.get(column)
+            if status == condition:
+                in_condition_len += 1
+            if error_condition is not None and status == error_condition:
+                raise ResourceWrongStatusException(
+                    name, column=column, expected=condition, got=status
+                )
+            if resource_count:
+                if in_condition_len == resource_count and not (
+                    dont_allow_other_resources and len(rows) != in_condition_len
+                ):
+                    return True
+            elif len(rows) == in_condition_len:
+                return True
+        return False
+
+    def _wait_for_resource_watch(
+        self,
+        client,
+        condition,
+        resource_name="",
+        column="STATUS",
+        selector=None,
+        resource_count=0,
+        timeout=60,
+        dont_allow_other_resources=False,
+        error_condition=None,
+    ):
+        """
+        Wait for a resource to reach a desired condition by watching the
+        columns printed by 'oc get', the condition is evaluated on every
+        change of the resources. Arguments are the same as of
+        wait_for_resource.
+
+        Args:
+            client (KubeAPIClient): Client of the cluster
+
+        Returns:
+            bool: True in case all resources reached desired condition
+
+        Raises:
+            TimeoutExpiredError: When the condition isn't reached in timeout
+            ResourceWrongStatusException: When a resource is in error_condition
+            KubeAPIUnsupportedOperation: When the resources can't be watched
+
+        """
+        log.info(
+            f"Watching resource(s) of kind {self._kind}"
+            f" identified by name '{resource_name}' using selector {selector}"
+            f" at column name {column} to reach desired condition {condition}"
+        )
+        watch = table_watch.TableWatch(
+            client,
+            self._kind,
+            namespace=self.namespace,
+            name=resource_name or None,
+            selector=None if resource_name else selector,
+        )
+        actual_status = None
+        try:
+            for rows in watch.changes(timeout):
+                if column not in watch.columns:
+                    raise KubeAPIUnsupportedOperation(
+                        f"Column {column} is not printed for {self._kind}"
+                    )
+                if resource_name:
+                    status = rows.get(resource_name, {}).get(column)
+                    if status == condition:
+                        log.info(
+                            f"status of {resource_name} at column {column}"
+                            f" reached desired condition: {condition}"
+                        )
+                        return True
+                    if error_condition is not None and status == error_condition:
+                        raise ResourceWrongStatusException(
+                            resource_name,
+                            column=column,
+                            expected=condition,
+                            got=status,
+                        )
+                elif self._rows_reached_condition(
+                    rows,
+                    condition,
+                    column,
+                    resource_count=resource_count,
+                    dont_allow_other_resources=dont_allow_other_resources,
+                    error_condition=error_condition,
+                ):
+                    log.info(
+                        f"{len(rows)} resource(s) of kind {self._kind} using "
+                        f"selector {selector} reached condition {condition}"
+                    )
+                    return True
+                else:
+                    status = [values.get(column) for values in rows.values()]
+                if status != actual_status:
+                    log.info(
+                        f"status of {resource_name or selector} at column "
+                        f"{column} changed: {actual_status} -> {status} "
+                        f"(waiting for {condition})"
+                    )
+                actual_status = status
+            raise TimeoutExpiredError(
+                timeout,
+                f"Timed out after {timeout}s waiting for {self._kind} "
+                f"{resource_name or selector} to reach condition {condition}",
+            )
+        except (TimeoutExpiredError, ResourceWrongStatusException) as ex:
+            log.error(
+                f"Wait for {self._kind} resource {resource_name} at column {column}"
+                f" to reach desired condition {condition} failed: {ex},"
+                f" last actual status was {actual_status}"
+            )
+            output = self.describe(resource_name, selector=selector)
+            log.warning(
+                "Description of the resource(s) we were waiting for:\n%s", output
+            )
+            raise
+        finally:
+            log.debug(f"{watch}: {dict(watch.stats)}")
+
     def wait_for_delete(
         self,
         resource_name="",
@@ -1293,6 +1890,28 @@ class OCP(object):
         if config.ENV_DATA["platform"].lower() == constants.IBM_POWER_PLATFORM:
             timeout = 720
         start_time = time.time()
+        watch_client = self._watch_client() if resource_name else None
+        if watch_client:
+            try:
+                watch = table_watch.TableWatch(
+                    watch_client,
+                    self._kind,
+                    namespace=self.namespace,
+                    name=resource_name,
+                )
+                for rows in watch.changes(timeout):
+                    if resource_name not in rows:
+                        log.info(
+                            f"{self.kind} {resource_name} got deleted successfully"
+                        )
+                        return True
+                describe_out = self.describe(resource_name=resource_name)
+                raise TimeoutError(
+                    f"Timeout when waiting for {resource_name} to delete. "
+                    f"Describe output: {describe_out}"
+                )
+            except KubeAPIUnsupportedOperation as ex:
+                log.info(f"Unable to watch {self._kind}, polling instead: {ex}")
         while True:
             try:
                 self.get(resource_name=resource_name)
@@ -1659,6 +2278,97 @@ class OCP(object):
         return result
 
 
+def wait_for_many(
+    kind,
+    names=None,
+    selector=None,
+    predicate=constants.STATUS_RUNNING,
+    namespace=None,
+    timeout=300,
+    sleep=3,
+    cluster_kubeconfig="",
+):
+    """
+    Wait for many resources of one kind to get ready. All the resources are
+    evaluated from one list per interval instead of polling every resource
+    separately, so the number of requests doesn't grow with the number of
+    the resources (with RUN['informer_kinds'] the list is served from the
+    watch cache).
+
+    Args:
+        kind (str): Kind of the resources (e.g. Pod)
+        names (list): Names of the resources to wait for
+        selector (str): Label selector of the resources, if names are not
+            specified, all the listed resources have to be ready
+        predicate (function or str): Function called with the resource dict
+            which returns True when the resource is ready, or the expected
+            status of the resource, for pods as printed in the STATUS column
+            of 'oc get pod' (e.g. Running, Completed), for other kinds the
+            status.phase (e.g. Bound)
+        namespace (str): Namespace of the resources
+        timeout (int): Time in seconds to wait
+        sleep (int): Interval of the listing in seconds
+        cluster_kubeconfig (str): Kubeconfig of the cluster
+
+    Returns:
+        dict: Name of the resource to the time (as returned by time.time())
+            when it was first seen ready
+
+    Raises:
+        ResourcesNotReadyError: When some resources didn't get ready in time,
+            the exception has the names of these resources in 'missed' and
+            the timestamps of the ready ones in 'ready'
+
+    """
+    if not (names or selector):
+        raise ValueError("Names or selector of the resources must be specified")
+    if isinstance(predicate, str):
+        expected = predicate
+        if kind.lower() == constants.POD.lower():
+            from ocs_ci.ocs.resources.pod import get_pod_status_from_data
+
+            def predicate(resource):
+                return get_pod_status_from_data(resource) == expected
+
+        else:
+
+            def predicate(resource):
+                return (resource.get("status") or {}).get("phase") == expected
+
+    ocp_obj = OCP(kind=kind, namespace=namespace, cluster_kubeconfig=cluster_kubeconfig)
+    wanted = set(names or [])
+    ready = dict()
+    log.info(
+        f"Waiting for {len(wanted) or 'all'} {kind} resource(s) "
+        f"(selector: {selector}) in namespace {namespace} to get ready"
+    )
+    try:
+        for sample in TimeoutSampler(timeout, sleep, ocp_obj.get, selector=selector):
+            now = time.time()
+            listed = set()
+            for resource in sample.get("items", []):
+                name = resource["metadata"]["name"]
+                listed.add(name)
+                if name in ready or (names and name not in wanted):
+                    continue
+                if predicate(resource):
+                    ready[name] = now
+            if not names:
+                wanted = listed | set(ready)
+            missed = wanted - set(ready)
+            if wanted and not missed:
+                log.info(f"All {len(wanted)} {kind} resource(s) are ready")
+                return ready
+            log.info(
+                f"{len(wanted) - len(missed)}/{len(wanted)} {kind} resource(s) "
+                f"are ready"
+            )
+    except TimeoutExpiredError:
+        missed = sorted(wanted - set(ready))
+        log.error(f"{kind} resource(s) didn't get ready in {timeout}s: {missed}")
+        raise ResourcesNotReadyError(kind, missed, ready=ready, timeout=timeout)
+
+
 def get_all_resource_names_of_a_kind(kind):
     """
     Returns all the resource names of a particular type
@@ -11,19 +11,34 @@ this we might have to dynamically figure out at run time which backend to use.
 This module will have all api client class definitions in this file along with
 dispatcher class Exec.
 
+ExecSessionPool keeps long-lived shell sessions to the pods, so the commands
+executed repeatedly in the same pod (ceph toolbox, workload pods, awscli pod)
+don't pay for the 'oc' process, kubeconfig load, authentication and the exec
+stream setup on every command. Commands run one by one in the session shell,
+each framed by unique markers carrying its exit code, and stdout and stderr
+are kept separate by the exec stream channels.
+
 """
 
-from collections import namedtuple
+from collections import defaultdict, namedtuple
+import atexit
 import logging
+import select
+import shlex
+import subprocess
+import threading
+import time
+import uuid
 
-from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.exceptions import CommandFailed, PodExecSessionUnavailable
 
 # Upstream KubernetesClient
 from kubernetes import config
 from kubernetes.client import Configuration
-from kubernetes.client.apis import core_v1_api
+from kubernetes.client.api import core_v1_api
 from kubernetes.client.rest import ApiException
 from kubernetes.stream import stream
+from websocket import WebSocketException
 
 
 logger = logging.getLogger(__name__)
@@ -162,3 +177,375 @@ class KubClient(object):
             stdout = outbuf
 
         return stdout, stderr, ret
+
+
+DEFAULT_IDLE_TIMEOUT = 300
+DEFAULT_MAX_IDLE_SESSIONS = 4
+SESSION_OPEN_TIMEOUT = 30
+STDOUT_CHANNEL = 1
+STDERR_CHANNEL = 2
+
+
+def frame_command(argv, marker):
+    """
+    Render the command for the session shell
+
+    The command is executed like by 'oc exec' (without shell interpretation
+    and without access to the session stdin) in a subshell, so it can't
+    change state of the session. The exit code is printed after the marker
+    to the stdout and the marker alone to the stderr once the command
+    finished.
+
+    Args:
+        argv (list): Command and its arguments
+        marker (str): Unique marker of the command end
+
+    Returns:
+        bytes: Script written to the session stdin
+
+    """
+    command = " ".join(shlex.quote(arg) for arg in argv)
+    return (
+        f"(exec {command}) </dev/null; "
+        f"printf '{marker}%d\\n' $?; printf '{marker}\\n' >&2\n"
+    ).encode()
+
+
+class ExecSession(object):
+    """
+    Long-lived shell in the pod container executing the commands one by one
+    """
+
+    def __init__(
+        self,
+        api,
+        podname,
+        namespace,
+        container=None,
+        shell="/bin/sh",
+        clock=time.monotonic,
+    ):
+        """
+        Open the exec stream and check the shell responds
+
+        Args:
+            api (CoreV1Api): Kubernetes API client
+            podname (str): Name of the pod
+            namespace (str): Namespace of the pod
+            container (str): Container name, default container if not provided
+            shell (str): Shell started in the container
+            clock (callable): Monotonic clock
+
+        Raises:
+            PodExecSessionUnavailable: In case the session can't be opened
+
+        """
+        self.podname = podname
+        self.namespace = namespace
+        self.container = container
+        self._clock = clock
+        self.last_used = clock()
+        kwargs = {"container": container} if container else {}
+        try:
+            self._stream = stream(
+                api.connect_get_namespaced_pod_exec,
+                podname,
+                namespace,
+                command=[shell],
+                stdin=True,
+                stdout=True,
+                stderr=True,
+                tty=False,
+                binary=True,
+                _preload_content=False,
+                **kwargs,
+            )
+        except Exception as ex:
+            # failed handshake (e.g. pod not found) surfaces as various
+            # exceptions of the kubernetes client
+            raise PodExecSessionUnavailable(
+                f"Failed to open exec session to pod {namespace}/{podname}: {ex}"
+            )
+        try:
+            self.run(["true"], timeout=SESSION_OPEN_TIMEOUT)
+        except (CommandFailed, subprocess.TimeoutExpired) as ex:
+            self.close()
+            raise PodExecSessionUnavailable(
+                f"Shell {shell} doesn't respond in pod {namespace}/{podname}: {ex}"
+            )
+
+    @property
+    def alive(self):
+        """
+        bool: True if the exec stream is still open
+        """
+        try:
+            # process frames received while idle (e.g. close of the stream)
+            sock = self._stream.sock.sock
+            while (
+                self._stream.is_open() and sock and select.select([sock], [], [], 0)[0]
+            ):
+                self._stream.update(timeout=0)
+        except (WebSocketException, OSError, ValueError):
+            self.close()
+        return self._stream.is_open()
+
+    def _read(self, channel, buffer, marker, index):
+        """
+        Move data received on the channel to the buffer and find the marker
+
+        Args:
+            channel (int): Channel of the exec stream
+            buffer (bytearray): Data received so far
+            marker (bytes): Marker of the command end
+            index (int): Index of the marker found before, -1 if not found
+
+        Returns:
+            int: Index of the marker in the buffer, -1 if not received yet
+
+        """
+        start = max(0, len(buffer) - len(marker))
+        # the client returns empty str instead of bytes if nothing was received
+        data = self._stream.read_channel(channel)
+        if data:
+            buffer += data
+        return index if index >= 0 else buffer.find(marker, start)
+
+    def run(self, argv, timeout=600):
+        """
+        Execute the command in the session
+
+        Args:
+            argv (list): Command and its arguments
+            timeout (int): Timeout for the command in seconds
+
+        Returns:
+            tuple: stdout (bytes), stderr (bytes) and exit code (int)
+
+        Raises:
+            CommandFailed: In case the session was closed during the command
+            subprocess.TimeoutExpired: In case the command didn't finish in
+                time, the session is closed then
+
+        """
+        marker = f"__ocs_ci_exec_{uuid.uuid4().hex}__".encode()
+        # drop the output of background processes left by previous commands
+        self._stream.read_channel(STDOUT_CHANNEL)
+        self._stream.read_channel(STDERR_CHANNEL)
+        deadline = self._clock() + timeout
+        stdout, stderr = bytearray(), bytearray()
+        stdout_end = stderr_end = -1
+        returncode = None
+        try:
+            self._stream.write_stdin(frame_command(argv, marker.decode()))
+            while returncode is None or stderr_end < 0:
+                if not self._stream.is_open():
+                    raise CommandFailed(
+                        f"Exec session to pod {self.namespace}/{self.podname} "
+                        f"was closed during command: {shlex.join(argv)}"
+                    )
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    self.close()
+                    raise subprocess.TimeoutExpired(argv, timeout)
+                self._stream.update(timeout=min(remaining, 1))
+                if returncode is None:
+                    stdout_end = self._read(STDOUT_CHANNEL, stdout, marker, stdout_end)
+                    line_end = stdout.find(b"\n", stdout_end)
+                    if stdout_end >= 0 and line_end >= 0:
+                        returncode = int(stdout[stdout_end + len(marker) : line_end])
+                if stderr_end < 0:
+                    stderr_end = self._read(STDERR_CHANNEL, stderr, marker, stderr_end)
+        except (WebSocketException, OSError) as ex:
+            self.close()
+            raise CommandFailed(
+                f"Exec session to pod {self.namespace}/{self.podname} failed "
+                f"during command: {shlex.join(argv)}: {ex}"
+            )
+        self.last_used = self._clock()
+        return bytes(stdout[:stdout_end]), bytes(stderr[:stderr_end]), returncode
+
+    def close(self):
+        """
+        Close the exec stream, the shell in the container exits
+        """
+        try:
+            # don't wait for the close response of the server
+            self._stream.close(timeout=0)
+        except (WebSocketException, OSError) as ex:
+            logger.debug(f"Failed to close exec session: {ex}")
+
+
+class ExecSessionPool(object):
+    """
+    Pool of long-lived exec sessions per kubeconfig, pod and container
+    """
+
+    def __init__(
+        self,
+        idle_timeout=DEFAULT_IDLE_TIMEOUT,
+        max_idle=DEFAULT_MAX_IDLE_SESSIONS,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            idle_timeout (float): Sessions not used for this number of seconds
+                are closed
+            max_idle (int): Maximal number of idle sessions kept per pod,
+                concurrent commands in the same pod open more sessions
+            clock (callable): Monotonic clock
+
+        """
+        self.idle_timeout = idle_timeout
+        self.max_idle = max_idle
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._idle = defaultdict(list)
+        self._apis = dict()
+        self.stats = {"opened": 0, "reused": 0, "evicted": 0}
+
+    def _api(self, kubeconfig):
+        """
+        Get API client and the lock serializing opening of the exec streams
+        (kubernetes stream temporarily replaces the request method of the
+        client)
+        """
+        with self._lock:
+            if kubeconfig not in self._apis:
+                try:
+                    api_client = config.new_client_from_config(config_file=kubeconfig)
+                except Exception as ex:
+                    raise PodExecSessionUnavailable(
+                        f"Failed to load kubeconfig {kubeconfig}: {ex}"
+                    )
+                api_client.configuration.assert_hostname = False
+                self._apis[kubeconfig] = (
+                    core_v1_api.CoreV1Api(api_client),
+                    threading.Lock(),
+                )
+            return self._apis[kubeconfig]
+
+    def evict_idle(self):
+        """
+        Close the sessions idle for longer than the idle timeout and the
+        sessions closed by the server
+        """
+        now = self._clock()
+        evicted = []
+        with self._lock:
+            for key, sessions in list(self._idle.items()):
+                keep = []
+                for session in sessions:
+                    if now - session.last_used > self.idle_timeout:
+                        evicted.append(session)
+                    else:
+                        keep.append(session)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+            self.stats["evicted"] += len(evicted)
+        for session in evicted:
+            session.close()
+
+    def _acquire(self, key):
+        kubeconfig, namespace, podname, container = key
+        while True:
+            with self._lock:
+                session = self._idle[key].pop() if self._idle.get(key) else None
+            if session is None:
+                break
+            if session.alive:
+                self.stats["reused"] += 1
+                return session
+            session.close()
+        api, open_lock = self._api(kubeconfig)
+        with open_lock:
+            session = ExecSession(
+                api, podname, namespace, container=container, clock=self._clock
+            )
+        self.stats["opened"] += 1
+        logger.debug(f"Opened exec session to pod {namespace}/{podname}")
+        return session
+
+    def run(self, kubeconfig, podname, namespace, argv, container=None, timeout=600):
+        """
+        Execute the command in an idle session to the pod or in a new one
+
+        Args:
+            kubeconfig (str): Path to the kubeconfig of the cluster
+            podname (str): Name of the pod
+            namespace (str): Namespace of the pod
+            argv (list): Command and its arguments
+            container (str): Container name
+            timeout (int): Timeout for the command in seconds
+
+        Returns:
+            tuple: stdout (bytes), stderr (bytes) and exit code (int)
+
+        Raises:
+            PodExecSessionUnavailable: In case the session can't be opened,
+                the command wasn't executed
+            CommandFailed: In case the session broke during the command
+            subprocess.TimeoutExpired: In case of the command timeout
+
+        """
+        self.evict_idle()
+        key = (kubeconfig, namespace, podname, container)
+        session = self._acquire(key)
+        try:
+            result = session.run(argv, timeout=timeout)
+        except BaseException:
+            session.close()
+            raise
+        with self._lock:
+            if len(self._idle[key]) < self.max_idle:
+                self._idle[key].append(session)
+                session = None
+        if session is not None:
+            session.close()
+        return result
+
+    def close_all(self):
+        """
+        Close all the idle sessions
+        """
+        with self._lock:
+            sessions = [s for sessions in self._idle.values() for s in sessions]
+            self._idle.clear()
+        for session in sessions:
+            session.close()
+
+
+_session_pool = None
+_session_pool_lock = threading.Lock()
+
+
+def get_session_pool(idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """
+    Get the shared pool of exec sessions
+
+    Args:
+        idle_timeout (float): Idle timeout of the sessions in seconds
+
+    Returns:
+        ExecSessionPool: Shared pool
+
+    """
+    global _session_pool
+    with _session_pool_lock:
+        if _session_pool is None:
+            _session_pool = ExecSessionPool(idle_timeout=idle_timeout)
+        _session_pool.idle_timeout = idle_timeout
+        return _session_pool
+
+
+def close_sessions():
+    """
+    Close all the idle exec sessions of the shared pool
+    """
+    if _session_pool is not None:
+        _session_pool.close_all()
+
+
+atexit.register(close_sessions)
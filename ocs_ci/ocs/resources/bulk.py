@@ -0,0 +1,229 @@
+"""
+Bulk creation of many objects
+
+Helpers creating hundreds of PVCs or pods used to run one 'oc create' (one
+process, one kubeconfig load and one TLS handshake) per object. The bulk engine
+renders the objects into multi-object 'List' files and creates each chunk by
+one 'oc create -f' (or by the kube_api backend over pooled connections), while
+the number of objects submitted per second is limited by the configured QPS.
+"""
+
+import copy
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.ocp import OCP, record_created_resource
+from ocs_ci.ocs.resources.ocs import OCS
+from ocs_ci.utility import templating
+from ocs_ci.utility.utils import update_container_with_mirrored_image
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 200
+DEFAULT_QPS = 50
+
+
+class RateLimiter(object):
+    """
+    Token bucket limiting the number of operations per second
+    """
+
+    def __init__(self, qps, burst=None, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            qps (float): Allowed operations per second, 0 or None for unlimited
+            burst (int): Size of the bucket, qps by default
+            clock (callable): Monotonic clock
+            sleep (callable): Sleep function
+
+        """
+        self.qps = qps
+        self.burst = burst or max(1, int(qps or 1))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, count=1):
+        """
+        Wait until count operations are allowed
+
+        Args:
+            count (int): Number of operations, it can be higher than burst
+
+        Returns:
+            float: Time in seconds spent waiting
+
+        """
+        if not self.qps:
+            return 0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.qps)
+            self._last = now
+            # tokens can go negative, the following callers will wait
+            self._tokens -= count
+            delay = -self._tokens / self.qps if self._tokens < 0 else 0
+        if delay:
+            self._sleep(delay)
+        return delay
+
+
+def _chunks(items, size):
+    for index in range(0, len(items), size):
+        yield items[index : index + size]
+
+
+def _created_from_failed_chunk(chunk, error):
+    """
+    Objects of the chunk created by the failed 'create -f', oc (like the
+    kube_api backend) tries to create all the objects of the file and
+    reports the name of every object it failed to create
+
+    Args:
+        chunk (list): Dictionaries of the objects of the chunk
+        error (str): Error of the command
+
+    Returns:
+        list: Dictionaries of the objects which are not reported as failed,
+            empty when no object of the chunk is named in the error (e.g.
+            the server wasn't reachable)
+
+    """
+    failed = [obj for obj in chunk if f'"{obj["metadata"]["name"]}"' in error]
+    if not failed:
+        return []
+    return [obj for obj in chunk if obj not in failed]
+
+
+def bulk_create(
+    objects,
+    factory=OCS,
+    do_reload=False,
+    chunk_size=None,
+    qps=None,
+    yaml_dir=None,
+    threading_lock=None,
+):
+    """
+    Create many objects with a few requests
+
+    Args:
+        objects (list): Dictionaries of the objects to create
+        factory (callable): Class (e.g. PVC, Pod) of the returned objects,
+            it is called with the dictionary of the object as kwargs
+        do_reload (bool): Reload the objects with live data after creation
+            (one list per kind and namespace)
+        chunk_size (int): Number of objects created by one command,
+            RUN['bulk_create_chunk_size'] by default
+        qps (float): Maximal number of objects submitted per second,
+            RUN['bulk_create_qps'] by default, 0 for unlimited
+        yaml_dir (str): Directory where the List files are kept (e.g. for
+            'oc delete -f <dir>'), temporary directory removed after the
+            creation is used when not provided
+        threading_lock (threading.RLock): Lock used for the oc commands
+
+    Returns:
+        list: Objects created by the factory in the same order as provided
+
+    Raises:
+        CommandFailed: In case creation of any object failed, the following
+            chunks are not created. The objects created before the failure
+            are in the 'created' attribute of the exception so that the
+            caller can delete them.
+
+    """
+    if not objects:
+        return []
+    if chunk_size is None:
+        chunk_size = config.RUN.get("bulk_create_chunk_size", DEFAULT_CHUNK_SIZE)
+    if qps is None:
+        qps = config.RUN.get("bulk_create_qps", DEFAULT_QPS)
+    limiter = RateLimiter(qps, burst=chunk_size)
+    objects = [copy.deepcopy(obj) for obj in objects]
+    for obj in objects:
+        if obj.get("kind") in ("Pod", "Deployment", "DeploymentConfig", "StatefulSet"):
+            update_container_with_mirrored_image(obj)
+
+    keep_files = yaml_dir is not None
+    yaml_dir = yaml_dir or tempfile.mkdtemp(prefix="bulk-create-")
+    oc = OCP(threading_lock=threading_lock)
+    start = time.time()
+    created_data = []
+    try:
+        for index, chunk in enumerate(_chunks(objects, chunk_size)):
+            list_file = os.path.join(yaml_dir, f"bulk-{index:04d}.yaml")
+            templating.dump_data_to_temp_yaml(
+                {"apiVersion": "v1", "kind": "List", "items": chunk},
+                list_file,
+                log=False,
+            )
+            waited = limiter.acquire(len(chunk))
+            log.info(
+                f"Creating {len(chunk)} objects from {list_file}"
+                + (f" (throttled for {waited:.1f}s)" if waited else "")
+            )
+            try:
+                oc.exec_oc_cmd(f"create -f {list_file}", out_yaml_format=False)
+            except CommandFailed as ex:
+                partial = _created_from_failed_chunk(chunk, str(ex))
+                _record_created(partial)
+                created_data.extend(partial)
+                ex.created = [factory(**obj) for obj in created_data]
+                log.error(
+                    f"Creation of objects from {list_file} failed, "
+                    f"{len(created_data)} objects were created"
+                )
+                raise
+            _record_created(chunk)
+            created_data.extend(chunk)
+    finally:
+        if not keep_files:
+            for name in os.listdir(yaml_dir):
+                os.remove(os.path.join(yaml_dir, name))
+            os.rmdir(yaml_dir)
+    log.info(f"Created {len(objects)} objects in {time.time() - start:.1f}s")
+
+    created = [factory(**obj) for obj in objects]
+    if do_reload:
+        reload_objects(created)
+    return created
+
+
+def _record_created(objects):
+    """
+    Record the created objects for the resource checker, only the objects
+    which were really created are recorded
+    """
+    if config.RUN.get("resource_checker"):
+        for obj in objects:
+            record_created_resource(obj)
+
+
+def reload_objects(ocs_objs):
+    """
+    Reload many objects with one list per kind and namespace instead of one
+    get per object
+
+    Args:
+        ocs_objs (list): OCS objects to reload
+
+    """
+    groups = defaultdict(list)
+    for ocs_obj in ocs_objs:
+        groups[(ocs_obj.kind, ocs_obj.namespace)].append(ocs_obj)
+    for (kind, namespace), group in groups.items():
+        items = OCP(kind=kind, namespace=namespace).get()
+        live = {item["metadata"]["name"]: item for item in items.get("items", [])}
+        for ocs_obj in group:
+            if ocs_obj.name in live:
+                ocs_obj.reload(data=live[ocs_obj.name])
+            else:
+                ocs_obj.reload()
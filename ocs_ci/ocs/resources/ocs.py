@@ -88,15 +88,20 @@ class OCS(object):
     def is_deleted(self):
         return self._is_deleted
 
-    def reload(self):
+    def reload(self, data=None):
         """
         Reloading the OCS instance with the new information from its actual
         data.
         After creating a resource from a yaml file, the actual yaml file is
         being changed and more information about the resource is added.
+
+        Args:
+            data (dict): Actual data of the resource (e.g. item of a list
+                fetched for many objects), fetched from the cluster if not
+                provided
         """
         cluster_kubeconfig = self.ocp.cluster_kubeconfig
-        self.data = self.get()
+        self.data = data if data is not None else self.get()
         self.__init__(**self.data)
         self.ocp.cluster_kubeconfig = cluster_kubeconfig
 
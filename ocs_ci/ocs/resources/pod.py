@@ -4,11 +4,12 @@ Pod related functionalities and context info
 Each pod in the openshift cluster will have a corresponding pod object
 """
 
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import logging
 import os
 import re
+import shlex
+import subprocess
 import yaml
 import tempfile
 import time
@@ -20,7 +21,7 @@ from semantic_version import Version
 from ocs_ci.ocs.ocp import get_images, OCP, verify_images_upgraded, get_sha256_digest
 from ocs_ci.helpers import helpers
 from ocs_ci.helpers.proxy import update_container_with_proxy_env
-from ocs_ci.ocs import constants, defaults, node, workload, ocp
+from ocs_ci.ocs import constants, defaults, informer, node, workload, ocp
 from ocs_ci.framework import config
 from ocs_ci.ocs.exceptions import (
     CephToolBoxNotFoundException,
@@ -33,19 +34,24 @@ from ocs_ci.ocs.exceptions import (
     NotFoundError,
     TimeoutException,
     NoRunningCephToolBoxException,
+    PodExecSessionUnavailable,
+    ResourcesNotReadyError,
     TolerationNotFoundException,
 )
 
 from ocs_ci.ocs.utils import setup_ceph_toolbox, get_pod_name_by_pattern
 from ocs_ci.ocs.resources.ocs import OCS
 from ocs_ci.ocs.resources.job import get_job_obj, get_jobs_with_prefix
-from ocs_ci.utility import templating
+from ocs_ci.utility import command_telemetry, templating
+from ocs_ci.utility.log_scanner import LogScanner, pod_log_source, raise_for_error
 from ocs_ci.utility.utils import (
     get_primary_nb_db_pod,
     run_cmd,
     check_timeout_reached,
     TimeoutSampler,
     exec_cmd,
+    mask_secrets,
+    process_command_result,
 )
 from ocs_ci.utility.utils import check_if_executable_in_path
 from ocs_ci.utility.retry import retry
@@ -187,6 +193,22 @@ class Pod(OCS):
         Returns:
             Munch Obj: This object represents a returned yaml file
         """
+        run_config = cluster_config or config
+        if run_config.RUN.get("pod_exec_sessions") and not (
+            set(kwargs) - {"ignore_error", "silent"}
+        ):
+            try:
+                return self.exec_cmd_in_session(
+                    command,
+                    out_yaml_format=out_yaml_format,
+                    secrets=secrets,
+                    timeout=timeout,
+                    container_name=container_name,
+                    cluster_config=cluster_config,
+                    **kwargs,
+                )
+            except PodExecSessionUnavailable as ex:
+                logger.debug(f"Command is executed by oc client: {ex}")
         if container_name:
             cmd = f"exec {self.name} -c {container_name} -- {command}"
         else:
@@ -201,6 +223,97 @@ class Pod(OCS):
             **kwargs,
         )
 
+    def exec_cmd_in_session(
+        self,
+        command,
+        out_yaml_format=True,
+        secrets=None,
+        timeout=600,
+        container_name=None,
+        cluster_config=None,
+        ignore_error=False,
+        silent=False,
+    ):
+        """
+        Execute a command on a pod in the persistent exec session from the
+        shared pool instead of a new 'oc rsh' process
+
+        The command is executed without shell interpretation like by 'oc rsh',
+        output and errors are handled the same way as for 'oc rsh'.
+
+        Args:
+            command (str): The command to execute on the given pod
+            out_yaml_format (bool): whether to return yaml loaded python
+                object OR to return raw output
+            secrets (list): A list of secrets to be masked with asterisks
+            timeout (int): timeout for the command, defaults to 600 seconds
+            container_name (str): The container name
+            cluster_config (MultiClusterConfig): Config of the cluster
+            ignore_error (bool): True if ignore non zero return code and do not
+                raise the exception
+            silent (bool): If True will silent errors from the command
+
+        Returns:
+            dict: Loaded output if out_yaml_format is True
+            str: Output of the command otherwise
+
+        Raises:
+            PodExecSessionUnavailable: In case the session can't be opened,
+                the command wasn't executed
+            CommandFailed: In case the command failed
+
+        """
+        # kubernetes client is needed only when the sessions are enabled
+        from ocs_ci.ocs import pod_exec
+
+        run_config = cluster_config or config
+        argv = shlex.split(command)
+        if not argv:
+            raise PodExecSessionUnavailable("Empty command")
+        kubeconfig = self.ocp.get_kubeconfig(cluster_config)
+        target = f"{self.name} -c {container_name}" if container_name else self.name
+        masked_cmd = mask_secrets(
+            f"oc -n {self.namespace} rsh {target} {command}", secrets
+        )
+        logger.debug(f"Executing command in exec session: {masked_cmd}")
+        pool = pod_exec.get_session_pool(
+            idle_timeout=run_config.RUN.get(
+                "pod_exec_idle_timeout", pod_exec.DEFAULT_IDLE_TIMEOUT
+            )
+        )
+        start = time.perf_counter()
+        stdout, stderr, returncode = pool.run(
+            kubeconfig,
+            self.name,
+            self.namespace,
+            argv,
+            container=container_name,
+            timeout=timeout,
+        )
+        processed = time.perf_counter()
+        if returncode:
+            # the same message as printed by oc
+            stderr += f"command terminated with exit code {returncode}\n".encode()
+        try:
+            completed_process = process_command_result(
+                subprocess.CompletedProcess(argv, returncode, stdout, stderr),
+                masked_cmd,
+                secrets=secrets,
+                ignore_error=ignore_error,
+                silent=silent,
+                stdout_loader=ocp.load_yaml_output if out_yaml_format else None,
+            )
+        finally:
+            command_telemetry.record_command(
+                ["oc", "rsh", self.name, argv[0]],
+                cluster_config,
+                subprocess_time=processed - start,
+                parse_time=time.perf_counter() - processed,
+                output_bytes=len(stdout),
+                error=bool(returncode),
+            )
+        return ocp.command_output(completed_process, out_yaml_format, secrets)
+
     def exec_s3_cmd_on_pod(self, command, mcg_obj=None):
         """
         Execute an S3 command on a pod
@@ -376,12 +489,18 @@ class Pod(OCS):
         """
         if "rook-ceph-tools" not in self.labels.values():
             raise CommandFailed("Ceph commands can be executed only on toolbox pod")
-        ceph_cmd = ceph_cmd
-        if format:
-            ceph_cmd += f" --format {format}"
-        out = self.exec_cmd_on_pod(
-            ceph_cmd, out_yaml_format=out_yaml_format, timeout=timeout
-        )
+        if config.RUN.get("ceph_command_cache"):
+            from ocs_ci.ocs import ceph_commands
+
+            out = ceph_commands.get_service(self).exec_ceph_cmd(
+                ceph_cmd, format, out_yaml_format=out_yaml_format, timeout=timeout
+            )
+        else:
+            if format:
+                ceph_cmd += f" --format {format}"
+            out = self.exec_cmd_on_pod(
+                ceph_cmd, out_yaml_format=out_yaml_format, timeout=timeout
+            )
 
         # For some commands, like "ceph fs ls", the returned output is a list
         if isinstance(out, list):
@@ -836,8 +955,103 @@ def get_all_pods(
     return pod_objs
 
 
+def get_pod_status_from_data(pod_data):
+    """
+    Get the status of the pod the same way as printed in the STATUS column
+    of 'oc get pod', without calling oc
+
+    Args:
+        pod_data (dict): The pod dict
+
+    Returns:
+        str: The pod status (e.g. Running, Pending, Terminating,
+            CrashLoopBackOff, Init:0/1, Completed)
+
+    """
+    status = pod_data.get("status") or {}
+    reason = status.get("reason") or status.get("phase") or ""
+    init_containers = (pod_data.get("spec") or {}).get("initContainers") or []
+    initializing = False
+    for i, container in enumerate(status.get("initContainerStatuses") or []):
+        state = container.get("state") or {}
+        terminated = state.get("terminated")
+        waiting = state.get("waiting")
+        if terminated and terminated.get("exitCode") == 0:
+            continue
+        if terminated:
+            if terminated.get("reason"):
+                reason = f"Init:{terminated['reason']}"
+            elif terminated.get("signal"):
+                reason = f"Init:Signal:{terminated['signal']}"
+            else:
+                reason = f"Init:ExitCode:{terminated.get('exitCode')}"
+        elif waiting and waiting.get("reason", "PodInitializing") != "PodInitializing":
+            reason = f"Init:{waiting['reason']}"
+        else:
+            reason = f"Init:{i}/{len(init_containers)}"
+        initializing = True
+        break
+    if not initializing:
+        has_running = False
+        for container in reversed(status.get("containerStatuses") or []):
+            state = container.get("state") or {}
+            terminated = state.get("terminated")
+            waiting = state.get("waiting")
+            if waiting and waiting.get("reason"):
+                reason = waiting["reason"]
+            elif terminated and terminated.get("reason"):
+                reason = terminated["reason"]
+            elif terminated and terminated.get("signal"):
+                reason = f"Signal:{terminated['signal']}"
+            elif terminated:
+                reason = f"ExitCode:{terminated.get('exitCode')}"
+            elif container.get("ready") and state.get("running"):
+                has_running = True
+        if reason == "Completed" and has_running:
+            ready = any(
+                condition.get("type") == "Ready" and condition.get("status") == "True"
+                for condition in status.get("conditions") or []
+            )
+            reason = constants.STATUS_RUNNING if ready else "NotReady"
+    if (pod_data.get("metadata") or {}).get("deletionTimestamp"):
+        reason = "Unknown" if status.get("reason") == "NodeLost" else "Terminating"
+    return reason
+
+
+def filter_pods_having_label(pods, label):
+    """
+    Filter the already listed pods by label, e.g. to get pods of one role
+    from a snapshot of all the pods in the namespace
+
+    Args:
+        pods (list): Pod objects or pod dicts
+        label (str): Equality based label selector (e.g. app=rook-ceph-mon)
+
+    Returns:
+        list: The pods having the label
+
+    Raises:
+        ValueError: When the selector is set based
+
+    """
+    requirements = informer.parse_selector(label)
+    if requirements is None:
+        raise ValueError(f"Set based selector {label} is not supported")
+    return [
+        pod_obj
+        for pod_obj in pods
+        if informer.match_labels(
+            pod_obj.data if isinstance(pod_obj, OCS) else pod_obj, requirements
+        )
+    ]
+
+
 def get_ceph_tools_pod(
-    skip_creating_pod=False, wait=False, namespace=None, get_running_pods=True
+    skip_creating_pod=False,
+    wait=False,
+    namespace=None,
+    get_running_pods=True,
+    pod_snapshot=None,
 ):
     """
     Get the Ceph tools pod
@@ -849,6 +1063,9 @@ def get_ceph_tools_pod(
         namespace: Namespace of OCS
         get_running_pods (bool): If True, get only the ceph tool pods in a Running status.
             If False, get the ceph tool pods even if they are not in a Running status.
+        pod_snapshot (list): Pod dicts of the OCS namespace listed by the
+            caller (e.g. by CephCluster.scan_cluster), the tool box pod is
+            looked up there first instead of listing the pods again
 
     Returns:
         Pod object: The Ceph tools pod object
@@ -884,13 +1101,24 @@ def get_ceph_tools_pod(
     else:
         namespace = namespace or config.ENV_DATA["cluster_namespace"]
 
-    ocp_pod_obj = OCP(
-        kind=constants.POD,
-        namespace=namespace,
-        selector=constants.TOOL_APP_LABEL,
-        cluster_kubeconfig=cluster_kubeconfig,
-    )
-    ct_pod_items = ocp_pod_obj.data["items"]
+    snapshot_ct_pods = []
+    if pod_snapshot and not cluster_kubeconfig:
+        snapshot_ct_pods = [
+            pod
+            for pod in filter_pods_having_label(pod_snapshot, constants.TOOL_APP_LABEL)
+            if not get_running_pods
+            or get_pod_status_from_data(pod) == constants.STATUS_RUNNING
+        ]
+
+    ct_pod_items = snapshot_ct_pods
+    if not snapshot_ct_pods:
+        ocp_pod_obj = OCP(
+            kind=constants.POD,
+            namespace=namespace,
+            selector=constants.TOOL_APP_LABEL,
+            cluster_kubeconfig=cluster_kubeconfig,
+        )
+        ct_pod_items = ocp_pod_obj.data["items"]
     if not (ct_pod_items or skip_creating_pod):
         # setup ceph_toolbox pod if the cluster has been setup by some other CI
         setup_ceph_toolbox()
@@ -934,19 +1162,11 @@ def get_ceph_tools_pod(
 
             # In the case of node failure, the CT pod will be recreated with the old
             # one in status Terminated. Therefore, need to filter out the Terminated pod
-
-            # Update the OCP pod object without the selector
-            ocp_pod_obj = OCP(
-                kind=constants.POD,
-                namespace=namespace,
-                cluster_kubeconfig=cluster_kubeconfig,
-            )
             running_ct_pods = list()
 
             for pod in ct_pod_items:
-                pod_status = ocp_pod_obj.get_resource_status(
-                    pod.get("metadata").get("name")
-                )
+                # status of the just listed pod as printed by 'oc get pod'
+                pod_status = get_pod_status_from_data(pod)
                 logger.info(f"Pod name: {pod.get('metadata').get('name')}")
                 logger.info(f"Pod status: {pod_status}")
                 if pod_status == constants.STATUS_RUNNING:
@@ -957,7 +1177,9 @@ def get_ceph_tools_pod(
         return running_ct_pods
 
     with config.RunWithProviderConfigContextIfAvailable():
-        if wait:
+        if snapshot_ct_pods:
+            running_ct_pods = snapshot_ct_pods
+        elif wait:
             running_ct_pods = retry(NoRunningCephToolBoxException, tries=10, delay=5)(
                 _get_tools_pod_objs
             )()
@@ -3821,46 +4043,86 @@ def wait_for_pods_to_be_in_statuses_concurrently(
     cluster_kubeconfig="",
 ):
     """
-    Verify pods are running in the namespace using app selectors. This method is using concurrent futures to
-    speed up execution and will be blocking until all pods are running or timeout is reached
+    Verify pods are running in the namespace using app selectors. The pods of
+    all the selectors are evaluated together from one list of the pods in the
+    namespace per interval, blocking until all pods are running or timeout is
+    reached
 
     Args:
-        app_selectors_to_resource_count_list:
+        app_selectors_to_resource_count_list (list): Dicts of the selector
+            to the expected number of the pods, e.g. [{"app=foo": 1}]. 0 means
+            all the listed pods of the selector (at least one)
         namespace: namespace of the pods expected to run
         timeout: time to wait for the pods to be running in seconds
-        status: status of the pods to wait for
+        status: status of the pods to wait for, as printed in the STATUS
+            column of 'oc get pod'
         cluster_kubeconfig: The kubeconfig file to use for the oc command
 
     Returns:
-        bool: True if all pods are running, False otherwise
+        bool: True if all pods are running
+
+    Raises:
+        ResourcesNotReadyError: When pods of some selectors didn't reach the
+            status in time, the selectors are in 'missed'. It's a subclass of
+            TimeoutExpiredError which was raised by the previous per selector
+            wait_for_resource() calls
+
     """
     pod = OCP(
         kind=constants.POD, namespace=namespace, cluster_kubeconfig=cluster_kubeconfig
     )
-    results = dict()
+    selectors = dict()
+    for item in app_selectors_to_resource_count_list:
+        selectors.update(item)
+    requirements = {
+        app_selector: informer.parse_selector(app_selector)
+        for app_selector in selectors
+    }
+    ready = dict()
+
+    def count_pods_in_status():
+        pods = pod.get()["items"]
+        counts = dict()
+        for app_selector, selector_requirements in requirements.items():
+            if selector_requirements is None:
+                # set based selector is evaluated by the API server
+                items = pod.get(selector=app_selector)["items"]
+            else:
+                items = [
+                    pod_data
+                    for pod_data in pods
+                    if informer.match_labels(pod_data, selector_requirements)
+                ]
+            in_status = sum(
+                1 for pod_data in items if get_pod_status_from_data(pod_data) == status
+            )
+            counts[app_selector] = (in_status, len(items))
+        return counts
 
-    def check_pod_status(app_selector, resource_count):
-        results[app_selector] = pod.wait_for_resource(
-            condition=status,
-            selector=app_selector,
-            resource_count=resource_count,
-            timeout=timeout,
+    try:
+        for counts in TimeoutSampler(timeout, 3, count_pods_in_status):
+            for app_selector, resource_count in selectors.items():
+                if app_selector in ready:
+                    continue
+                in_status, listed = counts[app_selector]
+                if resource_count:
+                    reached = in_status == resource_count
+                else:
+                    reached = listed > 0 and in_status == listed
+                if reached:
+                    logger.info(
+                        f"{in_status} pods with selector {app_selector} "
+                        f"reached status {status}"
+                    )
+                    ready[app_selector] = time.time()
+            if len(ready) == len(selectors):
+                return True
+    except TimeoutExpiredError:
+        missed = sorted(set(selectors) - set(ready))
+        raise ResourcesNotReadyError(
+            constants.POD, missed, ready=ready, timeout=timeout
         )
 
-    with ThreadPoolExecutor(
-        max_workers=len(app_selectors_to_resource_count_list)
-    ) as executor:
-        futures = []
-        for item in app_selectors_to_resource_count_list:
-            for app_selector, resource_count in item.items():
-                futures.append(
-                    executor.submit(check_pod_status, app_selector, resource_count)
-                )
-
-        [future.result() for future in futures]
-
-    return all(value for value in results.values())
-
 
 def get_pod_ip(pod_obj):
     """
@@ -4129,6 +4391,7 @@ def search_pattern_in_pod_logs(
     container=None,
     all_containers=False,
     since=None,
+    log_path=None,
 ):
     """
     Searches for the given regular expression pattern in the logs of a pod and returns all matching lines.
@@ -4141,22 +4404,29 @@ def search_pattern_in_pod_logs(
         all_containers (bool, optional): Whether to search logs for all containers in the pod. Defaults to False.
         since (str, optional): Only return logs newer than a relative duration like 5s, 2m, or 3h.
             Defaults to None.
+        log_path (str, optional): Path of the collected pod log (plain or compressed) to search instead of
+            fetching the logs from the cluster. Defaults to None.
 
     Returns:
         A list of matched lines with the pattern.
-    """
-    namespace = namespace or config.ENV_DATA["cluster_namespace"]
-    pod_logs = get_pod_logs(
-        pod_name=pod_name,
+
+    Raises:
+        CommandFailed: In case the logs could not be fetched
+    """
+    # the log is streamed and scanned, it's never kept in memory whole
+    scanner = LogScanner([pattern], max_hits=None)
+    if log_path:
+        return [hit.line for hit in scanner.scan_file(log_path).hits]
+    source = pod_log_source(
+        pod_name,
         namespace=namespace,
         container=container,
         all_containers=all_containers,
         since=since,
     )
-
-    matched_lines = [line for line in pod_logs.split("\n") if re.search(pattern, line)]
-
-    return matched_lines
+    result = scanner.scan([source])[pod_name]
+    raise_for_error(result)
+    return [hit.line for hit in result.hits]
 
 
 def get_containers_names_by_pod(pod: OCP) -> set:
@@ -0,0 +1,230 @@
+"""
+Watch of the columns printed by 'oc get' for condition based waits
+
+OCP.wait_for_resource polls 'oc get' for the object and then again for the
+tabular status column on every iteration, two round trips per poll for a
+condition which changes a handful of times. TableWatch lists the objects once
+and then follows a single watch stream, both in the server side printed Table
+format, so the very same columns as printed by 'oc get' are available for
+every change as soon as it happens.
+
+The watch resumes from the last seen resourceVersion when the stream ends and
+lists the objects again when the version expired (410 Gone). Any other
+failure raises KubeAPIUnsupportedOperation, and the caller falls back to
+polling with 'oc'.
+"""
+
+import logging
+import math
+import time
+from collections import defaultdict
+
+from ocs_ci.ocs.exceptions import (
+    CommandFailed,
+    KubeAPIUnsupportedOperation,
+    KubeAPIWatchExpired,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_WATCH_TIMEOUT = 300
+
+
+def cell_value(cell):
+    """
+    Format table cell the same way as 'oc get' prints it
+
+    Args:
+        cell (object): Cell of the Table row
+
+    Returns:
+        str: Printed value
+
+    """
+    if cell is None:
+        return "<none>"
+    if isinstance(cell, bool):
+        return str(cell).lower()
+    return str(cell)
+
+
+class TableWatch(object):
+    """
+    List+watch of the printed rows of one kind, optionally limited to one
+    object or to objects matching label selector
+    """
+
+    def __init__(
+        self,
+        client,
+        kind,
+        namespace=None,
+        name=None,
+        selector=None,
+        field_selector=None,
+        watch_timeout=DEFAULT_WATCH_TIMEOUT,
+    ):
+        """
+        Args:
+            client (KubeAPIClient): Client of the cluster
+            kind (str): Resource kind
+            namespace (str): Namespace, default namespace of the kubeconfig
+                is used if not specified
+            name (str): Watch only the object with this name
+            selector (str): Label selector
+            field_selector (str): Field selector
+            watch_timeout (int): Server side timeout of one watch request
+
+        Raises:
+            KubeAPIUnsupportedOperation: When the kind is not known
+
+        """
+        self.client = client
+        try:
+            self.resource = client.resolve(kind)
+        except CommandFailed as ex:
+            raise KubeAPIUnsupportedOperation(f"Discovery of {kind} failed: {ex}")
+        self.namespace = namespace
+        self.selector = selector
+        field_selectors = [field_selector] if field_selector else []
+        if name:
+            field_selectors.append(f"metadata.name={name}")
+        self.field_selector = ",".join(field_selectors) or None
+        self.watch_timeout = watch_timeout
+        self.columns = None
+        self.rows = dict()
+        self.resource_version = None
+        self.stats = defaultdict(int)
+
+    def __repr__(self):
+        return (
+            f"TableWatch({self.resource.kind}, namespace={self.namespace}, "
+            f"selector={self.selector}, field_selector={self.field_selector})"
+        )
+
+    @property
+    def _kind(self):
+        if self.resource.group:
+            return f"{self.resource.name}.{self.resource.group}"
+        return self.resource.name
+
+    def _table(self, obj):
+        """
+        Check the object is Table and remember its columns
+        """
+        if obj.get("kind") != "Table":
+            raise KubeAPIUnsupportedOperation(
+                f"{self}: API server returned {obj.get('kind')} instead of Table"
+            )
+        if obj.get("columnDefinitions"):
+            self.columns = [
+                column["name"].upper() for column in obj["columnDefinitions"]
+            ]
+        if self.columns is None:
+            raise KubeAPIUnsupportedOperation(f"{self}: Table without columns")
+        return obj
+
+    def _row(self, row):
+        """
+        Get name and printed columns of the Table row
+        """
+        values = dict(zip(self.columns, map(cell_value, row.get("cells") or [])))
+        metadata = (row.get("object") or {}).get("metadata") or {}
+        return metadata.get("name") or values.get("NAME"), values
+
+    def list(self):
+        """
+        List the rows and replace the current ones
+        """
+        try:
+            table = self.client.list_objects(
+                self._kind,
+                namespace=self.namespace,
+                selector=self.selector,
+                field_selector=self.field_selector,
+                as_table=True,
+            )
+        except CommandFailed as ex:
+            raise KubeAPIUnsupportedOperation(f"{self}: list failed: {ex}")
+        self.stats["lists"] += 1
+        self._table(table)
+        self.rows = dict(self._row(row) for row in table.get("rows") or [])
+        self.resource_version = (table.get("metadata") or {}).get("resourceVersion")
+
+    def handle_event(self, event):
+        """
+        Apply the watch event to the rows
+
+        Args:
+            event (dict): Watch event with Table object
+
+        Returns:
+            bool: True if the rows changed
+
+        """
+        obj = event.get("object") or {}
+        self.stats["events"] += 1
+        if event.get("type") not in ("ADDED", "MODIFIED", "DELETED"):
+            # BOOKMARK carries only the resourceVersion
+            self.resource_version = (obj.get("metadata") or {}).get(
+                "resourceVersion", self.resource_version
+            )
+            return False
+        self._table(obj)
+        for row in obj.get("rows") or []:
+            name, values = self._row(row)
+            if event["type"] == "DELETED":
+                self.rows.pop(name, None)
+            else:
+                self.rows[name] = values
+            self.resource_version = (
+                (row.get("object") or {}).get("metadata") or {}
+            ).get("resourceVersion") or self.resource_version
+        return True
+
+    def changes(self, timeout):
+        """
+        Follow the changes of the rows
+
+        Args:
+            timeout (float): Time in seconds to follow the changes
+
+        Yields:
+            dict: Name of the object to its printed columns (e.g.
+                {'my-pod': {'NAME': 'my-pod', 'STATUS': 'Running', ...}}),
+                first the current rows and then after every change
+
+        Raises:
+            KubeAPIUnsupportedOperation: When the objects can't be listed or
+                watched in Table format
+
+        """
+        deadline = time.monotonic() + timeout
+        self.list()
+        yield self.rows
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                self.stats["watches"] += 1
+                for event in self.client.watch(
+                    self._kind,
+                    namespace=self.namespace,
+                    resource_version=self.resource_version,
+                    selector=self.selector,
+                    field_selector=self.field_selector,
+                    timeout_seconds=math.ceil(min(remaining, self.watch_timeout)),
+                    as_table=True,
+                ):
+                    if self.handle_event(event):
+                        yield self.rows
+                    if time.monotonic() >= deadline:
+                        return
+            except KubeAPIWatchExpired as ex:
+                log.debug(f"{self}: watch expired, relisting: {ex}")
+                self.stats["expired"] += 1
+                self.list()
+                yield self.rows
+            except CommandFailed as ex:
+                raise KubeAPIUnsupportedOperation(f"{self}: watch failed: {ex}")
@@ -0,0 +1,69 @@
+"""
+Pytest configuration for ocs tests.
+"""
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.framework.logger_factory import set_log_record_factory
+from ocs_ci.ocs import kube_api
+from ocs_ci.ocs.tests.fake_kube_api import FakeKubeAPIServer
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_logging():
+    """
+    Set up the custom log record factory for all tests.
+    This ensures the 'clusterctx' attribute is available in log records.
+    """
+    set_log_record_factory()
+
+
+@pytest.fixture
+def fake_api_options():
+    """
+    Options of the fake_api fixture, override this fixture in the test module
+    to change them for all its tests. Supported keys:
+
+        resources (list): Resources served by the server, in the format of
+            DEFAULT_RESOURCES
+        objects (list): Objects added to the server before the test
+        env_data (dict): Additional ENV_DATA of the config
+        no_oc (bool): Fail the test when OCP executes the oc binary
+
+    """
+    return dict()
+
+
+@pytest.fixture
+def fake_api(request, tmp_path, monkeypatch, fake_api_options):
+    """
+    Fake Kubernetes API server with the kubeconfig written to tmp_path, the
+    config points OCP to it with the kube_api backend. The path of the
+    kubeconfig is in the 'kubeconfig' attribute of the server.
+
+    The options from fake_api_options can be updated for single test by
+    indirect parametrization, e.g.
+    @pytest.mark.parametrize("fake_api", [{"objects": [...]}], indirect=True)
+
+    """
+    options = dict(fake_api_options, **getattr(request, "param", {}))
+    with FakeKubeAPIServer(resources=options.get("resources")) as server:
+        server.kubeconfig = server.write_kubeconfig(str(tmp_path / "kubeconfig"))
+        monkeypatch.setitem(config.ENV_DATA, "cluster_path", str(tmp_path))
+        for key, value in options.get("env_data", {}).items():
+            monkeypatch.setitem(config.ENV_DATA, key, value)
+        monkeypatch.setitem(config.RUN, "kubeconfig_location", "kubeconfig")
+        monkeypatch.setitem(config.RUN, "oc_backend", kube_api.KUBE_API_BACKEND)
+        if options.get("no_oc"):
+
+            def no_oc(*args, **kwargs):
+                raise AssertionError("oc executed")
+
+            monkeypatch.setattr("ocs_ci.ocs.ocp.exec_cmd", no_oc)
+        for obj in options.get("objects", []):
+            server.add_object(obj)
+        try:
+            yield server
+        finally:
+            kube_api.close_clients()
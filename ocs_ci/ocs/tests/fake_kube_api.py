@@ -0,0 +1,845 @@
+# -*- coding: utf8 -*-
+"""
+Minimal in-memory Kubernetes API server used by unit tests and benchmarks of
+the kube_api backend. It supports discovery, get/list with label and field
+selectors, create, merge patch and delete of the objects and watches (also in
+the printed Table format with NAME and STATUS columns), and it records
+every request so the tests can count the API round trips. Watch events can be
+injected by the tests together with resourceVersion gaps (410 Gone).
+
+Pod exec requests (websocket with the v4.channel.k8s.io protocol) run the
+requested command as a local process, so exec clients can be tested end to
+end against any pod object added to the server.
+"""
+
+import base64
+import copy
+import hashlib
+import json
+import os
+import signal
+import struct
+import subprocess
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import yaml
+
+# (group, version, plural, kind, namespaced, short names)
+DEFAULT_RESOURCES = [
+    ("", "v1", "pods", "Pod", True, ["po"]),
+    ("", "v1", "persistentvolumeclaims", "PersistentVolumeClaim", True, ["pvc"]),
+    ("", "v1", "persistentvolumes", "PersistentVolume", False, ["pv"]),
+    ("", "v1", "namespaces", "Namespace", False, ["ns"]),
+    ("", "v1", "nodes", "Node", False, ["no"]),
+    ("", "v1", "configmaps", "ConfigMap", True, ["cm"]),
+    ("", "v1", "events", "Event", True, ["ev"]),
+    ("storage.k8s.io", "v1", "storageclasses", "StorageClass", False, ["sc"]),
+    ("ceph.rook.io", "v1", "cephclusters", "CephCluster", True, []),
+    ("ceph.rook.io", "v1", "cephblockpools", "CephBlockPool", True, []),
+]
+
+# Columns of the printed Table: (name, path of the value in the object)
+TABLE_COLUMNS = [("Name", "metadata.name"), ("Status", "status.phase")]
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+EXEC_PROTOCOL = "v4.channel.k8s.io"
+
+
+def websocket_frame(opcode, payload):
+    """
+    Encode unmasked (server to client) websocket frame
+
+    Args:
+        opcode (int): Frame opcode (2 for binary, 8 for close)
+        payload (bytes): Frame payload
+
+    Returns:
+        bytes: Encoded frame
+
+    """
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 2**16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def match_labels(obj, selector):
+    """
+    Evaluate equality based label selector (e.g. 'app=foo,tier!=db,env')
+
+    Args:
+        obj (dict): Object to check
+        selector (str): Label selector
+
+    Returns:
+        bool: True if the object matches the selector
+
+    """
+    labels = obj.get("metadata", {}).get("labels") or {}
+    for requirement in filter(None, selector.split(",")):
+        if "!=" in requirement:
+            key, value = requirement.split("!=", 1)
+            if labels.get(key.strip()) == value.strip():
+                return False
+        elif "=" in requirement:
+            key, value = requirement.replace("==", "=").split("=", 1)
+            if labels.get(key.strip()) != value.strip():
+                return False
+        elif requirement.startswith("!"):
+            if requirement[1:].strip() in labels:
+                return False
+        elif requirement.strip() not in labels:
+            return False
+    return True
+
+
+def match_fields(obj, selector):
+    """
+    Evaluate simple field selector (e.g. 'status.phase=Running')
+
+    Args:
+        obj (dict): Object to check
+        selector (str): Field selector
+
+    Returns:
+        bool: True if the object matches the selector
+
+    """
+    for requirement in filter(None, selector.split(",")):
+        negate = "!=" in requirement
+        key, value = requirement.replace("!=", "=").replace("==", "=").split("=", 1)
+        current = obj
+        for part in key.split("."):
+            current = current.get(part, {}) if isinstance(current, dict) else {}
+        current = current if isinstance(current, str) else ""
+        if (current == value) == negate:
+            return False
+    return True
+
+
+def to_table(objects, column_definitions=True):
+    """
+    Convert the objects to the printed Table (as=Table;g=meta.k8s.io)
+
+    Args:
+        objects (list): Objects to convert
+        column_definitions (bool): Include the column definitions, the API
+            server sends them only in the first event of a watch
+
+    Returns:
+        dict: Table
+
+    """
+    rows = []
+    for obj in objects:
+        cells = []
+        for _, path in TABLE_COLUMNS:
+            value = obj
+            for part in path.split("."):
+                value = value.get(part) if isinstance(value, dict) else None
+            cells.append(value)
+        rows.append(
+            {
+                "cells": cells,
+                "object": {
+                    "kind": "PartialObjectMetadata",
+                    "apiVersion": "meta.k8s.io/v1",
+                    "metadata": obj.get("metadata", {}),
+                },
+            }
+        )
+    table = {"kind": "Table", "apiVersion": "meta.k8s.io/v1", "rows": rows}
+    if column_definitions:
+        table["columnDefinitions"] = [
+            {"name": name, "type": "string", "format": "", "description": ""}
+            for name, _ in TABLE_COLUMNS
+        ]
+    return table
+
+
+def merge_patch(target, patch):
+    """
+    Apply JSON merge patch (RFC 7386)
+    """
+    if not isinstance(patch, dict):
+        return patch
+    if not isinstance(target, dict):
+        target = {}
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = merge_patch(target.get(key), value)
+    return target
+
+
+class FakeKubeAPIServer(object):
+    """
+    In-memory Kubernetes API server listening on localhost
+    """
+
+    def __init__(self, resources=None, latency=0):
+        """
+        Args:
+            resources (list): Resources served by the server, in the format
+                of DEFAULT_RESOURCES
+            latency (float): Artificial latency in seconds added to each request
+
+        """
+        self.resources = resources or DEFAULT_RESOURCES
+        self.latency = latency
+        self.objects = dict()
+        self.requests = list()
+        self.resource_version = 1
+        self.lock = threading.RLock()
+        self.changed = threading.Condition(self.lock)
+        # (resourceVersion, plural, namespace, event type, object)
+        self.events = list()
+        # watches started from resourceVersion older than this one get 410
+        self.compacted_version = 0
+        self._watch_generation = 0
+        self.token = uuid.uuid4().hex
+        self.exec_processes = set()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Start the server in the background thread
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the server
+        """
+        self.expire_watches()
+        for proc in list(self.exec_processes):
+            self.kill_exec_process(proc)
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @staticmethod
+    def kill_exec_process(proc):
+        """
+        Kill the process started by exec request with all its children
+        (e.g. to simulate restart of the container)
+
+        Args:
+            proc (subprocess.Popen): Process to kill
+
+        """
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
+
+    def write_kubeconfig(self, path, namespace="default"):
+        """
+        Write kubeconfig pointing to this server
+
+        Args:
+            path (str): Where to write the kubeconfig
+            namespace (str): Default namespace of the context
+
+        Returns:
+            str: Path to the kubeconfig
+
+        """
+        kubeconfig = {
+            "apiVersion": "v1",
+            "kind": "Config",
+            "clusters": [{"name": "fake", "cluster": {"server": self.url}}],
+            "users": [{"name": "admin", "user": {"token": self.token}}],
+            "contexts": [
+                {
+                    "name": "admin",
+                    "context": {
+                        "cluster": "fake",
+                        "user": "admin",
+                        "namespace": namespace,
+                    },
+                }
+            ],
+            "current-context": "admin",
+        }
+        with open(path, "w") as fd:
+            yaml.safe_dump(kubeconfig, fd)
+        return path
+
+    def count_requests(self, method=None, path_prefix=""):
+        """
+        Count recorded requests
+
+        Args:
+            method (str): Count only requests of this HTTP method
+            path_prefix (str): Count only requests of path with this prefix
+
+        Returns:
+            int: Number of matching requests
+
+        """
+        return len(
+            [
+                req
+                for req in self.requests
+                if (method is None or req[0] == method)
+                and req[1].startswith(path_prefix)
+            ]
+        )
+
+    def _resource(self, group, version, plural):
+        for resource in self.resources:
+            if resource[:3] == (group, version, plural):
+                return resource
+        return None
+
+    def _next_version(self):
+        self.resource_version += 1
+        return str(self.resource_version)
+
+    def _resource_of(self, obj):
+        group, _, version = obj["apiVersion"].rpartition("/")
+        return next(
+            r
+            for r in self.resources
+            if r[0] == group and r[1] == version and r[3] == obj["kind"]
+        )
+
+    def _record_event(self, event_type, plural, obj):
+        """
+        Record watch event for the stored object and wake up watches
+        """
+        namespace = obj["metadata"].get("namespace")
+        self.events.append(
+            (
+                int(obj["metadata"]["resourceVersion"]),
+                plural,
+                namespace,
+                event_type,
+                copy.deepcopy(obj),
+            )
+        )
+        self.changed.notify_all()
+
+    def add_object(self, obj):
+        """
+        Store object into the server directly, ADDED or MODIFIED watch event
+        is generated
+
+        Args:
+            obj (dict): Object definition, apiVersion and kind are required
+
+        Returns:
+            dict: Stored object
+
+        """
+        with self.lock:
+            resource = self._resource_of(obj)
+            metadata = obj.setdefault("metadata", {})
+            if resource[4]:
+                metadata.setdefault("namespace", "default")
+            else:
+                metadata.pop("namespace", None)
+            metadata.setdefault("uid", str(uuid.uuid4()))
+            metadata.setdefault(
+                "creationTimestamp", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            )
+            metadata["resourceVersion"] = self._next_version()
+            key = (resource[2], metadata.get("namespace"), metadata["name"])
+            event_type = "MODIFIED" if key in self.objects else "ADDED"
+            self.objects[key] = obj
+            self._record_event(event_type, resource[2], obj)
+            return obj
+
+    def delete_object(self, api_version, kind, name, namespace=None):
+        """
+        Delete object from the server directly, DELETED watch event is
+        generated
+
+        Args:
+            api_version (str): apiVersion of the object
+            kind (str): Kind of the object
+            name (str): Name of the object
+            namespace (str): Namespace of the object
+
+        Returns:
+            dict: Deleted object or None when the object doesn't exist
+
+        """
+        with self.lock:
+            resource = self._resource_of({"apiVersion": api_version, "kind": kind})
+            obj = self.objects.pop((resource[2], namespace, name), None)
+            if obj is not None:
+                obj["metadata"]["resourceVersion"] = self._next_version()
+                self._record_event("DELETED", resource[2], obj)
+            return obj
+
+    def compact(self, skip=0):
+        """
+        Forget all the recorded events, watches started from older
+        resourceVersion will get 410 Gone. This simulates etcd compaction.
+
+        Args:
+            skip (int): Increase the resourceVersion by this number to create
+                gap in the resource versions
+
+        """
+        with self.lock:
+            self.resource_version += skip
+            self.compacted_version = self.resource_version
+            self.events = list()
+
+    def expire_watches(self):
+        """
+        Terminate all running watches with ERROR event 410 Gone
+        """
+        with self.lock:
+            self._watch_generation += 1
+            self.changed.notify_all()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, don't wait for ACK
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _status(self, code, reason, message):
+                self._send(
+                    code,
+                    {
+                        "kind": "Status",
+                        "apiVersion": "v1",
+                        "status": "Failure",
+                        "message": message,
+                        "reason": reason,
+                        "code": code,
+                    },
+                )
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length)) if length else None
+
+            def _handle(self, method):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with server.lock:
+                    server.requests.append((method, url.path, query))
+                if server.latency:
+                    time.sleep(server.latency)
+                if self.headers.get("Authorization") != f"Bearer {server.token}":
+                    return self._status(401, "Unauthorized", "Unauthorized")
+                parts = [unquote(p) for p in url.path.strip("/").split("/")]
+                if parts == ["api"]:
+                    return self._send(200, {"kind": "APIVersions", "versions": ["v1"]})
+                if parts == ["apis"]:
+                    return self._send(200, self._api_groups())
+                if parts[0] == "api" and len(parts) >= 2:
+                    group, version, rest = "", parts[1], parts[2:]
+                elif parts[0] == "apis" and len(parts) >= 3:
+                    group, version, rest = parts[1], parts[2], parts[3:]
+                else:
+                    return self._status(
+                        404,
+                        "NotFound",
+                        "the server could not find the requested resource",
+                    )
+                if not rest:
+                    return self._send(200, self._resource_list(group, version))
+                namespace = None
+                if rest[0] == "namespaces" and len(rest) >= 3:
+                    namespace, rest = rest[1], rest[2:]
+                resource = server._resource(group, version, rest[0])
+                if not resource:
+                    return self._status(
+                        404,
+                        "NotFound",
+                        "the server could not find the requested resource",
+                    )
+                name = rest[1] if len(rest) > 1 else None
+                if rest[0] == "pods" and rest[2:] == ["exec"]:
+                    return self._exec(namespace, name, parse_qs(url.query))
+                handler = getattr(self, f"_{method.lower()}")
+                return handler(resource, namespace, name, query)
+
+            def _api_groups(self):
+                groups = dict()
+                for group, version, *_ in server.resources:
+                    if group:
+                        groups.setdefault(group, []).append(version)
+                return {
+                    "kind": "APIGroupList",
+                    "apiVersion": "v1",
+                    "groups": [
+                        {
+                            "name": group,
+                            "versions": [
+                                {"groupVersion": f"{group}/{v}", "version": v}
+                                for v in versions
+                            ],
+                            "preferredVersion": {
+                                "groupVersion": f"{group}/{versions[0]}",
+                                "version": versions[0],
+                            },
+                        }
+                        for group, versions in groups.items()
+                    ],
+                }
+
+            def _resource_list(self, group, version):
+                return {
+                    "kind": "APIResourceList",
+                    "groupVersion": f"{group}/{version}" if group else version,
+                    "resources": [
+                        {
+                            "name": plural,
+                            "singularName": kind.lower(),
+                            "namespaced": namespaced,
+                            "kind": kind,
+                            "shortNames": short_names,
+                            "verbs": ["create", "delete", "get", "list", "patch"],
+                        }
+                        for g, v, plural, kind, namespaced, short_names in server.resources
+                        if (g, v) == (group, version)
+                    ],
+                }
+
+            def _as_table(self):
+                return "as=Table" in (self.headers.get("Accept") or "")
+
+            def _chunk(self, data):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _watch(self, resource, namespace, query):
+                plural = resource[2]
+                selector = query.get("labelSelector")
+                field_selector = query.get("fieldSelector")
+                as_table = self._as_table()
+                first_event = True
+                try:
+                    since = int(query.get("resourceVersion") or 0)
+                except ValueError:
+                    since = 0
+                deadline = time.time() + int(query.get("timeoutSeconds") or 60)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                expired = False
+                with server.lock:
+                    generation = server._watch_generation
+                    if since and since < server.compacted_version:
+                        expired = True
+                try:
+                    while not expired:
+                        with server.lock:
+                            pending = [
+                                e
+                                for e in server.events
+                                if e[0] > since
+                                and e[1] == plural
+                                and (namespace is None or e[2] == namespace)
+                            ]
+                            if not pending:
+                                if generation != server._watch_generation:
+                                    expired = True
+                                    break
+                                remaining = deadline - time.time()
+                                if remaining <= 0:
+                                    break
+                                server.changed.wait(min(remaining, 0.5))
+                                continue
+                        for rv, _, _, event_type, obj in pending:
+                            since = rv
+                            if selector and not match_labels(obj, selector):
+                                continue
+                            if field_selector and not match_fields(obj, field_selector):
+                                continue
+                            if as_table:
+                                obj = to_table([obj], column_definitions=first_event)
+                            first_event = False
+                            event = {"type": event_type, "object": obj}
+                            self._chunk(json.dumps(event).encode() + b"\n")
+                    if expired:
+                        gone = {
+                            "kind": "Status",
+                            "apiVersion": "v1",
+                            "status": "Failure",
+                            "message": "too old resource version",
+                            "reason": "Expired",
+                            "code": 410,
+                        }
+                        event = {"type": "ERROR", "object": gone}
+                        self._chunk(json.dumps(event).encode() + b"\n")
+                    self._chunk(b"")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                self.close_connection = True
+
+            def _read_frame(self):
+                head = self.rfile.read(2)
+                if len(head) < 2:
+                    return None, b""
+                length = head[1] & 0x7F
+                if length == 126:
+                    length = struct.unpack("!H", self.rfile.read(2))[0]
+                elif length == 127:
+                    length = struct.unpack("!Q", self.rfile.read(8))[0]
+                mask = self.rfile.read(4) if head[1] & 0x80 else b""
+                payload = self.rfile.read(length)
+                if mask:
+                    payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+                return head[0] & 0x0F, payload
+
+            def _exec(self, namespace, name, query):
+                with server.lock:
+                    pod = server.objects.get(("pods", namespace, name))
+                if pod is None:
+                    return self._status(404, "NotFound", f'pods "{name}" not found')
+                containers = [c["name"] for c in pod["spec"].get("containers", [])]
+                container = query.get("container", [None])[0]
+                if container and container not in containers:
+                    return self._status(
+                        400,
+                        "BadRequest",
+                        f"container {container} is not valid for pod {name}",
+                    )
+                key = self.headers.get("Sec-WebSocket-Key", "")
+                accept = hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()
+                self.send_response(101, "Switching Protocols")
+                self.send_header("Upgrade", "websocket")
+                self.send_header("Connection", "Upgrade")
+                self.send_header(
+                    "Sec-WebSocket-Accept", base64.b64encode(accept).decode()
+                )
+                self.send_header("Sec-WebSocket-Protocol", EXEC_PROTOCOL)
+                self.end_headers()
+                self.wfile.flush()
+                self.close_connection = True
+                # own process group, so the whole "container" can be killed
+                proc = subprocess.Popen(
+                    query["command"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    start_new_session=True,
+                )
+                server.exec_processes.add(proc)
+                write_lock = threading.Lock()
+
+                def send(opcode, payload):
+                    with write_lock:
+                        try:
+                            self.wfile.write(websocket_frame(opcode, payload))
+                            self.wfile.flush()
+                        except OSError:
+                            pass
+
+                def pump(pipe, channel):
+                    for data in iter(lambda: os.read(pipe.fileno(), 65536), b""):
+                        send(0x2, bytes([channel]) + data)
+
+                def stdin():
+                    try:
+                        while True:
+                            opcode, payload = self._read_frame()
+                            if opcode is None or opcode == 0x8:
+                                break
+                            if payload[:1] == b"\x00":
+                                proc.stdin.write(payload[1:])
+                                proc.stdin.flush()
+                    except (OSError, ValueError):
+                        pass
+                    server.kill_exec_process(proc)
+
+                pumps = [
+                    threading.Thread(target=pump, args=(proc.stdout, 1), daemon=True),
+                    threading.Thread(target=pump, args=(proc.stderr, 2), daemon=True),
+                ]
+                for thread in pumps:
+                    thread.start()
+                threading.Thread(target=stdin, daemon=True).start()
+                returncode = proc.wait()
+                for thread in pumps:
+                    thread.join()
+                if returncode == 0:
+                    status = {"status": "Success"}
+                else:
+                    status = {
+                        "status": "Failure",
+                        "reason": "NonZeroExitCode",
+                        "details": {
+                            "causes": [
+                                {"reason": "ExitCode", "message": str(returncode)}
+                            ]
+                        },
+                    }
+                send(0x2, b"\x03" + json.dumps(status).encode())
+                send(0x8, struct.pack("!H", 1000))
+                server.exec_processes.discard(proc)
+
+            def _get(self, resource, namespace, name, query):
+                if query.get("watch") in ("1", "true"):
+                    return self._watch(resource, namespace, query)
+                group, version, plural, kind, *_ = resource
+                api_version = f"{group}/{version}" if group else version
+                with server.lock:
+                    if name:
+                        obj = server.objects.get((plural, namespace, name))
+                        if obj is None:
+                            return self._status(
+                                404, "NotFound", f'{plural} "{name}" not found'
+                            )
+                        return self._send(200, obj)
+                    items = [
+                        {
+                            k: v
+                            for k, v in obj.items()
+                            if k not in ("apiVersion", "kind")
+                        }
+                        for (res, ns, _), obj in sorted(server.objects.items())
+                        if res == plural and (namespace is None or ns == namespace)
+                    ]
+                    list_version = str(server.resource_version)
+                if query.get("labelSelector"):
+                    items = [
+                        i for i in items if match_labels(i, query["labelSelector"])
+                    ]
+                if query.get("fieldSelector"):
+                    items = [
+                        i for i in items if match_fields(i, query["fieldSelector"])
+                    ]
+                if self._as_table():
+                    table = to_table(items)
+                    table["metadata"] = {"resourceVersion": list_version}
+                    return self._send(200, table)
+                if "as=PartialObjectMetadataList" in (self.headers.get("Accept") or ""):
+                    return self._send(
+                        200,
+                        {
+                            "kind": "PartialObjectMetadataList",
+                            "apiVersion": "meta.k8s.io/v1",
+                            "metadata": {"resourceVersion": list_version},
+                            "items": [
+                                {
+                                    "kind": "PartialObjectMetadata",
+                                    "apiVersion": "meta.k8s.io/v1",
+                                    "metadata": i.get("metadata", {}),
+                                }
+                                for i in items
+                            ],
+                        },
+                    )
+                return self._send(
+                    200,
+                    {
+                        "kind": f"{kind}List",
+                        "apiVersion": api_version,
+                        "metadata": {"resourceVersion": list_version},
+                        "items": items,
+                    },
+                )
+
+            def _post(self, resource, namespace, name, query):
+                obj = self._body()
+                plural = resource[2]
+                obj_name = obj.get("metadata", {}).get("name")
+                if namespace:
+                    obj["metadata"]["namespace"] = namespace
+                with server.lock:
+                    if (plural, namespace, obj_name) in server.objects:
+                        return self._status(
+                            409,
+                            "AlreadyExists",
+                            f'{plural} "{obj_name}" already exists',
+                        )
+                    obj = server.add_object(obj)
+                return self._send(201, obj)
+
+            def _patch(self, resource, namespace, name, query):
+                patch = self._body()
+                plural = resource[2]
+                with server.lock:
+                    obj = server.objects.get((plural, namespace, name))
+                    if obj is None:
+                        return self._status(
+                            404, "NotFound", f'{plural} "{name}" not found'
+                        )
+                    if (
+                        self.headers.get("Content-Type")
+                        == "application/json-patch+json"
+                    ):
+                        return self._status(
+                            415, "UnsupportedMediaType", "json patch is not supported"
+                        )
+                    merge_patch(obj, patch)
+                    obj["metadata"]["resourceVersion"] = server._next_version()
+                    server._record_event("MODIFIED", plural, obj)
+                return self._send(200, obj)
+
+            def _delete(self, resource, namespace, name, query):
+                plural = resource[2]
+                self._body()
+                with server.lock:
+                    obj = server.objects.get((plural, namespace, name))
+                    if obj is not None:
+                        server.delete_object(
+                            obj["apiVersion"], obj["kind"], name, namespace
+                        )
+                if obj is None:
+                    return self._status(404, "NotFound", f'{plural} "{name}" not found')
+                return self._send(200, obj)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_PATCH(self):
+                self._handle("PATCH")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+        return Handler
@@ -0,0 +1,148 @@
+# -*- coding: utf8 -*-
+
+import pytest
+
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.ocp import OCP
+from ocs_ci.ocs.resources import bulk
+from ocs_ci.ocs.resources.ocs import OCS
+
+NAMESPACE = "openshift-storage"
+
+
+def pvc(name):
+    return {
+        "apiVersion": "v1",
+        "kind": "PersistentVolumeClaim",
+        "metadata": {"name": name, "namespace": NAMESPACE},
+        "spec": {
+            "accessModes": ["ReadWriteOnce"],
+            "resources": {"requests": {"storage": "1Gi"}},
+            "storageClassName": "ocs-storagecluster-ceph-rbd",
+        },
+    }
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def oc_commands(monkeypatch):
+    """
+    Record commands executed by OCP.exec_oc_cmd
+    """
+    commands = []
+    exec_oc_cmd = OCP.exec_oc_cmd
+
+    def record(self, command, *args, **kwargs):
+        commands.append(command)
+        return exec_oc_cmd(self, command, *args, **kwargs)
+
+    monkeypatch.setattr(OCP, "exec_oc_cmd", record)
+    return commands
+
+
+def test_rate_limiter():
+    clock = FakeClock()
+    limiter = bulk.RateLimiter(10, burst=10, clock=clock, sleep=clock.sleep)
+    # the burst is allowed without waiting
+    assert limiter.acquire(10) == 0
+    assert limiter.acquire(5) == pytest.approx(0.5)
+    assert limiter.acquire(20) == pytest.approx(2.0)
+    clock.now += 10
+    assert limiter.acquire(10) == 0
+    assert bulk.RateLimiter(0).acquire(1000) == 0
+
+
+def test_bulk_create_in_chunks(fake_api, oc_commands, tmp_path):
+    yaml_dir = tmp_path / "yamls"
+    yaml_dir.mkdir()
+    objects = [pvc(f"pvc-{i}") for i in range(100)]
+    created = bulk.bulk_create(objects, chunk_size=25, qps=0, yaml_dir=str(yaml_dir))
+    # 100 objects created by 4 commands
+    assert len(oc_commands) == 4
+    assert all(command.startswith("create -f") for command in oc_commands)
+    assert [obj.name for obj in created] == [f"pvc-{i}" for i in range(100)]
+    assert all(isinstance(obj, OCS) for obj in created)
+    assert fake_api.count_requests("POST", f"/api/v1/namespaces/{NAMESPACE}") == 100
+    # List files are kept for the bulk deletion
+    assert len(list(yaml_dir.iterdir())) == 4
+
+
+def test_bulk_create_throttling(fake_api, monkeypatch):
+    clock = FakeClock()
+    rate_limiter = bulk.RateLimiter
+    monkeypatch.setattr(
+        bulk,
+        "RateLimiter",
+        lambda qps, burst=None: rate_limiter(qps, burst, clock, clock.sleep),
+    )
+    bulk.bulk_create([pvc(f"pvc-{i}") for i in range(25)], chunk_size=5, qps=2.5)
+    # first chunk is the burst, the other four wait 2 seconds each
+    assert clock.sleeps == pytest.approx([2.0] * 4)
+
+
+def test_bulk_create_records_resources(fake_api, monkeypatch):
+    from ocs_ci.framework import config
+
+    monkeypatch.setitem(config.RUN, "resource_checker", True)
+    monkeypatch.setitem(config.RUN, "RESOURCE_DICT_TEST", {"pvc": [], "pod": []})
+    bulk.bulk_create([pvc("pvc-a"), pvc("pvc-b")], qps=0)
+    assert config.RUN["RESOURCE_DICT_TEST"]["pvc"] == ["pvc-a", "pvc-b"]
+    # the object which failed is not recorded, the following chunks are not
+    # created
+    with pytest.raises(CommandFailed, match="AlreadyExists") as excinfo:
+        bulk.bulk_create(
+            [pvc("pvc-c"), pvc("pvc-a"), pvc("pvc-d")], chunk_size=1, qps=0
+        )
+    assert config.RUN["RESOURCE_DICT_TEST"]["pvc"] == ["pvc-a", "pvc-b", "pvc-c"]
+    assert [obj.name for obj in excinfo.value.created] == ["pvc-c"]
+    # the objects of the failed chunk created by oc are recorded as well
+    with pytest.raises(CommandFailed, match="AlreadyExists") as excinfo:
+        bulk.bulk_create(
+            [pvc("pvc-e"), pvc("pvc-f"), pvc("pvc-a"), pvc("pvc-g")],
+            chunk_size=2,
+            qps=0,
+        )
+    assert [obj.name for obj in excinfo.value.created] == ["pvc-e", "pvc-f", "pvc-g"]
+    assert config.RUN["RESOURCE_DICT_TEST"]["pvc"][3:] == ["pvc-e", "pvc-f", "pvc-g"]
+
+
+def test_bulk_create_reload_with_one_list(fake_api):
+    created = bulk.bulk_create(
+        [pvc(f"pvc-{i}") for i in range(20)], qps=0, do_reload=True
+    )
+    assert all(obj.data["metadata"].get("resourceVersion") for obj in created)
+    assert (
+        fake_api.count_requests(
+            "GET", f"/api/v1/namespaces/{NAMESPACE}/persistentvolumeclaims"
+        )
+        == 1
+    )
+
+
+def test_bulk_create_failure(fake_api):
+    bulk.bulk_create([pvc("pvc-0")], qps=0)
+    with pytest.raises(CommandFailed, match="AlreadyExists"):
+        bulk.bulk_create([pvc("pvc-0"), pvc("pvc-1")], qps=0)
+    # the other objects of the chunk are created like by oc
+    assert fake_api.count_requests("POST", f"/api/v1/namespaces/{NAMESPACE}") == 3
+
+
+def test_created_from_failed_chunk():
+    chunk = [pvc("pvc-0"), pvc("pvc-1")]
+    error = 'Error from server (AlreadyExists): persistentvolumeclaims "pvc-1" exists'
+    assert bulk._created_from_failed_chunk(chunk, error) == [pvc("pvc-0")]
+    # no object is named, e.g. the server is not reachable
+    error = "Unable to connect to the server: connection refused"
+    assert bulk._created_from_failed_chunk(chunk, error) == []
@@ -0,0 +1,164 @@
+# -*- coding: utf8 -*-
+
+import json
+import os
+import sys
+
+import pytest
+
+from ocs_ci.ocs import ceph_commands, pod_exec
+from ocs_ci.ocs.resources.pod import Pod
+from ocs_ci.ocs.tests.fake_kube_api import FakeKubeAPIServer
+
+NAMESPACE = "openshift-storage"
+EXEC_PATH = f"/api/v1/namespaces/{NAMESPACE}/pods/rook-ceph-tools/exec"
+
+# stand-in for the ceph CLI of the toolbox, its state is stored in state.json
+FAKE_CEPH = """#!{python}
+import json, os, sys
+here = os.path.dirname(sys.argv[0])
+with open(os.path.join(here, "calls"), "a") as fd:
+    fd.write(" ".join(sys.argv[1:]) + "\\n")
+with open(os.path.join(here, "state.json")) as fd:
+    state = json.load(fd)
+args = sys.argv[1:]
+fmt = args[args.index("--format") + 1] if "--format" in args else None
+words = args[: args.index("--format")] if fmt else args
+if words == ["health"]:
+    print("HEALTH_OK")
+    sys.exit(0)
+if words == ["status"]:
+    out = {{
+        "health": {{"status": "HEALTH_OK"}},
+        "monmap": {{"epoch": 3}},
+        "osdmap": {{"epoch": state["osd_epoch"], "num_osds": 3}},
+        "pgmap": state["pgmap"],
+    }}
+elif words == ["osd", "tree"]:
+    out = {{"nodes": [{{"id": -1, "name": "default"}}], "epoch": state["osd_epoch"]}}
+elif words == ["df"]:
+    out = {{"stats": {{"total_used_bytes": state["pgmap"]["bytes_used"]}}}}
+else:
+    sys.exit(22)
+print(json.dumps(out, indent=4 if fmt == "json-pretty" else None))
+"""
+
+
+@pytest.fixture
+def ceph(tmp_path, monkeypatch):
+    from ocs_ci.framework import config
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "ceph").write_text(FAKE_CEPH.format(python=sys.executable))
+    (bin_dir / "ceph").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    class FakeCeph(object):
+        def set_state(self, osd_epoch, bytes_used, read_bytes_sec=0):
+            pgmap = {"bytes_used": bytes_used, "read_bytes_sec": read_bytes_sec}
+            state = {"osd_epoch": osd_epoch, "pgmap": pgmap}
+            (bin_dir / "state.json").write_text(json.dumps(state))
+
+        @property
+        def calls(self):
+            calls = bin_dir / "calls"
+            return calls.read_text().splitlines() if calls.exists() else []
+
+    fake_ceph = FakeCeph()
+    fake_ceph.set_state(10, 100)
+    with FakeKubeAPIServer() as server:
+        toolbox_data = {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "name": "rook-ceph-tools",
+                "namespace": NAMESPACE,
+                "labels": {"app": "rook-ceph-tools"},
+            },
+            "spec": {"containers": [{"name": "rook-ceph-tools"}]},
+        }
+        server.add_object(toolbox_data)
+        server.write_kubeconfig(str(tmp_path / "kubeconfig"))
+        monkeypatch.setitem(config.ENV_DATA, "cluster_path", str(tmp_path))
+        monkeypatch.setitem(config.ENV_DATA, "http_proxy", "")
+        monkeypatch.setitem(config.ENV_DATA, "no_proxy", "")
+        monkeypatch.setitem(config.RUN, "kubeconfig_location", "kubeconfig")
+        monkeypatch.setitem(config.RUN, "ceph_command_cache", True)
+        ceph_commands.cache_stats.reset()
+        fake_ceph.server = server
+        fake_ceph.toolbox = Pod(**toolbox_data)
+        yield fake_ceph
+        ceph_commands._services.clear()
+        pod_exec.close_sessions()
+
+
+def test_cached_maps():
+    assert ceph_commands.cached_maps("ceph osd tree") == ("osdmap",)
+    assert ceph_commands.cached_maps("ceph df detail") == ("osdmap", "pgmap")
+    assert ceph_commands.cached_maps("ceph osd pool set rbd size 2") == ()
+    assert ceph_commands.cached_maps("ceph osd treex") == ()
+    assert ceph_commands.cached_maps("ceph health") == ()
+
+
+def test_status_epochs():
+    epochs = ceph_commands.status_epochs(
+        {"osdmap": {"osdmap": {"epoch": 7}}, "monmap": {"epoch": 2}, "pgmap": {}}
+    )
+    assert epochs == {"osdmap": 7, "monmap": 2, "fsmap": None, "pgmap": None}
+    pgmap = {"num_pgs": 113, "bytes_used": 10, "read_op_per_sec": 7}
+    epochs = ceph_commands.status_epochs({"pgmap": pgmap})
+    pgmap["read_op_per_sec"] = 70
+    assert ceph_commands.status_epochs({"pgmap": pgmap}) == epochs
+    pgmap["bytes_used"] = 20
+    assert ceph_commands.status_epochs({"pgmap": pgmap}) != epochs
+
+
+def test_output_cached_by_epoch(ceph):
+    tree = ceph.toolbox.exec_ceph_cmd("ceph osd tree")
+    assert tree["epoch"] == 10
+    assert ceph.toolbox.exec_ceph_cmd("ceph osd tree") == tree
+    assert ceph.calls.count("osd tree --format json") == 1
+    # compact json is requested when the output is loaded
+    assert "osd tree --format json-pretty" not in ceph.calls
+
+    # new osdmap epoch invalidates the cached tree
+    ceph.set_state(11, 100)
+    assert ceph.toolbox.exec_ceph_cmd("ceph osd tree")["epoch"] == 11
+    assert ceph.calls.count("osd tree --format json") == 2
+    stats = ceph_commands.cache_stats
+    assert (stats.hits, stats.misses, stats.probes) == (1, 2, 3)
+    assert stats.hit_ratio == pytest.approx(1 / 3)
+
+
+def test_usage_change_invalidates_df(ceph):
+    df = ceph.toolbox.exec_ceph_cmd("ceph df")
+    assert ceph.toolbox.exec_ceph_cmd("ceph df") == df
+    ceph.set_state(10, 200)
+    assert ceph.toolbox.exec_ceph_cmd("ceph df")["stats"]["total_used_bytes"] == 200
+    assert ceph.calls.count("df --format json") == 2
+    # IO rates reported in the pgmap summary don't invalidate the output
+    ceph.set_state(10, 200, read_bytes_sec=4096)
+    assert ceph.toolbox.exec_ceph_cmd("ceph df")["stats"]["total_used_bytes"] == 200
+    assert ceph.calls.count("df --format json") == 2
+
+
+def test_no_probe_when_cache_disabled(ceph, monkeypatch):
+    from ocs_ci.framework import config
+
+    service = ceph_commands.get_service(ceph.toolbox)
+    monkeypatch.setitem(config.RUN, "ceph_command_cache", False)
+    assert service.exec_ceph_cmd("ceph osd tree")["epoch"] == 10
+    assert ceph.calls == ["osd tree --format json"]
+    assert ceph_commands.cache_stats.probes == 0
+
+
+def test_commands_share_one_session(ceph):
+    for _ in range(5):
+        assert ceph.toolbox.exec_ceph_cmd("ceph health", format=None) == "HEALTH_OK"
+    status = ceph.toolbox.exec_ceph_cmd("ceph status")
+    assert status["osdmap"]["epoch"] == 10
+    # raw output keeps the requested format
+    raw = ceph.toolbox.exec_ceph_cmd("ceph osd tree", out_yaml_format=False)
+    assert raw.startswith("{\n")
+    assert ceph.server.count_requests("GET", EXEC_PATH) == 1
@@ -0,0 +1,150 @@
+# -*- coding: utf8 -*-
+
+import logging
+
+import pytest
+
+from ocs_ci.ocs.cluster import CephCluster
+from ocs_ci.ocs.resources.pod import get_pod_status_from_data
+from ocs_ci.ocs.tests.fake_kube_api import DEFAULT_RESOURCES
+
+
+log = logging.getLogger(__name__)
+
+NAMESPACE = "openshift-storage"
+RESOURCES = DEFAULT_RESOURCES + [
+    ("ceph.rook.io", "v1", "cephfilesystems", "CephFilesystem", True, []),
+]
+
+
+def pod(name, app, phase="Running", container_state=None, **metadata):
+    container_state = container_state or (
+        {"running": {}} if phase == "Running" else {"waiting": {}}
+    )
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": dict(
+            name=name, namespace=NAMESPACE, labels={"app": app}, **metadata
+        ),
+        "spec": {"containers": [{"name": app, "ports": [{"containerPort": 6789}]}]},
+        "status": {
+            "phase": phase,
+            "conditions": [{"type": "Ready", "status": "True"}],
+            "containerStatuses": [
+                {
+                    "name": app,
+                    "ready": "running" in container_state,
+                    "state": container_state,
+                }
+            ],
+        },
+    }
+
+
+def ceph_resource(kind, name):
+    return {
+        "apiVersion": "ceph.rook.io/v1",
+        "kind": kind,
+        "metadata": {"name": name, "namespace": NAMESPACE},
+        "status": {"ceph": {"health": "HEALTH_OK"}},
+    }
+
+
+@pytest.mark.parametrize(
+    "pod_data, expected",
+    [
+        (pod("a", "foo"), "Running"),
+        (pod("a", "foo", phase="Pending"), "Pending"),
+        (
+            pod(
+                "a", "foo", container_state={"waiting": {"reason": "CrashLoopBackOff"}}
+            ),
+            "CrashLoopBackOff",
+        ),
+        (
+            pod(
+                "a",
+                "foo",
+                phase="Succeeded",
+                container_state={"terminated": {"reason": "Completed", "exitCode": 0}},
+            ),
+            "Completed",
+        ),
+        (pod("a", "foo", deletionTimestamp="2024-01-01T00:00:00Z"), "Terminating"),
+    ],
+)
+def test_pod_status_from_data(pod_data, expected):
+    assert get_pod_status_from_data(pod_data) == expected
+
+
+def test_pod_status_init_containers():
+    pod_data = pod("a", "foo", phase="Pending")
+    pod_data["spec"]["initContainers"] = [{"name": "init-0"}, {"name": "init-1"}]
+    pod_data["status"]["initContainerStatuses"] = [
+        {"state": {"terminated": {"exitCode": 0, "reason": "Completed"}}},
+        {"state": {"running": {}}},
+    ]
+    assert get_pod_status_from_data(pod_data) == "Init:1/2"
+    pod_data["status"]["initContainerStatuses"][1]["state"] = {
+        "waiting": {"reason": "ImagePullBackOff"}
+    }
+    assert get_pod_status_from_data(pod_data) == "Init:ImagePullBackOff"
+
+
+@pytest.fixture
+def fake_api_options():
+    objects = [
+        ceph_resource("CephCluster", "ocs-storagecluster-cephcluster"),
+        ceph_resource("CephBlockPool", "ocs-storagecluster-pool"),
+        ceph_resource("CephFilesystem", "ocs-storagecluster-fs"),
+    ]
+    objects += [pod(f"rook-ceph-mon-{name}", "rook-ceph-mon") for name in "abc"]
+    objects += [
+        pod("rook-ceph-mon-d", "rook-ceph-mon", phase="Pending"),
+        pod("rook-ceph-mgr-a", "rook-ceph-mgr"),
+        pod("rook-ceph-mds-a", "rook-ceph-mds"),
+        pod("rook-ceph-rgw-a", "rook-ceph-rgw"),
+        pod("noobaa-core-0", "noobaa"),
+        pod("rook-ceph-tools-old", "rook-ceph-tools", phase="Failed"),
+        pod("rook-ceph-tools-new", "rook-ceph-tools"),
+    ]
+    return {
+        "resources": RESOURCES,
+        "objects": objects,
+        # cluster wide proxy is looked up by the first Pod object otherwise
+        "env_data": {"cluster_namespace": NAMESPACE, "http_proxy": "", "no_proxy": ""},
+        "no_oc": True,
+    }
+
+
+@pytest.mark.parametrize("osds", [3, 30])
+def test_scan_cluster_constant_calls(fake_api, osds):
+    for i in range(osds):
+        fake_api.add_object(pod(f"rook-ceph-osd-{i}", "rook-ceph-osd"))
+    requests_before = len(fake_api.requests)
+    ceph_cluster = CephCluster()
+    requests = len(fake_api.requests) - requests_before
+    log.info(f"CephCluster with {osds} osds: {requests} API requests")
+
+    assert [mon.name for mon in ceph_cluster.mons] == [
+        "rook-ceph-mon-a",
+        "rook-ceph-mon-b",
+        "rook-ceph-mon-c",
+    ]
+    assert all(mon.port == 6789 for mon in ceph_cluster.mons)
+    assert ceph_cluster.mon_count == 3
+    assert ceph_cluster.osd_count == osds
+    assert (ceph_cluster.mgr_count, ceph_cluster.mds_count) == (1, 1)
+    assert (ceph_cluster.rgw_count, ceph_cluster.noobaa_count) == (1, 1)
+    assert ceph_cluster.toolbox.name == "rook-ceph-tools-new"
+    assert fake_api.count_requests("GET", f"/api/v1/namespaces/{NAMESPACE}/pods") == 1
+    # 4 discovery, 3 ceph resources, pods snapshot, reload of 2 ceph resources
+    assert requests == 10
+
+    requests_before = len(fake_api.requests)
+    fake_api.add_object(pod(f"rook-ceph-osd-{osds}", "rook-ceph-osd"))
+    ceph_cluster.refresh_pods("osds")
+    assert ceph_cluster.osd_count == osds + 1
+    assert ceph_cluster.mon_count == 3
+    assert len(fake_api.requests) - requests_before == 1
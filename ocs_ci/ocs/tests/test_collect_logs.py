@@ -0,0 +1,234 @@
+# -*- coding: utf8 -*-
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import utils
+from ocs_ci.utility import gather_plan
+from ocs_ci.utility.gather_plan import GatherPlan
+
+
+MG_DELAY = 1
+# fake oc: 'adm must-gather' logs its start and end and takes MG_DELAY seconds
+FAKE_OC = """#!/bin/sh
+for arg in "$@"; do
+    case "$arg" in
+        --dest-dir=*) dest="${arg#--dest-dir=}";;
+    esac
+done
+name=$(basename "$dest")
+echo "start $name $(date +%s.%N)" >> "$OC_LOG"
+sleep "$MG_DELAY"
+echo "end $name $(date +%s.%N)" >> "$OC_LOG"
+"""
+
+
+class Recorder(object):
+    """
+    Records the start and the end of the gatherers
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = dict()
+        self.running = 0
+        self.max_running = 0
+
+    def add(self, event, name, timestamp=None):
+        with self.lock:
+            self.events[(event, name)] = timestamp or time.time()
+            self.running += 1 if event == "start" else -1
+            self.max_running = max(self.max_running, self.running)
+
+    def gatherer(self, name, delay, error=None):
+        def gather(*args, **kwargs):
+            self.add("start", name)
+            time.sleep(delay)
+            self.add("end", name)
+            if error:
+                raise error
+
+        return gather
+
+    def start(self, name):
+        return self.events[("start", name)]
+
+    def end(self, name):
+        return self.events[("end", name)]
+
+
+def test_plan_dependencies():
+    recorder = Recorder()
+    plan = GatherPlan(concurrency=10, poll_interval=0.05)
+    plan.add("toolbox", recorder.gatherer("toolbox", 0.3))
+    plan.add("mg", recorder.gatherer("mg", 0.5))
+    plan.add("ceph", recorder.gatherer("ceph", 0.1), depends=["toolbox", "mg"])
+    plan.add("broken", recorder.gatherer("broken", 0.1, ValueError("broken")))
+    plan.add("dependent", recorder.gatherer("dependent", 0), depends=["broken"])
+    plan.add("transitive", recorder.gatherer("transitive", 0), depends=["dependent"])
+    manifest = plan.run()
+
+    assert recorder.start("ceph") >= recorder.end("mg")
+    assert recorder.start("ceph") >= recorder.end("toolbox")
+    assert recorder.start("mg") < recorder.end("toolbox")
+    assert recorder.max_running >= 2
+    assert {name: entry["status"] for name, entry in manifest.items()} == {
+        "toolbox": "succeeded",
+        "mg": "succeeded",
+        "ceph": "succeeded",
+        "broken": "failed",
+        "dependent": "skipped",
+        "transitive": "skipped",
+    }
+    assert manifest["broken"]["error"] == "broken"
+    assert manifest["dependent"]["duration"] is None
+    assert manifest["mg"]["duration"] == pytest.approx(0.5, abs=0.2)
+    with pytest.raises(ValueError, match="broken"):
+        plan.raise_first_failure()
+
+
+def test_plan_invalid_gatherers():
+    plan = GatherPlan()
+    plan.add("a", time.sleep)
+    with pytest.raises(ValueError):
+        plan.add("a", time.sleep)
+    with pytest.raises(ValueError):
+        plan.add("b", time.sleep, depends=["c"])
+
+
+def test_plan_timeout():
+    recorder = Recorder()
+    plan = GatherPlan(concurrency=10, poll_interval=0.05)
+    plan.add("stuck", recorder.gatherer("stuck", 2), timeout=0.3)
+    plan.add("dependent", recorder.gatherer("dependent", 0), depends=["stuck"])
+    plan.add("quick", recorder.gatherer("quick", 0.1))
+    manifest = plan.run()
+    # the plan doesn't wait for the stuck gatherer
+    assert ("end", "stuck") not in recorder.events
+    assert manifest["stuck"]["status"] == "timed_out"
+    assert manifest["dependent"]["status"] == "skipped"
+    assert manifest["quick"]["status"] == "succeeded"
+
+
+def test_plan_concurrency_shared():
+    recorder = Recorder()
+    plans = [GatherPlan(concurrency=3, poll_interval=0.05) for _ in range(2)]
+    for i, plan in enumerate(plans):
+        for j in range(4):
+            plan.add(f"g{j}", recorder.gatherer(f"{i}-{j}", 0.2))
+    threads = [threading.Thread(target=plan.run) for plan in plans]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert recorder.max_running == 3
+    assert all(
+        entry["status"] == "succeeded"
+        for plan in plans
+        for entry in plan.manifest.values()
+    )
+
+
+@pytest.fixture
+def fake_must_gather(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    oc = bin_dir / "oc"
+    oc.write_text(FAKE_OC)
+    oc.chmod(0o755)
+    oc_log = tmp_path / "oc.log"
+    oc_log.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("OC_LOG", str(oc_log))
+    monkeypatch.setenv("MG_DELAY", str(MG_DELAY))
+    monkeypatch.setattr("ocs_ci.utility.utils._oc_plugin_list_cache", [])
+    monkeypatch.setitem(config.RUN, "kubeconfig", str(tmp_path / "kubeconfig"))
+    monkeypatch.setitem(config.RUN, "log_dir", str(tmp_path / "logs"))
+    monkeypatch.setitem(config.RUN, "run_id", 1)
+    monkeypatch.setitem(config.ENV_DATA, "cluster_name", "cluster-0")
+    monkeypatch.setitem(config.ENV_DATA, "cluster_path", str(tmp_path))
+    monkeypatch.setitem(config.REPORTING, "ocp_must_gather_image", "ocp-mg")
+    monkeypatch.setitem(config.REPORTING, "tarball_mg_logs", False)
+    monkeypatch.setitem(config.REPORTING, "log_collection_concurrency", 4)
+    monkeypatch.setitem(config.DEPLOYMENT, "external_mode", True)
+    monkeypatch.setitem(config.DEPLOYMENT, "disconnected", False)
+    monkeypatch.setitem(config.MULTICLUSTER, "multicluster_mode", None)
+    monkeypatch.setitem(config.RUN, "is_ocp_deployment_failed", False)
+
+    def events():
+        recorded = dict()
+        for line in oc_log.read_text().splitlines():
+            event, name, timestamp = line.split()
+            recorded[(event, name)] = float(timestamp)
+        return recorded
+
+    return events
+
+
+def test_collect_ocs_logs_parallel(fake_must_gather, monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(utils, "setup_ceph_toolbox", recorder.gatherer("toolbox", 0.5))
+    monkeypatch.setattr(
+        utils, "collect_ceph_external", recorder.gatherer("external_ceph", 0.2)
+    )
+    utils.mg_collected_types.clear()
+
+    utils._collect_ocs_logs(config, "test", ocp=True, ocs=True, status_failure=False)
+    recorder.events.update(fake_must_gather())
+
+    must_gathers = [
+        "ocs_must_gather",
+        "ocp_must_gather",
+        "ocp_service_logs_must_gather",
+    ]
+    # the must-gathers and the toolbox setup run concurrently, ceph commands
+    # wait for both the toolbox and the OCS must-gather
+    assert max(recorder.start(name) for name in must_gathers) < min(
+        recorder.end(name) for name in must_gathers
+    )
+    assert recorder.start("external_ceph") >= recorder.end("toolbox")
+    assert recorder.start("external_ceph") >= recorder.end("ocs_must_gather")
+    assert utils.mg_collected_types == {"ocs", "ocp"}
+
+    log_dir = os.path.join(config.RUN["log_dir"], "test_1", "cluster-0")
+    with open(os.path.join(log_dir, gather_plan.MANIFEST_FILE)) as manifest_file:
+        manifest = json.load(manifest_file)
+    assert set(manifest) == {
+        "ocs_must_gather",
+        "ceph_toolbox",
+        "external_ceph",
+        "ocp_must_gather",
+        "ocp_service_logs",
+    }
+    assert all(entry["status"] == "succeeded" for entry in manifest.values())
+    assert manifest["external_ceph"]["depends"] == ["ceph_toolbox", "ocs_must_gather"]
+    assert manifest["ocs_must_gather"]["duration"] >= MG_DELAY
+
+
+def test_collect_ocs_logs_skips_dependents(fake_must_gather, monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(
+        utils,
+        "setup_ceph_toolbox",
+        recorder.gatherer("toolbox", 0, RuntimeError("no toolbox")),
+    )
+    monkeypatch.setattr(
+        utils, "collect_ceph_external", recorder.gatherer("external_ceph", 0)
+    )
+    monkeypatch.setenv("MG_DELAY", "0")
+    with pytest.raises(RuntimeError, match="no toolbox"):
+        utils._collect_ocs_logs(
+            config, "test", ocp=False, ocs=True, status_failure=False
+        )
+    assert ("start", "external_ceph") not in recorder.events
+    log_dir = os.path.join(config.RUN["log_dir"], "test_1", "cluster-0")
+    with open(os.path.join(log_dir, gather_plan.MANIFEST_FILE)) as manifest_file:
+        manifest = json.load(manifest_file)
+    assert manifest["ocs_must_gather"]["status"] == "succeeded"
+    assert manifest["ceph_toolbox"]["status"] == "failed"
+    assert manifest["external_ceph"]["status"] == "skipped"
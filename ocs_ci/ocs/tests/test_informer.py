@@ -0,0 +1,184 @@
+# -*- coding: utf8 -*-
+
+import time
+
+import pytest
+
+from ocs_ci.ocs import informer, kube_api
+
+
+NAMESPACE = "openshift-storage"
+
+
+def pod(name, app, phase="Running"):
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {"name": name, "namespace": NAMESPACE, "labels": {"app": app}},
+        "status": {"phase": phase},
+    }
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def fake_api_options():
+    return {"objects": [pod("pod-0", "foo"), pod("pod-1", "bar")]}
+
+
+@pytest.fixture
+def client(fake_api, tmp_path):
+    client = kube_api.KubeAPIClient(str(tmp_path / "kubeconfig"))
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def pod_informer(client):
+    inf = informer.Informer(client, "pod", NAMESPACE, watch_timeout=5).start()
+    assert inf.wait_for_sync(10)
+    yield inf
+    inf.stop()
+
+
+@pytest.mark.parametrize(
+    "selector, expected",
+    [
+        (None, []),
+        ("app=foo", [("app", "=", "foo")]),
+        ("app==foo,tier!=db", [("app", "=", "foo"), ("tier", "!=", "db")]),
+        ("env,!debug", [("env", "exists", None), ("debug", "!exists", None)]),
+        ("env in (a,b)", None),
+    ],
+)
+def test_parse_selector(selector, expected):
+    assert informer.parse_selector(selector) == expected
+
+
+def test_initial_sync(pod_informer):
+    assert pod_informer.get("pod-0")["metadata"]["labels"] == {"app": "foo"}
+    assert pod_informer.get("pod-0")["kind"] == "Pod"
+    assert [p["metadata"]["name"] for p in pod_informer.list("app=bar")] == ["pod-1"]
+    assert pod_informer.get("missing") is None
+
+
+def test_watch_events(fake_api, pod_informer):
+    fake_api.add_object(pod("pod-2", "foo"))
+    assert wait_until(lambda: pod_informer.get("pod-2") is not None)
+    assert [p["metadata"]["name"] for p in pod_informer.list("app=foo")] == [
+        "pod-0",
+        "pod-2",
+    ]
+
+    fake_api.add_object(pod("pod-2", "bar", phase="Pending"))
+    assert wait_until(lambda: pod_informer.get("pod-2")["status"]["phase"] == "Pending")
+    # label index is updated on modification
+    assert [p["metadata"]["name"] for p in pod_informer.list("app=foo")] == ["pod-0"]
+
+    fake_api.delete_object("v1", "Pod", "pod-0", NAMESPACE)
+    assert wait_until(lambda: pod_informer.get("pod-0") is None)
+    assert pod_informer.list("app=foo") == []
+    # everything was delivered through one list and watch stream
+    assert pod_informer.stats["lists"] == 1
+
+
+def test_returned_objects_are_copies(pod_informer):
+    pod_informer.get("pod-0")["metadata"]["labels"]["app"] = "changed"
+    pod_informer.list()[0]["status"]["phase"] = "Failed"
+    assert pod_informer.get("pod-0")["metadata"]["labels"]["app"] == "foo"
+    assert pod_informer.get("pod-0")["status"]["phase"] == "Running"
+
+
+def test_resource_version_gap_relists(fake_api, pod_informer):
+    # change objects without delivering events and compact the event history,
+    # the watch gets 410 Gone and the informer has to relist
+    with fake_api.lock:
+        fake_api.objects.pop(("pods", NAMESPACE, "pod-0"))
+        fake_api.objects[("pods", NAMESPACE, "pod-5")] = pod("pod-5", "foo")
+        fake_api.objects[("pods", NAMESPACE, "pod-5")]["metadata"][
+            "resourceVersion"
+        ] = "100"
+    fake_api.compact(skip=100)
+    fake_api.expire_watches()
+    assert wait_until(lambda: pod_informer.stats["lists"] == 2)
+    assert wait_until(lambda: pod_informer.synced)
+    assert pod_informer.stats["expired"] == 1
+    assert pod_informer.get("pod-0") is None
+    assert pod_informer.get("pod-5") is not None
+    # and the watch continues from the new list
+    fake_api.add_object(pod("pod-6", "foo"))
+    assert wait_until(lambda: pod_informer.get("pod-6") is not None)
+
+
+def test_unexpected_error_relists(fake_api, client, monkeypatch):
+    watch = client.watch
+    calls = []
+
+    def broken_watch(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            # e.g. malformed event or connection error while streaming
+            raise KeyError("object")
+        return watch(*args, **kwargs)
+
+    monkeypatch.setattr(client, "watch", broken_watch)
+    inf = informer.Informer(client, "pod", NAMESPACE, watch_timeout=5, retry_delay=0.1)
+    inf.start()
+    try:
+        assert wait_until(lambda: inf.stats["lists"] == 2)
+        assert wait_until(lambda: inf.synced)
+        assert inf.stats["errors"] == 1
+        assert inf._thread.is_alive()
+        fake_api.add_object(pod("pod-7", "foo"))
+        assert wait_until(lambda: inf.get("pod-7") is not None)
+    finally:
+        inf.stop()
+
+
+def test_not_synced_without_thread(client):
+    inf = informer.Informer(client, "pod", NAMESPACE)
+    inf._list()
+    assert inf._synced.is_set()
+    assert not inf.synced
+
+
+def test_ocp_get_served_from_informer(fake_api, tmp_path, monkeypatch):
+    from ocs_ci.framework import config
+    from ocs_ci.ocs.ocp import OCP
+
+    monkeypatch.setitem(config.ENV_DATA, "cluster_path", str(tmp_path))
+    monkeypatch.setitem(config.RUN, "kubeconfig_location", "kubeconfig")
+    monkeypatch.setitem(config.RUN, "oc_backend", kube_api.KUBE_API_BACKEND)
+    monkeypatch.setitem(config.RUN, "informer_kinds", ["Pod"])
+    try:
+        pollers = [OCP(kind="pod", namespace=NAMESPACE) for _ in range(5)]
+        for _ in range(10):
+            for ocp_obj in pollers:
+                pods = ocp_obj.get(selector="app=foo")
+                assert [p["metadata"]["name"] for p in pods["items"]] == ["pod-0"]
+                assert ocp_obj.get("pod-1")["metadata"]["name"] == "pod-1"
+        # 50 pollers were answered by single list of pods
+        assert fake_api.count_requests("GET", f"/api/v1/namespaces/{NAMESPACE}") == 2
+        assert (
+            len(
+                [
+                    r
+                    for r in fake_api.requests
+                    if r[1] == f"/api/v1/namespaces/{NAMESPACE}/pods"
+                    and "watch" not in r[2]
+                ]
+            )
+            == 1
+        )
+        # objects missing in cache are fetched from the API
+        assert ocp_obj.get("missing", dont_raise=True, silent=True) is None
+    finally:
+        informer.stop_informers()
+        kube_api.close_clients()
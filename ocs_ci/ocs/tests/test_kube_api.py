@@ -0,0 +1,235 @@
+# -*- coding: utf8 -*-
+
+import os
+import subprocess
+import threading
+
+import pytest
+
+from ocs_ci.ocs import kube_api
+from ocs_ci.ocs.exceptions import CommandFailed, KubeAPIUnsupportedOperation
+
+
+@pytest.fixture
+def fake_api_options():
+    """
+    Fake API server with a few pods
+    """
+    objects = [
+        {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "name": f"pod-{i}",
+                "namespace": "openshift-storage",
+                "labels": {"app": app},
+            },
+            "status": {"phase": "Running"},
+        }
+        for i, app in enumerate(["foo", "foo", "bar"])
+    ]
+    return {"objects": objects}
+
+
+@pytest.fixture
+def client(fake_api, tmp_path):
+    client = kube_api.KubeAPIClient(str(tmp_path / "kubeconfig"))
+    yield client
+    client.close()
+
+
+def test_parse_get_command():
+    req = kube_api.parse_oc_command(
+        "get pod -n openshift-storage --selector=app=foo -o yaml"
+    )
+    assert req.verb == "get"
+    assert req.kind == "pod"
+    assert req.name == ""
+    assert req.namespace == "openshift-storage"
+    assert req.selector == "app=foo"
+    assert req.output == "yaml"
+
+
+def test_parse_kind_slash_name():
+    req = kube_api.parse_oc_command("delete pvc/my-pvc --wait=false")
+    assert (req.kind, req.name, req.wait) == ("pvc", "my-pvc", False)
+
+
+def test_parse_patch_command():
+    req = kube_api.parse_oc_command(
+        "patch storagecluster ocs -n openshift-storage "
+        '-p \'{"spec": {"foo": "bar"}}\' --type merge'
+    )
+    assert req.patch == {"spec": {"foo": "bar"}}
+    assert req.patch_type == "merge"
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "get pods",
+        "get pods -o wide",
+        "get pods -o jsonpath={.items}",
+        "get pods,pvc -o yaml",
+        "get pods --show-labels -o yaml",
+        "describe pod foo",
+        "apply -f foo.yaml",
+        "delete -f foo.yaml",
+        "exec foo -- ls",
+    ],
+)
+def test_parse_unsupported_command(command):
+    with pytest.raises(KubeAPIUnsupportedOperation):
+        kube_api.parse_oc_command(command)
+
+
+def test_get_list(client):
+    pods = client.get("pods", namespace="openshift-storage", selector="app=foo")
+    assert pods["kind"] == "List"
+    assert [pod["metadata"]["name"] for pod in pods["items"]] == ["pod-0", "pod-1"]
+    # oc fills kind and apiVersion of each item
+    assert all(pod["kind"] == "Pod" for pod in pods["items"])
+    assert all(pod["apiVersion"] == "v1" for pod in pods["items"])
+
+
+def test_get_by_short_name(client):
+    pod = client.get("po", name="pod-2", namespace="openshift-storage")
+    assert pod["metadata"]["labels"] == {"app": "bar"}
+
+
+def test_get_not_found(client):
+    with pytest.raises(CommandFailed) as excinfo:
+        client.get("Pod", name="missing", namespace="openshift-storage")
+    assert 'Error from server (NotFound): pods "missing" not found' in str(
+        excinfo.value
+    )
+
+
+def test_unknown_kind(client):
+    with pytest.raises(KubeAPIUnsupportedOperation):
+        client.get("unknownthing")
+
+
+def test_group_resource(fake_api, client):
+    fake_api.add_object(
+        {
+            "apiVersion": "ceph.rook.io/v1",
+            "kind": "CephBlockPool",
+            "metadata": {"name": "pool", "namespace": "openshift-storage"},
+        }
+    )
+    pools = client.get("cephblockpool", namespace="openshift-storage")
+    assert pools["items"][0]["apiVersion"] == "ceph.rook.io/v1"
+    assert pools["items"][0]["kind"] == "CephBlockPool"
+
+
+def test_execute_create_patch_delete(client, tmp_path):
+    pvc_yaml = tmp_path / "pvc.yaml"
+    pvc_yaml.write_text(
+        "apiVersion: v1\n"
+        "kind: PersistentVolumeClaim\n"
+        "metadata:\n"
+        "  name: my-pvc\n"
+        "  namespace: openshift-storage\n"
+    )
+    out = client.execute(kube_api.parse_oc_command(f"create -f {pvc_yaml}"))
+    assert out == "persistentvolumeclaim/my-pvc created"
+    out = client.execute(
+        kube_api.parse_oc_command(
+            'patch pvc my-pvc -n openshift-storage -p \'{"metadata": {"labels": '
+            '{"a": "b"}}}\' --type merge'
+        )
+    )
+    assert out == "persistentvolumeclaim/my-pvc patched"
+    pvc = client.get("pvc", name="my-pvc", namespace="openshift-storage")
+    assert pvc["metadata"]["labels"] == {"a": "b"}
+    out = client.execute(
+        kube_api.parse_oc_command("delete pvc my-pvc -n openshift-storage")
+    )
+    assert out == 'persistentvolumeclaim "my-pvc" deleted'
+
+
+def test_connection_reuse(fake_api, client):
+    for _ in range(10):
+        client.get("pods", namespace="openshift-storage")
+    # discovery of the core group is done only once
+    assert fake_api.count_requests("GET", "/api/v1/namespaces") == 10
+    assert fake_api.count_requests("GET", "/api/v1") == 11
+
+
+def test_get_client_is_shared(fake_api, tmp_path):
+    kubeconfig = str(tmp_path / "kubeconfig")
+    try:
+        assert kube_api.get_client(kubeconfig) is kube_api.get_client(kubeconfig)
+    finally:
+        kube_api.close_clients()
+
+
+def test_ocp_get_uses_kube_api_backend(fake_api, tmp_path, monkeypatch):
+    from ocs_ci.framework import config
+    from ocs_ci.ocs.ocp import OCP
+
+    monkeypatch.setitem(config.ENV_DATA, "cluster_path", str(tmp_path))
+    monkeypatch.setitem(config.RUN, "kubeconfig_location", "kubeconfig")
+    monkeypatch.setitem(config.RUN, "oc_backend", kube_api.KUBE_API_BACKEND)
+    try:
+        ocp_obj = OCP(kind="Pod", namespace="openshift-storage")
+        pods = ocp_obj.get(selector="app=bar")
+        assert [pod["metadata"]["name"] for pod in pods["items"]] == ["pod-2"]
+        assert ocp_obj.get(resource_name="missing", dont_raise=True) is None
+    finally:
+        kube_api.close_clients()
+
+
+def test_get_client_keeps_replaced_client_open(fake_api, tmp_path, monkeypatch):
+    kubeconfig = str(tmp_path / "kubeconfig")
+    old = kube_api.get_client(kubeconfig)
+    closed = []
+    monkeypatch.setattr(old, "close", lambda: closed.append(old))
+    stat = os.stat(kubeconfig)
+    os.utime(kubeconfig, (stat.st_atime, stat.st_mtime + 10))
+    new = kube_api.get_client(kubeconfig)
+    assert new is not old
+    # another thread may still be using the replaced client
+    assert closed == []
+    assert old.get("pods", namespace="openshift-storage")["items"]
+    kube_api.close_clients()
+    assert closed == [old]
+
+
+def test_request_count_concurrent(client):
+    threads = [
+        threading.Thread(
+            target=lambda: [
+                client.get("pods", namespace="openshift-storage") for _ in range(20)
+            ]
+        )
+        for _ in range(4)
+    ]
+    # discovery request is sent by the first call
+    client.get("pods", namespace="openshift-storage")
+    start_count = client.request_count
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert client.request_count - start_count == 80
+
+
+def test_output_file_executed_by_oc(fake_api, monkeypatch):
+    from ocs_ci.ocs.ocp import OCP
+
+    commands = []
+
+    def exec_cmd(cmd, **kwargs):
+        commands.append((cmd, kwargs["output_file"]))
+        return subprocess.CompletedProcess(cmd, 0, b"", b"")
+
+    monkeypatch.setattr("ocs_ci.ocs.ocp.exec_cmd", exec_cmd)
+    ocp_obj = OCP(kind="Pod", namespace="openshift-storage")
+    ocp_obj.exec_oc_cmd(
+        "get pod", out_yaml_format=False, silent=True, output_file="/tmp/out"
+    )
+    assert len(commands) == 1
+    assert commands[0][0].endswith("get pod")
+    assert commands[0][1] == "/tmp/out"
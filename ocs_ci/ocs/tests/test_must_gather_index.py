@@ -0,0 +1,216 @@
+# -*- coding: utf8 -*-
+
+import os
+import tarfile
+from types import SimpleNamespace
+
+import pytest
+
+from ocs_ci.ocs.must_gather import must_gather
+from ocs_ci.ocs.must_gather.must_gather import MustGather
+from ocs_ci.ocs.must_gather.path_index import (
+    PathIndex,
+    build_path_index,
+    tarball_members,
+)
+
+
+MG_DIR = "must-gather.local.1/quay-io-odf-must-gather-sha256-abc"
+PODS = ["rook-ceph-osd-0-abc", "rook-ceph-mon-a-def", "compute-0-debug"]
+
+
+def legacy_paths(names):
+    """
+    Path list of MustGather._get_paths_from_tarball before the path index
+    """
+    paths = []
+    for name in names:
+        paths.append(name)
+        parts = name.replace("\\", "/").split("/")
+        for i in range(1, len(parts)):
+            parent = "/".join(parts[:i])
+            if parent and parent not in paths:
+                paths.append(parent)
+    return paths
+
+
+def legacy_paths_from_tarball(tarball_path):
+    with tarfile.open(tarball_path, "r:*") as tar:
+        return legacy_paths(member.name for member in tar.getmembers())
+
+
+def legacy_all_paths(root):
+    """
+    MustGather.get_all_paths before the path index
+    """
+    full_paths = []
+    for root_dir, dirs, files in os.walk(root):
+        for name in files + dirs:
+            full_paths.append(os.path.join(root_dir, name))
+        for name in files:
+            if name.endswith(".tar.gz"):
+                tarball_path = os.path.join(root_dir, name)
+                full_paths.extend(legacy_paths_from_tarball(tarball_path))
+    return full_paths
+
+
+def legacy_verify_paths_in_dir(full_paths, paths):
+    return [path for path in paths if not any(path in full for full in full_paths)]
+
+
+def tarball_names(entries):
+    """
+    Member names of synthetic must-gather tarball with the number of entries
+    """
+    names = []
+    pod = 0
+    while len(names) < entries:
+        pod_dir = (
+            f"{MG_DIR}/namespaces/openshift-storage-{pod // 200}/pods/rook-pod-{pod}"
+        )
+        for container in range(3):
+            names.append(f"{pod_dir}/c-{container}/c-{container}/logs/current.log")
+        pod += 1
+    return names[:entries]
+
+
+def write_tarball(path, names, dirs=()):
+    with tarfile.open(path, "w:gz", compresslevel=1) as tar:
+        for name in dirs:
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.DIRTYPE
+            tar.addfile(info)
+        for name in names:
+            tar.addfile(tarfile.TarInfo(name))
+
+
+@pytest.fixture
+def mg_root(tmp_path):
+    """
+    Must-gather directory with the pod logs in the tree and packed
+    must-gather of another cluster
+    """
+    root = tmp_path / "test_ocs_logs"
+    pods_dir = root / "cluster-0" / "ocs_must_gather" / "ns" / "openshift-storage"
+    for pod in PODS:
+        (pods_dir / "pods" / pod).mkdir(parents=True)
+        (pods_dir / "pods" / pod / f"{pod}.log").write_text("log")
+    ceph_dir = root / "cluster-0" / "ocs_must_gather" / "ceph"
+    (ceph_dir / "ceph_logs" / "journal_compute-1").mkdir(parents=True)
+    (ceph_dir / "ceph_logs" / "journal_compute-1" / "log.log").write_text("x")
+    (ceph_dir / "ceph_status").write_text("kind: status")
+    (ceph_dir / "empty").write_text("")
+    (root / "cluster-1").mkdir()
+    write_tarball(
+        str(root / "cluster-1" / "ocs_must_gather.tar.gz"),
+        [
+            f"{MG_DIR}/namespaces/openshift-storage/pods/noobaa-core-0/core.log",
+            f"{MG_DIR}/namespaces/openshift-storage/pods/noobaa-db-0/db.log",
+            f"{MG_DIR}/ceph/ceph_status",
+            f"{MG_DIR}/noobaa/noobaa_diagnostics_1.tar.gz",
+        ],
+        dirs=[MG_DIR],
+    )
+    return str(root)
+
+
+@pytest.fixture
+def mustgather(mg_root, monkeypatch):
+    monkeypatch.setattr(
+        must_gather.version, "get_semantic_ocs_version_from_config", lambda: None
+    )
+    mg = MustGather()
+    mg.root = mg_root
+    mg.log_type = "OTHERS"
+    return mg
+
+
+def test_index_matches_legacy_paths(mustgather, mg_root):
+    mustgather.get_all_paths()
+    assert mustgather.full_paths == legacy_all_paths(mg_root)
+    index = mustgather.path_index
+
+    # basename lookup of search_file_path
+    legacy_basenames = {}
+    for path in mustgather.full_paths:
+        name = os.path.basename(path)
+        if name not in legacy_basenames or os.path.isfile(path):
+            legacy_basenames[name] = path
+    for name, path in legacy_basenames.items():
+        assert MustGather._find_file_path(index, name) == path
+    assert MustGather._find_file_path(index, "missing") is None
+
+    queries = ["/ceph_logs/journal_", "noobaa-core", "pods/rook", "/missing/", "\n"]
+    assert mustgather.verify_paths_in_dir(queries) == legacy_verify_paths_in_dir(
+        mustgather.full_paths, queries
+    )
+    assert mustgather.verify_paths_not_in_dir(queries) == [
+        "/ceph_logs/journal_",
+        "noobaa-core",
+        "pods/rook",
+    ]
+
+
+def test_index_lookups(mg_root):
+    index = build_path_index(mg_root)
+    status = os.path.join(mg_root, "cluster-0/ocs_must_gather/ceph/ceph_status")
+    assert index.find_basename("ceph_status") == [status, f"{MG_DIR}/ceph/ceph_status"]
+    assert index.is_file(status)
+    assert not index.is_file(f"{MG_DIR}/ceph/ceph_status")
+    assert index.is_dir(f"{MG_DIR}/ceph")
+    assert f"{MG_DIR}/namespaces" in index
+    assert index.glob("noobaa_diagnostics_*.tar.gz") == [
+        f"{MG_DIR}/noobaa/noobaa_diagnostics_1.tar.gz"
+    ]
+    assert index.glob("*/pods/*/db.log") == [
+        f"{MG_DIR}/namespaces/openshift-storage/pods/noobaa-db-0/db.log"
+    ]
+    assert index.glob("*.log") == index.find_suffix(".log")
+    assert len(index.find_suffix(".log")) == len(PODS) + 3
+    assert index.children(f"{MG_DIR}/namespaces/openshift-storage/pods") == [
+        f"{MG_DIR}/namespaces/openshift-storage/pods/noobaa-core-0",
+        f"{MG_DIR}/namespaces/openshift-storage/pods/noobaa-db-0",
+    ]
+    assert set(index.files()) == {
+        path for path in legacy_all_paths(mg_root) if os.path.isfile(path)
+    }
+
+
+def test_validations_use_index(mustgather, mg_root, monkeypatch):
+    monkeypatch.setattr(
+        must_gather,
+        "get_all_pods",
+        lambda namespace: [SimpleNamespace(name=pod) for pod in PODS],
+    )
+    walks = []
+    walk = os.walk
+
+    def counted_walk(*args, **kwargs):
+        walks.append(args)
+        return walk(*args, **kwargs)
+
+    monkeypatch.setattr(os, "walk", counted_walk)
+    mustgather.compare_running_pods()
+    mustgather.validate_file_size()
+    mustgather.verify_paths_in_dir(["/ceph_logs/journal_"])
+    assert mustgather.empty_files == ["empty"]
+    # the index walks the tree once for all the validations
+    assert len(walks) == 1
+
+
+def test_index_matches_legacy_tarball(tmp_path):
+    """
+    Check the path index of the members of synthetic must-gather tarball
+    against the legacy path list, both with path queries
+    """
+    tarball_path = str(tmp_path / "mg.tar.gz")
+    write_tarball(tarball_path, tarball_names(1000))
+    members = tarball_members(tarball_path)
+    legacy = legacy_paths(name for name, _ in members)
+    index = PathIndex()
+    index.add_members(members)
+    assert index.paths == legacy
+    queries = [f"rook-pod-{i}/c-1" for i in range(0, 300, 20)] + ["rook-pod-999/"]
+    missing = [query for query in queries if not index.contains_substring(query)]
+    assert missing == legacy_verify_paths_in_dir(legacy, queries)
+    assert missing == ["rook-pod-999/"]
@@ -0,0 +1,139 @@
+# -*- coding: utf8 -*-
+
+import logging
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants, node
+from ocs_ci.ocs.ocp import OCP
+
+
+log = logging.getLogger(__name__)
+
+NODES_PATH = "/api/v1/nodes"
+
+# 'oc get node' output recorded for the nodes returned by node_data()
+RECORDED_OC_GET_NODES = """\
+NAME        STATUS                     ROLES                  AGE   VERSION
+master-0    Ready                      control-plane,master   10d   v1.29.5+29c5ead
+compute-0   Ready                      worker                 10d   v1.29.5+29c5ead
+compute-1   Ready,SchedulingDisabled   infra,worker           10d   v1.29.5+29c5ead
+compute-2   NotReady                   worker                 10d   v1.29.5+29c5ead
+edge-0      Unknown                    <none>                 10d   v1.29.5+29c5ead
+"""
+
+
+def node_data(name, roles=(), labels=None, ready="True", unschedulable=False):
+    labels = dict(labels or {})
+    labels.update({f"node-role.kubernetes.io/{role}": "" for role in roles})
+    data = {
+        "apiVersion": "v1",
+        "kind": "Node",
+        "metadata": {"name": name, "labels": labels},
+        "spec": {},
+        "status": {"conditions": []},
+    }
+    if ready is not None:
+        data["status"]["conditions"] = [
+            {"type": "MemoryPressure", "status": "False"},
+            {"type": "Ready", "status": ready},
+        ]
+    if unschedulable:
+        data["spec"]["unschedulable"] = True
+        data["spec"]["taints"] = [
+            {"key": "node.kubernetes.io/unschedulable", "effect": "NoSchedule"}
+        ]
+    return data
+
+
+RECORDED_NODES = [
+    node_data("master-0", roles=["control-plane", "master"]),
+    node_data("compute-0", roles=["worker"]),
+    node_data("compute-1", roles=["infra", "worker"], unschedulable=True),
+    node_data("compute-2", labels={"kubernetes.io/role": "worker"}, ready="False"),
+    node_data("edge-0", ready=None),
+]
+
+
+@pytest.mark.parametrize(
+    "node_dict", RECORDED_NODES, ids=lambda n: n["metadata"]["name"]
+)
+def test_node_columns_match_oc_output(node_dict, monkeypatch):
+    """
+    Roles and status derived from the node dict are the same as the values
+    parsed from the 'oc get node <name>' output by OCP.get_resource
+    """
+    header, *lines = RECORDED_OC_GET_NODES.splitlines()
+    line = next(
+        line for line in lines if line.split()[0] == node_dict["metadata"]["name"]
+    )
+    monkeypatch.setattr(OCP, "get", lambda *args, **kwargs: f"{header}\n{line}\n")
+    ocp_obj = OCP(kind="node")
+    name = node_dict["metadata"]["name"]
+    assert node.get_node_roles(node_dict) == ocp_obj.get_resource(name, "ROLES")
+    assert node.get_node_status_from_data(node_dict) == ocp_obj.get_resource(
+        name, "STATUS"
+    )
+
+
+def test_node_taints():
+    assert node.get_node_taints(RECORDED_NODES[0]) == []
+    assert [t["key"] for t in node.get_node_taints(RECORDED_NODES[2])] == [
+        "node.kubernetes.io/unschedulable"
+    ]
+
+
+@pytest.fixture
+def fake_api_options():
+    return {"env_data": {"platform": "vsphere"}, "no_oc": True}
+
+
+@pytest.fixture
+def fake_api(fake_api):
+    node.invalidate_node_index()
+    yield fake_api
+    node.invalidate_node_index()
+
+
+@pytest.mark.parametrize("workers", [3, 100])
+def test_get_nodes_single_list(fake_api, workers):
+    for data in RECORDED_NODES[:3]:
+        fake_api.add_object(data)
+    for i in range(workers):
+        fake_api.add_object(node_data(f"worker-{i:03}", roles=["worker"]))
+
+    worker_names = [n.name for n in node.get_nodes()]
+    assert worker_names == ["compute-0", "compute-1"] + [
+        f"worker-{i:03}" for i in range(workers)
+    ]
+    assert [n.name for n in node.get_nodes(constants.MASTER_MACHINE)] == ["master-0"]
+    assert node.get_master_nodes() == ["master-0"]
+    assert sorted(node.get_worker_nodes()) == sorted(worker_names)
+    assert [
+        n.name for n in node.get_nodes_in_statuses(["Ready,SchedulingDisabled"])
+    ] == ["compute-1"]
+    requests = fake_api.count_requests("GET", NODES_PATH)
+    log.info(f"{workers + 3} nodes: {requests} list requests by 5 node helpers")
+    # one list per helper, no call per node
+    assert requests == 5
+
+
+def test_node_index_ttl(fake_api, monkeypatch):
+    monkeypatch.setitem(config.RUN, "node_index_ttl", 60)
+    for data in RECORDED_NODES:
+        fake_api.add_object(data)
+    node.get_nodes()
+    node.get_master_nodes()
+    node.get_worker_nodes()
+    assert node.get_all_nodes() == sorted(n["metadata"]["name"] for n in RECORDED_NODES)
+    assert fake_api.count_requests("GET", NODES_PATH) == 1
+
+    # waiting for status always lists the current state
+    node.wait_for_nodes_status(["compute-0"], timeout=10)
+    assert fake_api.count_requests("GET", NODES_PATH) == 2
+
+    fake_api.add_object(node_data("compute-3", roles=["worker"]))
+    assert "compute-3" not in node.get_all_nodes()
+    node.invalidate_node_index()
+    assert "compute-3" in node.get_all_nodes()
@@ -0,0 +1,94 @@
+# -*- coding: utf8 -*-
+
+import json
+import os
+import stat
+import sys
+
+import pytest
+import yaml
+
+from ocs_ci.ocs import ocp
+
+FAKE_OC = """#!{python}
+import json, os, sys, yaml
+here = os.path.dirname(sys.argv[0])
+with open(os.path.join(here, "calls"), "a") as fd:
+    fd.write(" ".join(sys.argv[1:]) + "\\n")
+with open(os.path.join(here, "data.json")) as fd:
+    data = json.load(fd)
+if "json" in sys.argv:
+    sys.stdout.write(json.dumps(data, indent=4))
+else:
+    sys.stdout.write(yaml.safe_dump(data))
+"""
+
+POD_LIST = {
+    "apiVersion": "v1",
+    "kind": "List",
+    "items": [
+        {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "name": f"pod-{i}",
+                "namespace": "openshift-storage",
+                "creationTimestamp": "2024-01-01T00:00:00Z",
+                "labels": {"app": "foo", "version": "4.14"},
+            },
+            "spec": {"containers": [{"name": "c", "ports": [{"port": 80}]}]},
+            "status": {"phase": "Running", "ready": True, "restartCount": 0},
+        }
+        for i in range(3)
+    ],
+    "metadata": {"resourceVersion": ""},
+}
+
+
+@pytest.fixture
+def fake_oc(tmp_path, monkeypatch):
+    from ocs_ci.framework import config
+
+    oc = tmp_path / "oc"
+    oc.write_text(FAKE_OC.format(python=sys.executable))
+    oc.chmod(oc.stat().st_mode | stat.S_IEXEC)
+    (tmp_path / "data.json").write_text(json.dumps(POD_LIST))
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setitem(config.ENV_DATA, "cluster_path", str(tmp_path))
+    monkeypatch.setitem(config.RUN, "oc_singleflight", False)
+    return tmp_path / "calls"
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        ("get pods -n ns -o yaml", ("get pods -n ns -o json", True)),
+        ("get pod foo --output=yaml", ("get pod foo -o json", True)),
+        ("get pod foo -oyaml", ("get pod foo -o json", True)),
+        ("get pod foo -o jsonpath={.yaml}", ("get pod foo -o jsonpath={.yaml}", False)),
+        ("get pod yaml -o wide", ("get pod yaml -o wide", False)),
+        ("create -f pod.yaml -o yaml", ("create -f pod.yaml -o yaml", False)),
+    ],
+)
+def test_json_output_command(command, expected):
+    assert ocp.json_output_command(command) == expected
+
+
+def test_get_json_and_yaml_are_identical(fake_oc, monkeypatch):
+    from ocs_ci.framework import config
+
+    ocp_obj = ocp.OCP(kind="pod", namespace="openshift-storage")
+    from_json = ocp_obj.get()
+    monkeypatch.setitem(config.RUN, "oc_json_output", False)
+    from_yaml = ocp_obj.get()
+    assert from_json == from_yaml == POD_LIST
+    calls = fake_oc.read_text().splitlines()
+    assert calls[0].endswith("-o json")
+    assert calls[1].endswith("-o yaml")
+
+
+def test_raw_output_is_not_changed(fake_oc):
+    ocp_obj = ocp.OCP(kind="pod", namespace="openshift-storage")
+    out = ocp_obj.exec_oc_cmd("get pods -o yaml", out_yaml_format=False)
+    assert yaml.safe_load(out) == POD_LIST
+    assert fake_oc.read_text().strip().endswith("-o yaml")
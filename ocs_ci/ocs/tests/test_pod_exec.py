@@ -0,0 +1,157 @@
+# -*- coding: utf8 -*-
+
+import subprocess
+import time
+
+import pytest
+
+from ocs_ci.ocs import pod_exec
+from ocs_ci.ocs.exceptions import CommandFailed, PodExecSessionUnavailable
+from ocs_ci.ocs.ocp import OCP
+from ocs_ci.ocs.resources.pod import Pod
+
+NAMESPACE = "openshift-storage"
+EXEC_PATH = f"/api/v1/namespaces/{NAMESPACE}/pods/tools/exec"
+
+
+def pod(name):
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {"name": name, "namespace": NAMESPACE},
+        "spec": {"containers": [{"name": "toolbox"}]},
+    }
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_api_options():
+    return {"objects": [pod("tools")]}
+
+
+@pytest.fixture
+def pool():
+    session_pool = pod_exec.ExecSessionPool()
+    yield session_pool
+    session_pool.close_all()
+
+
+def test_session_output_and_exit_code(fake_api, pool):
+    def run(*argv):
+        return pool.run(fake_api.kubeconfig, "tools", NAMESPACE, list(argv))
+
+    # arguments are not interpreted by the shell, like by 'oc exec'
+    assert run("echo", "$HOME | x") == (b"$HOME | x\n", b"", 0)
+    # output without trailing newline and separate stderr
+    script = "printf out; printf err >&2; exit 3"
+    assert run("sh", "-c", script) == (b"out", b"err", 3)
+    # shell builtins can't change the state of the session
+    assert run("cd", "/")[2] == 127
+    assert run("sh", "-c", "read line; echo $?")[0] == b"1\n"
+    assert fake_api.count_requests("GET", EXEC_PATH) == 1
+
+
+def test_sessions_are_reused(fake_api, pool):
+    for i in range(20):
+        out, _, _ = pool.run(fake_api.kubeconfig, "tools", NAMESPACE, ["echo", str(i)])
+        assert out == f"{i}\n".encode()
+    assert fake_api.count_requests("GET", EXEC_PATH) == 1
+    # other container of the pod uses its own session
+    pool.run(fake_api.kubeconfig, "tools", NAMESPACE, ["true"], container="toolbox")
+    assert fake_api.count_requests("GET", EXEC_PATH) == 2
+    assert pool.stats == {"opened": 2, "reused": 19, "evicted": 0}
+
+
+def test_idle_sessions_are_evicted(fake_api):
+    clock = FakeClock()
+    pool = pod_exec.ExecSessionPool(idle_timeout=60, clock=clock)
+    pool.run(fake_api.kubeconfig, "tools", NAMESPACE, ["true"])
+    clock.now += 30
+    pool.run(fake_api.kubeconfig, "tools", NAMESPACE, ["true"])
+    clock.now += 61
+    pool.evict_idle()
+    assert pool.stats["evicted"] == 1
+    pool.run(fake_api.kubeconfig, "tools", NAMESPACE, ["true"])
+    assert pool.stats["opened"] == 2
+    pool.close_all()
+
+
+def test_closed_session_is_replaced(fake_api, pool):
+    pool.run(fake_api.kubeconfig, "tools", NAMESPACE, ["true"])
+    # e.g. the pod was restarted
+    for proc in list(fake_api.exec_processes):
+        fake_api.kill_exec_process(proc)
+    # until the server closed the stream
+    deadline = time.time() + 10
+    while fake_api.exec_processes and time.time() < deadline:
+        time.sleep(0.01)
+    out, _, _ = pool.run(fake_api.kubeconfig, "tools", NAMESPACE, ["echo", "ok"])
+    assert out == b"ok\n"
+    assert pool.stats["opened"] == 2
+
+
+def test_command_timeout(fake_api, pool):
+    with pytest.raises(subprocess.TimeoutExpired):
+        pool.run(fake_api.kubeconfig, "tools", NAMESPACE, ["sleep", "10"], timeout=1)
+    # the session with the running command is not reused
+    assert pool.run(fake_api.kubeconfig, "tools", NAMESPACE, ["true"])[2] == 0
+    assert pool.stats["opened"] == 2
+
+
+def test_session_unavailable(fake_api, pool):
+    with pytest.raises(PodExecSessionUnavailable):
+        pool.run(fake_api.kubeconfig, "missing", NAMESPACE, ["true"])
+    with pytest.raises(PodExecSessionUnavailable):
+        pool.run(fake_api.kubeconfig, "tools", NAMESPACE, ["true"], container="x")
+
+
+@pytest.fixture
+def exec_sessions(fake_api, tmp_path, monkeypatch):
+    from ocs_ci.framework import config
+
+    monkeypatch.setitem(config.ENV_DATA, "cluster_path", str(tmp_path))
+    monkeypatch.setitem(config.RUN, "kubeconfig_location", "kubeconfig")
+    monkeypatch.setitem(config.RUN, "pod_exec_sessions", True)
+    # no cluster wide proxy to look up when the pod objects are created
+    monkeypatch.setitem(config.ENV_DATA, "http_proxy", "")
+    monkeypatch.setitem(config.ENV_DATA, "no_proxy", "")
+    oc_commands = []
+
+    def exec_oc_cmd(self, command, *args, **kwargs):
+        oc_commands.append(command)
+        return "executed by oc"
+
+    monkeypatch.setattr(OCP, "exec_oc_cmd", exec_oc_cmd)
+    yield oc_commands
+    pod_exec.close_sessions()
+
+
+def test_exec_cmd_on_pod_in_session(fake_api, exec_sessions):
+    tools = Pod(**pod("tools"))
+    out = tools.exec_cmd_on_pod("sh -c 'echo \"{health: HEALTH_OK, osds: 3}\"'")
+    assert out == {"health": "HEALTH_OK", "osds": 3}
+    out = tools.exec_cmd_on_pod("echo secret-key", out_yaml_format=False)
+    assert out == "secret-key\n"
+    with pytest.raises(CommandFailed, match="command terminated with exit code 2"):
+        tools.exec_cmd_on_pod("sh -c 'exit 2'", out_yaml_format=False)
+    assert tools.exec_cmd_on_pod(
+        "sh -c 'exit 2'", out_yaml_format=False, ignore_error=True
+    ) == ("")
+    assert fake_api.count_requests("GET", EXEC_PATH) == 1
+    assert exec_sessions == []
+
+
+def test_exec_cmd_on_pod_fallback(fake_api, exec_sessions):
+    missing = Pod(**pod("missing"))
+    assert missing.exec_cmd_on_pod("ls", out_yaml_format=False) == "executed by oc"
+    # options not supported by the session are executed by oc as well
+    tools = Pod(**pod("tools"))
+    tools.exec_cmd_on_pod("ls", out_yaml_format=False, skip_tls_verify=True)
+    assert exec_sessions == ["rsh missing ls", "rsh tools ls"]
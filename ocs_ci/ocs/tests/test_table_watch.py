@@ -0,0 +1,171 @@
+# -*- coding: utf8 -*-
+
+import threading
+import time
+
+import pytest
+
+from ocs_ci.ocs import kube_api
+from ocs_ci.ocs.exceptions import (
+    KubeAPIUnsupportedOperation,
+    ResourceWrongStatusException,
+    TimeoutExpiredError,
+)
+from ocs_ci.ocs.ocp import OCP
+from ocs_ci.ocs.table_watch import TableWatch
+
+
+NAMESPACE = "openshift-storage"
+PODS_PATH = f"/api/v1/namespaces/{NAMESPACE}/pods"
+
+
+def pod(name, app, phase="Running"):
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {"name": name, "namespace": NAMESPACE, "labels": {"app": app}},
+        "status": {"phase": phase},
+    }
+
+
+def script(server, events, interval=0.1):
+    """
+    Add the objects to the server from background thread, None deletes pod-0
+    """
+
+    def run():
+        for obj in events:
+            time.sleep(interval)
+            if obj is None:
+                server.delete_object("v1", "Pod", "pod-0", NAMESPACE)
+            else:
+                server.add_object(obj)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture
+def fake_api_options():
+    return {"objects": [pod("pod-0", "foo", "Pending"), pod("pod-1", "bar")]}
+
+
+@pytest.fixture
+def client(fake_api, tmp_path):
+    client = kube_api.KubeAPIClient(str(tmp_path / "kubeconfig"))
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def kube_api_backend(fake_api, monkeypatch):
+    monkeypatch.setattr(OCP, "describe", lambda *args, **kwargs: "")
+    return fake_api
+
+
+def test_table_watch_changes(fake_api, client):
+    watch = TableWatch(client, "pod", namespace=NAMESPACE, selector="app=foo")
+    script(fake_api, [pod("pod-0", "foo", "Running"), pod("pod-2", "foo")])
+    seen = []
+    for rows in watch.changes(timeout=10):
+        seen.append({name: values["STATUS"] for name, values in rows.items()})
+        if len(rows) == 2:
+            break
+    assert watch.columns == ["NAME", "STATUS"]
+    assert seen == [
+        {"pod-0": "Pending"},
+        {"pod-0": "Running"},
+        {"pod-0": "Running", "pod-2": "Running"},
+    ]
+    assert watch.stats["lists"] == 1
+    assert watch.stats["watches"] == 1
+
+
+def test_table_watch_by_name(fake_api, client):
+    watch = TableWatch(client, "pod", namespace=NAMESPACE, name="pod-0")
+    script(fake_api, [pod("pod-1", "bar", "Failed"), None])
+    seen = [dict(rows) for rows in watch.changes(timeout=3)]
+    assert [list(rows) for rows in seen] == [["pod-0"], []]
+
+
+def test_table_watch_relists_expired(fake_api, client):
+    watch = TableWatch(client, "pod", namespace=NAMESPACE, name="pod-0")
+    changes = watch.changes(timeout=10)
+    assert next(changes)["pod-0"]["STATUS"] == "Pending"
+    fake_api.compact(skip=10)
+    fake_api.add_object(pod("pod-0", "foo", "Running"))
+    fake_api.expire_watches()
+    assert next(changes)["pod-0"]["STATUS"] == "Running"
+    assert watch.stats["expired"] == 1
+    assert watch.stats["lists"] == 2
+
+
+def test_table_watch_unknown_kind(client):
+    with pytest.raises(KubeAPIUnsupportedOperation):
+        TableWatch(client, "unknownkind")
+
+
+def test_wait_for_resource_single_stream(kube_api_backend):
+    ocp_obj = OCP(kind="Pod", namespace=NAMESPACE)
+    script(
+        kube_api_backend,
+        [pod("pod-0", "foo", "ContainerCreating"), pod("pod-0", "foo", "Running")],
+    )
+    start = time.monotonic()
+    assert ocp_obj.wait_for_resource(
+        "Running", resource_name="pod-0", timeout=30, sleep=3
+    )
+    # reacted to the event and didn't wait for the next sample
+    assert time.monotonic() - start < 2
+    assert kube_api_backend.count_requests("GET", PODS_PATH) == 2
+
+
+def test_wait_for_resource_count(kube_api_backend):
+    ocp_obj = OCP(kind="Pod", namespace=NAMESPACE)
+    script(
+        kube_api_backend,
+        [pod("pod-2", "foo", "Pending"), pod("pod-0", "foo"), pod("pod-2", "foo")],
+    )
+    assert ocp_obj.wait_for_resource(
+        "Running",
+        selector="app=foo",
+        resource_count=2,
+        dont_allow_other_resources=True,
+        timeout=30,
+    )
+
+
+def test_wait_for_resource_error_condition(kube_api_backend):
+    ocp_obj = OCP(kind="Pod", namespace=NAMESPACE)
+    script(kube_api_backend, [pod("pod-0", "foo", "Failed")])
+    with pytest.raises(ResourceWrongStatusException):
+        ocp_obj.wait_for_resource(
+            "Running", resource_name="pod-0", timeout=30, error_condition="Failed"
+        )
+
+
+def test_wait_for_resource_timeout(kube_api_backend):
+    ocp_obj = OCP(kind="Pod", namespace=NAMESPACE)
+    with pytest.raises(TimeoutExpiredError):
+        ocp_obj.wait_for_resource("Running", resource_name="pod-0", timeout=1)
+
+
+def test_wait_for_resource_column_not_printed(kube_api_backend, tmp_path):
+    ocp_obj = OCP(kind="Pod", namespace=NAMESPACE)
+    with pytest.raises(KubeAPIUnsupportedOperation):
+        ocp_obj._wait_for_resource_watch(
+            kube_api.get_client(str(tmp_path / "kubeconfig")),
+            "1/1",
+            resource_name="pod-0",
+            column="READY",
+        )
+
+
+def test_wait_for_delete(kube_api_backend):
+    ocp_obj = OCP(kind="Pod", namespace=NAMESPACE)
+    script(kube_api_backend, [None])
+    start = time.monotonic()
+    assert ocp_obj.wait_for_delete("pod-0", timeout=30, sleep=3)
+    assert time.monotonic() - start < 2
+    assert kube_api_backend.count_requests("GET", PODS_PATH) == 2
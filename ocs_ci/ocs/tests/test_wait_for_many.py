@@ -0,0 +1,202 @@
+# -*- coding: utf8 -*-
+
+import logging
+import threading
+import time
+
+import pytest
+
+from ocs_ci.ocs.exceptions import ResourcesNotReadyError
+from ocs_ci.ocs.ocp import OCP, wait_for_many
+from ocs_ci.ocs.resources.pod import wait_for_pods_to_be_in_statuses_concurrently
+
+
+log = logging.getLogger(__name__)
+
+NAMESPACE = "openshift-storage"
+PODS_PATH = f"/api/v1/namespaces/{NAMESPACE}/pods"
+
+
+def pod(name, app="foo", phase="Pending"):
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {"name": name, "namespace": NAMESPACE, "labels": {"app": app}},
+        "status": {"phase": phase},
+    }
+
+
+def start_pods(server, names, delay, app="foo"):
+    """
+    Move the pods to Running phase after the delay from background thread
+    """
+
+    def run():
+        time.sleep(delay)
+        for name in names:
+            server.add_object(pod(name, app, "Running"))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_wait_for_many_names(fake_api):
+    names = [f"pod-{i}" for i in range(5)]
+    for name in names + ["other"]:
+        fake_api.add_object(pod(name))
+    start_pods(fake_api, names, 0.3)
+    start = time.time()
+    ready = wait_for_many(
+        "Pod", names=names, predicate="Running", namespace=NAMESPACE, sleep=0.1
+    )
+    assert sorted(ready) == names
+    assert all(start < timestamp < time.time() for timestamp in ready.values())
+
+
+def test_wait_for_many_selector_and_predicate(fake_api):
+    fake_api.add_object(pod("pod-0"))
+    fake_api.add_object(pod("pod-1", phase="Running"))
+    fake_api.add_object(pod("bar-0", app="bar"))
+    start_pods(fake_api, ["pod-0"], 0.2)
+    ready = wait_for_many(
+        "Pod",
+        selector="app=foo",
+        predicate=lambda obj: obj["status"]["phase"] == "Running",
+        namespace=NAMESPACE,
+        sleep=0.1,
+    )
+    assert sorted(ready) == ["pod-0", "pod-1"]
+    assert ready["pod-1"] < ready["pod-0"]
+
+
+def test_wait_for_many_reports_missed(fake_api):
+    names = [f"pod-{i}" for i in range(4)]
+    for name in names:
+        fake_api.add_object(pod(name))
+    start_pods(fake_api, names[:2], 0)
+    with pytest.raises(ResourcesNotReadyError) as excinfo:
+        wait_for_many("Pod", names=names, namespace=NAMESPACE, timeout=1, sleep=0.1)
+    assert excinfo.value.missed == ["pod-2", "pod-3"]
+    assert sorted(excinfo.value.ready) == ["pod-0", "pod-1"]
+    assert "pod-2, pod-3" in str(excinfo.value)
+
+
+def test_wait_for_pods_of_selectors(fake_api):
+    for i in range(2):
+        fake_api.add_object(pod(f"foo-{i}"))
+    fake_api.add_object(pod("bar-0", app="bar", phase="Running"))
+    start_pods(fake_api, ["foo-0", "foo-1"], 0.2)
+    assert wait_for_pods_to_be_in_statuses_concurrently(
+        [{"app=foo": 2}, {"app=bar": 1}], NAMESPACE, timeout=30
+    )
+    with pytest.raises(ResourcesNotReadyError) as excinfo:
+        wait_for_pods_to_be_in_statuses_concurrently(
+            [{"app=foo": 2}, {"app=baz": 1}], NAMESPACE, timeout=3
+        )
+    assert excinfo.value.missed == ["app=baz"]
+    crashing = pod("baz-0", app="baz", phase="Running")
+    crashing["status"]["containerStatuses"] = [
+        {"ready": False, "state": {"waiting": {"reason": "CrashLoopBackOff"}}}
+    ]
+    fake_api.add_object(crashing)
+    with pytest.raises(ResourcesNotReadyError):
+        wait_for_pods_to_be_in_statuses_concurrently(
+            [{"app=baz": 1}], NAMESPACE, timeout=3
+        )
+
+
+def test_wait_for_pods_of_selectors_count(fake_api):
+    for i in range(3):
+        fake_api.add_object(pod(f"foo-{i}", phase="Running"))
+    fake_api.add_object(pod("bar-0", app="bar", phase="Running"))
+    fake_api.add_object(pod("bar-1", app="bar"))
+    # the exact count of the pods is expected
+    with pytest.raises(ResourcesNotReadyError) as excinfo:
+        wait_for_pods_to_be_in_statuses_concurrently(
+            [{"app=foo": 2}], NAMESPACE, timeout=4
+        )
+    assert excinfo.value.missed == ["app=foo"]
+    # 0 means all the listed pods
+    assert wait_for_pods_to_be_in_statuses_concurrently(
+        [{"app=foo": 0}], NAMESPACE, timeout=3
+    )
+    with pytest.raises(ResourcesNotReadyError) as excinfo:
+        wait_for_pods_to_be_in_statuses_concurrently(
+            [{"app=bar": 0}, {"app=baz": 0}], NAMESPACE, timeout=4
+        )
+    assert excinfo.value.missed == ["app=bar", "app=baz"]
+
+
+def test_wait_for_many_pod_status_column(fake_api):
+    """
+    Pods are compared by the STATUS column of 'oc get pod', not status.phase
+    """
+    crashing = pod("crashing", phase="Running")
+    crashing["status"]["containerStatuses"] = [
+        {"ready": False, "state": {"waiting": {"reason": "CrashLoopBackOff"}}}
+    ]
+    terminating = pod("terminating", phase="Running")
+    terminating["metadata"]["deletionTimestamp"] = "2024-01-01T00:00:00Z"
+    completed = pod("completed", phase="Succeeded")
+    completed["status"]["containerStatuses"] = [
+        {
+            "ready": False,
+            "state": {"terminated": {"exitCode": 0, "reason": "Completed"}},
+        }
+    ]
+    for obj in (crashing, terminating, completed, pod("running", phase="Running")):
+        fake_api.add_object(obj)
+    with pytest.raises(ResourcesNotReadyError) as excinfo:
+        wait_for_many(
+            "Pod",
+            names=["crashing", "terminating", "running"],
+            namespace=NAMESPACE,
+            timeout=1,
+            sleep=0.1,
+        )
+    assert excinfo.value.missed == ["crashing", "terminating"]
+    ready = wait_for_many(
+        "Pod",
+        names=["completed"],
+        predicate="Completed",
+        namespace=NAMESPACE,
+        sleep=0.1,
+    )
+    assert list(ready) == ["completed"]
+
+
+@pytest.mark.parametrize("count", [10, 100, 1000])
+def test_wait_for_many_request_count(fake_api, count):
+    """
+    Compare the API requests of wait_for_many with per object polling
+    """
+    names = [f"pod-{i}" for i in range(count)]
+    for name in names:
+        fake_api.add_object(pod(name))
+    sleep = 0.2
+
+    start_pods(fake_api, names, 0.5)
+    ocp_obj = OCP(kind="Pod", namespace=NAMESPACE)
+    pending = set(names)
+    while pending:
+        for name in sorted(pending):
+            if ocp_obj.get(resource_name=name)["status"]["phase"] == "Running":
+                pending.discard(name)
+        time.sleep(sleep)
+    per_object = fake_api.count_requests("GET", PODS_PATH)
+
+    for name in names:
+        fake_api.add_object(pod(name))
+    start_pods(fake_api, names, 0.5)
+    start = time.monotonic()
+    wait_for_many("Pod", names=names, namespace=NAMESPACE, timeout=60, sleep=sleep)
+    elapsed = time.monotonic() - start
+    batched = fake_api.count_requests("GET", PODS_PATH) - per_object
+    log.info(
+        f"{count} pods: {per_object} requests by per object polling, "
+        f"{batched} by wait_for_many in {elapsed:.2f}s"
+    )
+    assert batched <= elapsed / sleep + 2
+    assert per_object >= count
+    assert batched < per_object
@@ -38,6 +38,14 @@ from ocs_ci.ocs.openstack import CephVMNode
 from ocs_ci.ocs.parallel import parallel
 from ocs_ci.ocs.resources.ocs import OCS
 from ocs_ci.utility import templating, version
+from ocs_ci.utility.artifact_store import get_artifact_store
+from ocs_ci.utility.artifact_writer import (
+    ArtifactWriter,
+    compress_tree,
+    compression_enabled,
+    write_artifact,
+)
+from ocs_ci.utility.gather_plan import SUCCEEDED, GatherPlan
 from ocs_ci.utility.prometheus import PrometheusAPI
 from ocs_ci.utility.retry import retry
 from ocs_ci.utility.utils import (
@@ -66,6 +74,9 @@ mg_collected_logs = 0
 mg_collected_types = set()
 mg_lock = threading.Lock()
 subctl_lock = threading.Lock()
+# time for packing of the logs after the collection command timed out
+GATHER_TIMEOUT_MARGIN = 300
+NOOBAA_DB_DUMP_TIMEOUT = 1800
 
 
 def create_ceph_nodes(cluster_conf, inventory, osp_cred, run_id, instances_name=None):
@@ -957,7 +968,9 @@ def run_must_gather(
 
     Args:
         log_dir_path (str): directory for dumped must-gather logs (if REPORTING["tarball_mg_logs"] is set, this
-            directory will be packed to the parent directory with extension .tar.gz)
+            directory will be packed to the parent directory with extension .tar.gz, if REPORTING["dedup_mg_logs"]
+            is set, its files are deduplicated to the artifact store of the session instead, if
+            REPORTING["compress_artifacts"] is set, its big files are compressed in place instead)
         image (str): must-gather image registry path
         command (str): optional command to execute within the must-gather image
         cluster_config (MultiClusterConfig): Holds specifc cluster config object in case of multicluster
@@ -1027,7 +1040,21 @@ def run_must_gather(
             log.error(f"Must-Gather Output: {mg_output}")
         export_mg_pods_logs(log_dir_path=log_dir_path)
 
-    if config.REPORTING.get("tarball_mg_logs"):
+    if config.REPORTING.get("dedup_mg_logs"):
+        # hardlinks to the blobs of the session instead of the tarball
+        series = os.path.join(
+            cluster_config.ENV_DATA["cluster_name"], os.path.basename(log_dir_path)
+        )
+        try:
+            get_artifact_store(cluster_config).add_tree(log_dir_path, series=series)
+        except OSError as err:
+            log.error(f"Failed to store must-gather logs! Error: {err}")
+    elif compression_enabled(cluster_config):
+        try:
+            compress_tree(log_dir_path)
+        except OSError as err:
+            log.error(f"Failed to compress must-gather logs! Error: {err}")
+    elif config.REPORTING.get("tarball_mg_logs"):
         tarball_path = f"{log_dir_path}.tar.gz"
         log.info(f"Packing must-gather logs to {tarball_path}")
         try:
@@ -1043,18 +1070,20 @@ def run_must_gather(
     return mg_output
 
 
-def collect_ceph_external(path):
+def collect_ceph_external(path, setup_toolbox=True):
     """
     Collect ceph commands via cli tool on External mode cluster
 
     Args:
         path(str): The destination for saving the ceph files [output ceph commands]
+        setup_toolbox (bool): False when the toolbox pod is already set up
 
     """
     try:
         # In case it fails in deployment sooner than we create the toolbox pod
         # we need to make sure the toolbox pod is created
-        setup_ceph_toolbox()
+        if setup_toolbox:
+            setup_ceph_toolbox()
         log.info(f"Collecting external ceph logs to: {path}")
         kubeconfig_path = os.path.join(
             config.ENV_DATA["cluster_path"], config.RUN["kubeconfig_location"]
@@ -1109,8 +1138,9 @@ def get_logs_ocp_mg_pods(log_dir_path):
                     log_dir_path, f"describe_ocp_mg_{pod_mg_ns.name}.log"
                 )
                 pod_mg_describe = pod_mg_ns.describe()
-                with open(file_path_describe, "w") as df:
-                    df.write(f"ocp mg pod describe:\n{pod_mg_describe}")
+                write_artifact(
+                    file_path_describe, f"ocp mg pod describe:\n{pod_mg_describe}"
+                )
                 log.debug(f"ocp mg pod describe:\n{pod_mg_describe}")
 
                 ocp_mg_pod_logs = get_pod_logs(
@@ -1119,8 +1149,7 @@ def get_logs_ocp_mg_pods(log_dir_path):
                 file_path_describe = os.path.join(
                     log_dir_path, f"log_ocp_mg_{pod_mg_ns.name}.log"
                 )
-                with open(file_path_describe, "w") as df:
-                    df.write(ocp_mg_pod_logs)
+                write_artifact(file_path_describe, ocp_mg_pod_logs)
                 log.debug(f"ocp mg pod logs:\n{ocp_mg_pod_logs}")
     except Exception as e:
         log.error(e)
@@ -1147,8 +1176,7 @@ def get_helper_pods_output(log_dir_path):
             file_path_describe = os.path.join(
                 log_dir_path, f"describe_ocs_mg_helper_pod_{helper_pod}.log"
             )
-            with open(file_path_describe, "w") as df:
-                df.write(describe_helper_pod)
+            write_artifact(file_path_describe, describe_helper_pod)
             log.debug(
                 f"****helper pod {helper_pod} describe****\n{describe_helper_pod}\n"
             )
@@ -1157,8 +1185,7 @@ def get_helper_pods_output(log_dir_path):
             file_path_describe = os.path.join(
                 log_dir_path, f"log_ocs_mg_helper_pod_{helper_pod}.log"
             )
-            with open(file_path_describe, "w") as df:
-                df.write(log_helper_pod)
+            write_artifact(file_path_describe, log_helper_pod)
             log.debug(f"****helper pod {helper_pod} logs***\n{log_helper_pod}")
         except Exception as e:
             log.error(e)
@@ -1222,6 +1249,128 @@ def collect_noobaa_db_dump(log_dir_path, cluster_config=None):
     )
 
 
+def _run_ocs_must_gather(log_dir_path, image, cluster_config, **kwargs):
+    """
+    Run OCS must-gather and check it works in a disconnected environment
+
+    Args:
+        log_dir_path (str): directory for dumped must-gather logs
+        image (str): OCS must-gather image with tag
+        cluster_config (MultiClusterConfig): Config of the cluster
+        **kwargs: Other arguments of run_must_gather
+
+    Raises:
+        ValueError: In case must-gather can't run in a disconnected environment
+
+    """
+    mg_output = run_must_gather(
+        log_dir_path, image, cluster_config=cluster_config, **kwargs
+    )
+    mg_collected_types.add("ocs")
+    if (
+        ocsci_config.DEPLOYMENT.get("disconnected")
+        and mg_output
+        and "cannot stat 'jq'" in mg_output
+    ):
+        raise ValueError(
+            f"must-gather fails in an disconnected environment bz-1974959\n{mg_output}"
+        )
+
+
+def _collect_noobaa_db_dump_with_retries(log_dir_path, cluster_config, attempts=5):
+    """
+    Collect noobaa DB dump, retried in case the dump command fails
+
+    Args:
+        log_dir_path (str): directory for the dump
+        cluster_config (MultiClusterConfig): Config of the cluster
+        attempts (int): Number of attempts
+
+    """
+    for _ in range(attempts):
+        try:
+            collect_noobaa_db_dump(log_dir_path, cluster_config)
+            mg_collected_types.add("mcg")
+            return
+        except CommandFailed as ex:
+            log.error(f"Failed to dump noobaa DB! Error: {ex}")
+            sleep(30)
+
+
+def _collect_acm_logs(log_dir_path, cluster_config):
+    """
+    Collect ACM must-gather with the image of the installed ACM
+
+    Args:
+        log_dir_path (str): directory of the cluster logs
+        cluster_config (MultiClusterConfig): Config of the ACM cluster
+
+    """
+    log.info("Collecting ACM logs")
+    image_prefix = '"acm_must_gather"'
+    acm_mustgather_path = os.path.join(log_dir_path, "acmlogs")
+    csv_cmd = (
+        f"oc --kubeconfig {cluster_config.RUN['kubeconfig']} "
+        f"get csv -l {constants.ACM_CSV_LABEL} -n open-cluster-management -o json"
+    )
+    jq_cmd = (
+        f"jq -r '.items[0].spec.relatedImages[]|select(.name=={image_prefix}).image'"
+    )
+    json_out = run_cmd(csv_cmd)
+    out = subprocess.run(
+        shlex.split(jq_cmd), input=json_out.encode(), stdout=subprocess.PIPE
+    )
+    acm_mustgather_image = out.stdout.decode()
+    run_must_gather(
+        acm_mustgather_path,
+        acm_mustgather_image,
+        cluster_config=cluster_config,
+    )
+
+
+def _collect_submariner_logs(log_dir_path, cluster_config):
+    """
+    Collect submariner logs with subctl gather, subctl is downloaded when
+    missing and subctl_version is configured
+
+    Args:
+        log_dir_path (str): directory of the cluster logs
+        cluster_config (MultiClusterConfig): Config of the cluster
+
+    """
+    with subctl_lock:
+        try:
+            run_cmd("subctl")
+        except (CommandFailed, FileNotFoundError):
+            if not cluster_config.ENV_DATA.get("subctl_version"):
+                log.warning(
+                    "subctl binary not found and subctl_version not configured, "
+                    "skipping submariner log collection"
+                )
+                return
+            log.debug("subctl binary not found, downloading now...")
+            # Importing here to avoid circular import error
+            from ocs_ci.deployment.acm import Submariner
+
+            submariner = Submariner()
+            submariner.download_binary()
+
+    submariner_log_path = os.path.join(
+        log_dir_path,
+        "submariner",
+    )
+    run_cmd(f"mkdir -p {submariner_log_path}")
+    run_cmd(f"chmod -R 777 {submariner_log_path}")
+    submariner_log_collect = (
+        f"subctl gather --kubeconfig {cluster_config.RUN['kubeconfig']}"
+    )
+    log.info("Collecting submariner logs")
+    # cwd of the command only, the other gatherers run concurrently
+    out = run_cmd(submariner_log_collect, timeout=1200, cwd=submariner_log_path)
+    run_cmd(f"chmod -R 777 {submariner_log_path}")
+    log.info(out)
+
+
 def _collect_ocs_logs(
     cluster_config,
     dir_name,
@@ -1240,8 +1389,19 @@ def _collect_ocs_logs(
     """
     This function runs in thread
 
+    The gatherers of the cluster run concurrently (see GatherPlan), the
+    timing manifest of the collection is written to the log directory of the
+    cluster. When the logs of several clusters are collected in parallel,
+    their gatherers share one concurrency semaphore
+    (REPORTING['log_collection_concurrency'] is the limit for all of them,
+    not per cluster), so the gatherers of one cluster may wait for the
+    others.
+
+    Raises:
+        Exception: The first error of the failed gatherers, raised after all
+            the other gatherers finished
+
     """
-    global mg_collected_types
     log.info(
         (
             f"RUNNING IN CTX: {cluster_config.ENV_DATA['cluster_name']} RUNID: = {cluster_config.RUN['run_id']}"
@@ -1270,6 +1430,16 @@ def _collect_ocs_logs(
             f"{cluster_config.ENV_DATA['cluster_name']}",
         )
 
+    mg_kwargs = dict(
+        cluster_config=cluster_config,
+        output_file=output_file,
+        skip_after_max_fail=skip_after_max_fail,
+        timeout=timeout,
+        since_time=since_time,
+    )
+    # must-gather is killed after its timeout, packing of the logs follows
+    mg_timeout = timeout + GATHER_TIMEOUT_MARGIN
+    plan = GatherPlan()
     if ocs:
         latest_tag = cluster_config.REPORTING.get(
             "ocs_must_gather_latest_tag",
@@ -1288,26 +1458,15 @@ def _collect_ocs_logs(
             ocs_must_gather_image_and_tag = mirror_image(
                 ocs_must_gather_image_and_tag, cluster_config
             )
-        mg_output = run_must_gather(
-            ocs_log_dir_path,
-            ocs_must_gather_image_and_tag,
-            cluster_config=cluster_config,
-            command=ocs_flags,
-            silent=silent,
-            output_file=output_file,
-            skip_after_max_fail=skip_after_max_fail,
-            timeout=timeout,
-            mg_options=mg_options,
-            since_time=since_time,
+        plan.add(
+            "ocs_must_gather",
+            _run_ocs_must_gather,
+            args=(ocs_log_dir_path, ocs_must_gather_image_and_tag),
+            kwargs=dict(
+                command=ocs_flags, silent=silent, mg_options=mg_options, **mg_kwargs
+            ),
+            timeout=mg_timeout,
         )
-        mg_collected_types.add("ocs")
-        if (
-            ocsci_config.DEPLOYMENT.get("disconnected")
-            and "cannot stat 'jq'" in mg_output
-        ):
-            raise ValueError(
-                f"must-gather fails in an disconnected environment bz-1974959\n{mg_output}"
-            )
         if config.DEPLOYMENT["external_mode"] and not ocsci_config.RUN.get(
             "is_ocp_deployment_failed"
         ):
@@ -1315,7 +1474,17 @@ def _collect_ocs_logs(
             external_ceph_log_dir_path = os.path.join(
                 log_dir_path, f"external_ceph_logs_{timestamp}"
             )
-            collect_ceph_external(path=external_ceph_log_dir_path)
+            # In case it fails in deployment sooner than we create the toolbox
+            # pod we need to make sure the toolbox pod is created, meanwhile
+            # the must-gathers already run
+            plan.add("ceph_toolbox", setup_ceph_toolbox, timeout=600)
+            plan.add(
+                "external_ceph",
+                collect_ceph_external,
+                kwargs=dict(path=external_ceph_log_dir_path, setup_toolbox=False),
+                depends=["ceph_toolbox", "ocs_must_gather"],
+                timeout=600 + GATHER_TIMEOUT_MARGIN,
+            )
     if ocp:
         ocp_log_dir_path = os.path.join(log_dir_path, "ocp_must_gather")
         ocp_service_log_dir_path = os.path.join(
@@ -1324,105 +1493,68 @@ def _collect_ocs_logs(
         ocp_must_gather_image = cluster_config.REPORTING["ocp_must_gather_image"]
         if cluster_config.DEPLOYMENT.get("disconnected"):
             ocp_must_gather_image = mirror_image(ocp_must_gather_image)
-        run_must_gather(
-            ocp_log_dir_path,
-            ocp_must_gather_image,
-            cluster_config=cluster_config,
-            output_file=output_file,
-            skip_after_max_fail=skip_after_max_fail,
-            timeout=timeout,
-            since_time=since_time,
+        plan.add(
+            "ocp_must_gather",
+            run_must_gather,
+            args=(ocp_log_dir_path, ocp_must_gather_image),
+            kwargs=mg_kwargs,
+            timeout=mg_timeout,
         )
-        run_must_gather(
-            ocp_service_log_dir_path,
-            ocp_must_gather_image,
-            "/usr/bin/gather_service_logs worker",
-            cluster_config=cluster_config,
-            output_file=output_file,
-            skip_after_max_fail=skip_after_max_fail,
-            timeout=timeout,
-            since_time=since_time,
+        plan.add(
+            "ocp_service_logs",
+            run_must_gather,
+            args=(
+                ocp_service_log_dir_path,
+                ocp_must_gather_image,
+                "/usr/bin/gather_service_logs worker",
+            ),
+            kwargs=mg_kwargs,
+            timeout=mg_timeout,
+        )
+    if mcg and not (
+        ocsci_config.multicluster
+        and ocsci_config.get_active_acm_index()
+        == cluster_config.MULTICLUSTER["multicluster_index"]
+    ):
+        plan.add(
+            "noobaa_db_dump",
+            _collect_noobaa_db_dump_with_retries,
+            args=(log_dir_path, cluster_config),
+            timeout=NOOBAA_DB_DUMP_TIMEOUT,
         )
-        mg_collected_types.add("ocp")
-    if mcg:
-        counter = 0
-        while counter < 5:
-            counter += 1
-            try:
-                if (
-                    ocsci_config.multicluster
-                    and ocsci_config.get_active_acm_index()
-                    == cluster_config.MULTICLUSTER["multicluster_index"]
-                ):
-                    break
-                collect_noobaa_db_dump(log_dir_path, cluster_config)
-                mg_collected_types.add("mcg")
-                break
-            except CommandFailed as ex:
-                log.error(f"Failed to dump noobaa DB! Error: {ex}")
-                sleep(30)
     # Collect ACM logs only from ACM
     # Collect this only once, with parallel ocp/ocs log collection, we want to collect acm logs only once
-    if ocs:
-        if cluster_config.MULTICLUSTER.get("multicluster_mode", None) == "regional-dr":
-            if cluster_config.MULTICLUSTER.get("acm_cluster", False):
-                log.info("Collecting ACM logs")
-                image_prefix = '"acm_must_gather"'
-                acm_mustgather_path = os.path.join(log_dir_path, "acmlogs")
-                csv_cmd = (
-                    f"oc --kubeconfig {cluster_config.RUN['kubeconfig']} "
-                    f"get csv -l {constants.ACM_CSV_LABEL} -n open-cluster-management -o json"
-                )
-                jq_cmd = f"jq -r '.items[0].spec.relatedImages[]|select(.name=={image_prefix}).image'"
-                json_out = run_cmd(csv_cmd)
-                out = subprocess.run(
-                    shlex.split(jq_cmd), input=json_out.encode(), stdout=subprocess.PIPE
-                )
-                acm_mustgather_image = out.stdout.decode()
-                run_must_gather(
-                    acm_mustgather_path,
-                    acm_mustgather_image,
-                    cluster_config=cluster_config,
-                )
-
-            # We want to skip submariner log collection if it's in import clusters phase
-            if not cluster_config.ENV_DATA.get("import_clusters_to_acm", False):
-                subctl_available = True
-                with subctl_lock:
-                    try:
-                        run_cmd("subctl")
-                    except (CommandFailed, FileNotFoundError):
-                        if not cluster_config.ENV_DATA.get("subctl_version"):
-                            log.warning(
-                                "subctl binary not found and subctl_version not configured, "
-                                "skipping submariner log collection"
-                            )
-                            subctl_available = False
-                        else:
-                            log.debug("subctl binary not found, downloading now...")
-                            # Importing here to avoid circular import error
-                            from ocs_ci.deployment.acm import Submariner
-
-                            submariner = Submariner()
-                            submariner.download_binary()
+    if (
+        ocs
+        and cluster_config.MULTICLUSTER.get("multicluster_mode", None) == "regional-dr"
+    ):
+        if cluster_config.MULTICLUSTER.get("acm_cluster", False):
+            plan.add(
+                "acm_must_gather",
+                _collect_acm_logs,
+                args=(log_dir_path, cluster_config),
+                timeout=defaults.MUST_GATHER_TIMEOUT + GATHER_TIMEOUT_MARGIN,
+            )
+        # We want to skip submariner log collection if it's in import clusters phase
+        if not cluster_config.ENV_DATA.get("import_clusters_to_acm", False):
+            plan.add(
+                "submariner",
+                _collect_submariner_logs,
+                args=(log_dir_path, cluster_config),
+                timeout=1200 + GATHER_TIMEOUT_MARGIN,
+            )
 
-                if subctl_available:
-                    submariner_log_path = os.path.join(
-                        log_dir_path,
-                        "submariner",
-                    )
-                    run_cmd(f"mkdir -p {submariner_log_path}")
-                    cwd = os.getcwd()
-                    run_cmd(f"chmod -R 777 {submariner_log_path}")
-                    os.chdir(submariner_log_path)
-                    submariner_log_collect = (
-                        f"subctl gather --kubeconfig {cluster_config.RUN['kubeconfig']}"
-                    )
-                    log.info("Collecting submariner logs")
-                    out = run_cmd(submariner_log_collect, timeout=1200)
-                    run_cmd(f"chmod -R 777 {submariner_log_path}")
-                    os.chdir(cwd)
-                    log.info(out)
+    manifest = plan.run()
+    if ocp and all(
+        manifest[name]["status"] == SUCCEEDED
+        for name in ("ocp_must_gather", "ocp_service_logs")
+    ):
+        mg_collected_types.add("ocp")
+    try:
+        plan.write_manifest(log_dir_path)
+    except OSError as ex:
+        log.warning(f"Failed to write log collection manifest: {ex}")
+    plan.raise_first_failure()
 
 
 def collect_ocs_logs(
@@ -1463,65 +1595,27 @@ def collect_ocs_logs(
     """
     cwd = os.getcwd()
     results = list()
+    # the gatherers of every cluster run concurrently in its GatherPlan
     with ThreadPoolExecutor() as executor:
-        for cluster in ocsci_config.clusters:
-            if ocp:
-                results.append(
-                    executor.submit(
-                        _collect_ocs_logs,
-                        cluster,
-                        dir_name=dir_name,
-                        ocp=ocp,
-                        ocs=False,
-                        mcg=False,
-                        status_failure=status_failure,
-                        ocs_flags=ocs_flags,
-                        mg_options=mg_options,
-                        silent=silent,
-                        output_file=output_file,
-                        skip_after_max_fail=skip_after_max_fail,
-                        timeout=timeout,
-                        since_time=since_time,
-                    )
-                )
-            if ocs:
-                results.append(
-                    executor.submit(
-                        _collect_ocs_logs,
-                        cluster,
-                        dir_name=dir_name,
-                        ocp=False,
-                        ocs=ocs,
-                        mcg=False,
-                        status_failure=status_failure,
-                        ocs_flags=ocs_flags,
-                        mg_options=mg_options,
-                        silent=silent,
-                        output_file=output_file,
-                        skip_after_max_fail=skip_after_max_fail,
-                        timeout=timeout,
-                        since_time=since_time,
-                    )
-                )
-            if mcg:
-                results.append(
-                    executor.submit(
-                        _collect_ocs_logs,
-                        cluster,
-                        dir_name=dir_name,
-                        ocp=False,
-                        ocs=False,
-                        mcg=mcg,
-                        status_failure=status_failure,
-                        ocs_flags=ocs_flags,
-                        mg_options=mg_options,
-                        silent=silent,
-                        output_file=output_file,
-                        skip_after_max_fail=skip_after_max_fail,
-                        timeout=timeout,
-                        since_time=since_time,
-                    )
+        for cluster in ocsci_config.clusters if ocp or ocs or mcg else []:
+            results.append(
+                executor.submit(
+                    _collect_ocs_logs,
+                    cluster,
+                    dir_name=dir_name,
+                    ocp=ocp,
+                    ocs=ocs,
+                    mcg=mcg,
+                    status_failure=status_failure,
+                    ocs_flags=ocs_flags,
+                    mg_options=mg_options,
+                    silent=silent,
+                    output_file=output_file,
+                    skip_after_max_fail=skip_after_max_fail,
+                    timeout=timeout,
+                    since_time=since_time,
                 )
+            )
 
     for f in as_completed(results):
         try:
@@ -1544,6 +1638,7 @@ def collect_prometheus_metrics(
 ):
     """
     Collects metrics from Prometheus and saves them in file in json format.
+    The big metric files are compressed when REPORTING['compress_artifacts'] is set.
     Metrics can be found in OCP Console in Monitoring -> Metrics.
 
     Args:
@@ -1573,7 +1668,7 @@ def collect_prometheus_metrics(
         )
         file_name = os.path.join(log_dir_path, f"{metric}.json")
         log.info(f"Saving {metric} data into {file_name}")
-        with open(file_name, "w") as outfile:
+        with ArtifactWriter(file_name) as outfile:
             json.dump(datapoints.json(), outfile)
 
 
@@ -2008,14 +2103,12 @@ def set_recovery_as_primary():
     """
     # 1. Popout primary from clusters list
     cluster = get_primary_cluster_config()
-    ocsci_config.clusters.remove(cluster)
+    # Also decrements count of nclusters
+    ocsci_config.remove_cluster(ocsci_config.clusters.index(cluster))
 
     # 2.Reindexing After removing primary cluster
     cluster_config_reindex()
     log.info("Old primary cluster config removed from list")
-
-    # Decrement count from nclusters
-    ocsci_config.nclusters -= 1
     log.info(f"Number of clusters present in env: {ocsci_config.nclusters}")
 
     # Switch context to recovery
@@ -2152,12 +2245,10 @@ def collect_pod_container_rpm_package(dir_name):
                     )
                 if container_output:
                     log_file_name = f"{package_log_dir_path}/{pod_obj.name}-{container_name}-rpm.log"
-                    with open(log_file_name, "w") as f:
-                        f.write(container_output)
+                    write_artifact(log_file_name, container_output)
                 if go_output:
                     go_log_file_name = f"{package_log_dir_path}/{pod_obj.name}-{container_name}-go-version.log"
-                    with open(go_log_file_name, "w") as f:
-                        f.write(go_output)
+                    write_artifact(go_log_file_name, go_output)
 
     if config.REPORTING.get("tarball_mg_logs"):
         tarball_path = f"{package_log_dir_path}.tar.gz"
@@ -0,0 +1,437 @@
+"""
+asyncio counterparts of exec_cmd and TimeoutSampler
+
+Waiting for hundreds or thousands of resources with a thread (or greenlet) per
+wait costs a thread stack per wait and contends on the GIL while the threads
+mostly sleep. The coroutines here run all the waits in one event loop: the
+commands are executed as asyncio subprocesses, at most
+RUN['async_command_limit'] of them at a time, identical concurrent read-only
+oc commands share one subprocess and the samplers sleep with asyncio.sleep.
+
+Every asyncio task runs in its own copy of the context, the cluster set by
+in_cluster_context (or by config.switch_ctx called in the task) is used by
+the config accesses of the task only.
+
+The sync adapters (run_sync, run_concurrently) run the coroutines from the
+sync code, eg.::
+
+    samplers = [
+        AsyncTimeoutSampler(300, 5, pod_is_running, name) for name in names
+    ]
+    run_concurrently(sampler.wait_for_func_value(True) for sampler in samplers)
+"""
+
+import asyncio
+import contextvars
+import inspect
+import logging
+import shlex
+import subprocess
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from ocs_ci.framework import config, config_index_var
+from ocs_ci.utility import command_telemetry
+from ocs_ci.utility.utils import (
+    TimeoutSampler,
+    _invalidate_oc_reads,
+    _oc_singleflight_key,
+    _split_command,
+    add_kubeconfig_arg,
+    exec_env,
+    mask_secrets,
+    process_command_result,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_COMMAND_LIMIT = 64
+
+
+class _LoopState(object):
+    """
+    Semaphore limiting the running subprocesses and the in-flight shared oc
+    commands of one event loop (asyncio primitives can't be shared by loops)
+    """
+
+    def __init__(self):
+        limit = config.RUN.get("async_command_limit") or DEFAULT_COMMAND_LIMIT
+        self.semaphore = asyncio.Semaphore(limit)
+        self.in_flight = dict()
+
+
+_loop_states = weakref.WeakKeyDictionary()
+
+
+def _loop_state():
+    """
+    Returns:
+        _LoopState: State of the running event loop
+
+    """
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _loop_states[loop] = _LoopState()
+    return state
+
+
+async def _run_subprocess(cmd, env, timeout):
+    """
+    Run the command as asyncio subprocess, waiting for a free slot of the
+    command limit first
+
+    Args:
+        cmd (list): Command to run
+        env (dict): Environment of the command
+        timeout (int): Timeout for the command
+
+    Returns:
+        tuple: Completed process of the command (CompletedProcess) and time
+            spent waiting for the free slot in seconds (float)
+
+    Raises:
+        subprocess.TimeoutExpired: In case the command doesn't finish in time
+
+    """
+    state = _loop_state()
+    start = time.perf_counter()
+    async with state.semaphore:
+        slot_wait = time.perf_counter() - start
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise subprocess.TimeoutExpired(cmd, timeout)
+    return (
+        subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr),
+        slot_wait,
+    )
+
+
+async def _run_shared(key, cmd, env, timeout):
+    """
+    Run the command, callers with the same key await the one in-flight run
+
+    Args:
+        key (tuple): Key of the command, see utils._oc_singleflight_key
+        cmd (list): Command to run
+        env (dict): Environment of the command
+        timeout (int): Timeout for the command
+
+    Returns:
+        tuple: Completed process and time spent waiting for the free slot
+
+    Raises:
+        subprocess.TimeoutExpired: In case the command (or the in-flight run)
+            doesn't finish in the timeout of the caller
+
+    """
+    in_flight = _loop_state().in_flight
+    task = in_flight.get(key)
+    if task is not None:
+        log.debug("Command result shared with identical in-flight command")
+        try:
+            # one cancelled caller must not cancel the shared run
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        except Exception as ex:
+            # the failure of the in-flight run is not the failure of this
+            # caller, run on its own
+            log.debug(f"In-flight command failed ({ex}), running it again")
+            return await _run_subprocess(cmd, env, timeout)
+    task = asyncio.ensure_future(_run_subprocess(cmd, env, timeout))
+    in_flight[key] = task
+    task.add_done_callback(lambda _: in_flight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def exec_cmd_async(
+    cmd,
+    secrets=None,
+    timeout=600,
+    ignore_error=False,
+    silent=False,
+    cluster_config=None,
+    output_file=None,
+    cmd_log_level=logging.DEBUG,
+    stdout_loader=None,
+    env=None,
+):
+    """
+    Run an arbitrary command locally in asyncio subprocess, counterpart of
+    utils.exec_cmd
+
+    Args:
+        cmd (str): command to run, shell is never used
+        secrets (list): A list of secrets to be masked with asterisks
+        timeout (int): Timeout for the command, defaults to 600 seconds.
+        ignore_error (bool): True if ignore non zero return code and do not
+            raise the exception.
+        silent (bool): If True will silent errors from the server, default false
+        cluster_config (MultiClusterConfig): In case of multicluster environment
+            this object will be non-null
+        output_file (str): path where to write output of stderr from command
+            - apply only when silent mode is True
+        cmd_log_level (int): Log level for the "Executing command" message.
+        stdout_loader (callable): Function to load the masked stdout (e.g. json
+            loads), see utils.exec_cmd
+        env (dict): Environment of the command, KUBECONFIG is set in it
+
+    Raises:
+        CommandFailed: In case the command execution fails
+        subprocess.TimeoutExpired: In case the command doesn't finish in time
+
+    Returns:
+        CompletedProcess: A CompletedProcess object of the command that was
+            executed, see utils.exec_cmd
+
+    """
+    run_config = cluster_config or config
+    kubeconfig_path = run_config.RUN.get("kubeconfig")
+    env_kubeconfig = kubeconfig_path or config.RUN.get("kubeconfig")
+    custom_env = env is not None
+    if custom_env:
+        env = dict(env)
+        if env_kubeconfig:
+            env["KUBECONFIG"] = env_kubeconfig
+    else:
+        env = exec_env(env_kubeconfig)
+    if isinstance(cmd, str):
+        cmd = list(_split_command(cmd))
+    if kubeconfig_path:
+        cmd = add_kubeconfig_arg(cmd, kubeconfig_path)
+    masked_cmd = shlex.join(mask_secrets(cmd, secrets))
+    log.log(cmd_log_level, f"Executing command: {masked_cmd}")
+
+    key = None
+    if not custom_env:
+        key = _oc_singleflight_key(cmd, env, cluster_config)
+    start = time.perf_counter()
+    if key:
+        completed_process, slot_wait = await _run_shared(key, cmd, env, timeout)
+    else:
+        try:
+            completed_process, slot_wait = await _run_subprocess(cmd, env, timeout)
+        finally:
+            _invalidate_oc_reads(cmd)
+    processed = time.perf_counter()
+    failed = True
+    try:
+        completed_process = process_command_result(
+            completed_process,
+            masked_cmd,
+            secrets=secrets,
+            ignore_error=ignore_error,
+            silent=silent,
+            output_file=output_file,
+            stdout_loader=stdout_loader,
+        )
+        failed = bool(completed_process.returncode)
+        return completed_process
+    finally:
+        command_telemetry.record_command(
+            cmd,
+            cluster_config,
+            lock_wait=slot_wait,
+            subprocess_time=processed - start - slot_wait,
+            parse_time=time.perf_counter() - processed,
+            output_bytes=len(completed_process.stdout or b""),
+            error=failed,
+        )
+
+
+class AsyncTimeoutSampler(TimeoutSampler):
+    """
+    Samples the function output in the event loop, counterpart of
+    TimeoutSampler with the same arguments, timeout handling, logging and
+    adaptive scheduling (see TimeoutSampler.with_backoff).
+
+    The func can be a coroutine function (awaited on every sample) or a plain
+    function, which must not block for long. Iterate over the samples with
+    'async for', eg.::
+
+        async for pods in AsyncTimeoutSampler(300, 5, list_pods_async):
+            if all_running(pods):
+                break
+    """
+
+    async def __aiter__(self):
+        # adaptive schedule takes one more sample at the deadline
+        final_sample = False
+        while True:
+            self._start_attempt(final_sample)
+            try:
+                result = self.func(*self.func_args, **self.func_kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+                self.last_result = result
+                self._has_result = True
+                self.last_exception = None
+                try:
+                    yield result
+                except GeneratorExit:
+                    self.stats["time_to_success"] = time.time() - self.start_time
+                    raise
+            except Exception as exc:
+                self._log_failed_attempt(exc)
+            sleep, final_sample = self._plan_sleep()
+            await asyncio.sleep(sleep)
+            self._record_sleep(sleep)
+
+    async def wait_for_func_value(self, value):
+        """
+        Wait until func returns the given value.
+
+        Args:
+            value: Expected return value of func we are waiting for.
+
+        Raises:
+            TimeoutExpiredError: When func doesn't return the value in time
+                (or the configured timeout_exc_cls)
+
+        """
+        samples = self.__aiter__()
+        try:
+            async for i_value in samples:
+                if i_value == value:
+                    self.stats["time_to_success"] = time.time() - self.start_time
+                    break
+        except self.timeout_exc_cls:
+            self._log_wait_failure(value)
+            raise
+        finally:
+            await samples.aclose()
+
+    async def wait_for_func_status(self, result):
+        """
+        Wait until func returns the given result.
+
+        Args:
+            result (bool): Expected result from func.
+
+        Returns:
+            bool: True if func returned the result, False on timeout
+
+        """
+        try:
+            await self.wait_for_func_value(result)
+            return True
+        except self.timeout_exc_cls:
+            return False
+
+
+async def in_cluster_context(config_index, awaitable):
+    """
+    Await the awaitable with the config of the given cluster, other tasks
+    keep using their own cluster
+
+    Args:
+        config_index (int): Index of the cluster config
+        awaitable (awaitable): Coroutine to await in the cluster context
+
+    Returns:
+        object: Result of the awaitable
+
+    """
+    token = config_index_var.set(config_index)
+    try:
+        return await awaitable
+    finally:
+        config_index_var.reset(token)
+
+
+async def gather_limited(awaitables, limit=None, return_exceptions=False):
+    """
+    Await the awaitables concurrently, at most limit of them at a time
+
+    Args:
+        awaitables (iterable): Coroutines (or other awaitables) to await
+        limit (int): Maximal number of awaitables awaited at the same time,
+            None for no limit
+        return_exceptions (bool): True to return the exceptions raised by the
+            awaitables among the results instead of raising the first one
+
+    Returns:
+        list: Results of the awaitables, in their order
+
+    """
+    awaitables = list(awaitables)
+    if limit:
+        semaphore = asyncio.Semaphore(limit)
+
+        async def limited(awaitable):
+            async with semaphore:
+                return await awaitable
+
+        awaitables = [limited(awaitable) for awaitable in awaitables]
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        # don't leave the other waits running after the first failure
+        for task in tasks:
+            task.cancel()
+
+
+def run_sync(awaitable):
+    """
+    Run the coroutine to completion from sync code. The coroutine runs in
+    a new event loop of this thread, or of a helper thread when this thread
+    already runs an event loop. The cluster context of the caller is used.
+
+    Args:
+        awaitable (coroutine): Coroutine to run
+
+    Returns:
+        object: Result of the coroutine
+
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(awaitable)
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(context.run, asyncio.run, awaitable).result()
+
+
+def run_concurrently(awaitables, limit=None, return_exceptions=False):
+    """
+    Sync adapter of gather_limited: await thousands of waits concurrently in
+    one thread
+
+    Args:
+        awaitables (iterable): Coroutines to await
+        limit (int): Maximal number of coroutines awaited at the same time,
+            None for no limit
+        return_exceptions (bool): True to return the exceptions raised by the
+            coroutines among the results instead of raising the first one
+
+    Returns:
+        list: Results of the coroutines, in their order
+
+    """
+    awaitables = list(awaitables)
+    # run the config context of the calling thread in the event loop, the
+    # loop may run in a helper thread without the thread local index
+    config_index = config_index_var.get()
+    if config_index is None:
+        config_index = getattr(config.thread_local_data, "config_index", None)
+    if config_index is not None:
+        awaitables = [
+            in_cluster_context(config_index, awaitable) for awaitable in awaitables
+        ]
+    return run_sync(
+        gather_limited(awaitables, limit=limit, return_exceptions=return_exceptions)
+    )
@@ -0,0 +1,371 @@
+"""
+Content-addressed store of the collected log artifacts
+
+When several tests fail in one session, every failure collects full
+must-gathers and most of their content (CRDs, static configs, logs of the
+pods which didn't log anything new) is identical to the previous collection.
+ArtifactStore hashes every collected file into the blob directory of the
+session, each file of the collection becomes a hardlink to its blob and the
+collection gets a manifest of its files. A log which only grew since the
+previous collection of the same series (eg. OCS must-gather of the same
+cluster) is stored as a delta: the blob of the appended part and a recipe
+pointing to the previous content. The delta file in the collection directory
+contains only the lines appended since the previous collection, restore
+rebuilds the full tree, eg.::
+
+    store = get_artifact_store()
+    store.add_tree(log_dir_path, series="cluster-1/ocs_must_gather")
+    ...
+    ArtifactStore.restore(log_dir_path, restored_path)
+"""
+
+import errno
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+
+from ocs_ci.framework import config
+
+log = logging.getLogger(__name__)
+
+MANIFEST_FILE = "artifact_manifest.json"
+BLOBS_DIR = "blobs"
+SERIES_DIR = "series"
+RECIPE_SUFFIX = ".delta"
+# only logs are appended to between the collections
+DELTA_SUFFIXES = (".log",)
+CHUNK_SIZE = 1024 * 1024
+
+_stores = dict()
+_stores_lock = threading.Lock()
+
+
+class ArtifactStore(object):
+    """
+    Blob store shared by the log collections of one session
+    """
+
+    def __init__(self, store_dir):
+        """
+        Args:
+            store_dir (str): Directory of the blobs, on the same filesystem as
+                the collected logs to hardlink them
+
+        """
+        self.store_dir = store_dir
+        self.blobs_dir = os.path.join(store_dir, BLOBS_DIR)
+        self.series_dir = os.path.join(store_dir, SERIES_DIR)
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        os.makedirs(self.series_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats = dict(
+            files=0,
+            bytes=0,
+            stored_bytes=0,
+            deduplicated_files=0,
+            delta_files=0,
+        )
+
+    def blob_path(self, sha):
+        """
+        Args:
+            sha (str): sha256 of the content
+
+        Returns:
+            str: Path of the blob of the content
+
+        """
+        return os.path.join(self.blobs_dir, sha[:2], sha)
+
+    def _count(self, **stats):
+        with self._lock:
+            for key, value in stats.items():
+                self.stats[key] += value
+
+    def has_content(self, sha):
+        """
+        Args:
+            sha (str): sha256 of the content
+
+        Returns:
+            bool: True if the content is stored as blob or as delta recipe
+
+        """
+        path = self.blob_path(sha)
+        return os.path.exists(path) or os.path.exists(path + RECIPE_SUFFIX)
+
+    def _link_blob(self, file_path, sha):
+        """
+        Make the file and the blob of its content one file, the blob is
+        created from the file when missing
+
+        Returns:
+            bool: True if the content was already stored
+
+        """
+        blob_path = self.blob_path(sha)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        try:
+            os.link(file_path, blob_path)
+            return False
+        except FileExistsError:
+            pass
+        except OSError as ex:
+            if ex.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+            # no hardlinks, the store keeps its copy
+            if not os.path.exists(blob_path):
+                _copy_atomic(file_path, blob_path)
+                return False
+            return True
+        tmp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError as ex:
+            if ex.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+            return True
+        os.replace(tmp_path, file_path)
+        return True
+
+    def _previous(self, series):
+        """
+        Returns:
+            dict: Files of the previous collection of the series
+
+        """
+        if not series:
+            return dict()
+        path = os.path.join(self.series_dir, _series_file(series))
+        try:
+            with open(path) as series_file:
+                return json.load(series_file)
+        except FileNotFoundError:
+            return dict()
+
+    def add_tree(self, tree_dir, series=None):
+        """
+        Store the files of the collected tree, replace them by hardlinks to
+        their blobs (or by the appended part for the grown logs) and write the
+        manifest of the tree
+
+        Args:
+            tree_dir (str): Directory of the collected logs
+            series (str): Name of the series of the collections the deltas are
+                computed against, eg. '<cluster name>/ocs_must_gather', None
+                for no deltas
+
+        Returns:
+            dict: Manifest of the tree, the relative path of every file by
+                its sha256 and size, deltas have base sha256 and size too
+
+        """
+        previous = self._previous(series)
+        files = dict()
+        for root, dirs, names in os.walk(tree_dir):
+            dirs.sort()
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                rel_path = os.path.relpath(path, tree_dir)
+                if rel_path == MANIFEST_FILE:
+                    continue
+                if os.path.islink(path):
+                    files[rel_path] = {"symlink": os.readlink(path)}
+                    continue
+                files[rel_path] = self._add_file(path, previous.get(rel_path))
+        manifest = {"series": series, "files": files}
+        with open(os.path.join(tree_dir, MANIFEST_FILE), "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+        if series:
+            series_path = os.path.join(self.series_dir, _series_file(series))
+            tmp_path = f"{series_path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "w") as series_file:
+                json.dump(files, series_file)
+            os.replace(tmp_path, series_path)
+        log.info(
+            f"Artifacts of {tree_dir} stored to {self.store_dir}: {len(files)} "
+            f"files, {self.stats['stored_bytes']} of {self.stats['bytes']} bytes "
+            "stored in the session"
+        )
+        return manifest
+
+    def _add_file(self, path, previous_entry):
+        """
+        Store one file of the tree
+
+        Args:
+            path (str): Path of the file
+            previous_entry (dict): Manifest entry of the same file in the
+                previous collection of the series
+
+        Returns:
+            dict: Manifest entry of the file
+
+        """
+        base_size = None
+        if (
+            previous_entry
+            and "sha" in previous_entry
+            and path.endswith(DELTA_SUFFIXES)
+            and self.has_content(previous_entry["sha"])
+        ):
+            base_size = previous_entry["size"]
+        sha, size, prefix_sha = _hash_file(path, base_size)
+        entry = {"sha": sha, "size": size}
+        self._count(files=1, bytes=size)
+        if (
+            prefix_sha is not None
+            and prefix_sha == previous_entry["sha"]
+            and size > base_size
+            and not self.has_content(sha)
+        ):
+            self._store_delta(path, sha, previous_entry["sha"], base_size)
+            entry.update(delta=True, base=previous_entry["sha"], base_size=base_size)
+            self._count(delta_files=1, stored_bytes=size - base_size)
+            return entry
+        if self._link_blob(path, sha):
+            self._count(deduplicated_files=1)
+        else:
+            self._count(stored_bytes=size)
+        return entry
+
+    def _store_delta(self, path, sha, base_sha, base_size):
+        """
+        Replace the file by its part appended to the base content, store the
+        part as blob and the recipe of the full content
+        """
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        delta_hash = hashlib.sha256()
+        with open(path, "rb") as source, open(tmp_path, "wb") as delta_file:
+            source.seek(base_size)
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                delta_hash.update(chunk)
+                delta_file.write(chunk)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+        delta_sha = delta_hash.hexdigest()
+        self._link_blob(path, delta_sha)
+        recipe_path = self.blob_path(sha) + RECIPE_SUFFIX
+        os.makedirs(os.path.dirname(recipe_path), exist_ok=True)
+        tmp_path = f"{recipe_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as recipe_file:
+            json.dump({"base": base_sha, "delta": delta_sha}, recipe_file)
+        os.replace(tmp_path, recipe_path)
+
+    def write_content(self, sha, target):
+        """
+        Write the stored content to the file object
+
+        Args:
+            sha (str): sha256 of the content
+            target (file): Binary file object to write the content to
+
+        Raises:
+            FileNotFoundError: In case the content is not stored
+
+        """
+        blob_path = self.blob_path(sha)
+        recipe_path = blob_path + RECIPE_SUFFIX
+        if os.path.exists(recipe_path):
+            with open(recipe_path) as recipe_file:
+                recipe = json.load(recipe_file)
+            self.write_content(recipe["base"], target)
+            self.write_content(recipe["delta"], target)
+            return
+        with open(blob_path, "rb") as blob:
+            shutil.copyfileobj(blob, target, CHUNK_SIZE)
+
+    @classmethod
+    def restore(cls, tree_dir, dest_dir, store_dir=None):
+        """
+        Restore the full collected tree, the unchanged files are hardlinked
+        from the tree and the deltas are rebuilt from the store
+
+        Args:
+            tree_dir (str): Directory of the collected logs with manifest
+            dest_dir (str): Directory for the restored tree
+            store_dir (str): Directory of the store, defaults to the store of
+                the session
+
+        """
+        with open(os.path.join(tree_dir, MANIFEST_FILE)) as manifest_file:
+            manifest = json.load(manifest_file)
+        store = cls(store_dir) if store_dir else get_artifact_store()
+        for rel_path, entry in manifest["files"].items():
+            dest_path = os.path.join(dest_dir, rel_path)
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            if "symlink" in entry:
+                os.symlink(entry["symlink"], dest_path)
+            elif entry.get("delta"):
+                with open(dest_path, "wb") as dest_file:
+                    store.write_content(entry["sha"], dest_file)
+            else:
+                try:
+                    os.link(os.path.join(tree_dir, rel_path), dest_path)
+                except OSError:
+                    shutil.copyfile(os.path.join(tree_dir, rel_path), dest_path)
+
+
+def _series_file(series):
+    return hashlib.sha256(series.encode()).hexdigest() + ".json"
+
+
+def _copy_atomic(source, target):
+    tmp_path = f"{target}.{uuid.uuid4().hex}.tmp"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+def _hash_file(path, prefix_size=None):
+    """
+    Hash the file content and optionally its prefix in one read
+
+    Args:
+        path (str): Path of the file
+        prefix_size (int): Size of the prefix to hash, None for no prefix
+
+    Returns:
+        tuple: sha256 of the content, size of the content and sha256 of the
+            prefix (None if not requested or the file is shorter)
+
+    """
+    content_hash = hashlib.sha256()
+    prefix_hash = hashlib.sha256() if prefix_size is not None else None
+    size = 0
+    with open(path, "rb") as content:
+        for chunk in iter(lambda: content.read(CHUNK_SIZE), b""):
+            content_hash.update(chunk)
+            if prefix_hash is not None and size < prefix_size:
+                prefix_hash.update(chunk[: prefix_size - size])
+            size += len(chunk)
+    prefix_sha = None
+    if prefix_hash is not None and size >= prefix_size:
+        prefix_sha = prefix_hash.hexdigest()
+    return content_hash.hexdigest(), size, prefix_sha
+
+
+def get_artifact_store(cluster_config=None):
+    """
+    Store of the session in RUN['log_dir']
+
+    Args:
+        cluster_config (MultiClusterConfig): Config of the cluster, the store
+            is shared by all the clusters of the run
+
+    Returns:
+        ArtifactStore: Store of the session
+
+    """
+    run_config = cluster_config or config
+    store_dir = os.path.join(
+        os.path.expanduser(run_config.RUN["log_dir"]),
+        f"artifact_store_{run_config.RUN['run_id']}",
+    )
+    with _stores_lock:
+        if store_dir not in _stores:
+            _stores[store_dir] = ArtifactStore(store_dir)
+        return _stores[store_dir]
@@ -0,0 +1,348 @@
+"""
+Compressed writer and transparent reader of the collected log artifacts
+
+The collectors write the logs through ArtifactWriter: the content is buffered
+up to the threshold and the small artifact is written as plain file, the
+bigger one is compressed on the fly to '<path>.zst' (multithreaded zstd, gzip
+'<path>.gz' when zstandard is not installed), so the uncompressed copy never
+hits the disk, eg.::
+
+    with ArtifactWriter(os.path.join(log_dir, "pod.log")) as writer:
+        writer.write(logs)
+    ...
+    with open_artifact(os.path.join(log_dir, "pod.log")) as log_file:
+        for line in log_file:
+            ...
+
+open_artifact and read_artifact find the compressed variant of the path and
+read plain, zstd and gzip artifacts alike.
+"""
+
+import gzip
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from ocs_ci.framework import config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+log = logging.getLogger(__name__)
+
+ZSTD_SUFFIX = ".zst"
+GZIP_SUFFIX = ".gz"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_LEVEL = 3
+# on the fly compression, the fastest level compresses the logs well enough
+GZIP_LEVEL = 1
+DEFAULT_THRESHOLD = 64 * 1024
+CHUNK_SIZE = 1024 * 1024
+# artifacts compressed already, compress_tree leaves them as they are
+COMPRESSED_SUFFIXES = (
+    ZSTD_SUFFIX,
+    GZIP_SUFFIX,
+    ".tgz",
+    ".bz2",
+    ".xz",
+    ".zip",
+)
+
+
+def compression_suffix():
+    """
+    Returns:
+        str: Suffix of the compressed artifacts, '.zst' or '.gz' when
+            zstandard is not installed
+
+    """
+    return ZSTD_SUFFIX if zstandard is not None else GZIP_SUFFIX
+
+
+def compression_enabled(cluster_config=None):
+    """
+    Args:
+        cluster_config (MultiClusterConfig): Config of the cluster
+
+    Returns:
+        bool: True if REPORTING['compress_artifacts'] is set
+
+    """
+    return bool((cluster_config or config).REPORTING.get("compress_artifacts"))
+
+
+class ArtifactWriter(object):
+    """
+    File-like writer of one artifact, compressing it once it grows over the
+    threshold
+    """
+
+    def __init__(self, path, compress=None, threshold=None, threads=None):
+        """
+        Args:
+            path (str): Path of the artifact, the compressed artifact gets the
+                compression suffix
+            compress (bool): Compress the artifact, defaults to
+                REPORTING['compress_artifacts']
+            threshold (int): Artifacts up to this number of bytes are written
+                plain, defaults to REPORTING['artifact_compression_threshold']
+            threads (int): Number of the zstd compression threads, 0 for
+                compression in the writing thread, defaults to
+                REPORTING['artifact_compression_threads']
+
+        """
+        reporting = config.REPORTING
+        self.plain_path = path
+        self.path = path
+        self.compress = compression_enabled() if compress is None else compress
+        if threshold is None:
+            threshold = reporting.get(
+                "artifact_compression_threshold", DEFAULT_THRESHOLD
+            )
+        self.threshold = threshold
+        if threads is None:
+            threads = reporting.get("artifact_compression_threads", 0)
+        self.threads = threads
+        self.bytes_written = 0
+        self._buffer = []
+        self._buffered = 0
+        self._file = None
+        self._stream = None
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def compressed(self):
+        """
+        Returns:
+            bool: True if the artifact is written compressed
+
+        """
+        return self._stream is not None
+
+    def _open_compressed(self):
+        """
+        Start the compressed artifact and write the buffered content to it
+        """
+        self.path = self.plain_path + compression_suffix()
+        self._file = open(self.path, "wb")
+        if zstandard is not None:
+            compressor = zstandard.ZstdCompressor(
+                level=ZSTD_LEVEL, threads=self.threads
+            )
+            self._stream = compressor.stream_writer(self._file)
+        else:
+            self._stream = gzip.GzipFile(
+                filename=os.path.basename(self.plain_path),
+                fileobj=self._file,
+                mode="wb",
+                compresslevel=GZIP_LEVEL,
+            )
+        for chunk in self._buffer:
+            self._stream.write(chunk)
+        self._buffer = []
+
+    def write(self, data):
+        """
+        Args:
+            data (str or bytes): Content to append, str is encoded to UTF-8
+
+        Returns:
+            int: Number of the written characters or bytes
+
+        """
+        if self.closed:
+            raise ValueError(f"Artifact {self.path} is closed")
+        chunk = (
+            data.encode("utf-8", "surrogateescape") if isinstance(data, str) else data
+        )
+        self.bytes_written += len(chunk)
+        if self._stream is not None:
+            self._stream.write(chunk)
+        elif not self.compress:
+            if self._file is None:
+                self._file = open(self.plain_path, "wb")
+            self._file.write(chunk)
+        elif self._buffered + len(chunk) > self.threshold:
+            self._buffer.append(chunk)
+            self._open_compressed()
+        else:
+            self._buffer.append(chunk)
+            self._buffered += len(chunk)
+        return len(data)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def close(self):
+        """
+        Finish the artifact, the content up to the threshold is written plain
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            finally:
+                if not self._file.closed:
+                    self._file.close()
+            return
+        if self._file is not None:
+            self._file.close()
+            return
+        with open(self.plain_path, "wb") as plain_file:
+            plain_file.writelines(self._buffer)
+        self._buffer = []
+
+
+def write_artifact(path, content, **kwargs):
+    """
+    Write the artifact through ArtifactWriter
+
+    Args:
+        path (str): Path of the artifact
+        content (str or bytes): Content of the artifact
+        kwargs (dict): ArtifactWriter arguments (compress, threshold, threads)
+
+    Returns:
+        str: Path of the written artifact, with the compression suffix if
+            compressed
+
+    """
+    with ArtifactWriter(path, **kwargs) as writer:
+        writer.write(content)
+    return writer.path
+
+
+def find_artifact(path):
+    """
+    Args:
+        path (str): Path of the artifact as it was written
+
+    Returns:
+        str: The path if it exists, else its compressed variant, None if
+            there is none of them
+
+    """
+    for candidate in (path, path + ZSTD_SUFFIX, path + GZIP_SUFFIX):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def open_artifact(path, mode="r", encoding="utf-8", errors="replace"):
+    """
+    Open the artifact for reading, the compressed content is decompressed
+    while reading
+
+    Args:
+        path (str): Path of the artifact, plain or compressed (the compressed
+            variant of the path is found when the path doesn't exist)
+        mode (str): 'r' for text, 'rb' for binary file object
+        encoding (str): Encoding of the text
+        errors (str): How to handle the encoding errors of the text
+
+    Returns:
+        file: Readable file object of the content
+
+    Raises:
+        FileNotFoundError: In case there is no artifact of the path
+        ImportError: In case the artifact is zstd compressed and zstandard is
+            not installed
+
+    """
+    artifact_path = find_artifact(path)
+    if artifact_path is None:
+        raise FileNotFoundError(f"No artifact {path}")
+    with open(artifact_path, "rb") as raw:
+        magic = raw.read(len(ZSTD_MAGIC))
+    if magic.startswith(GZIP_MAGIC):
+        binary = gzip.open(artifact_path, "rb")
+    elif magic == ZSTD_MAGIC:
+        if zstandard is None:
+            raise ImportError(f"zstandard is required to read {artifact_path}")
+        binary = io.BufferedReader(
+            zstandard.ZstdDecompressor().stream_reader(
+                open(artifact_path, "rb"), closefd=True
+            )
+        )
+    else:
+        binary = open(artifact_path, "rb")
+    if mode == "rb":
+        return binary
+    return io.TextIOWrapper(binary, encoding=encoding, errors=errors)
+
+
+def read_artifact(path, mode="r"):
+    """
+    Args:
+        path (str): Path of the artifact, plain or compressed
+        mode (str): 'r' for text, 'rb' for bytes
+
+    Returns:
+        str or bytes: Content of the artifact
+
+    """
+    with open_artifact(path, mode=mode) as artifact:
+        return artifact.read()
+
+
+def _compress_file(path):
+    """
+    Replace the file by its compressed artifact
+    """
+    # zero threshold: the first chunk starts the compressed artifact, the
+    # plain file is never rewritten
+    with open(path, "rb") as source:
+        with ArtifactWriter(path, compress=True, threshold=0, threads=0) as writer:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                writer.write(chunk)
+    os.remove(path)
+
+
+def compress_tree(tree_dir, threshold=None, workers=None):
+    """
+    Compress the files of the collected tree (eg. must-gather written by oc)
+    in place file by file, so the tree never takes more space than the
+    uncompressed tree and the files being compressed
+
+    Args:
+        tree_dir (str): Directory of the collected logs
+        threshold (int): Files up to this size are kept plain, defaults to
+            REPORTING['artifact_compression_threshold']
+        workers (int): Number of the files compressed at the same time,
+            defaults to REPORTING['artifact_compression_threads'] (at least 1)
+
+    Returns:
+        int: Number of the compressed files
+
+    """
+    if threshold is None:
+        threshold = config.REPORTING.get(
+            "artifact_compression_threshold", DEFAULT_THRESHOLD
+        )
+    if workers is None:
+        workers = config.REPORTING.get("artifact_compression_threads", 0)
+    paths = []
+    for root, _, names in os.walk(tree_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            if name.endswith(COMPRESSED_SUFFIXES) or os.path.islink(path):
+                continue
+            if os.path.getsize(path) > threshold:
+                paths.append(path)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        list(executor.map(_compress_file, paths))
+    log.info(f"Compressed {len(paths)} files of {tree_dir}")
+    return len(paths)
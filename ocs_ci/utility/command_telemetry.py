@@ -0,0 +1,398 @@
+"""
+In-process telemetry of the executed oc and ceph commands
+
+Every command executed by exec_cmd (and every oc command served by the
+kube_api backend or by pod exec session) is recorded under its call shape -
+the executable, verb, kind and cluster index, e.g. ('oc', 'get', 'pod', 0) or
+('oc', 'rsh', 'ceph', 0) - together with the time spent waiting on the
+threading lock, in the subprocess (or API call), processing of the output and
+the output size. The records are aggregated right away to per shape counters
+and a log2 latency histogram, so the recording costs a few microseconds and
+memory doesn't grow with the number of calls.
+
+Two recorders are kept: one reset at the start of every test and one for the
+whole session.
+"""
+
+import csv
+import json
+import os
+import threading
+
+from ocs_ci.framework import config
+from ocs_ci.utility.singleflight import OC_OPTIONS_WITH_VALUE
+
+# executables which verb (and kind) is recorded, the first positional
+# argument of other commands can be anything (host, path, ...)
+VERB_PROGRAMS = frozenset(["oc", "kubectl", "ceph", "rados", "rbd"])
+# oc verbs followed by the kind of the resource
+OC_KIND_VERBS = frozenset(
+    [
+        "annotate",
+        "delete",
+        "describe",
+        "edit",
+        "get",
+        "label",
+        "patch",
+        "scale",
+        "wait",
+    ]
+)
+# histogram buckets are powers of two of milliseconds: <1ms, <2ms, ... >=2^19ms
+HISTOGRAM_BUCKETS = 21
+
+
+def _positional(args, count):
+    """
+    Get first positional arguments of the command, options and values of
+    the options are skipped
+    """
+    positional = []
+    skip_value = False
+    for arg in args:
+        if skip_value:
+            skip_value = False
+        elif arg in OC_OPTIONS_WITH_VALUE:
+            skip_value = True
+        elif arg == "--":
+            continue
+        elif not arg.startswith("-"):
+            positional.append(arg)
+            if len(positional) == count:
+                break
+    return positional
+
+
+def command_shape(cmd):
+    """
+    Get low cardinality shape of the command: resource names, pod names and
+    other arguments are dropped
+
+    Args:
+        cmd (list): Split command
+
+    Returns:
+        tuple: Executable, verb and kind (empty strings if not known)
+
+    """
+    if not cmd:
+        return ("", "", "")
+    program = os.path.basename(cmd[0])
+    if program not in VERB_PROGRAMS:
+        return (program, "", "")
+    if program in ("oc", "kubectl"):
+        positional = _positional(cmd[1:], 3)
+        verb = positional[0] if positional else ""
+        kind = ""
+        if verb in OC_KIND_VERBS and len(positional) > 1:
+            kind = positional[1].split("/")[0].split(".")[0].lower()
+        elif verb in ("rsh", "exec"):
+            # the executable run in the pod
+            if "--" in cmd[:-1]:
+                kind = os.path.basename(cmd[cmd.index("--") + 1])
+            else:
+                remote = _positional(cmd[cmd.index(verb) + 1 :], 2)
+                if len(remote) > 1:
+                    kind = os.path.basename(remote[1])
+        return (program, verb, kind)
+    positional = _positional(cmd[1:], 2)
+    return (program, positional[0] if positional else "", "")
+
+
+def cluster_index(cluster_config=None):
+    """
+    Get index of the cluster the command is executed against
+
+    Args:
+        cluster_config (MultiClusterConfig): Config of the cluster, current
+            cluster context if not provided
+
+    Returns:
+        int: Multicluster index, None if not known
+
+    """
+    run_config = cluster_config or config
+    try:
+        return run_config.MULTICLUSTER.get("multicluster_index")
+    except AttributeError:
+        return None
+
+
+class ShapeStats(object):
+    """
+    Aggregated records of one call shape
+    """
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "total_time",
+        "max_time",
+        "lock_wait",
+        "subprocess_time",
+        "parse_time",
+        "output_bytes",
+        "histogram",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.lock_wait = 0.0
+        self.subprocess_time = 0.0
+        self.parse_time = 0.0
+        self.output_bytes = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, lock_wait, subprocess_time, parse_time, output_bytes, error):
+        total = lock_wait + subprocess_time + parse_time
+        self.calls += 1
+        self.errors += error
+        self.total_time += total
+        if total > self.max_time:
+            self.max_time = total
+        self.lock_wait += lock_wait
+        self.subprocess_time += subprocess_time
+        self.parse_time += parse_time
+        self.output_bytes += output_bytes
+        bucket = int(total * 1000).bit_length()
+        self.histogram[min(bucket, HISTOGRAM_BUCKETS - 1)] += 1
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.errors += other.errors
+        self.total_time += other.total_time
+        self.max_time = max(self.max_time, other.max_time)
+        self.lock_wait += other.lock_wait
+        self.subprocess_time += other.subprocess_time
+        self.parse_time += other.parse_time
+        self.output_bytes += other.output_bytes
+        for index, count in enumerate(other.histogram):
+            self.histogram[index] += count
+
+    def percentile(self, percent):
+        """
+        Estimate latency percentile from the histogram
+
+        Args:
+            percent (float): Percentile (e.g. 95)
+
+        Returns:
+            float: Upper bound of the bucket in seconds
+
+        """
+        if not self.calls:
+            return 0.0
+        threshold = self.calls * percent / 100.0
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if seen >= threshold:
+                return min((2**index) / 1000.0, self.max_time)
+        return self.max_time
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_time": round(self.total_time, 6),
+            "max_time": round(self.max_time, 6),
+            "p50": round(self.percentile(50), 6),
+            "p95": round(self.percentile(95), 6),
+            "lock_wait": round(self.lock_wait, 6),
+            "subprocess_time": round(self.subprocess_time, 6),
+            "parse_time": round(self.parse_time, 6),
+            "output_bytes": self.output_bytes,
+        }
+
+
+class CommandRecorder(object):
+    """
+    Thread safe aggregation of the command records by the call shape
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.shapes = dict()
+
+    def record(
+        self,
+        shape,
+        lock_wait=0.0,
+        subprocess_time=0.0,
+        parse_time=0.0,
+        output_bytes=0,
+        error=False,
+    ):
+        """
+        Record one call
+
+        Args:
+            shape (tuple): Call shape (executable, verb, kind, cluster index)
+            lock_wait (float): Seconds spent waiting on the threading lock
+            subprocess_time (float): Seconds spent in the subprocess or API call
+            parse_time (float): Seconds spent processing the output (masking,
+                loading, logging)
+            output_bytes (int): Size of the stdout
+            error (bool): True if the command failed
+
+        """
+        with self._lock:
+            stats = self.shapes.get(shape)
+            if stats is None:
+                stats = self.shapes[shape] = ShapeStats()
+            stats.add(lock_wait, subprocess_time, parse_time, output_bytes, error)
+
+    def reset(self):
+        """
+        Drop all the records
+        """
+        with self._lock:
+            self.shapes = dict()
+
+    def top(self, count=10):
+        """
+        Get the hottest call shapes
+
+        Args:
+            count (int): Number of shapes
+
+        Returns:
+            list: Tuples (shape, ShapeStats) sorted by total time
+
+        """
+        with self._lock:
+            items = list(self.shapes.items())
+        items.sort(key=lambda item: item[1].total_time, reverse=True)
+        return items[:count]
+
+    def totals(self):
+        """
+        Get aggregate of all the shapes
+
+        Returns:
+            ShapeStats: Sum of all the records
+
+        """
+        total = ShapeStats()
+        with self._lock:
+            for stats in self.shapes.values():
+                total.merge(stats)
+        return total
+
+    def summary(self, count=10):
+        """
+        Get summary suitable for reports
+
+        Args:
+            count (int): Number of the hottest shapes included
+
+        Returns:
+            dict: Totals and the hottest shapes
+
+        """
+        return {
+            "totals": self.totals().to_dict(),
+            "top": [
+                dict(shape=" ".join(str(part) for part in shape), **stats.to_dict())
+                for shape, stats in self.top(count)
+            ],
+        }
+
+    def format_table(self, count=10):
+        """
+        Format the hottest shapes as text table
+
+        Args:
+            count (int): Number of shapes
+
+        Returns:
+            str: Table with one line per shape
+
+        """
+        lines = [
+            f"{'shape':40} {'calls':>6} {'total':>9} {'p95':>8} {'lock':>8} "
+            f"{'exec':>9} {'parse':>8} {'output':>10}"
+        ]
+        for shape, stats in self.top(count):
+            program, verb, kind, index = shape
+            name = " ".join(filter(None, (program, verb, kind)))
+            name = f"{name} [{index}]" if index is not None else name
+            lines.append(
+                f"{name[:40]:40} {stats.calls:6} {stats.total_time:8.2f}s "
+                f"{stats.percentile(95):7.3f}s {stats.lock_wait:7.2f}s "
+                f"{stats.subprocess_time:8.2f}s {stats.parse_time:7.2f}s "
+                f"{stats.output_bytes:10}"
+            )
+        return "\n".join(lines)
+
+
+test_recorder = CommandRecorder()
+session_recorder = CommandRecorder()
+
+
+def record_command(
+    cmd,
+    cluster_config=None,
+    lock_wait=0.0,
+    subprocess_time=0.0,
+    parse_time=0.0,
+    output_bytes=0,
+    error=False,
+):
+    """
+    Record executed command to the test and session recorders
+
+    Args:
+        cmd (list): Split command
+        cluster_config (MultiClusterConfig): Config of the cluster
+        lock_wait (float): Seconds spent waiting on the threading lock
+        subprocess_time (float): Seconds spent in the subprocess or API call
+        parse_time (float): Seconds spent processing the output
+        output_bytes (int): Size of the stdout
+        error (bool): True if the command failed
+
+    """
+    if not config.RUN.get("command_telemetry", True):
+        return
+    shape = command_shape(cmd) + (cluster_index(cluster_config),)
+    test_recorder.record(
+        shape, lock_wait, subprocess_time, parse_time, output_bytes, error
+    )
+    session_recorder.record(
+        shape, lock_wait, subprocess_time, parse_time, output_bytes, error
+    )
+
+
+def save_report(recorder, log_dir, count=10):
+    """
+    Save summary of the recorder to command_telemetry.json and all the shapes
+    to command_telemetry.csv
+
+    Args:
+        recorder (CommandRecorder): Recorder to save
+        log_dir (str): Directory of the report files
+        count (int): Number of the hottest shapes included in the JSON summary
+
+    Returns:
+        tuple: Paths of the JSON and CSV files
+
+    """
+    json_file = os.path.join(log_dir, "command_telemetry.json")
+    with open(json_file, "w") as fd:
+        json.dump(recorder.summary(count), fd, indent=2)
+    csv_file = os.path.join(log_dir, "command_telemetry.csv")
+    with open(csv_file, "w", newline="") as fd:
+        writer = None
+        for shape, stats in recorder.top(len(recorder.shapes)):
+            row = dict(
+                zip(("program", "verb", "kind", "cluster"), shape), **stats.to_dict()
+            )
+            if writer is None:
+                writer = csv.DictWriter(fd, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+    return json_file, csv_file
@@ -13,6 +13,24 @@ from ocs_ci.ocs import ocp, defaults, constants, exceptions
 log = logging.getLogger(__name__)
 
 
+# Fields of the objects needed by the leak check in addition to metadata
+LEAK_CHECK_FIELDS = {constants.PV: ["spec.claimRef.namespace"]}
+
+
+def leak_check_key(item):
+    """
+    Args:
+        item (dict): Object (or its metadata projection)
+
+    Returns:
+        str: Key identifying the object by the leak check, generateName of
+            the object or its name if it has no generateName
+
+    """
+    metadata = item.get("metadata")
+    return metadata.get("generateName", metadata.get("name"))
+
+
 def compare_dicts(before, after):
     """
     Comparing 2 dicts and providing diff list of [added items, removed items]
@@ -29,32 +47,10 @@ def compare_dicts(before, after):
         log.debug("compare_dicts: both before and after are None")
         return None
 
-    added = []
-    removed = []
-    uid_before = [
-        uid.get("metadata").get("generateName", uid.get("metadata").get("name"))
-        for uid in before
-    ]
-    uid_after = [
-        uid.get("metadata").get("generateName", uid.get("metadata").get("name"))
-        for uid in after
-    ]
-    diff_added = [val for val in uid_after if val not in uid_before]
-    diff_removed = [val for val in uid_before if val not in uid_after]
-    if diff_added:
-        added = [
-            val
-            for val in after
-            if val.get("metadata").get("generateName", val.get("metadata").get("name"))
-            in [v for v in diff_added]
-        ]
-    if diff_removed:
-        removed = [
-            val
-            for val in before
-            if val.get("metadata").get("generateName", val.get("metadata").get("name"))
-            in [v for v in diff_removed]
-        ]
+    keys_before = {leak_check_key(item) for item in before}
+    keys_after = {leak_check_key(item) for item in after}
+    added = [item for item in after if leak_check_key(item) not in keys_before]
+    removed = [item for item in before if leak_check_key(item) not in keys_after]
     return [added, removed]
 
 
@@ -62,7 +58,9 @@ def assign_get_values(
     env_status_dict, key, kind=None, exclude_labels=None, exclude_job_owned_pods=True
 ):
     """
-    Assigning kind status into env_status_dict
+    Assigning kind status into env_status_dict. Only the metadata of the
+    objects (and the fields in LEAK_CHECK_FIELDS) is fetched, that's all
+    the leak check needs.
 
     Args:
         env_status_dict (dict): Dictionary which is
@@ -72,12 +70,15 @@ def assign_get_values(
         exclude_labels (list): App labels to ignore leftovers
         exclude_job_owned_pods (bool): If True, exclude pods owned by Jobs
     """
-    items = kind.get(all_namespaces=True)["items"]
+    items = kind.get_metadata(
+        all_namespaces=True, fields=LEAK_CHECK_FIELDS.get(kind.kind)
+    )
     items_filtered = []
     for item in items:
         ns = item.get("metadata", {}).get("namespace")
         if item.get("kind") == constants.PV:
-            ns = item.get("spec").get("claimRef", {}).get("namespace")
+            # spec is omitted from the metadata listing of unclaimed PVs
+            ns = ((item.get("spec") or {}).get("claimRef") or {}).get("namespace")
 
         item_labels = item.get("metadata", {}).get("labels", {})
         if exclude_labels:
@@ -154,7 +155,7 @@ def get_environment_status(env_dict, exclude_labels=None, exclude_job_owned_pods
         exclude_job_owned_pods (bool): If True, exclude pods owned by Jobs
     """
     with ThreadPoolExecutor(max_workers=len(config.RUN["KINDS"])) as executor:
-        for key, kind in zip(env_dict.keys(), config.RUN["KINDS"]):
+        futures = [
             executor.submit(
                 assign_get_values,
                 env_dict,
@@ -163,6 +164,10 @@ def get_environment_status(env_dict, exclude_labels=None, exclude_job_owned_pods
                 exclude_labels=exclude_labels,
                 exclude_job_owned_pods=exclude_job_owned_pods,
             )
+            for key, kind in zip(env_dict.keys(), config.RUN["KINDS"])
+        ]
+    for future in futures:
+        future.result()
 
 
 def get_status_before_execution(exclude_labels=None, exclude_job_owned_pods=True):
@@ -0,0 +1,281 @@
+"""
+Concurrent log collection with dependencies between the gatherers
+
+The log collection of a cluster consists of independent gatherers (OCS, OCP
+and service logs must-gathers, noobaa DB dump, ACM must-gather, submariner
+logs) and of gatherers which need another one finished first (the ceph
+commands of external mode need the toolbox pod). GatherPlan runs every
+gatherer as soon as its dependencies succeeded, at most
+REPORTING['log_collection_concurrency'] gatherers of all the plans at
+a time, stops waiting for a gatherer after its timeout and skips the
+gatherers depending on a failed one. The timing manifest of the run
+records what ran, how long it took and what was skipped, eg.::
+
+    plan = GatherPlan()
+    plan.add("toolbox", setup_ceph_toolbox, timeout=600)
+    plan.add("ceph", collect_ceph_external, args=(path,), depends=["toolbox"])
+    plan.add("ocp", run_must_gather, args=(ocp_path, ocp_image))
+    manifest = plan.run()
+    plan.write_manifest(log_dir_path)
+
+The gatherers run with the cluster config of the thread which runs the plan.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ocs_ci.framework import config, config_index_var
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+MANIFEST_FILE = "collection_manifest.json"
+# status of the gatherers in the manifest
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+SKIPPED = "skipped"
+
+Gatherer = namedtuple("Gatherer", "name func args kwargs depends timeout")
+
+_semaphores = dict()
+_semaphores_lock = threading.Lock()
+
+
+def get_concurrency_semaphore(limit=None):
+    """
+    Semaphore shared by all the plans with the same concurrency limit, the
+    plans of several clusters collected in parallel share the limit
+
+    Args:
+        limit (int): Maximal number of gatherers running at a time, defaults
+            to REPORTING['log_collection_concurrency']
+
+    Returns:
+        threading.BoundedSemaphore: Semaphore of the limit
+
+    """
+    limit = (
+        limit
+        or config.REPORTING.get("log_collection_concurrency")
+        or DEFAULT_CONCURRENCY
+    )
+    with _semaphores_lock:
+        if limit not in _semaphores:
+            _semaphores[limit] = threading.BoundedSemaphore(limit)
+        return _semaphores[limit]
+
+
+class GatherPlan(object):
+    """
+    Gatherers with dependencies run concurrently with bounded concurrency
+
+    The gatherers run in threads which can't be stopped, a timed out gatherer
+    is only abandoned: it keeps running (and holding its slot of the
+    concurrency semaphore) until it returns, and the interpreter joins its
+    thread at exit. Gatherers running external commands should pass their
+    own timeout to the command (like the must-gather helpers do), so that
+    the process is killed.
+    """
+
+    def __init__(self, concurrency=None, poll_interval=1):
+        """
+        Args:
+            concurrency (int): Maximal number of gatherers of all the plans
+                running at a time, defaults to
+                REPORTING['log_collection_concurrency']
+            poll_interval (float): How often (in seconds) the timeouts of the
+                running gatherers are checked
+
+        """
+        self.semaphore = get_concurrency_semaphore(concurrency)
+        self.poll_interval = poll_interval
+        self.gatherers = dict()
+        self.manifest = dict()
+        self.exceptions = dict()
+        self._started = dict()
+        self._config_index = None
+
+    def add(self, name, func, args=(), kwargs=None, depends=(), timeout=None):
+        """
+        Add the gatherer to the plan
+
+        Args:
+            name (str): Unique name of the gatherer
+            func (callable): Function collecting the logs
+            args (tuple): Positional arguments of func
+            kwargs (dict): Keyword arguments of func
+            depends (iterable): Names of the gatherers which have to succeed
+                before this one starts
+            timeout (float): Time (in seconds) to wait for the gatherer once it
+                acquired the concurrency semaphore, the time spent waiting for
+                the semaphore is not counted. None for no limit. The thread of
+                the timed out gatherer is not killed, the plan just stops
+                waiting for it.
+
+        Raises:
+            ValueError: In case the gatherer of the name is already added or
+                depends on a gatherer not added yet
+
+        """
+        if name in self.gatherers:
+            raise ValueError(f"Gatherer {name} is already in the plan")
+        unknown = [dep for dep in depends if dep not in self.gatherers]
+        if unknown:
+            raise ValueError(f"Gatherer {name} depends on unknown gatherers {unknown}")
+        self.gatherers[name] = Gatherer(
+            name, func, tuple(args), dict(kwargs or {}), tuple(depends), timeout
+        )
+
+    def _run_gatherer(self, gatherer):
+        """
+        Run the gatherer once there is a free slot of the concurrency limit
+        """
+        if self._config_index is not None:
+            config_index_var.set(self._config_index)
+        with self.semaphore:
+            self._started[gatherer.name] = time.time()
+            log.info(f"Running log gatherer {gatherer.name}")
+            return gatherer.func(*gatherer.args, **gatherer.kwargs)
+
+    def _record(self, gatherer, status, error=None):
+        """
+        Record the status and the timing of the gatherer to the manifest
+        """
+        entry = {
+            "status": status,
+            "depends": list(gatherer.depends),
+            "start": self._started.get(gatherer.name),
+            "duration": None,
+        }
+        if entry["start"] is not None:
+            entry["duration"] = round(time.time() - entry["start"], 3)
+        if error:
+            entry["error"] = error
+        self.manifest[gatherer.name] = entry
+        duration = entry["duration"]
+        duration = f" in {duration}s" if duration is not None else ""
+        log.info(f"Log gatherer {gatherer.name} {status}{duration}")
+
+    def _schedule(self, executor, pending, running):
+        """
+        Submit the pending gatherers with the succeeded dependencies, skip the
+        ones with the unsuccessful dependencies
+        """
+        for name in list(pending):
+            gatherer = pending[name]
+            states = [
+                self.manifest.get(dep, {}).get("status") for dep in gatherer.depends
+            ]
+            if all(state == SUCCEEDED for state in states):
+                running[executor.submit(self._run_gatherer, gatherer)] = gatherer
+                del pending[name]
+            elif any(state not in (None, SUCCEEDED) for state in states):
+                failed = [
+                    dep
+                    for dep, state in zip(gatherer.depends, states)
+                    if state not in (None, SUCCEEDED)
+                ]
+                self._record(
+                    gatherer, SKIPPED, error=f"unsuccessful dependencies {failed}"
+                )
+                del pending[name]
+
+    def run(self):
+        """
+        Run all the gatherers of the plan
+
+        The run returns once all the gatherers finished or timed out, the
+        threads of the timed out gatherers are left running (see the class
+        docstring), so the process may still wait for them on exit.
+
+        Returns:
+            dict: Manifest of the run, the status ('succeeded', 'failed',
+                'timed_out' or 'skipped'), dependencies, start time, duration
+                and error of every gatherer by its name
+
+        """
+        pending = dict(self.gatherers)
+        running = dict()
+        start = time.time()
+        # the executor threads run in the cluster context of the caller
+        self._config_index = config_index_var.get()
+        if self._config_index is None:
+            self._config_index = getattr(config.thread_local_data, "config_index", None)
+        executor = ThreadPoolExecutor(
+            max_workers=max(len(pending), 1), thread_name_prefix="gather"
+        )
+        try:
+            # a gatherer skipped as dependent may make others skipped too
+            while pending or running:
+                before = len(pending)
+                self._schedule(executor, pending, running)
+                if len(pending) != before:
+                    continue
+                done, _ = wait(
+                    running, timeout=self.poll_interval, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    gatherer = running.pop(future)
+                    try:
+                        future.result()
+                        self._record(gatherer, SUCCEEDED)
+                    except Exception as ex:
+                        log.exception(f"Log gatherer {gatherer.name} failed")
+                        self.exceptions[gatherer.name] = ex
+                        self._record(gatherer, FAILED, error=str(ex))
+                now = time.time()
+                for future, gatherer in list(running.items()):
+                    started = self._started.get(gatherer.name)
+                    if (
+                        gatherer.timeout is not None
+                        and started is not None
+                        and now - started > gatherer.timeout
+                    ):
+                        running.pop(future)
+                        self._record(
+                            gatherer,
+                            TIMED_OUT,
+                            error=f"not finished in {gatherer.timeout}s",
+                        )
+        finally:
+            # don't wait for the abandoned timed out gatherers
+            executor.shutdown(wait=False)
+        log.info(
+            f"Log collection of {len(self.gatherers)} gatherers finished in "
+            f"{time.time() - start:.1f}s"
+        )
+        return self.manifest
+
+    def raise_first_failure(self):
+        """
+        Raise the exception of the first failed gatherer, if any
+
+        Raises:
+            Exception: The exception raised by the first failed gatherer
+
+        """
+        for exception in self.exceptions.values():
+            raise exception
+
+    def write_manifest(self, log_dir_path):
+        """
+        Write the timing manifest of the run to the log directory
+
+        Args:
+            log_dir_path (str): Directory of the collected logs
+
+        Returns:
+            str: Path of the manifest file
+
+        """
+        os.makedirs(log_dir_path, exist_ok=True)
+        manifest_path = os.path.join(log_dir_path, MANIFEST_FILE)
+        with open(manifest_path, "w") as manifest_file:
+            json.dump(self.manifest, manifest_file, indent=2, sort_keys=True)
+        return manifest_path
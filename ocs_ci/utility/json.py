@@ -1,5 +1,10 @@
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class SetToListJSONEncoder(json.JSONEncoder):
     """
@@ -17,3 +22,22 @@ class SetToListJSONEncoder(json.JSONEncoder):
         if isinstance(obj, set):
             return list(obj)
         return super().default(obj)
+
+
+def loads(data):
+    """
+    Deserialize JSON document, the fast orjson decoder is used when installed
+
+    Args:
+        data (str or bytes): JSON document
+
+    Returns:
+        object: Deserialized python object
+
+    Raises:
+        ValueError: In case the data is not valid JSON document
+
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,602 @@
+"""
+Streaming multi-pattern scanner of pod and node logs
+
+The logs are streamed from the 'oc logs' (or 'oc debug ... dmesg')
+subprocesses of at most LogScanner.concurrency sources at a time and scanned
+chunk by chunk while they are read: all the patterns are compiled to one
+alternation, a chunk without any match is only counted and the matching
+lines are checked by the individual patterns. Only the hits, the context
+lines before the current line and the hits waiting for their context lines
+after are kept in memory, the full log is optionally streamed to the log
+directory through ArtifactWriter, eg.::
+
+    scanner = LogScanner(["core dumped", "oom_reaper"], regex=False, context=3)
+    results = scanner.scan(
+        [pod_log_source(name) for name in pod_names]
+        + [node_log_source(name) for name in node_names]
+    )
+    for result in results.values():
+        for hit in result.hits:
+            log.info(f"{hit.source} {hit.container}:{hit.line_number} {hit.line}")
+
+The patterns are matched per line, '^' and '$' anchor the line.
+"""
+
+import asyncio
+import codecs
+import logging
+import os
+import re
+import shlex
+import subprocess
+import time
+from collections import deque, namedtuple
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.utility import command_telemetry
+from ocs_ci.utility.aio import _loop_state, run_concurrently
+from ocs_ci.utility.artifact_writer import ArtifactWriter, open_artifact
+from ocs_ci.utility.utils import add_kubeconfig_arg, exec_env
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_MAX_HITS = 1000
+CHUNK_SIZE = 256 * 1024
+
+LogHit = namedtuple(
+    "LogHit", "source namespace container line_number line patterns before after"
+)
+LogHit.__doc__ = """
+Line of the log matching at least one pattern: the source name (pod or
+node), its namespace and container, 1-based line number, the line, the
+matching patterns and the context lines before and after the line
+"""
+
+
+class LogSource(object):
+    """
+    Command streaming one log to its stdout
+    """
+
+    def __init__(self, name, cmd, namespace=None, container=None, kind="pod"):
+        """
+        Args:
+            name (str): Name of the log source, eg. pod or node name
+            cmd (list): Command printing the log
+            namespace (str): Namespace of the pod
+            container (str): Container of the pod, None for the default or
+                all the containers
+            kind (str): 'pod' or 'node'
+
+        """
+        self.name = name
+        self.cmd = cmd
+        self.namespace = namespace
+        self.container = container
+        self.kind = kind
+        self.kubeconfig = None
+        self.cluster_config = None
+
+    def __repr__(self):
+        return f"LogSource({self.kind} {self.name})"
+
+
+def _oc_command(args, cluster_config=None):
+    """
+    Returns:
+        tuple: oc command with the kubeconfig of the cluster and the
+            kubeconfig for the environment
+
+    """
+    run_config = cluster_config or config
+    kubeconfig = run_config.RUN.get("kubeconfig")
+    cmd = ["oc"] + args
+    if kubeconfig:
+        cmd = add_kubeconfig_arg(cmd, kubeconfig)
+    return cmd, kubeconfig or config.RUN.get("kubeconfig")
+
+
+def pod_log_source(
+    pod_name,
+    namespace=None,
+    container=None,
+    all_containers=False,
+    previous=False,
+    since=None,
+    cluster_config=None,
+):
+    """
+    Source of the pod log, arguments of pod.get_pod_logs
+
+    Args:
+        pod_name (str): Name of the pod
+        namespace (str): Namespace of the pod, defaults to the cluster
+            namespace
+        container (str): Name of the container
+        all_containers (bool): Log of all the containers of the pod
+        previous (bool): Log of the previous instance of the container
+        since (str): Only logs newer than a relative duration like 5s, 2m
+        cluster_config (MultiClusterConfig): Config of the cluster
+
+    Returns:
+        LogSource: Source of the log
+
+    """
+    run_config = cluster_config or config
+    namespace = namespace or run_config.ENV_DATA["cluster_namespace"]
+    args = ["-n", namespace, "logs", pod_name]
+    if container:
+        args += ["-c", container]
+    if previous:
+        args.append("--previous")
+    if all_containers:
+        args.append("--all-containers=true")
+    if since:
+        args.append(f"--since={since}")
+    cmd, kubeconfig = _oc_command(args, cluster_config)
+    source = LogSource(
+        pod_name,
+        cmd,
+        namespace=namespace,
+        container="*" if all_containers else container,
+    )
+    source.kubeconfig = kubeconfig
+    source.cluster_config = cluster_config
+    return source
+
+
+def node_log_source(node_name, namespace="default", cluster_config=None):
+    """
+    Source of the kernel log of the node, see node.get_node_logs
+
+    Args:
+        node_name (str): Name of the node
+        namespace (str): Namespace of the debug pod
+        cluster_config (MultiClusterConfig): Config of the cluster
+
+    Returns:
+        LogSource: Source of the log
+
+    """
+    args = [
+        "debug",
+        f"nodes/{node_name}",
+        f"--to-namespace={namespace}",
+        "--",
+        "chroot",
+        "/host",
+        "dmesg",
+    ]
+    cmd, kubeconfig = _oc_command(args, cluster_config)
+    source = LogSource(node_name, cmd, kind="node")
+    source.kubeconfig = kubeconfig
+    source.cluster_config = cluster_config
+    return source
+
+
+class LogScanResult(object):
+    """
+    Hits of one log and the state of its scan, only the context lines and
+    the hits waiting for the lines after them are kept
+    """
+
+    def __init__(self, scanner, source, keep_content=False):
+        """
+        Args:
+            scanner (LogScanner): Scanner of the log
+            source (LogSource): Source of the log
+            keep_content (bool): Keep the whole log in content
+
+        """
+        self.source = source
+        self.hits = []
+        # number of the hits, including the ones over the max hits
+        self.hit_count = 0
+        self.lines = 0
+        self.bytes = 0
+        self.error = None
+        self.dump_path = None
+        self._content = [] if keep_content else None
+        self._scanner = scanner
+        self._before = deque(maxlen=scanner.context)
+        self._pending = []
+        self._partial = ""
+
+    @property
+    def content(self):
+        """
+        Returns:
+            str: The whole log, None if not kept
+
+        """
+        if self._content is None:
+            return None
+        return "".join(self._content)
+
+    def feed(self, text):
+        """
+        Scan the next decoded chunk of the log
+
+        Args:
+            text (str): Chunk of the log
+
+        """
+        if self._content is not None:
+            self._content.append(text)
+        text = self._partial + text
+        cut = text.rfind("\n")
+        if cut < 0:
+            self._partial = text
+            return
+        self._partial = text[cut + 1 :]
+        self._scan(text[:cut])
+
+    def _scan(self, complete):
+        """
+        Scan the complete lines, only the lines with a candidate match of
+        the patterns are split and matched, the others are just counted
+
+        Args:
+            complete (str): Lines of the log without the last new line
+
+        """
+        scanner = self._scanner
+        find = scanner.finder(complete)
+        end = len(complete)
+        pos = 0
+        while pos <= end:
+            candidate = pos if self._pending else find(pos)
+            if candidate < 0:
+                self._skip(complete, pos, end + 1)
+                return
+            line_start = complete.rfind("\n", pos, candidate) + 1 or pos
+            if line_start > pos:
+                self._skip(complete, pos, line_start)
+            line_end = complete.find("\n", line_start)
+            if line_end < 0:
+                line_end = end
+            self._feed_line(complete[line_start:line_end])
+            pos = line_end + 1
+
+    def _skip(self, complete, start, end):
+        """
+        Count the lines without match, complete[start:end - 1], and keep the
+        last of them as the context
+        """
+        segment = complete[start : end - 1]
+        self.lines += segment.count("\n") + 1
+        context = self._scanner.context
+        if context:
+            self._before.extend(segment.rsplit("\n", context)[-context:])
+
+    def finish(self):
+        """
+        Scan the last line of the log without the new line
+        """
+        if self._partial:
+            self._feed_line(self._partial)
+            self._partial = ""
+        self._pending = []
+
+    def _feed_line(self, line):
+        self.lines += 1
+        scanner = self._scanner
+        if self._pending:
+            for hit in self._pending:
+                hit.after.append(line)
+            if len(self._pending[0].after) >= scanner.context:
+                self._pending = [
+                    hit for hit in self._pending if len(hit.after) < scanner.context
+                ]
+        patterns = scanner.match(line)
+        if patterns:
+            self.hit_count += 1
+            if scanner.max_hits is None or len(self.hits) < scanner.max_hits:
+                hit = LogHit(
+                    source=self.source.name,
+                    namespace=self.source.namespace,
+                    container=self.source.container,
+                    line_number=self.lines,
+                    line=line,
+                    patterns=patterns,
+                    before=list(self._before),
+                    after=[],
+                )
+                self.hits.append(hit)
+                if scanner.context:
+                    self._pending.append(hit)
+        self._before.append(line)
+
+
+class LogScanner(object):
+    """
+    Scanner of the logs for any of the patterns
+    """
+
+    def __init__(
+        self,
+        patterns,
+        regex=True,
+        ignore_case=False,
+        context=0,
+        max_hits=DEFAULT_MAX_HITS,
+        concurrency=None,
+        timeout=600,
+    ):
+        """
+        Args:
+            patterns (list): Patterns to look for
+            regex (bool): True if the patterns are regular expressions, False
+                for plain strings
+            ignore_case (bool): True for case insensitive matching
+            context (int): Number of lines kept before and after every hit
+            max_hits (int): Maximal number of the hits kept per log, None for
+                no limit
+            concurrency (int): Maximal number of the logs streamed at the same
+                time, defaults to DEFAULT_CONCURRENCY
+            timeout (int): Timeout for streaming one log in seconds
+
+        """
+        self.patterns = list(patterns)
+        flags = re.IGNORECASE if ignore_case else 0
+        sources = [pattern if regex else re.escape(pattern) for pattern in patterns]
+        self._compiled = [
+            (pattern, re.compile(source, flags))
+            for pattern, source in zip(self.patterns, sources)
+        ]
+        self.prefilter = None
+        # plain case sensitive strings are found by str.find, much faster than
+        # the regex alternation
+        self._literals = None
+        if not regex and not ignore_case:
+            self._literals = [pattern for pattern in self.patterns if pattern]
+        if sources:
+            try:
+                self.prefilter = re.compile(
+                    "|".join(f"(?:{source})" for source in sources),
+                    flags | re.MULTILINE,
+                )
+            except re.error:
+                # eg. global inline flags, the patterns are matched one by one
+                log.debug("Patterns can't be combined, matching them one by one")
+        self.context = context
+        self.max_hits = max_hits
+        self.concurrency = concurrency or DEFAULT_CONCURRENCY
+        self.timeout = timeout
+
+    def finder(self, text):
+        """
+        Args:
+            text (str): Lines of the log
+
+        Returns:
+            callable: Function returning the position of the first candidate
+                match in the text at or after the given position, -1 if
+                there is none. Candidate in a line doesn't mean the line
+                matches, the line is matched by match.
+
+        """
+        if not self.patterns:
+            return lambda pos: -1
+        if self._literals is not None:
+            # next position of every string, recomputed once passed
+            found = {literal: -1 for literal in self._literals}
+            missing = len(text) + 1
+
+            def find_literal(pos):
+                first = missing
+                for literal, index in found.items():
+                    if index < pos:
+                        index = text.find(literal, pos)
+                        found[literal] = index = missing if index < 0 else index
+                    first = min(first, index)
+                return -1 if first == missing else first
+
+            return find_literal
+        if self.prefilter is None:
+            # every line has to be matched by the patterns one by one
+            return lambda pos: pos
+        search = self.prefilter.search
+
+        def find_match(pos):
+            match = search(text, pos)
+            return match.start() if match else -1
+
+        return find_match
+
+    def match(self, line):
+        """
+        Args:
+            line (str): Line of the log without the new line
+
+        Returns:
+            list: Patterns matching the line, in the order of the patterns
+
+        """
+        if not self._compiled:
+            return []
+        if self.prefilter is not None:
+            if not self.prefilter.search(line):
+                return []
+            if len(self._compiled) == 1:
+                return [self.patterns[0]]
+        return [pattern for pattern, regex in self._compiled if regex.search(line)]
+
+    def scan_lines(self, lines, source=None):
+        """
+        Scan the lines of already fetched or collected log
+
+        Args:
+            lines (iterable): Lines of the log, eg. open file
+            source (LogSource): Source of the log for the hits
+
+        Returns:
+            LogScanResult: Hits of the log
+
+        """
+        result = LogScanResult(self, source or LogSource(None, None))
+        for line in lines:
+            result.feed(line)
+        result.finish()
+        return result
+
+    def scan_file(self, path, source=None):
+        """
+        Scan the collected log, plain or compressed
+
+        Args:
+            path (str): Path of the log, see artifact_writer.open_artifact
+            source (LogSource): Source of the log for the hits, defaults to the
+                file name
+
+        Returns:
+            LogScanResult: Hits of the log
+
+        """
+        source = source or LogSource(os.path.basename(path), None, kind="file")
+        with open_artifact(path) as log_file:
+            result = LogScanResult(self, source)
+            for chunk in iter(lambda: log_file.read(CHUNK_SIZE), ""):
+                result.feed(chunk)
+            result.finish()
+        return result
+
+    async def scan_source_async(self, source, dump_dir=None, keep_content=False):
+        """
+        Stream the log of the source and scan it
+
+        Args:
+            source (LogSource): Source of the log
+            dump_dir (str): Directory to stream the log to as <name>.log
+                through ArtifactWriter
+            keep_content (bool): Keep the whole log in the result
+
+        Returns:
+            LogScanResult: Hits of the log, error is set when the command
+                failed or timed out
+
+        """
+        result = LogScanResult(self, source, keep_content=keep_content)
+        writer = None
+        if dump_dir:
+            result.dump_path = os.path.join(dump_dir, f"{source.name}.log")
+            writer = ArtifactWriter(result.dump_path)
+        cmd = shlex.join(source.cmd)
+        log.debug(f"Streaming log: {cmd}")
+        state = _loop_state()
+        start = time.perf_counter()
+        slot_wait = 0.0
+        try:
+            async with state.semaphore:
+                slot_wait = time.perf_counter() - start
+                result.error = await self._stream(source, result, writer)
+        except OSError as ex:
+            result.error = f"Failed to execute command: {cmd}. Error: {ex}"
+        finally:
+            if writer is not None:
+                writer.close()
+                result.dump_path = writer.path
+        result.finish()
+        if result.error:
+            log.warning(result.error)
+        command_telemetry.record_command(
+            source.cmd,
+            source.cluster_config,
+            lock_wait=slot_wait,
+            subprocess_time=time.perf_counter() - start - slot_wait,
+            output_bytes=result.bytes,
+            error=bool(result.error),
+        )
+        return result
+
+    async def _stream(self, source, result, writer):
+        """
+        Run the command of the source and scan its stdout
+
+        Returns:
+            str: Error of the command, None if the log was fully streamed
+
+        """
+        cmd = shlex.join(source.cmd)
+        process = await asyncio.create_subprocess_exec(
+            *source.cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=exec_env(source.kubeconfig),
+        )
+        # stderr of oc is short, it's read whole
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        try:
+            await asyncio.wait_for(
+                self._read(process.stdout, result, writer), self.timeout
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            stderr_task.cancel()
+            return f"Streaming of {cmd} timed out after {self.timeout}s"
+        stderr = await stderr_task
+        if await process.wait():
+            return (
+                f"Error during execution of command: {cmd}."
+                f"\nError is {stderr.decode(errors='replace')}"
+            )
+        return None
+
+    @staticmethod
+    async def _read(stream, result, writer):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            chunk = await stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            result.bytes += len(chunk)
+            if writer is not None:
+                writer.write(chunk)
+            result.feed(decoder.decode(chunk))
+        result.feed(decoder.decode(b"", final=True))
+
+    def scan(self, sources, dump_dir=None, keep_content=False):
+        """
+        Stream and scan the logs of the sources concurrently
+
+        Args:
+            sources (list): Sources of the logs (LogSource)
+            dump_dir (str): Directory to stream the logs to as <name>.log,
+                compressed when REPORTING['compress_artifacts'] is set
+            keep_content (bool): Keep the whole logs in the results
+
+        Returns:
+            dict: Name of the source: its LogScanResult, in the order of the
+                sources
+
+        """
+        sources = list(sources)
+        if dump_dir:
+            os.makedirs(dump_dir, exist_ok=True)
+        results = run_concurrently(
+            (
+                self.scan_source_async(
+                    source, dump_dir=dump_dir, keep_content=keep_content
+                )
+                for source in sources
+            ),
+            limit=self.concurrency,
+        )
+        return {result.source.name: result for result in results}
+
+
+def raise_for_error(result):
+    """
+    Args:
+        result (LogScanResult): Result of the scan
+
+    Raises:
+        CommandFailed: In case the log was not fully streamed
+
+    """
+    if result.error:
+        raise CommandFailed(result.error)
@@ -69,10 +69,11 @@ def get_environment_status_after_execution(exclude_labels=None):
         if not config.RUN["RESOURCE_DICT_TEST"][kind]:
             continue
         else:
+            existing = set(config.RUN["ENV_STATUS_POST_TEST"][kind])
+            log.debug(f"checking in {config.RUN['ENV_STATUS_POST_TEST'][kind]}")
             for item in config.RUN["RESOURCE_DICT_TEST"][kind]:
                 log.debug(f"checking if {item} exists in environment")
-                log.debug(f"checking in {config.RUN['ENV_STATUS_POST_TEST'][kind]}")
-                if item in config.RUN["ENV_STATUS_POST_TEST"][kind]:
+                if item in existing:
                     log.error(f"leftover detected: {item} for kind {kind}")
                     if kind in leftover_resources.keys():
                         leftover_resources[kind].append(item)
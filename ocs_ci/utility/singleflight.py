@@ -0,0 +1,179 @@
+"""
+Singleflight coalescing of identical concurrent calls
+
+Parallel fixtures and ConfigSafeThread pools often issue the very same
+read-only 'oc get ... -o yaml' command within milliseconds. With SingleFlight
+the first caller (leader) executes the call and all the callers which come
+with the same key while the call is in flight (followers) wait for it and get
+the same result instead of forking another subprocess.
+
+A write finished in the meantime invalidates the in-flight calls: the
+callers which come after the write don't join the calls started before it
+(see SingleFlight.invalidate), so the read after write sees the write.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+
+log = logging.getLogger(__name__)
+
+# oc sub-commands which don't change the state of the cluster
+OC_READ_ONLY_VERBS = frozenset(
+    [
+        "api-resources",
+        "api-versions",
+        "describe",
+        "explain",
+        "get",
+        "version",
+        "whoami",
+    ]
+)
+# oc global options followed by value
+OC_OPTIONS_WITH_VALUE = frozenset(
+    ["--kubeconfig", "--context", "--cluster", "--server", "--namespace", "-n"]
+)
+# options which make the read command long running or streaming
+OC_STREAMING_OPTIONS = frozenset(["-w", "--watch", "--watch-only", "-f", "--follow"])
+
+
+class _Call(object):
+    """
+    In-flight call shared by the leader and the followers
+    """
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+        self.followers = 0
+
+
+class SingleFlight(object):
+    """
+    Execute only one call per key at a time, concurrent callers with the same
+    key share the result (or the exception) of the in-flight call
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = dict()
+        self.generation = 0
+        self.stats = defaultdict(int)
+
+    def invalidate(self):
+        """
+        Don't share the calls in flight with the callers which come from now
+        on, to be called when a write which the calls may not see finished
+        """
+        with self._lock:
+            self.generation += 1
+
+    def do(self, key, func, *args, wait_timeout=None, **kwargs):
+        """
+        Execute func or wait for the in-flight call with the same key started
+        after the last invalidation
+
+        Args:
+            key (hashable): Identification of the call
+            func (callable): Function to call
+            *args: Positional arguments of func
+            wait_timeout (float): Maximum time to wait for the in-flight call,
+                None for no limit
+            **kwargs: Keyword arguments of func
+
+        Returns:
+            tuple: (result of func, True if the result is shared with other
+                call which was already in flight)
+
+        Raises:
+            Exception: Exception raised by func, the caller which waited for
+                the failed in-flight call executes func on its own
+            TimeoutError: In case the in-flight call doesn't finish in
+                wait_timeout
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.generation == self.generation:
+                call.followers += 1
+                self.stats["coalesced"] += 1
+                leader = False
+            else:
+                call = _Call(self.generation)
+                self._calls[key] = call
+                self.stats["executed"] += 1
+                leader = True
+        if not leader:
+            if not call.done.wait(wait_timeout):
+                raise TimeoutError(
+                    f"In-flight call didn't finish in {wait_timeout} seconds"
+                )
+            if call.exception is None:
+                return call.result, True
+            # the failure (e.g. timeout) of the leader is not the failure of
+            # this caller, try on its own
+            log.debug(f"In-flight call failed ({call.exception}), calling again")
+            self.stats["retried"] += 1
+            return func(*args, **kwargs), False
+        try:
+            call.result = func(*args, **kwargs)
+        except Exception as ex:
+            call.exception = ex
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        if call.followers:
+            log.debug(f"Result of call was shared with {call.followers} callers")
+        return call.result, False
+
+    @property
+    def coalesced(self):
+        """
+        int: Number of calls which were served by other in-flight call
+        """
+        return self.stats["coalesced"]
+
+    def reset_stats(self):
+        """
+        Reset the counters of executed and coalesced calls
+        """
+        with self._lock:
+            self.stats.clear()
+
+
+def oc_read_only_verb(cmd):
+    """
+    Get read-only verb of the oc command
+
+    Args:
+        cmd (list): Split oc command
+
+    Returns:
+        str: Verb of the command (e.g. 'get') if the command is oc read-only
+            command which can be shared by concurrent callers, None otherwise
+
+    """
+    if not cmd or cmd[0] != "oc":
+        return None
+    verb = None
+    skip_value = False
+    for arg in cmd[1:]:
+        if skip_value:
+            skip_value = False
+            continue
+        if arg in OC_STREAMING_OPTIONS or arg.startswith("--watch"):
+            return None
+        if arg in OC_OPTIONS_WITH_VALUE:
+            skip_value = True
+            continue
+        if verb is None and not arg.startswith("-"):
+            verb = arg
+    if verb in OC_READ_ONLY_VERBS:
+        return verb
+    return None
@@ -2,7 +2,11 @@
 Pytest configuration for utility tests.
 """
 
+import os
+
 import pytest
+
+from ocs_ci.framework import config
 from ocs_ci.framework.logger_factory import set_log_record_factory
 
 
@@ -13,3 +17,34 @@ def setup_logging():
     This ensures the 'clusterctx' attribute is available in log records.
     """
     set_log_record_factory()
+
+
+@pytest.fixture
+def fake_oc(tmp_path, monkeypatch):
+    """
+    Factory installing fake oc binary for the test. It's called with the
+    body of the script (with shebang), the script is put first in PATH and
+    the OC_LOG environment variable points to an empty file which the script
+    can record its calls to. The kubeconfig of the cluster is set and the oc
+    plugins are not looked up, so the script is called only by the test.
+
+    Returns:
+        function: Installs the script, returns the path of the OC_LOG file
+
+    """
+    bin_dir = tmp_path / "bin"
+    oc_log = tmp_path / "oc.log"
+
+    def install(script):
+        bin_dir.mkdir(exist_ok=True)
+        oc = bin_dir / "oc"
+        oc.write_text(script)
+        oc.chmod(0o755)
+        oc_log.write_text("")
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setenv("OC_LOG", str(oc_log))
+        monkeypatch.setattr("ocs_ci.utility.utils._oc_plugin_list_cache", [])
+        monkeypatch.setitem(config.RUN, "kubeconfig", str(tmp_path / "kubeconfig"))
+        return oc_log
+
+    return install
@@ -0,0 +1,276 @@
+# -*- coding: utf8 -*-
+
+import asyncio
+import logging
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import gevent
+import gevent.subprocess
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import CommandFailed, TimeoutExpiredError
+from ocs_ci.ocs.parallel import parallel
+from ocs_ci.utility import aio
+from ocs_ci.utility.utils import TimeoutSampler, exec_cmd
+
+
+log = logging.getLogger(__name__)
+
+# fake oc: logs its arguments, sleeps OC_DELAY seconds and prints the status
+# of the pod, Running when the pod is listed in the ready directory
+FAKE_OC = """#!/bin/sh
+echo "$@" >> "$OC_LOG"
+for arg in "$@"; do name="$arg"; done
+if [ "$name" = "fail" ]; then
+    echo "error: failed" >&2
+    exit 1
+fi
+if [ -n "$OC_DELAY" ]; then
+    sleep "$OC_DELAY"
+fi
+if [ -e "$OC_READY/$name" ]; then echo Running; else echo Pending; fi
+"""
+
+
+@pytest.fixture
+def fake_oc(fake_oc, tmp_path, monkeypatch):
+    oc_log = fake_oc(FAKE_OC)
+    ready = tmp_path / "ready"
+    ready.mkdir()
+    monkeypatch.setenv("OC_READY", str(ready))
+    monkeypatch.setitem(config.RUN, "kubeconfig", "/tmp/kubeconfig")
+    return SimpleNamespace(ready=ready, calls=lambda: oc_log.read_text().splitlines())
+
+
+def test_exec_cmd_async(fake_oc):
+    (fake_oc.ready / "pod-a").touch()
+    completed = aio.run_sync(aio.exec_cmd_async("oc get pod pod-a"))
+    assert completed.stdout == b"Running\n"
+    assert fake_oc.calls() == ["--kubeconfig /tmp/kubeconfig get pod pod-a"]
+    with pytest.raises(CommandFailed, match="failed"):
+        aio.run_sync(aio.exec_cmd_async("oc fail"))
+    completed = aio.run_sync(aio.exec_cmd_async("oc fail", ignore_error=True))
+    assert completed.returncode == 1
+
+
+def test_exec_cmd_async_timeout(fake_oc, monkeypatch):
+    monkeypatch.setenv("OC_DELAY", "5")
+    with pytest.raises(subprocess.TimeoutExpired):
+        aio.run_sync(aio.exec_cmd_async("oc get pod pod-a", timeout=0.5))
+
+
+def test_exec_cmd_async_limit(fake_oc, monkeypatch):
+    monkeypatch.setenv("OC_DELAY", "0.3")
+    monkeypatch.setitem(config.RUN, "async_command_limit", 2)
+    start = time.monotonic()
+    aio.run_concurrently(aio.exec_cmd_async(f"oc get pod pod-{i}") for i in range(4))
+    # two rounds of two commands
+    assert time.monotonic() - start >= 0.6
+    assert len(fake_oc.calls()) == 4
+
+
+def test_exec_cmd_async_shares_identical_commands(fake_oc, monkeypatch):
+    monkeypatch.setenv("OC_DELAY", "0.3")
+    monkeypatch.setitem(config.RUN, "oc_singleflight", True)
+    results = aio.run_concurrently(
+        aio.exec_cmd_async("oc get pod pod-a") for _ in range(50)
+    )
+    assert {result.stdout for result in results} == {b"Pending\n"}
+    assert len(fake_oc.calls()) == 1
+
+
+def test_exec_cmd_async_follower_timeout(fake_oc, monkeypatch):
+    monkeypatch.setenv("OC_DELAY", "1")
+    monkeypatch.setitem(config.RUN, "oc_singleflight", True)
+
+    async def run():
+        leader = asyncio.ensure_future(aio.exec_cmd_async("oc get pod pod-a"))
+        await asyncio.sleep(0.1)
+        # the caller waiting for the in-flight command keeps its own timeout
+        with pytest.raises(subprocess.TimeoutExpired):
+            await aio.exec_cmd_async("oc get pod pod-a", timeout=0.2)
+        return await leader
+
+    assert aio.run_sync(run()).stdout == b"Pending\n"
+
+
+def test_async_sampler(fake_oc):
+    async def pod_status(name):
+        completed = await aio.exec_cmd_async(f"oc get pod {name}")
+        return completed.stdout.decode().strip()
+
+    async def start_pod(name, delay):
+        await asyncio.sleep(delay)
+        (fake_oc.ready / name).touch()
+
+    async def wait():
+        sampler = aio.AsyncTimeoutSampler(10, 0.1, pod_status, "pod-a")
+        _, status = await asyncio.gather(
+            start_pod("pod-a", 0.3), sampler.wait_for_func_status("Running")
+        )
+        return sampler, status
+
+    sampler, status = aio.run_sync(wait())
+    assert status
+    assert sampler.stats["iterations"] > 1
+    assert 0.3 <= sampler.stats["time_to_success"] < 5
+
+    sampler = aio.AsyncTimeoutSampler(0.5, 0.1, lambda: "Pending")
+    with pytest.raises(TimeoutExpiredError):
+        aio.run_sync(sampler.wait_for_func_value("Running"))
+    assert sampler.stats["time_to_success"] is None
+
+
+def test_async_sampler_backoff():
+    sampler = aio.AsyncTimeoutSampler(1, 0.05, lambda: 1).with_backoff(
+        max_sleep=0.2, jitter=False
+    )
+    with pytest.raises(TimeoutExpiredError):
+        aio.run_sync(sampler.wait_for_func_value(2))
+    # 0.05, 0.1, 0.2, 0.2, 0.2, 0.2, then the rest to the deadline
+    assert sampler.stats["iterations"] == 8
+    assert sampler.stats["total_sleep"] == pytest.approx(1, abs=0.05)
+
+
+def test_cluster_context_per_task(monkeypatch):
+    clusters = [
+        SimpleNamespace(ENV_DATA={"cluster_name": f"cluster-{i}"}, RUN={})
+        for i in range(2)
+    ]
+    monkeypatch.setattr(config, "_snapshot", (clusters, 0))
+
+    async def cluster_names():
+        names = []
+        for _ in range(3):
+            names.append(config.ENV_DATA["cluster_name"])
+            await asyncio.sleep(0.01)
+        return names
+
+    async def switching():
+        config.switch_ctx(0)
+        await asyncio.sleep(0.02)
+        return config.ENV_DATA["cluster_name"]
+
+    results = aio.run_concurrently(
+        [
+            aio.in_cluster_context(1, cluster_names()),
+            aio.in_cluster_context(0, cluster_names()),
+            aio.in_cluster_context(1, switching()),
+            aio.in_cluster_context(1, cluster_names()),
+        ]
+    )
+    assert results == [
+        ["cluster-1"] * 3,
+        ["cluster-0"] * 3,
+        "cluster-0",
+        ["cluster-1"] * 3,
+    ]
+    # the context of the caller is not changed
+    assert config.ENV_DATA["cluster_name"] == "cluster-0"
+
+
+def test_run_concurrently_in_thread_context(monkeypatch):
+    clusters = [
+        SimpleNamespace(ENV_DATA={"cluster_name": f"cluster-{i}"}, RUN={})
+        for i in range(2)
+    ]
+    monkeypatch.setattr(config, "_snapshot", (clusters, 0))
+
+    async def cluster_name():
+        return config.ENV_DATA["cluster_name"]
+
+    def thread_task():
+        config.thread_local_data.config_index = 1
+        try:
+            return aio.run_concurrently([cluster_name()])
+        finally:
+            del config.thread_local_data.config_index
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(thread_task).result() == ["cluster-1"]
+
+
+def test_run_sync_in_running_loop():
+    async def outer():
+        return aio.run_sync(asyncio.sleep(0, result="done"))
+
+    assert aio.run_sync(outer()) == "done"
+
+
+@pytest.mark.parametrize(
+    "waits", [int(os.environ.get("OCS_CI_CONCURRENT_WAITS_BENCHMARK", 200))]
+)
+def test_concurrent_waits_benchmark(fake_oc, monkeypatch, waits):
+    """
+    Compare concurrent waits for fake oc output by threads, gevent greenlets
+    and asyncio tasks. Set OCS_CI_CONCURRENT_WAITS_BENCHMARK=2000 for the full
+    comparison, it takes minutes.
+    """
+    monkeypatch.setenv("OC_DELAY", "0.1")
+    monkeypatch.setitem(config.RUN, "async_command_limit", waits)
+    monkeypatch.setitem(config.RUN, "command_telemetry", False)
+    names = [f"pod-{i}" for i in range(waits)]
+    for name in names:
+        (fake_oc.ready / name).touch()
+    timings = {}
+
+    def oc_status(name):
+        return exec_cmd(f"oc get pod {name}").stdout.decode().strip()
+
+    def wait_thread(name):
+        return TimeoutSampler(60, 1, oc_status, name).wait_for_func_status("Running")
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=waits) as executor:
+        assert all(executor.map(wait_thread, names))
+    timings["threads"] = time.monotonic() - start
+
+    def gevent_status(name):
+        return (
+            gevent.subprocess.run(
+                ["oc", "get", "pod", name],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            .stdout.decode()
+            .strip()
+        )
+
+    def wait_greenlet(name):
+        for status in TimeoutSampler(60, 1, gevent_status, name):
+            if status == "Running":
+                return True
+            gevent.sleep(1)
+
+    start = time.monotonic()
+    with parallel() as p:
+        for name in names:
+            p.spawn(wait_greenlet, name)
+        assert all(p)
+    timings["gevent"] = time.monotonic() - start
+
+    async def async_status(name):
+        completed = await aio.exec_cmd_async(f"oc get pod {name}")
+        return completed.stdout.decode().strip()
+
+    start = time.monotonic()
+    assert all(
+        aio.run_concurrently(
+            aio.AsyncTimeoutSampler(60, 1, async_status, name).wait_for_func_status(
+                "Running"
+            )
+            for name in names
+        )
+    )
+    timings["asyncio"] = time.monotonic() - start
+
+    log.info(
+        f"{waits} concurrent waits: "
+        + ", ".join(f"{name} {elapsed:.2f}s" for name, elapsed in timings.items())
+    )
+    assert len(fake_oc.calls()) == 3 * waits
@@ -0,0 +1,170 @@
+# -*- coding: utf8 -*-
+
+import json
+import logging
+import os
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import ocp, utils
+from ocs_ci.utility import artifact_store
+from ocs_ci.utility.artifact_store import ArtifactStore
+
+
+log = logging.getLogger(__name__)
+
+MG_DIR = "quay-io-rhceph-dev-odf4-odf-must-gather-rhel9-sha256-abc"
+
+
+def must_gather_tree(collection, pods=20, crds=200):
+    """
+    Files of synthetic must-gather of the collection (0 is the first one):
+    the static content doesn't change, the pod logs grow, pod-<collection>
+    restarts (logs anew) and one new pod comes in every collection
+    """
+    files = dict()
+    for i in range(crds):
+        files[f"{MG_DIR}/cluster-scoped-resources/crds/crd-{i}.yaml"] = (
+            f"apiVersion: apiextensions.k8s.io/v1\nkind: CRD\nname: crd-{i}\n" * 30
+        ).encode()
+    files[f"{MG_DIR}/timestamp"] = f"collection {collection}\n".encode()
+    for pod in range(pods + collection):
+        first = pod * 100 if 1 <= pod <= collection else 0
+        lines = range(first, (collection + 1) * 100)
+        path = f"{MG_DIR}/namespaces/openshift-storage/pods/pod-{pod}/current.log"
+        files[path] = "".join(
+            f"2024-05-01T10:00:{line:05d}Z pod-{pod} I reconciled the object {line}\n"
+            for line in lines
+        ).encode()
+    return files
+
+
+def write_tree(tree_dir, files):
+    for rel_path, content in files.items():
+        path = os.path.join(tree_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as tree_file:
+            tree_file.write(content)
+
+
+def read_tree(tree_dir):
+    files = dict()
+    for root, _, names in os.walk(tree_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, tree_dir)
+            if rel_path != artifact_store.MANIFEST_FILE:
+                with open(path, "rb") as tree_file:
+                    files[rel_path] = tree_file.read()
+    return files
+
+
+def disk_usage(*dirs):
+    """
+    Bytes of the files of the directories, hardlinked files counted once
+    """
+    inodes = dict()
+    for top in dirs:
+        for root, _, names in os.walk(top):
+            for name in names:
+                stat = os.lstat(os.path.join(root, name))
+                inodes[(stat.st_dev, stat.st_ino)] = stat.st_size
+    return sum(inodes.values())
+
+
+def test_store_dedup_and_restore(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    collections = [must_gather_tree(i) for i in range(5)]
+    tree_dirs = []
+    for i, files in enumerate(collections):
+        tree_dir = str(tmp_path / f"failure_{i}" / "ocs_must_gather")
+        write_tree(tree_dir, files)
+        manifest = store.add_tree(tree_dir, series="cluster-0/ocs_must_gather")
+        tree_dirs.append(tree_dir)
+        assert set(manifest["files"]) == set(files)
+
+    logical = sum(len(content) for files in collections for content in files.values())
+    used = disk_usage(str(tmp_path / "store"), *tree_dirs)
+    log.info(
+        f"{len(collections)} collections: {logical} bytes collected, {used} bytes "
+        f"on disk, dedup ratio {logical / used:.1f}, stats {store.stats}"
+    )
+    assert store.stats["bytes"] == logical
+    assert logical / used > 2
+    # all the logs of the previous collection grew, except the restarted one
+    assert store.stats["delta_files"] == 19 + 20 + 21 + 22
+    # the restarted pod logs anew
+    with open(
+        os.path.join(tree_dirs[2], artifact_store.MANIFEST_FILE)
+    ) as manifest_file:
+        manifest = json.load(manifest_file)
+    restarted = f"{MG_DIR}/namespaces/openshift-storage/pods/pod-2/current.log"
+    assert not manifest["files"][restarted].get("delta")
+    grown = f"{MG_DIR}/namespaces/openshift-storage/pods/pod-0/current.log"
+    assert manifest["files"][grown]["delta"]
+    # the collection keeps just the lines appended since the previous one
+    with open(os.path.join(tree_dirs[2], grown), "rb") as delta_file:
+        assert delta_file.read() == collections[2][grown][len(collections[1][grown]) :]
+
+    for i, tree_dir in enumerate(tree_dirs):
+        restored_dir = str(tmp_path / f"restored_{i}")
+        ArtifactStore.restore(tree_dir, restored_dir, store_dir=store.store_dir)
+        assert read_tree(restored_dir) == collections[i]
+
+
+def test_store_without_series(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    for i in range(2):
+        tree_dir = str(tmp_path / f"failure_{i}")
+        write_tree(tree_dir, must_gather_tree(i, pods=2, crds=2))
+        store.add_tree(tree_dir)
+    assert store.stats["delta_files"] == 0
+    # crds
+    assert store.stats["deduplicated_files"] == 2
+    crd = f"{MG_DIR}/cluster-scoped-resources/crds/crd-0.yaml"
+    assert os.path.samefile(tmp_path / "failure_0" / crd, tmp_path / "failure_1" / crd)
+    restored_dir = str(tmp_path / "restored")
+    ArtifactStore.restore(str(tmp_path / "failure_1"), restored_dir, store.store_dir)
+    assert read_tree(restored_dir) == must_gather_tree(1, pods=2, crds=2)
+
+
+def test_run_must_gather_dedup(tmp_path, monkeypatch):
+    collection = iter(range(3))
+
+    def must_gather(self, command, **kwargs):
+        dest_dir = command.split("--dest-dir=")[1].split()[0]
+        write_tree(dest_dir, must_gather_tree(next(collection), pods=3, crds=10))
+        return "must-gather output"
+
+    monkeypatch.setattr(ocp.OCP, "exec_oc_cmd", must_gather)
+    monkeypatch.setitem(config.ENV_DATA, "cluster_name", "cluster-0")
+    monkeypatch.setitem(config.RUN, "log_dir", str(tmp_path))
+    monkeypatch.setitem(config.RUN, "run_id", 1)
+    monkeypatch.setitem(config.REPORTING, "dedup_mg_logs", True)
+    monkeypatch.setitem(config.REPORTING, "tarball_mg_logs", True)
+    for i in range(3):
+        log_dir_path = str(tmp_path / f"test_{i}" / "ocs_must_gather")
+        utils.run_must_gather(log_dir_path, "image")
+        assert not os.path.exists(f"{log_dir_path}.tar.gz")
+        assert os.path.exists(os.path.join(log_dir_path, artifact_store.MANIFEST_FILE))
+    store = artifact_store.get_artifact_store()
+    assert store.store_dir == str(tmp_path / "artifact_store_1")
+    assert store.stats["deduplicated_files"] == 2 * 10
+    assert store.stats["delta_files"] == 2 + 3
+    ArtifactStore.restore(log_dir_path, str(tmp_path / "restored"))
+    assert read_tree(str(tmp_path / "restored")) == must_gather_tree(2, pods=3, crds=10)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1024 * 1024])
+def test_hash_file_prefix(tmp_path, chunk_size, monkeypatch):
+    monkeypatch.setattr(artifact_store, "CHUNK_SIZE", chunk_size)
+    path = tmp_path / "file.log"
+    path.write_bytes(b"0123456789" * 10)
+    prefix = tmp_path / "prefix.log"
+    prefix.write_bytes(b"0123456789" * 3 + b"012")
+    prefix_sha, prefix_size, _ = artifact_store._hash_file(str(prefix))
+    sha, size, sha_of_prefix = artifact_store._hash_file(str(path), prefix_size)
+    assert size == 100
+    assert sha_of_prefix == prefix_sha
+    assert artifact_store._hash_file(str(prefix), size)[2] is None
@@ -0,0 +1,242 @@
+# -*- coding: utf8 -*-
+
+import gzip
+import json
+import logging
+import os
+import random
+import tarfile
+import time
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import ocp, utils
+from ocs_ci.ocs.must_gather import must_gather
+from ocs_ci.ocs.must_gather.must_gather import MustGather
+from ocs_ci.ocs.must_gather.path_index import build_path_index
+from ocs_ci.ocs.resources import pod
+from ocs_ci.utility import artifact_writer
+from ocs_ci.utility.artifact_writer import (
+    ArtifactWriter,
+    compress_tree,
+    open_artifact,
+    read_artifact,
+    write_artifact,
+)
+
+
+log = logging.getLogger(__name__)
+
+CODECS = ["gzip"]
+if artifact_writer.zstandard is not None:
+    CODECS.append("zstd")
+
+
+@pytest.fixture(params=CODECS)
+def codec(request, monkeypatch):
+    """
+    Compression of the artifacts, gzip is the fallback without zstandard
+    """
+    if request.param == "gzip":
+        monkeypatch.setattr(artifact_writer, "zstandard", None)
+    return request.param
+
+
+def log_corpus(size, seed=0):
+    """
+    Synthetic pod log of about the size (bytes): timestamped lines of a few
+    components and levels with object names and ids
+    """
+    rnd = random.Random(seed)
+    components = ["reconciler", "csi-rbdplugin", "noobaa-core", "rook-ceph-osd"]
+    messages = [
+        "reconciled CephCluster ocs-storagecluster-cephcluster",
+        "GRPC call: /csi.v1.Controller/CreateVolume",
+        "volume pvc-{id} provisioned in {ms}ms",
+        "failed to get object bucket-{id}: timeout after {ms}ms",
+        "pg {id}.1f active+clean, {ms} objects",
+    ]
+    lines = []
+    written = 0
+    second = 0
+    while written < size:
+        second += rnd.randint(0, 2)
+        line = (
+            f"2024-05-01T10:{second // 60 % 60:02d}:{second % 60:02d}."
+            f"{rnd.randint(0, 999999):06d}Z {rnd.choice(['I', 'I', 'I', 'W', 'E'])} "
+            f"{rnd.choice(components)} "
+            + rnd.choice(messages).format(
+                id=rnd.randint(0, 10**8), ms=rnd.randint(1, 5000)
+            )
+            + "\n"
+        )
+        lines.append(line)
+        written += len(line)
+    return "".join(lines)
+
+
+def test_small_artifact_kept_plain(tmp_path, codec):
+    path = str(tmp_path / "pod.log")
+    assert write_artifact(path, "small log\n", compress=True, threshold=1024) == path
+    with open(path) as plain_file:
+        assert plain_file.read() == "small log\n"
+    assert read_artifact(path) == "small log\n"
+
+
+def test_big_artifact_compressed(tmp_path, codec):
+    path = str(tmp_path / "pod.log")
+    content = log_corpus(100 * 1024)
+    with ArtifactWriter(path, compress=True, threshold=1024, threads=2) as writer:
+        for line in content.splitlines(keepends=True):
+            writer.write(line)
+    suffix = ".zst" if codec == "zstd" else ".gz"
+    assert writer.path == path + suffix
+    assert not os.path.exists(path)
+    assert os.path.getsize(writer.path) * 3 < len(content)
+    # the written path and the compressed path read alike
+    assert read_artifact(path) == content
+    assert read_artifact(writer.path, mode="rb") == content.encode()
+    with open_artifact(path) as log_file:
+        assert next(iter(log_file)) == content.splitlines(keepends=True)[0]
+    if codec == "gzip":
+        with gzip.open(writer.path, "rt") as gzip_file:
+            assert gzip_file.read() == content
+
+
+def test_compression_disabled(tmp_path, monkeypatch):
+    monkeypatch.setitem(config.REPORTING, "compress_artifacts", False)
+    path = str(tmp_path / "metric.json")
+    data = {"data": {"result": [{"value": [i, str(i)]} for i in range(10000)]}}
+    with ArtifactWriter(path, threshold=10) as writer:
+        json.dump(data, writer)
+    assert writer.path == path
+    with open(path) as json_file:
+        assert json.load(json_file) == data
+
+    monkeypatch.setitem(config.REPORTING, "compress_artifacts", True)
+    with ArtifactWriter(path, threshold=10) as writer:
+        json.dump(data, writer)
+    assert writer.compressed
+    assert json.loads(read_artifact(path)) == data
+
+
+def test_missing_artifact(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_artifact(str(tmp_path / "missing.log"))
+
+
+def test_compress_tree(tmp_path, codec, monkeypatch):
+    tree = tmp_path / "ocs_must_gather"
+    (tree / "ceph").mkdir(parents=True)
+    (tree / "pods").mkdir()
+    big = log_corpus(64 * 1024)
+    (tree / "ceph" / "ceph_status").write_text("kind: status\nexit code 0\n")
+    (tree / "pods" / "rook-ceph-operator.log").write_text(big)
+    (tree / "pods" / "rook-ceph-operator.yaml").write_text("kind: Pod\n" + big)
+    (tree / "gather-debug.log").write_text(big)
+    with tarfile.open(str(tree / "noobaa_diagnostics.tar.gz"), "w:gz") as tar:
+        tar.add(str(tree / "ceph"), arcname="ceph")
+    assert compress_tree(str(tree), threshold=1024, workers=2) == 3
+    suffix = ".zst" if codec == "zstd" else ".gz"
+    assert sorted(
+        os.path.relpath(os.path.join(root, name), tree)
+        for root, _, names in os.walk(tree)
+        for name in names
+    ) == [
+        "ceph/ceph_status",
+        f"gather-debug.log{suffix}",
+        "noobaa_diagnostics.tar.gz",
+        f"pods/rook-ceph-operator.log{suffix}",
+        f"pods/rook-ceph-operator.yaml{suffix}",
+    ]
+    assert read_artifact(str(tree / "pods" / "rook-ceph-operator.log")) == big
+
+    # the must-gather validations read the compressed files
+    monkeypatch.setattr(
+        must_gather.version, "get_semantic_ocs_version_from_config", lambda: None
+    )
+    mustgather = MustGather()
+    mustgather.root = str(tmp_path)
+    index = build_path_index(str(tmp_path))
+    operator_yaml = mustgather._find_file_path(index, "rook-ceph-operator.yaml")
+    assert operator_yaml == str(tree / "pods" / f"rook-ceph-operator.yaml{suffix}")
+    assert mustgather._find_file_path(index, "ceph_status") == str(
+        tree / "ceph" / "ceph_status"
+    )
+    mustgather.files_path = {"rook-ceph-operator.yaml": operator_yaml}
+    mustgather.search_file_path = lambda: None
+    mustgather.validate_expected_files()
+    assert not mustgather.files_not_exist
+    assert not mustgather.files_content_issue
+
+    matched = pod.search_pattern_in_pod_logs(
+        "rook-ceph-operator",
+        r" E rook-ceph-osd pg \d+",
+        log_path=str(tree / "pods" / "rook-ceph-operator.log"),
+    )
+    expected = [
+        line
+        for line in big.splitlines()
+        if " E rook-ceph-osd pg " in line and line.split(" pg ")[1][0].isdigit()
+    ]
+    assert matched == expected
+    assert matched
+
+
+def test_run_must_gather_compress(tmp_path, monkeypatch):
+    content = log_corpus(10 * 1024)
+
+    def must_gather(self, command, **kwargs):
+        dest_dir = command.split("--dest-dir=")[1].split()[0]
+        with open(os.path.join(dest_dir, "current.log"), "w") as log_file:
+            log_file.write(content)
+        return "must-gather output"
+
+    monkeypatch.setattr(ocp.OCP, "exec_oc_cmd", must_gather)
+    monkeypatch.setitem(config.REPORTING, "dedup_mg_logs", False)
+    monkeypatch.setitem(config.REPORTING, "tarball_mg_logs", True)
+    monkeypatch.setitem(config.REPORTING, "compress_artifacts", True)
+    monkeypatch.setitem(config.REPORTING, "artifact_compression_threshold", 1024)
+    log_dir_path = str(tmp_path / "ocs_must_gather")
+    utils.run_must_gather(log_dir_path, "image")
+    assert not os.path.exists(f"{log_dir_path}.tar.gz")
+    assert os.listdir(log_dir_path) == [
+        "current.log" + artifact_writer.compression_suffix()
+    ]
+    assert read_artifact(os.path.join(log_dir_path, "current.log")) == content
+
+
+def test_compression_benchmark(tmp_path, codec):
+    """
+    Throughput and ratio of the compression of synthetic pod logs written
+    line by line. Set OCS_CI_ARTIFACT_WRITER_BENCHMARK to the size of the
+    corpus in MiB for bigger corpus.
+    """
+    size = int(os.environ.get("OCS_CI_ARTIFACT_WRITER_BENCHMARK", 8)) * 1024 * 1024
+    content = log_corpus(size)
+    lines = content.splitlines(keepends=True)
+    results = dict()
+    for compress in (False, True):
+        path = str(tmp_path / f"pod-{compress}.log")
+        start = time.perf_counter()
+        with ArtifactWriter(path, compress=compress, threshold=1024, threads=4) as (
+            writer
+        ):
+            writer.writelines(lines)
+        write_time = time.perf_counter() - start
+        start = time.perf_counter()
+        with open_artifact(path) as log_file:
+            read_lines = sum(1 for _ in log_file)
+        read_time = time.perf_counter() - start
+        assert read_lines == len(lines)
+        results[compress] = (write_time, read_time, os.path.getsize(writer.path))
+    megabytes = len(content) / 1024 / 1024
+    for compress, (write_time, read_time, stored) in results.items():
+        log.info(
+            f"{codec if compress else 'plain'}: {megabytes:.1f} MiB of logs "
+            f"written at {megabytes / write_time:.1f} MiB/s, read at "
+            f"{megabytes / read_time:.1f} MiB/s, stored in {stored} bytes, "
+            f"ratio {len(content) / stored:.1f}"
+        )
+    assert len(content) / results[True][2] > 3
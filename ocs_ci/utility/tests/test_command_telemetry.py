@@ -0,0 +1,183 @@
+# -*- coding: utf8 -*-
+
+import json
+import sys
+import threading
+
+import pytest
+
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.utility import command_telemetry, utils
+from ocs_ci.utility.command_telemetry import CommandRecorder, ShapeStats
+
+FAKE_OC = """#!{python}
+import sys
+if "missing" in sys.argv:
+    sys.stderr.write('Error from server (NotFound): pods "missing" not found')
+    sys.exit(1)
+sys.stdout.write("kind: List\\nitems: []\\n")
+"""
+
+
+@pytest.fixture
+def recorders(monkeypatch):
+    monkeypatch.setattr(command_telemetry, "test_recorder", CommandRecorder())
+    monkeypatch.setattr(command_telemetry, "session_recorder", CommandRecorder())
+    return command_telemetry
+
+
+@pytest.fixture
+def fake_oc(fake_oc):
+    fake_oc(FAKE_OC.format(python=sys.executable))
+
+
+@pytest.mark.parametrize(
+    "cmd, shape",
+    [
+        ("oc get pod my-pod -n openshift-storage -o yaml", ("oc", "get", "pod")),
+        ("oc -n openshift-storage get Pods.v1 -l app=rook", ("oc", "get", "pods")),
+        ("oc --kubeconfig /kc delete pvc/pvc-1", ("oc", "delete", "pvc")),
+        ("oc -n ns rsh rook-ceph-tools ceph osd tree", ("oc", "rsh", "ceph")),
+        ("oc exec tools -c toolbox -- /usr/bin/rados df", ("oc", "exec", "rados")),
+        ("oc apply -f /tmp/pvc.yaml", ("oc", "apply", "")),
+        ("ceph osd tree --format json", ("ceph", "osd", "")),
+        ("ssh -i key core@10.0.0.1 uptime", ("ssh", "", "")),
+        ("", ("", "", "")),
+    ],
+)
+def test_command_shape(cmd, shape):
+    assert command_telemetry.command_shape(cmd.split()) == shape
+
+
+def test_histogram_percentile():
+    stats = ShapeStats()
+    for _ in range(90):
+        stats.add(0.0, 0.003, 0.0, 10, False)
+    for _ in range(10):
+        stats.add(0.1, 0.4, 0.0, 1000, True)
+    assert stats.calls == 100
+    assert stats.errors == 10
+    assert stats.output_bytes == 10900
+    assert stats.lock_wait == pytest.approx(1.0)
+    # 3ms falls to the <4ms bucket, 500ms to the <512ms bucket
+    assert stats.percentile(50) == pytest.approx(0.004)
+    assert stats.percentile(95) == pytest.approx(0.5)
+    merged = ShapeStats()
+    merged.merge(stats)
+    merged.merge(stats)
+    assert merged.to_dict()["calls"] == 200
+    assert merged.percentile(90) == pytest.approx(0.004)
+
+
+def test_recorder_top_and_summary():
+    recorder = CommandRecorder()
+    threads = [
+        threading.Thread(
+            target=lambda: [
+                recorder.record(("oc", "get", "pod", 0), subprocess_time=0.01)
+                for _ in range(100)
+            ]
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.record(("oc", "apply", "", 0), subprocess_time=10.0)
+    top = recorder.top(1)
+    assert top[0][0] == ("oc", "apply", "", 0)
+    assert recorder.totals().calls == 401
+    summary = recorder.summary(2)
+    assert [shape["shape"] for shape in summary["top"]] == [
+        "oc apply  0",
+        "oc get pod 0",
+    ]
+    assert summary["top"][1]["calls"] == 400
+    assert "oc get pod [0]" in recorder.format_table()
+    json.dumps(summary)
+    recorder.reset()
+    assert recorder.top() == []
+
+
+def test_exec_cmd_is_recorded(recorders, fake_oc):
+    utils.exec_cmd("oc get pod -n openshift-storage")
+    utils.exec_cmd("oc get pod my-pod -o yaml")
+    with pytest.raises(CommandFailed):
+        utils.exec_cmd("oc get pod missing")
+    utils.exec_cmd("echo telemetry")
+    index = command_telemetry.cluster_index()
+    shapes = dict(recorders.test_recorder.top())
+    stats = shapes[("oc", "get", "pod", index)]
+    assert (stats.calls, stats.errors) == (3, 1)
+    assert stats.output_bytes == 2 * len("kind: List\nitems: []\n")
+    assert stats.subprocess_time > 0
+    assert stats.lock_wait == 0
+    assert shapes[("echo", "", "", index)].calls == 1
+    assert recorders.session_recorder.totals().calls == 4
+
+
+def test_lock_wait_is_recorded(recorders, fake_oc):
+    lock = threading.RLock()
+    release = threading.Event()
+
+    def hold_lock():
+        with lock:
+            release.wait()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    threading.Timer(0.3, release.set).start()
+    utils.exec_cmd("oc whoami", threading_lock=lock)
+    holder.join()
+    index = command_telemetry.cluster_index()
+    stats = dict(recorders.test_recorder.top())[("oc", "whoami", "", index)]
+    assert stats.lock_wait >= 0.2
+
+
+def test_telemetry_disabled(recorders, fake_oc, monkeypatch):
+    from ocs_ci.framework import config
+
+    monkeypatch.setitem(config.RUN, "command_telemetry", False)
+    utils.exec_cmd("oc get pod")
+    assert recorders.test_recorder.top() == []
+
+
+def test_save_report(tmp_path):
+    recorder = CommandRecorder()
+    recorder.record(("oc", "get", "pod", 0), subprocess_time=0.5, output_bytes=100)
+    recorder.record(("ceph", "osd", "", None), subprocess_time=0.1)
+    json_file, csv_file = command_telemetry.save_report(recorder, str(tmp_path), 1)
+    with open(json_file) as fd:
+        summary = json.load(fd)
+    assert summary["totals"]["calls"] == 2
+    assert len(summary["top"]) == 1
+    with open(csv_file) as fd:
+        lines = fd.read().splitlines()
+    assert lines[0].startswith("program,verb,kind,cluster,calls")
+    assert lines[1].startswith("oc,get,pod,0,1")
+    assert len(lines) == 3
+
+
+def test_record_command_fields(recorders):
+    """
+    The fields of the recorded calls are aggregated per shape and cluster,
+    the timing of the recording is measured by
+    scripts/python/benchmarks/bench_command_telemetry.py
+    """
+    cmd = "oc get pod -n openshift-storage".split()
+    for _ in range(3):
+        command_telemetry.record_command(
+            cmd, lock_wait=0.002, subprocess_time=0.01, parse_time=0.001
+        )
+    command_telemetry.record_command(cmd, output_bytes=100, error=True)
+    shape = ("oc", "get", "pod", command_telemetry.cluster_index())
+    stats = dict(recorders.test_recorder.top())[shape]
+    assert (stats.calls, stats.errors, stats.output_bytes) == (4, 1, 100)
+    assert stats.lock_wait == pytest.approx(0.006)
+    assert stats.subprocess_time == pytest.approx(0.03)
+    assert stats.parse_time == pytest.approx(0.003)
+    assert stats.total_time == pytest.approx(0.039)
+    assert stats.max_time == pytest.approx(0.013)
+    assert sum(stats.histogram) == 4
+    assert recorders.session_recorder.totals().calls == 4
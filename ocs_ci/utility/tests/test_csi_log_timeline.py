@@ -0,0 +1,396 @@
+# -*- coding: utf8 -*-
+
+import random
+import re
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.helpers import performance_lib
+from ocs_ci.helpers.performance_lib import (
+    CsiLogTimeline,
+    calculate_operation_time,
+    extruct_timestamp_from_log,
+)
+from ocs_ci.ocs import constants
+from ocs_ci.utility import version
+
+
+NAMESPACE = "namespace-test-2f4e"
+SC = "ocs-storagecluster-ceph-rbd"
+PODS = ["csi-rbdplugin-provisioner-5f8b-abc", "csi-rbdplugin-provisioner-5f8b-def"]
+
+# fake oc: 'get pod' lists the provisioner and plugin pods, 'logs <pod> -c
+# <container>' prints $LOG_DIR/<pod>-<container>.log, the start and the end
+# of every logs command are logged
+FAKE_OC = """#!/bin/sh
+pod=""
+container=""
+action=""
+while [ $# -gt 0 ]; do
+    case "$1" in
+        get) action=get;;
+        logs) action=logs; pod="$2"; shift;;
+        -c) container="$2"; shift;;
+    esac
+    shift
+done
+if [ "$action" = get ]; then
+    echo "NAME READY STATUS RESTARTS AGE"
+    echo "csi-rbdplugin-provisioner-5f8b-abc 7/7 Running 0 1h"
+    echo "csi-rbdplugin-provisioner-5f8b-def 7/7 Running 0 1h"
+    echo "csi-rbdplugin-x8k2p 4/4 Running 0 1h"
+    exit 0
+fi
+echo "start $pod-$container $(date +%s.%N)" >> "$OC_LOG"
+sleep "$FETCH_DELAY"
+cat "$LOG_DIR/$pod-$container.log"
+echo "end $pod-$container $(date +%s.%N)" >> "$OC_LOG"
+"""
+
+
+def legacy_provision_times(pvc_name, prov_logs, csi_logs, op="all"):
+    """
+    Line by line, PVC by PVC matching of get_pvc_provision_times before the
+    timeline
+    """
+    results = {}
+    for i in range(0, len(pvc_name)):
+        results[pvc_name[i].name] = {
+            "create": {"start": None, "end": None, "time": None},
+            "delete": {"start": None, "end": None, "time": None},
+            "csi_create": {"start": None, "end": None, "time": None},
+            "csi_delete": {"start": None, "end": None, "time": None},
+        }
+    for sublog in prov_logs:
+        for line in sublog:
+            for i in range(0, len(pvc_name)):
+                name = pvc_name[i].name
+                pv_name = pvc_name[i].backed_pv
+                times = results[name]
+                if op in ["all", "create"]:
+                    if (
+                        re.search(f"provision.*{name}.*started", line)
+                        and (
+                            version.get_semantic_ocs_version_from_config()
+                            <= version.VERSION_4_16
+                        )
+                    ) or re.search(f'Started.*PVC="[^"]*/{re.escape(name)}"', line):
+                        if times["create"]["start"] is None:
+                            times["create"]["start"] = extruct_timestamp_from_log(line)
+                    if (
+                        re.search(f"provision.*{name}.*succeeded", line)
+                        and (
+                            version.get_semantic_ocs_version_from_config()
+                            <= version.VERSION_4_16
+                        )
+                    ) or re.search(
+                        f"Succeeded.*{re.escape(name)}", line, re.IGNORECASE
+                    ):
+                        if times["create"]["end"] is None:
+                            times["create"]["end"] = extruct_timestamp_from_log(line)
+                            times["create"]["time"] = calculate_operation_time(
+                                name, times["create"]
+                            )
+                if op in ["all", "delete"]:
+                    if (
+                        re.search(f'delete "{pv_name}": started', line)
+                        and (
+                            version.get_semantic_ocs_version_from_config()
+                            <= version.VERSION_4_16
+                        )
+                    ) or re.search(
+                        f'"shouldDelete is true".*PV="{re.escape(pv_name)}"', line
+                    ):
+                        if times["delete"]["start"] is None:
+                            times["delete"]["start"] = extruct_timestamp_from_log(line)
+                    if (
+                        re.search(f'delete "{pv_name}": succeeded', line)
+                        and (
+                            version.get_semantic_ocs_version_from_config()
+                            <= version.VERSION_4_13
+                        )
+                    ) or re.search(
+                        f'deleted succeeded.*PV="{re.escape(pv_name)}"', line
+                    ):
+                        if times["delete"]["end"] is None:
+                            times["delete"]["end"] = extruct_timestamp_from_log(line)
+                            times["delete"]["time"] = calculate_operation_time(
+                                name, times["delete"]
+                            )
+    del_pv_names = [""] * len(pvc_name)
+    for sublog in csi_logs:
+        for line in sublog:
+            for i in range(0, len(pvc_name)):
+                name = pvc_name[i].name
+                pv_name = pvc_name[i].backed_pv
+                times = results[name]
+                if "generated volume id" in line.lower() and pv_name in line:
+                    del_pv_names[i] = line.split("(")[1].split(")")[0]
+                if op in ["all", "create"]:
+                    if f"Req-ID: {pv_name} GRPC call:" in line:
+                        if times["csi_create"]["start"] is None:
+                            times["csi_create"]["start"] = extruct_timestamp_from_log(
+                                line
+                            )
+                    if f"Req-ID: {pv_name} GRPC response:" in line:
+                        if times["csi_create"]["end"] is None:
+                            times["csi_create"]["end"] = extruct_timestamp_from_log(
+                                line
+                            )
+                            times["csi_create"]["time"] = calculate_operation_time(
+                                name, times["csi_create"]
+                            )
+                if op in ["all", "delete"] and del_pv_names[i]:
+                    if f"Req-ID: {del_pv_names[i]} GRPC call:" in line:
+                        if times["csi_delete"]["start"] is None:
+                            times["csi_delete"]["start"] = extruct_timestamp_from_log(
+                                line
+                            )
+                    if f"Req-ID: {del_pv_names[i]} GRPC response:" in line:
+                        if times["csi_delete"]["end"] is None:
+                            times["csi_delete"]["end"] = extruct_timestamp_from_log(
+                                line
+                            )
+                            times["csi_delete"]["time"] = calculate_operation_time(
+                                name, times["csi_delete"]
+                            )
+    return results
+
+
+class Clock(object):
+    """
+    Increasing klog timestamps, 'I1016 10:00:00.100000'
+    """
+
+    def __init__(self, rnd):
+        self.rnd = rnd
+        self.microseconds = 10 * 3600 * 10**6
+
+    def __call__(self, level="I"):
+        self.microseconds += self.rnd.randint(1, 50000)
+        seconds, micro = divmod(self.microseconds, 10**6)
+        return (
+            f"{level}1016 {seconds // 3600:02d}:{seconds // 60 % 60:02d}:"
+            f"{seconds % 60:02d}.{micro:06d}"
+        )
+
+
+def recorded_logs(count, legacy_format=False, seed=0):
+    """
+    Synthetic provisioner and CSI plugin logs of the creation and the deletion
+    of the PVCs: retried and failed requests, missing messages, PVCs deleted
+    by the second provisioner after the leader change, noise of other PVCs
+
+    Returns:
+        tuple: PVC objects, provisioner logs and CSI logs (lists of lines of
+            every pod)
+
+    """
+    rnd = random.Random(seed)
+    clock = Clock(rnd)
+    pvcs = []
+    for _ in range(count):
+        pvcs.append(
+            SimpleNamespace(
+                name=f"pvc-test-{uuid.UUID(int=rnd.getrandbits(128)).hex}",
+                backed_pv=f"pvc-{uuid.UUID(int=rnd.getrandbits(128))}",
+                volume_id=(
+                    "0001-0011-openshift-storage-0000000000000002-"
+                    f"{uuid.UUID(int=rnd.getrandbits(128))}"
+                ),
+            )
+        )
+    prov = [[], []]
+    csi = [[], []]
+    request = 0
+
+    def grpc(pod, req_id, method, retries=0):
+        nonlocal request
+        for attempt in range(retries + 1):
+            request += 1
+            csi[pod].append(
+                f"{clock()}       1 utils.go:198] ID: {request} Req-ID: {req_id} "
+                f"GRPC call: /csi.v1.Controller/{method}"
+            )
+            csi[pod].append(
+                f"{clock()}       1 utils.go:199] ID: {request} Req-ID: {req_id} "
+                'GRPC request: {"parameters":{"clusterID":"openshift-storage"}}'
+            )
+            if attempt < retries:
+                csi[pod].append(
+                    f"{clock('E')}       1 utils.go:203] ID: {request} Req-ID: "
+                    f"{req_id} GRPC error: rpc error: code = Aborted"
+                )
+        return request
+
+    for pvc in pvcs:
+        name = f"{NAMESPACE}/{pvc.name}"
+        for _ in range(rnd.randint(1, 2)):
+            if legacy_format:
+                prov[0].append(
+                    f'{clock()}       1 controller.go:1337] provision "{name}" '
+                    f'class "{SC}": started'
+                )
+            else:
+                prov[0].append(
+                    f'{clock()}       1 controller.go:1366] "Started" PVC="{name}"'
+                )
+        request_id = grpc(0, pvc.backed_pv, "CreateVolume", rnd.randint(0, 1))
+        csi[0].append(
+            f"{clock()}       1 rbd_util.go:1300] ID: {request_id} Req-ID: "
+            f"{pvc.backed_pv} generated Volume ID ({pvc.volume_id}) and image "
+            f"name (csi-vol-{pvc.volume_id[-36:]}) for request name "
+            f"({pvc.backed_pv})"
+        )
+        if rnd.random() < 0.02:
+            # creation not finished in the logs
+            continue
+        csi[0].append(
+            f"{clock()}       1 utils.go:205] ID: {request_id} Req-ID: "
+            f"{pvc.backed_pv} GRPC response: "
+            f'{{"volume":{{"volume_id":"{pvc.volume_id}"}}}}'
+        )
+        prov[0].append(
+            f'{clock()}       1 controller.go:1442] provision "{name}" class '
+            f'"{SC}": volume "{pvc.backed_pv}" provisioned'
+        )
+        if legacy_format:
+            prov[0].append(
+                f'{clock()}       1 controller.go:1459] provision "{name}" '
+                f'class "{SC}": succeeded'
+            )
+        else:
+            prov[0].append(
+                f'{clock()}       1 controller.go:1576] "Succeeded" PVC="{name}"'
+            )
+        prov[1].append(
+            f'{clock()}       1 controller.go:1100] "Saving volume" '
+            f'PV="{pvc.backed_pv}"'
+        )
+
+    for i, pvc in enumerate(pvcs):
+        if rnd.random() < 0.05:
+            # not deleted
+            continue
+        pod = i % 2
+        if legacy_format:
+            prov[pod].append(
+                f'{clock()}       1 controller.go:1471] delete "{pvc.backed_pv}": '
+                "started"
+            )
+        prov[pod].append(
+            f'{clock()}       1 controller.go:1520] "shouldDelete is true" '
+            f'PV="{pvc.backed_pv}"'
+        )
+        request_id = grpc(pod, pvc.volume_id, "DeleteVolume", rnd.randint(0, 1))
+        csi[pod].append(
+            f"{clock()}       1 utils.go:205] ID: {request_id} Req-ID: "
+            f"{pvc.volume_id} GRPC response: {{}}"
+        )
+        if legacy_format:
+            prov[pod].append(
+                f'{clock()}       1 controller.go:1486] delete "{pvc.backed_pv}": '
+                "succeeded"
+            )
+        prov[pod].append(
+            f'{clock()}       1 controller.go:1550] "Volume deleted succeeded" '
+            f'PV="{pvc.backed_pv}"'
+        )
+    return pvcs, prov, csi
+
+
+@pytest.mark.parametrize("ocs_version", ["4.12", "4.14", "4.18"])
+@pytest.mark.parametrize("op", ["all", "create", "delete"])
+def test_timeline_matches_legacy(ocs_version, op, monkeypatch):
+    monkeypatch.setitem(config.ENV_DATA, "ocs_version", ocs_version)
+    legacy_format = ocs_version != "4.18"
+    pvcs, prov, csi = recorded_logs(40, legacy_format=legacy_format)
+    timeline = CsiLogTimeline(prov_logs=prov, csi_logs=csi)
+    results = timeline.pvc_times(pvcs, op)
+    expected = legacy_provision_times(pvcs, prov, csi, op)
+    assert results == expected
+    times = [times["time"] for result in results.values() for times in result.values()]
+    assert any(time is None for time in times)
+    assert sum(time is not None for time in times) > 60
+
+
+def test_timeline_queries(monkeypatch):
+    monkeypatch.setitem(config.ENV_DATA, "ocs_version", "4.18")
+    pvcs, prov, csi = recorded_logs(20)
+    timeline = CsiLogTimeline(prov_logs=prov, csi_logs=csi)
+    assert timeline.lines == sum(len(lines) for lines in prov + csi)
+    # any subset of the PVCs is answered from the index
+    assert timeline.pvc_times(pvcs[5:7]) == legacy_provision_times(pvcs[5:7], prov, csi)
+    # the old format is not matched with the new OCS version
+    _, legacy_prov, _ = recorded_logs(5, legacy_format=True, seed=1)
+    assert not CsiLogTimeline(prov_logs=legacy_prov).create_start
+    assert CsiLogTimeline(prov_logs=legacy_prov, ocs_version="4.14").create_start
+
+    # the end logged before the start fails the calculation like before
+    pvc = pvcs[0]
+    lines = [
+        f'I1016 10:00:01.000000       1 controller.go:1576] "Succeeded" '
+        f'PVC="{NAMESPACE}/{pvc.name}"',
+        f'I1016 10:00:02.000000       1 controller.go:1366] "Started" '
+        f'PVC="{NAMESPACE}/{pvc.name}"',
+    ]
+    with pytest.raises(Exception, match="didn't found in the log"):
+        CsiLogTimeline(prov_logs=[lines]).pvc_times([pvc])
+    with pytest.raises(Exception, match="didn't found in the log"):
+        legacy_provision_times([pvc], [lines], [])
+
+
+@pytest.fixture
+def fake_oc(fake_oc, tmp_path, monkeypatch):
+    oc_log = fake_oc(FAKE_OC)
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    monkeypatch.setenv("LOG_DIR", str(log_dir))
+    monkeypatch.setenv("FETCH_DELAY", "0")
+    monkeypatch.setitem(config.ENV_DATA, "cluster_namespace", "openshift-storage")
+    monkeypatch.setitem(config.ENV_DATA, "ocs_version", "4.18")
+
+    def record(prov, csi):
+        for pod, prov_lines, csi_lines in zip(PODS, prov, csi):
+            (log_dir / f"{pod}-csi-provisioner.log").write_text(
+                "".join(f"{line}\n" for line in prov_lines)
+            )
+            (log_dir / f"{pod}-csi-rbdplugin.log").write_text(
+                "".join(f"{line}\n" for line in csi_lines)
+            )
+
+    def events():
+        recorded = []
+        for line in oc_log.read_text().splitlines():
+            event, name, timestamp = line.split()
+            recorded.append((float(timestamp), event, name))
+        return sorted(recorded)
+
+    return record, events
+
+
+def test_get_pvc_provision_times(fake_oc, monkeypatch):
+    record, events = fake_oc
+    monkeypatch.setenv("FETCH_DELAY", "0.5")
+    pvcs, prov, csi = recorded_logs(30)
+    record(prov, csi)
+    assert performance_lib.get_logfile_names(constants.CEPHBLOCKPOOL) == PODS
+    results = performance_lib.get_pvc_provision_times(
+        constants.CEPHBLOCKPOOL, pvcs, "2024-10-16T10:00:00Z"
+    )
+    assert results == legacy_provision_times(pvcs, prov, csi)
+    # the logs of both containers of both pods are read at the same time
+    running = peak = 0
+    for _, event, _ in events():
+        running += 1 if event == "start" else -1
+        peak = max(peak, running)
+    assert peak == 4
+
+    results = performance_lib.get_pvc_provision_times(
+        constants.CEPHBLOCKPOOL, pvcs, "2024-10-16T10:00:00Z", time_type="csi"
+    )
+    assert all(result["create"]["start"] is None for result in results.values())
+    assert results[pvcs[0].name]["csi_create"]["time"] is not None
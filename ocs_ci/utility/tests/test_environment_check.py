@@ -0,0 +1,340 @@
+# -*- coding: utf8 -*-
+
+import json
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants, exceptions, kube_api
+from ocs_ci.ocs.exceptions import ResourceLeftoversException
+from ocs_ci.ocs.ocp import METADATA_FIELDS, OCP, parse_metadata_jsonpath
+from ocs_ci.ocs.tests.fake_kube_api import FakeKubeAPIServer
+from ocs_ci.utility import environment_check
+from ocs_ci.utility.environment_check import LEAK_CHECK_FIELDS
+
+
+CLUSTER_NAMESPACE = "openshift-storage"
+KIND_LISTS = {
+    constants.POD: "pods",
+    constants.PV: "pvs",
+    constants.PVC: "pvcs",
+    constants.NAMESPACE: "namespaces",
+}
+
+
+def metadata(name, namespace=None, generate_name=None, labels=None, owner=None):
+    data = {
+        "name": name,
+        "uid": f"uid-{namespace}-{name}",
+        "creationTimestamp": "2024-05-01T10:00:00Z",
+        "resourceVersion": "123456",
+        "annotations": {"openshift.io/scc": "restricted-v2", "k8s.ovn.org/pod": "x"},
+        "managedFields": [
+            {"manager": "kubelet", "operation": "Update", "fieldsV1": {"f:status": {}}}
+        ],
+    }
+    if namespace:
+        data["namespace"] = namespace
+    if generate_name:
+        data["generateName"] = generate_name
+    if labels:
+        data["labels"] = labels
+    if owner:
+        data["ownerReferences"] = [
+            {"apiVersion": "batch/v1", "kind": owner, "name": "owner", "uid": "u"}
+        ]
+    return data
+
+
+def pod(name, namespace="namespace-test", **kwargs):
+    container = {
+        "name": "web",
+        "image": "quay.io/ocsci/nginx:latest",
+        "env": [{"name": f"VAR_{i}", "value": "x" * 40} for i in range(20)],
+        "volumeMounts": [{"name": "data", "mountPath": "/var/lib/www"}],
+        "resources": {"limits": {"cpu": "1", "memory": "1Gi"}},
+    }
+    return {
+        "apiVersion": "v1",
+        "kind": constants.POD,
+        "metadata": metadata(name, namespace, **kwargs),
+        "spec": {"containers": [container] * 2, "nodeName": "compute-0"},
+        "status": {
+            "phase": "Running",
+            "conditions": [
+                {"type": t, "status": "True", "lastTransitionTime": "2024"}
+                for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")
+            ],
+            "containerStatuses": [
+                {"name": "web", "ready": True, "state": {"running": {}}}
+            ],
+        },
+    }
+
+
+def pv(name, claim_namespace=None):
+    spec = {
+        "capacity": {"storage": "1Gi"},
+        "csi": {"driver": "rbd", "volumeHandle": name},
+    }
+    if claim_namespace:
+        spec["claimRef"] = {"name": "claim", "namespace": claim_namespace}
+    return {
+        "apiVersion": "v1",
+        "kind": constants.PV,
+        "metadata": metadata(name),
+        "spec": spec,
+        "status": {"phase": "Bound"},
+    }
+
+
+def pvc(name, namespace="namespace-test"):
+    return {
+        "apiVersion": "v1",
+        "kind": constants.PVC,
+        "metadata": metadata(name, namespace),
+        "spec": {"resources": {"requests": {"storage": "1Gi"}}},
+        "status": {"phase": "Bound"},
+    }
+
+
+def namespace(name, **kwargs):
+    return {
+        "apiVersion": "v1",
+        "kind": constants.NAMESPACE,
+        "metadata": metadata(name, **kwargs),
+        "status": {"phase": "Active"},
+    }
+
+
+def cluster_state(extra=None, missing=()):
+    """
+    Objects of the cluster, before the test (default) or after it
+    """
+    state = {
+        "pods": [
+            pod("app-0"),
+            pod("rook-ceph-osd-0", CLUSTER_NAMESPACE),
+            pod("console-0", "openshift-console"),
+            pod("job-a-xyz", generate_name="job-a-", owner="Job"),
+            pod("web-abc", generate_name="web-"),
+        ],
+        "pvs": [pv("pv-0", "namespace-test"), pv("pv-1", "openshift-monitoring")],
+        "pvcs": [pvc("pvc-0")],
+        "namespaces": [namespace("namespace-test"), namespace("openshift-console")],
+    }
+    for key, items in (extra or {}).items():
+        state[key] = state[key] + items
+    for key, name in missing:
+        state[key] = [i for i in state[key] if i["metadata"]["name"] != name]
+    return state
+
+
+def jsonpath_output(items, fields=()):
+    """
+    Output of 'oc get -A -o jsonpath=<ocp.metadata_jsonpath(fields)>'
+    """
+
+    def value(obj, path):
+        for part in path.split("."):
+            obj = obj.get(part) if isinstance(obj, dict) else None
+        if obj is None:
+            return ""
+        if isinstance(obj, (dict, list)):
+            return json.dumps(obj, separators=(",", ":"))
+        return str(obj)
+
+    paths = ["kind"] + [f"metadata.{field}" for field in METADATA_FIELDS]
+    paths += list(fields)
+    return "".join(
+        "\t".join(value(item, path) for path in paths) + "\n" for item in items
+    )
+
+
+def fake_exec_oc_cmd(state, commands):
+    def exec_oc_cmd(self, command, out_yaml_format=True, **kwargs):
+        commands.append(command)
+        items = state.get(KIND_LISTS.get(self.kind), [])
+        if "jsonpath" in command:
+            return jsonpath_output(items, LEAK_CHECK_FIELDS.get(self.kind, ()))
+        return {"apiVersion": "v1", "kind": "List", "items": items}
+
+    return exec_oc_cmd
+
+
+@pytest.fixture
+def leak_check_config(monkeypatch):
+    monkeypatch.setitem(config.ENV_DATA, "cluster_namespace", CLUSTER_NAMESPACE)
+    monkeypatch.setitem(config.RUN, "cephcluster", True)
+    monkeypatch.setitem(config.RUN, "lvm", False)
+    for key in ("KINDS", "ENV_STATUS_DICT", "ENV_STATUS_PRE", "ENV_STATUS_POST"):
+        monkeypatch.setitem(config.RUN, key, None)
+
+
+def detect_leftovers(monkeypatch, before, after, full_objects):
+    """
+    Run the environment check and return the detected leftovers by kind, the
+    full objects are listed like before the metadata only listing
+    """
+    commands = []
+    with monkeypatch.context() as m:
+        if full_objects:
+            m.setattr(
+                OCP,
+                "get_metadata",
+                lambda self, all_namespaces=False, fields=None: self.get(
+                    all_namespaces=all_namespaces
+                )["items"],
+            )
+        m.setattr(OCP, "exec_oc_cmd", fake_exec_oc_cmd(before, commands))
+        environment_check.get_status_before_execution()
+        m.setattr(OCP, "exec_oc_cmd", fake_exec_oc_cmd(after, commands))
+        try:
+            environment_check.get_status_after_execution()
+        except ResourceLeftoversException:
+            pass
+    detected = {}
+    for kind in config.RUN["ENV_STATUS_PRE"]:
+        diff = environment_check.compare_dicts(
+            config.RUN["ENV_STATUS_PRE"][kind], config.RUN["ENV_STATUS_POST"][kind]
+        )
+        if diff and (diff[0] or diff[1]):
+            detected[kind] = [
+                sorted(i["metadata"]["name"] for i in diff[0]),
+                sorted(i["metadata"]["name"] for i in diff[1]),
+            ]
+    return detected, commands
+
+
+def test_metadata_detection_identical(leak_check_config, monkeypatch):
+    before = cluster_state()
+    after = cluster_state(
+        extra={
+            # leftovers
+            "pods": [
+                pod("app-1"),
+                pod("rook-ceph-osd-1", CLUSTER_NAMESPACE),
+                # ignored by the check
+                pod("console-1", "openshift-console"),
+                pod("job-b-xyz", generate_name="job-b-", owner="Job"),
+                pod("web-def", generate_name="web-"),
+                pod("compute-0-debug"),
+                pod("labeled", labels={"app": "ignored"}),
+            ],
+            "pvs": [pv("pv-2", "namespace-test"), pv("pv-3", "openshift-logging")],
+            "namespaces": [
+                namespace("namespace-leftover"),
+                namespace("must-gather-x", generate_name="openshift-must-gather-"),
+            ],
+        },
+        missing=[("pvcs", "pvc-0")],
+    )
+    monkeypatch.setattr(
+        environment_check,
+        "assign_get_values",
+        _with_labels(environment_check.assign_get_values, ["app=ignored"]),
+    )
+    legacy, legacy_commands = detect_leftovers(monkeypatch, before, after, True)
+    detected, commands = detect_leftovers(monkeypatch, before, after, False)
+    assert detected == legacy
+    assert detected == {
+        "pod": [["app-1", "rook-ceph-osd-1"], []],
+        "pv": [["pv-2"], []],
+        "pvc": [[], ["pvc-0"]],
+        "namespace": [["namespace-leftover"], []],
+    }
+    assert all("-o yaml" in command for command in legacy_commands)
+    assert all("jsonpath" in command for command in commands)
+
+
+def test_unclaimed_pv(leak_check_config, monkeypatch):
+    before = cluster_state(extra={"pvs": [pv("pv-available")]})
+    after = cluster_state(extra={"pvs": [pv("pv-available"), pv("pv-released")]})
+    detected, _ = detect_leftovers(monkeypatch, before, after, False)
+    assert detected == {"pv": [["pv-released"], []]}
+
+
+def test_environment_status_errors_raised(leak_check_config, monkeypatch):
+    def fail(self, **kwargs):
+        raise exceptions.CommandFailed("listing failed")
+
+    monkeypatch.setattr(OCP, "get_metadata", fail)
+    with pytest.raises(exceptions.CommandFailed):
+        environment_check.get_status_before_execution()
+
+
+def _with_labels(func, exclude_labels):
+    def wrapper(*args, **kwargs):
+        kwargs["exclude_labels"] = exclude_labels
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def test_parse_metadata_jsonpath():
+    items = [
+        pv("pv-0", "namespace-test"),
+        pv("pv-1"),
+        pod("web-abc", generate_name="web-"),
+    ]
+    output = jsonpath_output(items, ["spec.claimRef.namespace"])
+    parsed = parse_metadata_jsonpath(output, "unused", ["spec.claimRef.namespace"])
+    assert parsed[0] == {
+        "kind": constants.PV,
+        "metadata": {
+            "name": "pv-0",
+            "uid": "uid-None-pv-0",
+            "creationTimestamp": "2024-05-01T10:00:00Z",
+        },
+        "spec": {"claimRef": {"namespace": "namespace-test"}},
+    }
+    assert "spec" not in parsed[1]
+    assert parsed[2]["metadata"]["generateName"] == "web-"
+    assert parsed[2]["metadata"]["namespace"] == "namespace-test"
+
+
+def test_get_metadata_kube_api(tmp_path, monkeypatch):
+    with FakeKubeAPIServer() as server:
+        server.write_kubeconfig(str(tmp_path / "kubeconfig"))
+        monkeypatch.setitem(config.ENV_DATA, "cluster_path", str(tmp_path))
+        monkeypatch.setitem(config.RUN, "kubeconfig_location", "kubeconfig")
+        monkeypatch.setitem(config.RUN, "oc_backend", kube_api.KUBE_API_BACKEND)
+        pods = [pod("web-abc", generate_name="web-", owner="Job"), pod("app-0")]
+        for item in pods:
+            server.add_object(item)
+        items = OCP(kind=constants.POD).get_metadata(all_namespaces=True)
+        kube_api.close_clients()
+    expected = parse_metadata_jsonpath(jsonpath_output(pods), constants.POD)
+    assert sorted(items, key=str) == sorted(expected, key=str)
+    assert "managedFields" not in items[0]["metadata"]
+
+
+def test_leak_check_metadata_listing(leak_check_config, monkeypatch):
+    """
+    Check that the leak check finds the same objects in the metadata printed
+    by oc as in the whole pod list, the metadata being much smaller
+    """
+    pods = [pod(f"pod-{i}", f"namespace-{i % 50}") for i in range(1000)]
+    pods.append(pod("noobaa-0", "openshift-storage-extra"))
+    full_output = json.dumps({"apiVersion": "v1", "kind": "List", "items": pods})
+    metadata_output = jsonpath_output(pods)
+    ocp_obj = OCP(kind=constants.POD)
+
+    def check(**patches):
+        status = {}
+        with monkeypatch.context() as m:
+            for name, value in patches.items():
+                m.setattr(OCP, name, value)
+            environment_check.assign_get_values(status, "pod", ocp_obj)
+        return status
+
+    status = check(
+        get_metadata=lambda *args, **kwargs: json.loads(full_output)["items"]
+    )
+    metadata_status = check(exec_oc_cmd=lambda *args, **kwargs: metadata_output)
+
+    names = [i["metadata"]["name"] for i in metadata_status["pod"]]
+    assert names == [i["metadata"]["name"] for i in status["pod"]]
+    assert len(names) == 1000
+    assert "noobaa-0" not in names
+    assert len(metadata_output) * 5 < len(full_output)
@@ -0,0 +1,274 @@
+# -*- coding: utf8 -*-
+
+import os
+import random
+import re
+import subprocess
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.helpers import helpers
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.resources import pod
+from ocs_ci.utility import log_scanner
+from ocs_ci.utility.artifact_writer import read_artifact
+from ocs_ci.utility.log_scanner import LogScanner, pod_log_source
+
+
+# fake oc: 'logs <pod>' and 'debug nodes/<node>' print LOG_LINES lines with
+# 'core dumped' every 5000th and 'oom_reaper' every 7919th line, pods named
+# broken-* fail, the start and the end of every command are logged
+FAKE_OC = """#!/bin/sh
+name=""
+while [ $# -gt 0 ]; do
+    case "$1" in
+        logs) name="$2"; shift;;
+        nodes/*) name="${1#nodes/}";;
+    esac
+    shift
+done
+echo "start $name $(date +%s.%N)" >> "$OC_LOG"
+sleep "$FETCH_DELAY"
+case "$name" in
+    broken-*) echo "pods \\"$name\\" not found" >&2; exit 1;;
+esac
+awk -v n="$LOG_LINES" -v name="$name" 'BEGIN {
+    for (i = 1; i <= n; i++) {
+        if (i % 5000 == 0) print "2024-05-01T10:00:00Z E " name " process core dumped " i;
+        else if (i % 7919 == 0) print "2024-05-01T10:00:00Z W oom_reaper: reaped process " i;
+        else print "2024-05-01T10:00:00Z I " name " reconciled the object " i;
+    }
+}'
+echo "end $name $(date +%s.%N)" >> "$OC_LOG"
+"""
+ERRORS = ["core dumped", "oom_reaper"]
+
+
+def fake_log(name, lines):
+    return "".join(
+        (
+            f"2024-05-01T10:00:00Z E {name} process core dumped {i}\n"
+            if i % 5000 == 0
+            else (
+                f"2024-05-01T10:00:00Z W oom_reaper: reaped process {i}\n"
+                if i % 7919 == 0
+                else f"2024-05-01T10:00:00Z I {name} reconciled the object {i}\n"
+            )
+        )
+        for i in range(1, lines + 1)
+    )
+
+
+def legacy_hits(content, patterns, context=0):
+    """
+    Line by line, pattern by pattern matching of the whole log in memory
+    """
+    lines = content.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    hits = []
+    for number, line in enumerate(lines):
+        matched = [pattern for pattern in patterns if re.search(pattern, line)]
+        if matched:
+            hits.append(
+                (
+                    number + 1,
+                    line,
+                    matched,
+                    lines[max(0, number - context) : number],
+                    lines[number + 1 : number + 1 + context],
+                )
+            )
+    return hits
+
+
+def as_tuples(hits):
+    return [
+        (hit.line_number, hit.line, hit.patterns, hit.before, hit.after) for hit in hits
+    ]
+
+
+@pytest.fixture
+def fake_oc(fake_oc, monkeypatch):
+    oc_log = fake_oc(FAKE_OC)
+    monkeypatch.setenv("FETCH_DELAY", "0")
+    monkeypatch.setenv("LOG_LINES", "20000")
+    monkeypatch.setitem(config.ENV_DATA, "cluster_namespace", "openshift-storage")
+    monkeypatch.setitem(config.REPORTING, "compress_artifacts", False)
+
+    def events():
+        recorded = []
+        for line in oc_log.read_text().splitlines():
+            event, name, timestamp = line.split()
+            recorded.append((float(timestamp), event, name))
+        return sorted(recorded)
+
+    return events
+
+
+def max_running(events):
+    running = peak = 0
+    for _, event, _ in events:
+        running += 1 if event == "start" else -1
+        peak = max(peak, running)
+    return peak
+
+
+@pytest.mark.parametrize("context", [0, 2])
+def test_scan_matches_legacy(context):
+    patterns = [r"core dumped", r"E \S+ process", r"^2024\S+ W oom", r"object 1\d{4}$"]
+    content = fake_log("pod-a", 30000) + "last line without new line core dumped"
+    scanner = LogScanner(patterns, context=context, max_hits=None)
+    rnd = random.Random(0)
+    chunks = []
+    position = 0
+    while position < len(content):
+        size = rnd.choice([1, 7, 100, 4096, 65536])
+        chunks.append(content[position : position + size])
+        position += size
+    result = scanner.scan_lines(chunks)
+    expected = legacy_hits(content, patterns, context)
+    assert len(expected) > 10000
+    assert as_tuples(result.hits) == expected
+    assert result.lines == 30001
+    # line with several patterns
+    hits = {hit.line_number: hit for hit in result.hits}
+    assert hits[15000].patterns == ["core dumped", r"E \S+ process"]
+
+
+def test_scan_literal_and_bounded():
+    content = fake_log("pod-[a]", 50000)
+    scanner = LogScanner(
+        ["core dumped", "pod-[a]", "OOM_REAPER"],
+        regex=False,
+        ignore_case=True,
+        max_hits=3,
+    )
+    result = scanner.scan_lines(content.splitlines(keepends=True))
+    assert result.hit_count == 50000
+    assert [hit.line_number for hit in result.hits] == [1, 2, 3]
+    assert result.hits[0].patterns == ["pod-[a]"]
+    assert LogScanner([]).scan_lines([content]).lines == 50000
+    # patterns which can't be combined are matched one by one
+    scanner = LogScanner(["(?i)CORE DUMPED", "oom_reaper"])
+    assert scanner.prefilter is None
+    hits = scanner.scan_lines([content]).hits
+    assert len(hits) == 50000 // 5000 + 50000 // 7919
+
+
+def test_scan_pods_concurrently(fake_oc, tmp_path, monkeypatch):
+    monkeypatch.setenv("FETCH_DELAY", "0.3")
+    names = [f"pod-{i}" for i in range(12)] + ["broken-0"]
+    scanner = LogScanner(ERRORS, regex=False, context=1, concurrency=4)
+    results = scanner.scan(
+        [pod_log_source(name) for name in names], dump_dir=str(tmp_path / "logs")
+    )
+    events = fake_oc()
+    assert max_running(events) == 4
+    assert list(results) == names
+    assert "not found" in results["broken-0"].error
+    content = fake_log("pod-3", 20000)
+    result = results["pod-3"]
+    assert result.error is None
+    assert result.lines == 20000
+    assert as_tuples(result.hits) == legacy_hits(content, ERRORS, context=1)
+    assert (result.hits[0].source, result.hits[0].namespace) == (
+        "pod-3",
+        "openshift-storage",
+    )
+    assert read_artifact(result.dump_path) == content
+
+
+def test_search_pattern_in_pod_logs(fake_oc):
+    matched = pod.search_pattern_in_pod_logs("pod-1", r"core dumped 1\d+")
+    assert matched == [
+        f"2024-05-01T10:00:00Z E pod-1 process core dumped {i}" for i in (10000, 15000)
+    ]
+    with pytest.raises(CommandFailed, match="not found"):
+        pod.search_pattern_in_pod_logs("broken-1", "core")
+
+
+@pytest.fixture
+def cluster_logs(fake_oc, monkeypatch):
+    monkeypatch.setattr(
+        helpers.node,
+        "get_node_objs",
+        lambda: [SimpleNamespace(name=f"compute-{i}") for i in range(3)],
+    )
+    monkeypatch.setattr(
+        helpers.pod,
+        "get_all_pods",
+        lambda namespace=None: [
+            SimpleNamespace(name=name) for name in ("pod-0", "pod-1", "broken-0")
+        ],
+    )
+
+
+def test_get_pods_nodes_logs(cluster_logs, tmp_path):
+    logs = helpers.get_pods_nodes_logs(log_dir=str(tmp_path / "logs"))
+    names = ["compute-0", "compute-1", "compute-2", "pod-0", "pod-1"]
+    assert list(logs) == names
+    assert logs["pod-1"] == fake_log("pod-1", 20000)
+    assert sorted(os.listdir(tmp_path / "logs")) == sorted(
+        [f"{name}.log" for name in names] + ["broken-0.log"]
+    )
+
+
+def test_get_logs_with_errors(cluster_logs, tmp_path, monkeypatch):
+    monkeypatch.setattr(helpers, "ocsci_log_path", lambda: str(tmp_path))
+    monkeypatch.setenv("LOG_LINES", "6000")
+    logs = helpers.get_logs_with_errors(errors=["reconciled the object 5999"])
+    assert set(logs) == {"compute-0", "compute-1", "compute-2", "pod-0", "pod-1"}
+    assert logs["pod-0"] == fake_log("pod-0", 6000)
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        ["bin", "oc.log"] + [f"{name}.log" for name in logs]
+    )
+
+    monkeypatch.setenv("LOG_LINES", "4000")
+    assert helpers.get_logs_with_errors() == {}
+
+
+def legacy_scan(names, patterns):
+    """
+    Fetch the logs one by one, keep them whole and match the patterns one by
+    one, like get_logs_with_errors before the scanner
+    """
+    found = dict()
+    for name in names:
+        content = subprocess.run(
+            ["oc", "logs", name], stdout=subprocess.PIPE, check=True
+        ).stdout.decode()
+        for pattern in patterns:
+            if pattern in content:
+                found.setdefault(name, []).append(pattern)
+    return found
+
+
+def test_scan_finds_legacy_errors(fake_oc, monkeypatch):
+    """
+    Check that the scanner finds the same errors as sequential fetching of
+    whole logs, without keeping the whole log in memory
+    """
+    monkeypatch.setenv("LOG_LINES", "100000")
+    patterns = ERRORS + [f"unknown error {i}" for i in range(8)]
+    names = [f"pod-{i}" for i in range(4)]
+    expected = legacy_scan(names, patterns)
+    tracemalloc.start()
+    try:
+        results = LogScanner(patterns, regex=False).scan(
+            [pod_log_source(name) for name in names]
+        )
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    found = {
+        name: sorted({p for hit in result.hits for p in hit.patterns})
+        for name, result in results.items()
+        if result.hits
+    }
+    assert found == expected == {name: ERRORS for name in names}
+    assert peak < len(fake_log("pod-0", 100000))
+    assert log_scanner.DEFAULT_CONCURRENCY > 1
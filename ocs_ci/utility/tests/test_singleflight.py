@@ -0,0 +1,190 @@
+# -*- coding: utf8 -*-
+
+import sys
+import threading
+import time
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.utility import utils
+from ocs_ci.utility.singleflight import SingleFlight, oc_read_only_verb
+
+FAKE_OC = """#!{python}
+import os, sys, time
+with open(os.environ["OC_LOG"], "a") as fd:
+    fd.write(" ".join(sys.argv[1:]) + "\\n")
+time.sleep(0.1 if "patch" in sys.argv else 0.5)
+if "missing" in sys.argv:
+    sys.stderr.write('Error from server (NotFound): pods "missing" not found')
+    sys.exit(1)
+sys.stdout.write("kind: List\\nitems: []\\n")
+"""
+
+
+@pytest.fixture
+def fake_oc(fake_oc, monkeypatch):
+    """
+    Fake oc binary which records every call and is slow enough to overlap
+    """
+    calls = fake_oc(FAKE_OC.format(python=sys.executable))
+    monkeypatch.setitem(config.RUN, "oc_singleflight", True)
+    utils.oc_read_singleflight.reset_stats()
+
+    def forks():
+        return len(calls.read_text().splitlines())
+
+    return forks
+
+
+def run_concurrently(func, count):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(index):
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as ex:
+            results[index] = ex
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.parametrize(
+    "cmd, verb",
+    [
+        (["oc", "get", "pods", "-o", "yaml"], "get"),
+        (["oc", "--kubeconfig", "/kc", "-n", "ns", "describe", "pod/x"], "describe"),
+        (["oc", "whoami", "--show-token"], "whoami"),
+        (["oc", "delete", "pod", "x"], None),
+        (["oc", "apply", "-f", "get.yaml"], None),
+        (["oc", "get", "pods", "-w"], None),
+        (["oc", "get", "pods", "--watch=true"], None),
+        (["oc", "rsh", "pod", "get"], None),
+        (["ls", "get"], None),
+    ],
+)
+def test_oc_read_only_verb(cmd, verb):
+    assert oc_read_only_verb(cmd) == verb
+
+
+def test_singleflight_shares_result():
+    singleflight = SingleFlight()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        time.sleep(0.3)
+        return "result"
+
+    results = run_concurrently(lambda: singleflight.do("key", slow_call), 5)
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+    assert all(result == "result" for result, _ in results)
+    assert singleflight.coalesced == 4
+    # the key is released after the call finished
+    assert singleflight.do("key", lambda: "next") == ("next", False)
+
+
+def test_singleflight_failure_not_shared():
+    singleflight = SingleFlight()
+    calls = []
+
+    def failing_call():
+        calls.append(1)
+        time.sleep(0.3)
+        raise ValueError("boom")
+
+    results = run_concurrently(lambda: singleflight.do("key", failing_call), 3)
+    assert all(isinstance(result, ValueError) for result in results)
+    # the callers which waited for the failed call try on their own
+    assert singleflight.stats["executed"] == 1
+    assert singleflight.stats["retried"] == 2
+    assert len(calls) == 3
+
+
+def test_singleflight_bounded_wait():
+    singleflight = SingleFlight()
+    leader = threading.Thread(
+        target=singleflight.do, args=("key", time.sleep, 0.5), daemon=True
+    )
+    leader.start()
+    time.sleep(0.1)
+    start = time.time()
+    with pytest.raises(TimeoutError):
+        singleflight.do("key", time.sleep, 0.5, wait_timeout=0.1)
+    assert time.time() - start < 0.4
+    leader.join()
+
+
+def test_singleflight_invalidate():
+    singleflight = SingleFlight()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        time.sleep(0.4)
+        return len(calls)
+
+    leader = threading.Thread(target=singleflight.do, args=("key", slow_call))
+    leader.start()
+    time.sleep(0.1)
+    # the call started before the write is not shared after it
+    singleflight.invalidate()
+    assert singleflight.do("key", slow_call) == (2, False)
+    leader.join()
+    assert singleflight.coalesced == 0
+
+
+def test_exec_cmd_coalesces_reads(fake_oc):
+    results = run_concurrently(
+        lambda: utils.run_cmd("oc get pods -n openshift-storage -o yaml"), 8
+    )
+    assert results == ["kind: List\nitems: []\n"] * 8
+    assert fake_oc() == 1
+    assert utils.oc_read_singleflight.coalesced == 7
+
+
+def test_exec_cmd_does_not_coalesce_writes(fake_oc):
+    run_concurrently(lambda: utils.run_cmd("oc delete pod foo -n ns"), 4)
+    assert fake_oc() == 4
+    assert utils.oc_read_singleflight.coalesced == 0
+
+
+def test_exec_cmd_shared_failure(fake_oc):
+    # each caller handles the shared result with its own ignore_error
+    results = run_concurrently(
+        lambda: utils.exec_cmd("oc get pod missing -n ns", ignore_error=True), 3
+    )
+    assert fake_oc() == 1
+    assert all(result.returncode == 1 for result in results)
+    with pytest.raises(CommandFailed, match="NotFound"):
+        utils.exec_cmd("oc get pod missing -n ns")
+
+
+def test_exec_cmd_read_after_write(fake_oc):
+    reader = threading.Thread(target=utils.run_cmd, args=("oc get pods -n ns -o yaml",))
+    reader.start()
+    time.sleep(0.05)
+    utils.run_cmd("oc patch pod foo -n ns -p {}")
+    # the read started before the patch finished is not shared
+    utils.run_cmd("oc get pods -n ns -o yaml")
+    reader.join()
+    assert fake_oc() == 3
+    assert utils.oc_read_singleflight.coalesced == 0
+
+
+def test_exec_cmd_singleflight_disabled(fake_oc, monkeypatch):
+    monkeypatch.delitem(config.RUN, "oc_singleflight")
+    run_concurrently(lambda: utils.run_cmd("oc get pods -n ns -o yaml"), 3)
+    assert fake_oc() == 3
+    monkeypatch.setitem(config.RUN, "oc_singleflight", False)
+    run_concurrently(lambda: utils.run_cmd("oc get pods -n ns -o yaml"), 3)
+    assert fake_oc() == 6
@@ -1,11 +1,17 @@
 # -*- coding: utf8 -*-
 
 import logging
+import os
+import shlex
+import stat
+import sys
+import threading
 from itertools import repeat
 from sys import platform
 
 import pytest
 
+from ocs_ci import framework
 from ocs_ci.ocs.exceptions import CommandFailed
 from ocs_ci.utility import utils, version
 
@@ -332,3 +338,199 @@ def test_is_base64_block_rejects_regular_text():
     regular_text = "This is a log message. It has punctuation!"
     regular_text = regular_text * 3  # Make it 100+ chars
     assert utils._is_base64_block(regular_text, min_length=100) is False
+
+
+def mask_secrets_one_by_one(plaintext, secrets):
+    for secret in secrets:
+        if secret is not None:
+            plaintext = plaintext.replace(secret, "*" * 5)
+    return plaintext
+
+
+@pytest.mark.parametrize(
+    "secrets",
+    [
+        ["abc", "bcd"],
+        ["bcd", "abc"],
+        ["ab", "xaby"],
+        ["xaby", "ab"],
+        ["token-1", "token-2", None, "token-1"],
+        ["**", "a*"],
+        ["", "abc"],
+    ],
+)
+def test_mask_secrets_same_as_one_by_one(secrets):
+    """
+    Check that masking of all the secrets in one pass gives the same result
+    as replacing the secrets one by one, including overlapping secrets.
+    """
+    plaintext = "abcd xaby token-1 token-2 a** **a abcabcd"
+    assert utils.mask_secrets(plaintext, secrets) == mask_secrets_one_by_one(
+        plaintext, secrets
+    )
+    assert utils.mask_secrets([plaintext, "abc"], secrets) == [
+        mask_secrets_one_by_one(plaintext, secrets),
+        mask_secrets_one_by_one("abc", secrets),
+    ]
+
+
+@pytest.mark.parametrize(
+    "output",
+    [
+        "",
+        None,
+        "status: Running\nname: test-pod",
+        "image: |\n  "
+        + "iVBORw0KGgoAAAANSUhEUgAAAA" * 30
+        + "\n  "
+        + "AAAAASUVORK5CYII1234567890AB" * 30
+        + "\nname: test-pod",
+        "token: " + "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9" * 10 + "\nstatus: ok",
+        "message: " + "This is a log message. " * 40 + "\n" + "QUJD" * 400,
+        "\n".join(["QUJDRA" * 20] * 5 + ["name: x"] + ["QUJDRA" * 20] * 20),
+    ],
+    ids=[
+        "empty",
+        "none",
+        "short",
+        "base64-block",
+        "long-token-line",
+        "long-text-line",
+        "base64-around-yaml",
+    ],
+)
+def test_sanitize_log_output_same_as_truncate_functions(output):
+    """
+    Check that the single pass sanitizer gives the same result as the
+    truncate functions applied one after another.
+    """
+    assert utils.sanitize_log_output(output) == utils.truncate_large_base64(
+        utils.truncate_long_lines(output)
+    )
+
+
+def test_exec_cmd_skips_log_output_without_debug(monkeypatch):
+    """
+    Check that the output isn't processed for the log when debug log is
+    disabled.
+    """
+
+    def fail(*args, **kwargs):
+        raise AssertionError("output should not be processed")
+
+    monkeypatch.setattr(utils, "sanitize_log_output", fail)
+    monkeypatch.setattr(utils, "filter_verbose_yaml", fail)
+    monkeypatch.setattr(utils.log, "level", logging.INFO)
+    monkeypatch.setattr(utils.log, "disabled", False)
+    utils.log.manager._clear_cache()
+    try:
+        assert utils.run_cmd("echo hello") == "hello\n"
+    finally:
+        utils.log.manager._clear_cache()
+
+
+# fake oc sleeps and exits as set in the kubeconfig file: "<delay> <rc>"
+FAKE_MULTICLUSTER_OC = """#!{python}
+import sys, time
+if "--kubeconfig" not in sys.argv:
+    sys.exit(0)
+with open(sys.argv[sys.argv.index("--kubeconfig") + 1]) as fd:
+    delay, rc = fd.read().split()
+time.sleep(float(delay))
+sys.stdout.write(f"slept {{delay}}")
+sys.stderr.write("error" if int(rc) else "")
+sys.exit(int(rc))
+"""
+
+
+@pytest.fixture
+def fake_clusters(tmp_path, monkeypatch):
+    """
+    Three clusters with the fake oc configured by (delay, rc) of the cluster
+    """
+    oc = tmp_path / "oc"
+    oc.write_text(FAKE_MULTICLUSTER_OC.format(python=sys.executable))
+    oc.chmod(oc.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(utils, "_oc_plugin_list_cache", "")
+    monkeypatch.setattr(framework.config, "clusters", framework.config.clusters)
+    monkeypatch.setattr(framework.config, "nclusters", 3)
+    framework.config.init_cluster_configs()
+
+    def setup(*clusters):
+        for index, (delay, rc) in enumerate(clusters):
+            kubeconfig = tmp_path / f"kubeconfig{index}"
+            kubeconfig.write_text(f"{delay} {rc}")
+            framework.config.clusters[index].RUN["kubeconfig"] = str(kubeconfig)
+            framework.config.clusters[index].ENV_DATA["cluster_name"] = f"c{index}"
+
+    return setup
+
+
+def test_run_cmd_multicluster_concurrently(fake_clusters):
+    fake_clusters((0.1, 0), (0.3, 0), (0.1, 0))
+    results = utils.run_cmd_multicluster_concurrently("oc whoami")
+    assert sorted(results) == [0, 1, 2]
+    assert results[1].stdout == "slept 0.3"
+    assert results[1].returncode == 0
+    assert results[1].duration >= 0.3
+
+
+def test_run_cmd_multicluster_concurrently_overlaps(fake_clusters, monkeypatch):
+    """
+    Check that the command runs on all the clusters at the same time, the
+    command on each cluster waits for the others to start
+    """
+    fake_clusters((0, 0), (0, 0), (0, 0))
+    barrier = threading.Barrier(3, timeout=30)
+    run_cmd_on_cluster = utils._run_cmd_on_cluster
+    timeouts = {}
+
+    def run_together(cmd, secrets, timeout, **kwargs):
+        timeouts[framework.config.ENV_DATA["cluster_name"]] = timeout
+        barrier.wait()
+        return run_cmd_on_cluster(cmd, secrets, timeout, **kwargs)
+
+    monkeypatch.setattr(utils, "_run_cmd_on_cluster", run_together)
+    results = utils.run_cmd_multicluster_concurrently("oc whoami", timeout={1: 10})
+    assert sorted(results) == [0, 1, 2]
+    assert not barrier.broken
+    # missing indexes use the default timeout
+    default = utils.MULTICLUSTER_CMD_TIMEOUT
+    assert timeouts == {"c0": default, "c1": 10, "c2": default}
+
+
+def test_run_cmd_multicluster_concurrently_partial_failure(fake_clusters):
+    fake_clusters((0.1, 0), (0.1, 1), (5.0, 0))
+    with pytest.raises(CommandFailed, match=r"on clusters \[1\]"):
+        utils.run_cmd_multicluster_concurrently(
+            "oc whoami", timeout={2: 10}, skip_index=[2]
+        )
+    results = utils.run_cmd_multicluster_concurrently(
+        "oc whoami", timeout={0: 10, 1: 10, 2: 0.5}, ignore_error=True
+    )
+    assert results[0].returncode == 0
+    assert (results[1].returncode, results[1].stderr) == (1, "error")
+    assert results[2].returncode is None
+    assert "Timed out" in results[2].stderr
+
+
+def test_exec_env_follows_environ(monkeypatch):
+    env = utils.exec_env("/tmp/kubeconfig1")
+    assert env["KUBECONFIG"] == "/tmp/kubeconfig1"
+    assert utils.exec_env("/tmp/kubeconfig2")["KUBECONFIG"] == "/tmp/kubeconfig2"
+    # every command gets its own environment
+    env["OCS_CI_TEST_EXEC_ENV"] = "modified"
+    assert "OCS_CI_TEST_EXEC_ENV" not in utils.exec_env("/tmp/kubeconfig1")
+    monkeypatch.setenv("OCS_CI_TEST_EXEC_ENV", "1")
+    assert utils.exec_env("/tmp/kubeconfig1")["OCS_CI_TEST_EXEC_ENV"] == "1"
+    assert utils.exec_env(None).get("KUBECONFIG") == os.environ.get("KUBECONFIG")
+
+
+def test_split_command_cached():
+    cmd = "oc -n openshift-storage get pod rook-ceph-tools -o yaml"
+    utils._split_command.cache_clear()
+    args = utils._split_command(cmd)
+    assert args == tuple(shlex.split(cmd))
+    assert utils._split_command(cmd) is args
+    assert utils._split_command.cache_info().hits == 1
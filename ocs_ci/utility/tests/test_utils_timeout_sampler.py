@@ -411,3 +411,147 @@ def test_ts_float_sleep_logged_correctly(caplog):
     assert sleep_records
     for rec in sleep_records:
         assert "0.5 seconds" in rec.getMessage()
+
+
+class FakeClock:
+    """
+    Replacement of the time module in ocs_ci.utility.utils: sleep advances
+    the clock instead of waiting and every sample takes sample_duration
+    """
+
+    def __init__(self, sample_duration=0):
+        self.now = 1000.0
+        self.sample_duration = sample_duration
+        self.sleeps = []
+        self.samples = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        assert seconds >= 0
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def func(self, result=None):
+        self.samples.append(self.now)
+        self.now += self.sample_duration
+        return result
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr("ocs_ci.utility.utils.time", fake_clock)
+    return fake_clock
+
+
+def test_ts_fixed_schedule_by_default(clock):
+    """
+    Without adaptive scheduling the sampler sleeps the fixed interval and
+    does not sample at the deadline.
+    """
+    ts = TimeoutSampler(10, 3, clock.func)
+    assert not ts.adaptive
+    with pytest.raises(TimeoutExpiredError):
+        for _ in ts:
+            pass
+    assert clock.sleeps == [3, 3, 3, 3]
+    assert clock.samples == [1000, 1003, 1006, 1009]
+    assert ts.stats == {"iterations": 4, "total_sleep": 12, "time_to_success": None}
+
+
+def test_ts_backoff_schedule(clock):
+    """
+    Fast probes come first, then the interval grows exponentially up to
+    max_sleep and the last sleep ends exactly at the deadline, where one more
+    sample is taken.
+    """
+    ts = TimeoutSampler(100, 2, clock.func).with_backoff(
+        backoff_factor=2, max_sleep=20, jitter=False, fast_probes=3, fast_probe_sleep=1
+    )
+    with pytest.raises(TimeoutExpiredError):
+        for _ in ts:
+            pass
+    assert clock.sleeps == [1, 1, 1, 2, 4, 8, 16, 20, 20, 20, 7]
+    assert clock.samples[-1] == 1100
+    assert clock.now == 1100
+    assert ts.stats["iterations"] == 12
+    assert ts.stats["total_sleep"] == 100
+
+
+def test_ts_backoff_accounts_sample_duration(monkeypatch):
+    """
+    Time spent in func counts to the deadline, the sleeps never overshoot it.
+    """
+    clock = FakeClock(sample_duration=1.5)
+    monkeypatch.setattr("ocs_ci.utility.utils.time", clock)
+    ti = TimeoutIterator(20, 4, clock.func, backoff_factor=3)
+    with pytest.raises(TimeoutExpiredError):
+        for _ in ti:
+            pass
+    assert clock.sleeps == [4, 12]
+    assert clock.samples == [1000, 1005.5, 1019]
+
+
+def test_ts_full_jitter(clock, monkeypatch):
+    """
+    Jittered sleeps are drawn from zero to the backoff interval.
+    """
+    bounds = []
+
+    def uniform(low, high):
+        bounds.append((low, high))
+        return high / 2
+
+    monkeypatch.setattr("ocs_ci.utility.utils.random.uniform", uniform)
+    ts = TimeoutSampler(60, 4, clock.func).with_backoff(max_sleep=16)
+    with pytest.raises(TimeoutExpiredError):
+        for _ in ts:
+            pass
+    assert bounds[:5] == [(0, 4), (0, 8), (0, 16), (0, 16), (0, 16)]
+    assert clock.sleeps[:5] == [2, 4, 8, 8, 8]
+    assert clock.now == 1060
+
+
+def test_ts_jitter_desynchronizes_samplers(clock):
+    """
+    Parallel samplers with the same parameters get different schedules.
+    """
+    schedules = set()
+    for _ in range(5):
+        clock.sleeps = []
+        ts = TimeoutSampler(30, 2, clock.func).with_backoff(max_sleep=8)
+        with pytest.raises(TimeoutExpiredError):
+            for _ in ts:
+                pass
+        assert all(sleep <= 8 for sleep in clock.sleeps)
+        schedules.add(tuple(clock.sleeps))
+    assert len(schedules) > 1
+
+
+def test_ts_time_to_success(clock):
+    """
+    Time to success is recorded when the caller stops iterating and by
+    wait_for_func_value.
+    """
+    results = iter([False, False, True])
+    ts = TimeoutSampler(60, 5, lambda: clock.func(next(results)))
+    ts.with_backoff(jitter=False)
+    for result in ts:
+        if result:
+            break
+    assert ts.stats == {"iterations": 3, "total_sleep": 15, "time_to_success": 15}
+
+    values = iter(range(10))
+    ts = TimeoutSampler(60, 1, lambda: clock.func(next(values)))
+    ts.wait_for_func_value(3)
+    assert ts.stats == {"iterations": 4, "total_sleep": 3, "time_to_success": 3}
+
+
+def test_ts_backoff_invalid_arguments():
+    ts = TimeoutSampler(10, 1, lambda: 1)
+    with pytest.raises(ValueError):
+        ts.with_backoff(backoff_factor=0.5)
+    with pytest.raises(ValueError):
+        ts.with_backoff(max_sleep=0)
@@ -0,0 +1,46 @@
+# -*- coding: utf8 -*-
+
+import copy
+import json
+
+import yaml
+
+from ocs_ci.utility.yaml_log_filter import filter_verbose_yaml
+
+PACKAGE_MANIFEST = {
+    "apiVersion": "packages.operators.coreos.com/v1",
+    "kind": "PackageManifest",
+    "metadata": {"name": "odf-operator"},
+    "status": {
+        "channels": [
+            {
+                "name": "stable",
+                "currentCSVDesc": {"description": "x" * 6000},
+                "entries": [{"name": "odf-operator.v4.14.0"}],
+            }
+        ]
+    },
+}
+
+
+def test_filter_verbose_yaml():
+    yaml_str = yaml.safe_dump(PACKAGE_MANIFEST)
+    filtered = filter_verbose_yaml(yaml_str)
+    assert filtered.startswith("[PackageManifest: odf-operator]")
+    assert "currentCSVDesc" not in filtered
+
+
+def test_filter_loaded_data_is_not_modified():
+    data = copy.deepcopy(PACKAGE_MANIFEST)
+    filtered = filter_verbose_yaml(json.dumps(data), data=data)
+    assert "currentCSVDesc" not in filtered
+    assert data == PACKAGE_MANIFEST
+
+
+def test_filter_skips_outputs_without_verbose_kinds(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("output should not be parsed")
+
+    monkeypatch.setattr(yaml, "safe_load", fail)
+    yaml_str = "kind: Pod\nmetadata:\n  name: x\ndata: " + "x" * 6000
+    assert filter_verbose_yaml(yaml_str) == yaml_str
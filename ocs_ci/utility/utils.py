@@ -1,7 +1,7 @@
 import binascii
 import tempfile
 from datetime import datetime, timedelta
-from functools import reduce
+from functools import lru_cache, reduce
 import base64
 import io
 import json
@@ -20,7 +20,7 @@ import traceback
 from typing import Match, Iterator
 import stat
 import shutil
-from copy import deepcopy
+from copy import copy, deepcopy
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import pandas as pd
@@ -29,6 +29,8 @@ from shutil import which, move, rmtree
 import pexpect
 import pytest
 import unicodedata
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 import hcl2
 import requests
@@ -42,7 +44,7 @@ from paramiko.auth_handler import AuthenticationException, SSHException
 from semantic_version import Version
 from tempfile import NamedTemporaryFile, mkdtemp, TemporaryDirectory
 from jinja2 import FileSystemLoader, Environment
-from ocs_ci.framework import config
+from ocs_ci.framework import config, config_safe_thread_pool_task
 from ocs_ci.framework import GlobalVariables as GV
 from ocs_ci.ocs import constants, defaults
 from ocs_ci.utility.yaml_log_filter import filter_verbose_yaml
@@ -68,6 +70,8 @@ from ocs_ci.ocs.exceptions import (
 from ocs_ci.utility import version as version_module
 from ocs_ci.utility.flexy import load_cluster_info
 from ocs_ci.utility.retry import retry
+from ocs_ci.utility import command_telemetry
+from ocs_ci.utility.singleflight import SingleFlight, oc_read_only_verb
 from ocs_ci.utility.jira import JiraHelper
 from psutil._common import bytes2human
 from ocs_ci.ocs.constants import HCI_PROVIDER_CLIENT_PLATFORMS
@@ -76,6 +80,8 @@ log = logging.getLogger(__name__)
 
 # variables
 _oc_plugin_list_cache = None
+# shares in-flight read-only oc commands between concurrent identical calls
+oc_read_singleflight = SingleFlight()
 mounting_dir = "/mnt/cephfs/"
 clients = []
 md5sum_list1 = []
@@ -438,6 +444,54 @@ def custom_ceph_config(suite_config, custom_config, custom_config_file):
     return full_custom_config
 
 
+def _secrets_are_independent(secrets):
+    """
+    Check that no secret can overlap with other secret or with the mask, so
+    all of them can be replaced in one pass with the same result as replacing
+    them one by one
+
+    Args:
+        secrets (tuple): Secret strings
+
+    Returns:
+        bool: True if the secrets can be replaced in one pass
+
+    """
+    for secret in secrets:
+        if not secret or "*" in secret:
+            return False
+    for first in secrets:
+        for second in secrets:
+            if first == second:
+                continue
+            if first in second:
+                return False
+            # suffix of the first secret is prefix of the second one
+            for size in range(1, min(len(first), len(second))):
+                if first.endswith(second[:size]):
+                    return False
+    return True
+
+
+@lru_cache(maxsize=128)
+def _compile_secrets(secrets):
+    """
+    Compile the secrets to one regular expression
+
+    Args:
+        secrets (tuple): Secret strings
+
+    Returns:
+        re.Pattern: Pattern matching any of the secrets, None if the secrets
+            have to be replaced one by one
+
+    """
+    secrets = tuple(dict.fromkeys(secrets))
+    if not _secrets_are_independent(secrets):
+        return None
+    return re.compile("|".join(re.escape(secret) for secret in secrets))
+
+
 def mask_secrets(plaintext, secrets):
     """
     Replace secrets in plaintext with asterisks
@@ -451,17 +505,36 @@ def mask_secrets(plaintext, secrets):
         str: The censored version of plaintext
 
     """
-    if secrets:
-        for secret in secrets:
-            if secret is None:
-                continue
-            if isinstance(plaintext, list):
-                plaintext = [string.replace(secret, "*" * 5) for string in plaintext]
-            else:
-                plaintext = plaintext.replace(secret, "*" * 5)
+    if not secrets:
+        return plaintext
+    secrets = tuple(secret for secret in secrets if secret is not None)
+    if not secrets:
+        return plaintext
+    try:
+        pattern = _compile_secrets(secrets)
+    except TypeError:
+        # unhashable secrets
+        pattern = None
+    if pattern is not None:
+        if isinstance(plaintext, list):
+            return [pattern.sub("*" * 5, string) for string in plaintext]
+        return pattern.sub("*" * 5, plaintext)
+    for secret in secrets:
+        if isinstance(plaintext, list):
+            plaintext = [string.replace(secret, "*" * 5) for string in plaintext]
+        else:
+            plaintext = plaintext.replace(secret, "*" * 5)
     return plaintext
 
 
+# Base64 alphabet: A-Z, a-z, 0-9, +, /, = (padding)
+# Using string module to avoid secret scanner false positive
+_BASE64_TABLE = str.maketrans("", "", string.ascii_letters + string.digits + "+/=")
+_WHITESPACE_TABLE = str.maketrans("", "", "\n\r \t")
+_UPPERCASE_TABLE = str.maketrans("", "", string.ascii_uppercase)
+_LOWERCASE_TABLE = str.maketrans("", "", string.ascii_lowercase)
+
+
 def _is_base64_block(text_block: str, min_length: int = 100) -> bool:
     """
     Check if a text block is likely base64 encoded data.
@@ -477,21 +550,15 @@ def _is_base64_block(text_block: str, min_length: int = 100) -> bool:
     if not text_block or len(text_block) < min_length:
         return False
 
-    # Base64 alphabet: A-Z, a-z, 0-9, +, /, = (padding)
-    # Using string module to avoid secret scanner false positive
-    base64_chars = set(string.ascii_letters + string.digits + "+/=")
-    non_whitespace = (
-        text_block.replace("\n", "")
-        .replace("\r", "")
-        .replace(" ", "")
-        .replace("\t", "")
-    )
+    non_whitespace = text_block.translate(_WHITESPACE_TABLE)
 
     if not non_whitespace:
         return False
 
     # Check character composition
-    base64_char_count = sum(1 for char in non_whitespace if char in base64_chars)
+    base64_char_count = len(non_whitespace) - len(
+        non_whitespace.translate(_BASE64_TABLE)
+    )
     ratio = base64_char_count / len(non_whitespace)
 
     # Must be 95%+ base64 characters to allow YAML prefixes like "- key:"
@@ -501,8 +568,16 @@ def _is_base64_block(text_block: str, min_length: int = 100) -> bool:
     # Additional heuristic: reject if it looks like regular text
     # Regular text is heavily lowercase-skewed (80%+ lowercase)
     # Base64 can have any distribution, so we only reject obvious text patterns
-    upper_count = sum(1 for c in non_whitespace if c.isupper())
-    lower_count = sum(1 for c in non_whitespace if c.islower())
+    if non_whitespace.isascii():
+        upper_count = len(non_whitespace) - len(
+            non_whitespace.translate(_UPPERCASE_TABLE)
+        )
+        lower_count = len(non_whitespace) - len(
+            non_whitespace.translate(_LOWERCASE_TABLE)
+        )
+    else:
+        upper_count = sum(1 for c in non_whitespace if c.isupper())
+        lower_count = sum(1 for c in non_whitespace if c.islower())
 
     # If there are letters, check if it's heavily lowercase (indicates text)
     if upper_count + lower_count > 0:
@@ -740,6 +815,288 @@ def run_cmd_multicluster(
     return completed_process
 
 
+# Result of the command executed on one cluster by
+# run_cmd_multicluster_concurrently, returncode is None if the command timed out
+ClusterCmdResult = namedtuple(
+    "ClusterCmdResult",
+    [
+        "stdout",
+        "stderr",
+        "returncode",
+        "duration",
+    ],
+)
+
+
+# timeout of the command of run_cmd_multicluster_concurrently per cluster
+MULTICLUSTER_CMD_TIMEOUT = 600
+
+
+def _run_cmd_on_cluster(cmd, secrets, timeout, **kwargs):
+    """
+    Run the command on the cluster of the thread config context, used by
+    run_cmd_multicluster_concurrently
+
+    Returns:
+        ClusterCmdResult: Result of the command
+
+    """
+    start = time.perf_counter()
+    try:
+        completed_process = exec_cmd(
+            cmd,
+            secrets=secrets,
+            timeout=timeout,
+            ignore_error=True,
+            cluster_config=config.cluster_ctx,
+            **kwargs,
+        )
+    except subprocess.TimeoutExpired:
+        return ClusterCmdResult(
+            "",
+            f"Timed out after {timeout} seconds",
+            None,
+            time.perf_counter() - start,
+        )
+    return ClusterCmdResult(
+        mask_secrets(completed_process.stdout.decode(), secrets),
+        mask_secrets(completed_process.stderr.decode(), secrets),
+        completed_process.returncode,
+        time.perf_counter() - start,
+    )
+
+
+def run_cmd_multicluster_concurrently(
+    cmd,
+    secrets=None,
+    timeout=MULTICLUSTER_CMD_TIMEOUT,
+    ignore_error=False,
+    skip_index=None,
+    **kwargs,
+):
+    """
+    Run command on multiple clusters at the same time. Unlike
+    run_cmd_multicluster, the wall time is the time of the slowest cluster
+    and a failure on one cluster doesn't stop the command on the others.
+    This is wrapper around exec_cmd
+
+    Args:
+        cmd (str): command to be run
+        secrets (list): A list of secrets to be masked with asterisks
+        timeout (int or dict): Timeout for the command in seconds, defaults
+            to MULTICLUSTER_CMD_TIMEOUT (600 seconds). Dict of cluster index
+            to the timeout sets the timeout per cluster, the command on the
+            clusters missing in the dict is not skipped, it runs with the
+            MULTICLUSTER_CMD_TIMEOUT timeout.
+        ignore_error (bool): True if ignore non zero return code (or timeout)
+            and do not raise the exception.
+        skip_index (list of int): List of indexes that needs to be skipped from executing the command
+
+    Raises:
+        CommandFailed: In case the command failed on any of the clusters,
+            raised after the command finished on all the clusters
+
+    Returns:
+        dict: Cluster index to ClusterCmdResult (stdout, stderr, returncode
+            and duration), skipped clusters are not included
+
+    """
+    if not isinstance(skip_index, list):
+        skip_index = [skip_index]
+    indexes = [
+        index for index in range(len(config.clusters)) if index not in skip_index
+    ]
+    if not indexes:
+        return dict()
+    with ThreadPoolExecutor(max_workers=len(indexes)) as executor:
+        futures = dict()
+        for index in indexes:
+            cluster_timeout = (
+                timeout.get(index, MULTICLUSTER_CMD_TIMEOUT)
+                if isinstance(timeout, dict)
+                else timeout
+            )
+            futures[index] = executor.submit(
+                config_safe_thread_pool_task,
+                index,
+                _run_cmd_on_cluster,
+                cmd,
+                secrets,
+                cluster_timeout,
+                **kwargs,
+            )
+        results = {index: future.result() for index, future in futures.items()}
+    failed = {
+        index: result for index, result in results.items() if result.returncode != 0
+    }
+    for index, result in failed.items():
+        log.error(
+            f"Command {mask_secrets(str(cmd), secrets)} failed on cluster "
+            f"{config.get_cluster_name_by_index(index)} with return code "
+            f"{result.returncode}: {result.stderr}"
+        )
+    if failed and not ignore_error:
+        raise CommandFailed(
+            f"Error during execution of command: {mask_secrets(str(cmd), secrets)} "
+            f"on clusters {sorted(failed)}."
+        )
+    return results
+
+
+def exec_env(kubeconfig=None):
+    """
+    Get environment of the commands executed by exec_cmd
+
+    The environment is copied from os.environ for every command: os.environ
+    is modified by many helpers (e.g. PATH of the downloaded binaries, vault
+    and cloud credentials) between the cluster context switches, so the
+    environment of the previous command can't be reused.
+
+    Args:
+        kubeconfig (str): Path to the kubeconfig set in KUBECONFIG
+
+    Returns:
+        dict: Copy of os.environ with KUBECONFIG set, owned by the caller
+
+    """
+    env = os.environ.copy()
+    if kubeconfig:
+        env["KUBECONFIG"] = kubeconfig
+    return env
+
+
+@lru_cache(maxsize=1024)
+def _split_command(cmd):
+    """
+    Split the command string like a shell, repeated commands are split once
+
+    Args:
+        cmd (str): Command
+
+    Returns:
+        tuple: Arguments of the command
+
+    """
+    return tuple(shlex.split(cmd))
+
+
+def add_kubeconfig_arg(cmd, kubeconfig_path):
+    """
+    Add --kubeconfig argument to the oc command, after the plugin name for
+    the oc plugin commands
+
+    Args:
+        cmd (list): Split command
+        kubeconfig_path (str): Path to the kubeconfig
+
+    Returns:
+        list: The command with --kubeconfig argument, commands other than oc
+            and commands which already have it are returned unchanged
+
+    """
+    global _oc_plugin_list_cache
+    if cmd[0] != "oc" or "--kubeconfig" in cmd or "mirror" in cmd:
+        return cmd
+    kube_index = 1
+    # check if we have an oc plugin in the command
+    if _oc_plugin_list_cache is None:
+        cp = subprocess.run(
+            shlex.split("oc plugin list"),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        if cp.returncode == 0:
+            _oc_plugin_list_cache = cp.stdout.decode().splitlines()
+
+    subcmd = cmd[1].split("-")
+    if len(subcmd) > 1:
+        subcmd = "_".join(subcmd)
+    if not isinstance(subcmd, str) and isinstance(subcmd, list):
+        subcmd = str(subcmd[0])
+
+    plugin_lines = _oc_plugin_list_cache or []
+    for l in plugin_lines:
+        if subcmd in l:
+            kube_index = 2
+            log.info(f"Found oc plugin {subcmd}")
+    cmd = list_insert_at_position(cmd, kube_index, ["--kubeconfig"])
+    cmd = list_insert_at_position(cmd, kube_index + 1, [kubeconfig_path])
+    return cmd
+
+
+def _oc_singleflight_key(cmd, env, cluster_config=None):
+    """
+    Get the key under which the oc command can be shared with identical
+    concurrent calls
+
+    Args:
+        cmd (list): Split command (with --kubeconfig already inserted)
+        env (dict): Environment of the command
+        cluster_config (MultiClusterConfig): Config of the cluster the command
+            is executed on, the current context is used if not provided
+
+    Returns:
+        tuple: Key of the command, None if the command must not be shared
+            (not read-only oc command or coalescing is disabled). The key
+            contains the generation of the oc writes, the command never joins
+            the identical command started before the last write finished
+
+    """
+    run_config = cluster_config or config
+    if not run_config.RUN.get("oc_singleflight", False):
+        return None
+    if not isinstance(cmd, list) or not oc_read_only_verb(cmd):
+        return None
+    cluster_index = run_config.MULTICLUSTER.get("multicluster_index")
+    return (
+        tuple(cmd),
+        env.get("KUBECONFIG"),
+        cluster_index,
+        oc_read_singleflight.generation,
+    )
+
+
+def _invalidate_oc_reads(cmd):
+    """
+    Stop sharing the in-flight read-only oc commands with the commands which
+    come after the finished oc write command
+
+    Args:
+        cmd (list): Split command which finished
+
+    """
+    if isinstance(cmd, list) and cmd and cmd[0] == "oc" and not oc_read_only_verb(cmd):
+        oc_read_singleflight.invalidate()
+
+
+def _run_subprocess(cmd, threading_lock=None, lock_timeout=7200, **kwargs):
+    """
+    Run the command with subprocess.run, oc commands are serialized by the
+    threading_lock when provided
+
+    Args:
+        cmd (list): Command to run
+        threading_lock (threading.RLock): Lock used for oc commands
+        lock_timeout (int): Maximum time to wait for the lock
+        **kwargs: Arguments of subprocess.run
+
+    Returns:
+        tuple: Completed process of the command (CompletedProcess) and time
+            spent waiting for the threading_lock in seconds (float)
+
+    """
+    lock_wait = 0.0
+    if threading_lock and cmd[0] == "oc":
+        start = time.perf_counter()
+        threading_lock.acquire(timeout=lock_timeout)
+        lock_wait = time.perf_counter() - start
+    try:
+        return subprocess.run(cmd, **kwargs), lock_wait
+    finally:
+        if threading_lock and cmd[0] == "oc":
+            threading_lock.release()
+
+
 @retry(
     CommandFailed,
     tries=6,
@@ -758,6 +1115,7 @@ def exec_cmd(
     lock_timeout=7200,
     output_file=None,
     cmd_log_level=logging.DEBUG,
+    stdout_loader=None,
     **kwargs,
 ):
     """
@@ -783,6 +1141,10 @@ def exec_cmd(
         output_file (str): path where to write output of stderr from command - apply only when silent mode is True
         cmd_log_level (int): Log level for the "Executing command" message.
             Defaults to logging.DEBUG. Use logging.INFO, logging.WARNING, etc. to override.
+        stdout_loader (callable): Function to load the masked stdout (e.g. json
+            loads). The loaded object is used by the log filter and stored in
+            the stdout_data attribute of the returned CompletedProcess (None
+            if the stdout is empty or can't be loaded).
 
     Raises:
         CommandFailed: In case the command execution fails
@@ -794,79 +1156,148 @@ def exec_cmd(
         returncode (str): The exit code of the process, negative for signals.
         stdout     (str): The standard output (None if not captured).
         stderr     (str): The standard error (None if not captured).
+        stdout_data (object): Loaded stdout, only if stdout_loader is provided.
 
     """
-    _env = kwargs.pop("env", os.environ.copy())
+    custom_env = "env" in kwargs
     kubeconfig_path = config.RUN.get("kubeconfig")
-    if kubeconfig_path:
-        _env["KUBECONFIG"] = kubeconfig_path
+    env_kubeconfig = kubeconfig_path
     if cluster_config:
         kubeconfig_path = cluster_config.RUN.get("kubeconfig")
-        if kubeconfig_path:
-            _env["KUBECONFIG"] = cluster_config.RUN.get("kubeconfig")
+        env_kubeconfig = kubeconfig_path or env_kubeconfig
+    if custom_env:
+        _env = kwargs.pop("env")
+        if env_kubeconfig:
+            _env["KUBECONFIG"] = env_kubeconfig
+    else:
+        _env = exec_env(env_kubeconfig)
     if isinstance(cmd, str) and not kwargs.get("shell"):
-        cmd = shlex.split(cmd)
-    if (
-        kubeconfig_path
-        and cmd[0] == "oc"
-        and "--kubeconfig" not in cmd
-        and "mirror" not in cmd
-    ):
-        kube_index = 1
-        # check if we have an oc plugin in the command
-        global _oc_plugin_list_cache
-        if _oc_plugin_list_cache is None:
-            cp = subprocess.run(
-                shlex.split("oc plugin list"),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+        cmd = list(_split_command(cmd))
+    if kubeconfig_path:
+        cmd = add_kubeconfig_arg(cmd, kubeconfig_path)
+    if kwargs.get("shell"):
+        masked_cmd = mask_secrets(cmd, secrets)
+    else:
+        masked_cmd = shlex.join(mask_secrets(cmd, secrets))
+    log.log(cmd_log_level, f"Executing command: {masked_cmd}")
+    run_kw = {
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.PIPE,
+        "timeout": timeout,
+        "env": _env,
+    }
+    # subprocess.run forbids stdin= and input= together; when callers pass input,
+    # stdin is managed internally. Do not inject stdin=PIPE if the caller set stdin.
+    if "input" not in kwargs and "stdin" not in kwargs:
+        run_kw["stdin"] = subprocess.PIPE
+    run_kw.update(kwargs)
+    singleflight_key = None
+    if not custom_env and not kwargs:
+        singleflight_key = _oc_singleflight_key(cmd, _env, cluster_config)
+    start = time.perf_counter()
+    if singleflight_key:
+        try:
+            (completed_process, lock_wait), shared = oc_read_singleflight.do(
+                singleflight_key,
+                _run_subprocess,
+                cmd,
+                threading_lock,
+                lock_timeout,
+                wait_timeout=timeout,
+                **run_kw,
+            )
+        except TimeoutError:
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        if shared:
+            log.debug("Command result shared with identical in-flight command")
+    else:
+        try:
+            completed_process, lock_wait = _run_subprocess(
+                cmd, threading_lock, lock_timeout, **run_kw
             )
-            if cp.returncode == 0:
-                _oc_plugin_list_cache = cp.stdout.decode().splitlines()
-
-        subcmd = cmd[1].split("-")
-        if len(subcmd) > 1:
-            subcmd = "_".join(subcmd)
-        if not isinstance(subcmd, str) and isinstance(subcmd, list):
-            subcmd = str(subcmd[0])
-
-        plugin_lines = _oc_plugin_list_cache or []
-        for l in plugin_lines:
-            if subcmd in l:
-                kube_index = 2
-                log.info(f"Found oc plugin {subcmd}")
-        cmd = list_insert_at_position(cmd, kube_index, ["--kubeconfig"])
-        cmd = list_insert_at_position(cmd, kube_index + 1, [kubeconfig_path])
+        finally:
+            _invalidate_oc_reads(cmd)
+    processed = time.perf_counter()
+    subprocess_time = processed - start - lock_wait
+    failed = True
     try:
-        if kwargs.get("shell"):
-            masked_cmd = mask_secrets(cmd, secrets)
-        else:
-            masked_cmd = shlex.join(mask_secrets(cmd, secrets))
-        log.log(cmd_log_level, f"Executing command: {masked_cmd}")
-        if threading_lock and cmd[0] == "oc":
-            threading_lock.acquire(timeout=lock_timeout)
-        run_kw = {
-            "stdout": subprocess.PIPE,
-            "stderr": subprocess.PIPE,
-            "timeout": timeout,
-            "env": _env,
-        }
-        # subprocess.run forbids stdin= and input= together; when callers pass input,
-        # stdin is managed internally. Do not inject stdin=PIPE if the caller set stdin.
-        if "input" not in kwargs and "stdin" not in kwargs:
-            run_kw["stdin"] = subprocess.PIPE
-        completed_process = subprocess.run(cmd, **run_kw, **kwargs)
+        completed_process = process_command_result(
+            completed_process,
+            masked_cmd,
+            secrets=secrets,
+            ignore_error=ignore_error,
+            silent=silent,
+            output_file=output_file,
+            stdout_loader=stdout_loader,
+        )
+        failed = bool(completed_process.returncode)
+        return completed_process
     finally:
-        if threading_lock and cmd[0] == "oc":
-            threading_lock.release()
-    masked_stdout = mask_secrets(completed_process.stdout.decode(), secrets)
-    log_stdout = filter_verbose_yaml(masked_stdout)
-    truncated_stdout = truncate_long_lines(log_stdout)
-    if len(completed_process.stdout) > 0:
-        truncated_stdout = truncate_large_base64(truncated_stdout)
-        log.debug(f"Command stdout: {truncated_stdout}")
-    else:
-        log.debug("Command stdout is empty")
+        command_telemetry.record_command(
+            cmd if isinstance(cmd, list) else cmd.split(),
+            cluster_config,
+            lock_wait=lock_wait,
+            subprocess_time=subprocess_time,
+            parse_time=time.perf_counter() - processed,
+            output_bytes=len(completed_process.stdout or b""),
+            error=failed,
+        )
+
+
+def process_command_result(
+    completed_process,
+    masked_cmd,
+    secrets=None,
+    ignore_error=False,
+    silent=False,
+    output_file=None,
+    stdout_loader=None,
+):
+    """
+    Log output of the executed command, load its stdout and check its return
+    code the same way for commands executed locally and commands executed
+    by other means (e.g. in pod exec session)
+
+    Args:
+        completed_process (CompletedProcess): Result of the command
+        masked_cmd (str): Command with masked secrets, used in the log and
+            in the error message
+        secrets (list): A list of secrets to be masked with asterisks
+        ignore_error (bool): True if ignore non zero return code and do not
+            raise the exception.
+        silent (bool): If True will silent errors from the server
+        output_file (str): path where to write output of stderr from command
+            - apply only when silent mode is True
+        stdout_loader (callable): Function to load the masked stdout
+
+    Raises:
+        CommandFailed: In case the command execution fails
+
+    Returns:
+        CompletedProcess: Result of the command, with stdout_data attribute
+            if stdout_loader is provided
+
+    """
+    masked_stdout = None
+    if stdout_loader or log.isEnabledFor(logging.DEBUG):
+        masked_stdout = mask_secrets(completed_process.stdout.decode(), secrets)
+    stdout_data = None
+    if stdout_loader:
+        if masked_stdout.strip():
+            try:
+                stdout_data = stdout_loader(masked_stdout)
+            except (ValueError, yaml.YAMLError) as ex:
+                log.debug(f"Failed to load command stdout: {ex}")
+        # completed process can be shared with other callers, don't modify it
+        completed_process = copy(completed_process)
+        completed_process.stdout_data = stdout_data
+    # the log output is prepared only when it is going to be logged
+    if log.isEnabledFor(logging.DEBUG):
+        if len(completed_process.stdout) > 0:
+            log_stdout = filter_verbose_yaml(masked_stdout, data=stdout_data)
+            log.debug(f"Command stdout: {sanitize_log_output(log_stdout)}")
+        else:
+            log.debug("Command stdout is empty")
 
     masked_stderr = mask_secrets(completed_process.stderr.decode(), secrets)
     if len(completed_process.stderr) > 0:
@@ -946,25 +1377,80 @@ def truncate_long_lines(output: str, max_line_length: int = 500) -> str:
     if not output:
         return output
 
-    lines = output.split("\n")
+    return "\n".join(
+        _truncate_line(line, max_line_length) for line in output.split("\n")
+    )
+
+
+def _truncate_line(line, max_line_length):
+    """
+    Truncate the middle of the line longer than max_line_length
+
+    Args:
+        line (str): Line to truncate
+        max_line_length (int): Maximum line length before truncation
+
+    Returns:
+        str: Truncated line
+
+    """
+    if len(line) <= max_line_length:
+        return line
+    # Keep prefix and suffix, truncate middle
+    prefix_len = max_line_length // 2
+    suffix_len = 50
+    truncated_chars = max(0, len(line) - prefix_len - suffix_len)
+    truncated_text = f"[...{truncated_chars} chars truncated...]"
+    if truncated_chars > len(truncated_text):
+        return f"{line[:prefix_len]}{truncated_text}{line[-suffix_len:]}"
+    return line  # Edge case: line just over threshold
+
+
+def sanitize_log_output(output, max_line_length=500, max_base64_size=1024):
+    """
+    Prepare command output for logging in one pass over its lines
+
+    The result is the same as of
+    truncate_large_base64(truncate_long_lines(output, max_line_length), max_base64_size)
+
+    Args:
+        output (str): Command output to process
+        max_line_length (int): Maximum line length before truncation
+        max_base64_size (int): Maximum size for base64 blocks
+
+    Returns:
+        str: Output with long lines and large base64 blocks truncated
+
+    """
+    if not output:
+        return output
+
     result = []
+    block = []
+    block_size = 0
 
-    for line in lines:
-        if len(line) > max_line_length:
-            # Keep prefix and suffix, truncate middle
-            prefix_len = max_line_length // 2
-            suffix_len = 50
-            truncated_chars = max(0, len(line) - prefix_len - suffix_len)
-            truncated_text = f"[...{truncated_chars} chars truncated...]"
-            if truncated_chars > len(truncated_text):
-                result.append(
-                    f"{line[:prefix_len]}{truncated_text}{line[-suffix_len:]}"
-                )
-            else:
-                result.append(line)  # Edge case: line just over threshold
+    def flush_block():
+        if block_size > max_base64_size:
+            result.append(
+                f"[BASE64_TRUNCATED: {block_size} chars removed for log brevity]"
+            )
         else:
-            result.append(line)
-
+            # Block is small, keep it (might be a secret to decode)
+            result.extend(block)
+        block.clear()
+
+    for line in output.split("\n"):
+        line = _truncate_line(line, max_line_length)
+        if _is_base64_block(line.strip(), min_length=50):
+            # size of the block joined by new lines
+            block_size = block_size + len(line) + 1 if block else len(line)
+            block.append(line)
+            continue
+        if block:
+            flush_block()
+        result.append(line)
+    if block:
+        flush_block()
     return "\n".join(result)
 
 
@@ -2265,7 +2751,16 @@ class TimeoutSampler(object):
     Once iteration starts, the following attributes are available for
     inspection: `attempt` (number of samples so far), `last_result` (most
     recent value returned by func) and `last_exception` (the exception raised
-    by the most recent sample, None if that sample succeeded).
+    by the most recent sample, None if that sample succeeded). The `stats`
+    dict records the number of iterations, the total time slept and the time
+    to success (seconds since the first sample when the caller stopped
+    iterating, None while sampling or after a timeout).
+
+    By default the sampler sleeps the fixed `sleep` interval between
+    samples. Adaptive scheduling can be enabled by `with_backoff`, eg.::
+
+        for sample in TimeoutSampler(600, 5, func).with_backoff(max_sleep=60):
+            ...
 
     Args:
         timeout (int): Timeout in seconds
@@ -2314,6 +2809,17 @@ class TimeoutSampler(object):
         self.last_exception = None
         # Timestamp of the last INFO-level progress log (for rate limiting)
         self.last_progress_log_time = None
+        # Adaptive scheduling, see with_backoff(), defaults keep fixed sleep
+        self.backoff_factor = 1
+        self.max_sleep = None
+        self.jitter = False
+        self.fast_probes = 0
+        self.fast_probe_sleep = 1
+        # Number of sleeps done and the next (not jittered) backoff interval
+        self._sleeps = 0
+        self._backoff_interval = None
+        self._deadline_reached = False
+        self.stats = {"iterations": 0, "total_sleep": 0, "time_to_success": None}
         # The exception to raise
         self.timeout_exc_cls = TimeoutExpiredError
         # Arguments that will be passed to the exception
@@ -2328,6 +2834,97 @@ class TimeoutSampler(object):
                 exc_info=True,
             )
 
+    def with_backoff(
+        self,
+        backoff_factor=2,
+        max_sleep=None,
+        jitter=True,
+        fast_probes=0,
+        fast_probe_sleep=1,
+    ):
+        """
+        Enable adaptive scheduling of the samples: the first `fast_probes`
+        samples are taken `fast_probe_sleep` seconds apart to catch fast
+        transitions, then the interval starts at `sleep` and is multiplied by
+        `backoff_factor` after each sample up to `max_sleep`. With jitter
+        enabled, the sleep is picked uniformly from zero to the interval (full
+        jitter), so parallel samplers don't poll the API in lockstep. The last
+        sleep is shortened to end at the timeout, where one more sample is
+        taken before the timeout exception is raised.
+
+        Args:
+            backoff_factor (float): Multiplier of the interval after each
+                sample, 1 keeps the interval fixed
+            max_sleep (float): Upper bound of the interval, None for no bound
+                other than the timeout
+            jitter (bool): True to randomize the sleeps with full jitter
+            fast_probes (int): Number of samples taken with fast_probe_sleep
+                interval before the backoff starts
+            fast_probe_sleep (float): Interval of the fast probes, in seconds
+
+        Returns:
+            TimeoutSampler: self, so the call can be chained
+
+        Raises:
+            ValueError: When backoff_factor is less than 1 or the intervals
+                are not positive
+
+        """
+        if backoff_factor < 1:
+            raise ValueError("backoff_factor should be at least 1")
+        if (max_sleep is not None and max_sleep <= 0) or fast_probe_sleep <= 0:
+            raise ValueError("max_sleep and fast_probe_sleep should be positive")
+        self.backoff_factor = backoff_factor
+        self.max_sleep = max_sleep
+        self.jitter = jitter
+        self.fast_probes = fast_probes
+        self.fast_probe_sleep = fast_probe_sleep
+        return self
+
+    @property
+    def adaptive(self):
+        """
+        Returns:
+            bool: True if the adaptive scheduling is enabled by with_backoff
+
+        """
+        return (
+            self.backoff_factor != 1
+            or self.max_sleep is not None
+            or self.jitter
+            or self.fast_probes > 0
+        )
+
+    def _next_sleep(self):
+        """
+        Compute the sleep before the next sample.
+
+        Returns:
+            float: Seconds to sleep, with the fixed schedule always `sleep`
+
+        """
+        if not self.adaptive:
+            return self.sleep
+        if self._sleeps < self.fast_probes:
+            interval = min(self.fast_probe_sleep, self.sleep)
+        else:
+            if self._backoff_interval is None:
+                self._backoff_interval = self.sleep
+            interval = self._backoff_interval
+            # grow incrementally and capped, so long waits don't overflow
+            self._backoff_interval = min(
+                self._backoff_interval * self.backoff_factor,
+                self.max_sleep or self.timeout,
+            )
+            if self.max_sleep is not None:
+                interval = min(interval, self.max_sleep)
+        if self.jitter:
+            interval = random.uniform(0, interval)
+        remaining = self.timeout - (time.time() - self.start_time)
+        # never sleep past the deadline, sample once more at the deadline
+        self._deadline_reached = interval >= remaining
+        return max(min(interval, remaining), 0)
+
     def _get_func_name(self):
         """
         Returns:
@@ -2415,47 +3012,127 @@ class TimeoutSampler(object):
         )
         self.last_progress_log_time = now
 
-    def __iter__(self):
+    def _log_failed_attempt(self, exc):
+        """
+        Log the exception raised by func, at INFO level at most once a minute
+
+        Args:
+            exc (Exception): Exception raised by the sampling attempt
+
+        """
+        self.last_exception = exc
+        # Rate-limit INFO logging to once per minute to reduce log noise
+        current_time = time.time()
+        if (
+            self.last_exception_info_log_time is None
+            or (current_time - self.last_exception_info_log_time) >= 60
+        ):
+            # Surface only the exception type here: this line is
+            # emitted at INFO, so keep it free of the (possibly
+            # sensitive) exception message. The full message and
+            # traceback are logged at DEBUG below.
+            log.info(
+                f"TimeoutSampler attempt {self.attempt} for function "
+                f"'{self._get_func_name()}' failed with "
+                f"{type(exc).__name__}, see debug level logs for details"
+            )
+            self.last_exception_info_log_time = current_time
+        log.debug(
+            f"Exception raised during iteration attempt {self.attempt}:",
+            exc_info=True,
+        )
+
+    def _start_attempt(self, final_sample=False):
+        """
+        Check the timeout before the next sample and count the attempt
+
+        Args:
+            final_sample (bool): True for the sample at the deadline taken by
+                the adaptive schedule
+
+        Raises:
+            TimeoutExpiredError: When the timeout expired (or the configured
+                timeout_exc_cls)
+
+        """
         if self.start_time is None:
             self.start_time = time.time()
+        self.last_sample_time = time.time()
+        if not final_sample and self.timeout <= (
+            self.last_sample_time - self.start_time
+        ):
+            self._raise_timeout()
+        self.attempt += 1
+        self.stats["iterations"] = self.attempt
+
+    def _plan_sleep(self):
+        """
+        Check the timeout after the sample and compute the following sleep
+
+        Returns:
+            tuple: Seconds to sleep (float) and whether the next sample is the
+                one at the deadline (bool)
+
+        Raises:
+            TimeoutExpiredError: When the timeout expired (or the configured
+                timeout_exc_cls)
+
+        """
+        if self.timeout <= (time.time() - self.start_time):
+            self._raise_timeout()
+        self._log_progress()
+        sleep = self._next_sleep()
+        log.debug("Going to sleep for %s seconds before next iteration", sleep)
+        return sleep, self.adaptive and self._deadline_reached
+
+    def _record_sleep(self, sleep):
+        self._sleeps += 1
+        self.stats["total_sleep"] += sleep
+
+    def _log_wait_failure(self, value):
+        """
+        Log that func didn't return the expected value before the timeout
+
+        Args:
+            value: Expected return value of func
+
+        """
+        last_attempt_info = f"last sampled value: {self._describe_last_result()}"
+        if self.last_exception is not None:
+            last_attempt_info += (
+                ", last attempt raised "
+                f"{self._describe_exception(self.last_exception)}"
+            )
+        log.error(
+            "function %s failed to return expected value %s "
+            "after multiple retries during %d second timeout (%s)",
+            self._get_func_name(),
+            value,
+            self.timeout,
+            last_attempt_info,
+        )
+
+    def __iter__(self):
+        # adaptive schedule takes one more sample at the deadline
+        final_sample = False
         while True:
-            self.last_sample_time = time.time()
-            if self.timeout <= (self.last_sample_time - self.start_time):
-                self._raise_timeout()
-            self.attempt += 1
+            self._start_attempt(final_sample)
             try:
                 result = self.func(*self.func_args, **self.func_kwargs)
                 self.last_result = result
                 self._has_result = True
                 self.last_exception = None
-                yield result
+                try:
+                    yield result
+                except GeneratorExit:
+                    # the caller stopped iterating, it got what it waited for
+                    self.stats["time_to_success"] = time.time() - self.start_time
+                    raise
             except Exception as exc:
-                self.last_exception = exc
-                # Rate-limit INFO logging to once per minute to reduce log noise
-                current_time = time.time()
-                if (
-                    self.last_exception_info_log_time is None
-                    or (current_time - self.last_exception_info_log_time) >= 60
-                ):
-                    # Surface only the exception type here: this line is
-                    # emitted at INFO, so keep it free of the (possibly
-                    # sensitive) exception message. The full message and
-                    # traceback are logged at DEBUG below.
-                    log.info(
-                        f"TimeoutSampler attempt {self.attempt} for function "
-                        f"'{self._get_func_name()}' failed with "
-                        f"{type(exc).__name__}, see debug level logs for details"
-                    )
-                    self.last_exception_info_log_time = current_time
-                log.debug(
-                    f"Exception raised during iteration attempt {self.attempt}:",
-                    exc_info=True,
-                )
-            if self.timeout <= (time.time() - self.start_time):
-                self._raise_timeout()
-            self._log_progress()
-            log.debug("Going to sleep for %s seconds before next iteration", self.sleep)
-            time.sleep(self.sleep)
+                self._log_failed_attempt(exc)
+            sleep, final_sample = self._plan_sleep()
+            time.sleep(sleep)
+            self._record_sleep(sleep)
 
     def wait_for_func_value(self, value):
         """
@@ -2468,22 +3145,10 @@ class TimeoutSampler(object):
         try:
             for i_value in self:
                 if i_value == value:
+                    self.stats["time_to_success"] = time.time() - self.start_time
                     break
         except self.timeout_exc_cls:
-            last_attempt_info = f"last sampled value: {self._describe_last_result()}"
-            if self.last_exception is not None:
-                last_attempt_info += (
-                    ", last attempt raised "
-                    f"{self._describe_exception(self.last_exception)}"
-                )
-            log.error(
-                "function %s failed to return expected value %s "
-                "after multiple retries during %d second timeout (%s)",
-                self._get_func_name(),
-                value,
-                self.timeout,
-                last_attempt_info,
-            )
+            self._log_wait_failure(value)
             raise
 
     def wait_for_func_status(self, result):
@@ -2521,9 +3186,25 @@ class TimeoutIterator(TimeoutSampler):
 
         t1 = TimeoutIterator(timeout=60, sleep=5, func=foo, func_args=[bar])
         t2 = TimeoutIterator(3600, sleep=10, func=foo, func_args=[bar])
+        t3 = TimeoutIterator(3600, 10, foo, backoff_factor=2, max_sleep=120)
+
+    The adaptive scheduling arguments are described in
+    TimeoutSampler.with_backoff.
     """
 
-    def __init__(self, timeout, sleep, func, func_args=None, func_kwargs=None):
+    def __init__(
+        self,
+        timeout,
+        sleep,
+        func,
+        func_args=None,
+        func_kwargs=None,
+        backoff_factor=1,
+        max_sleep=None,
+        jitter=False,
+        fast_probes=0,
+        fast_probe_sleep=1,
+    ):
         if func_args is None:
             func_args = []
         if func_kwargs is None:
@@ -2537,6 +3218,13 @@ class TimeoutIterator(TimeoutSampler):
             func_kwargs["func_sleep"] = func_kwargs["sleep"]
             del func_kwargs["sleep"]
         super().__init__(timeout, sleep, func, *func_args, **func_kwargs)
+        self.with_backoff(
+            backoff_factor=backoff_factor,
+            max_sleep=max_sleep,
+            jitter=jitter,
+            fast_probes=fast_probes,
+            fast_probe_sleep=fast_probe_sleep,
+        )
 
 
 def get_random_str(size=13):
@@ -5,6 +5,7 @@ Filters verbose fields from `oc get -o yaml` outputs BEFORE logging,
 while keeping full data available for actual use.
 """
 
+import copy
 import logging
 
 import yaml
@@ -21,13 +22,17 @@ VERBOSE_FIELDS: dict[str, dict[str, list[str]]] = {
 MIN_SIZE_FOR_FILTERING = 5000
 
 
-def filter_verbose_yaml(yaml_str: str, min_size: int = MIN_SIZE_FOR_FILTERING) -> str:
+def filter_verbose_yaml(
+    yaml_str: str, min_size: int = MIN_SIZE_FOR_FILTERING, data=None
+) -> str:
     """
     Filter verbose fields from YAML string for logging purposes only.
 
     Args:
-        yaml_str (str): Raw YAML string from oc command output.
+        yaml_str (str): Raw YAML (or JSON) string from oc command output.
         min_size (int): Minimum size to trigger filtering.
+        data (dict): Already loaded output. When provided, the string is not
+            parsed again and the data are not modified.
 
     Returns:
         str: Summary string for logging.
@@ -36,11 +41,18 @@ def filter_verbose_yaml(yaml_str: str, min_size: int = MIN_SIZE_FOR_FILTERING) -
     if not yaml_str or len(yaml_str) < min_size:
         return yaml_str
 
-    try:
-        data = yaml.safe_load(yaml_str)
-    except yaml.YAMLError:
+    # cheap check to avoid parsing of outputs without any verbose resource
+    if not any(kind in yaml_str for kind in VERBOSE_FIELDS):
         return yaml_str
 
+    # loaded data belong to the caller, filter only its copy
+    copy_data = data is not None
+    if data is None:
+        try:
+            data = yaml.safe_load(yaml_str)
+        except yaml.YAMLError:
+            return yaml_str
+
     if not isinstance(data, dict):
         return yaml_str
 
@@ -58,6 +70,9 @@ def filter_verbose_yaml(yaml_str: str, min_size: int = MIN_SIZE_FOR_FILTERING) -
     if not should_filter:
         return yaml_str
 
+    if copy_data:
+        data = copy.deepcopy(data)
+
     # Apply filtering
     if kind == "List":
         items = data.get("items")
@@ -0,0 +1,63 @@
+"""
+Benchmark of the per call command telemetry overhead.
+
+Compares the time of recording one executed command by
+command_telemetry.record_command with the time of one call of a fake 'oc'
+script executed by exec_cmd. The recording is expected to cost well under 1%
+of the call, so the telemetry can stay enabled by default.
+
+Usage:
+    python scripts/python/benchmarks/bench_command_telemetry.py --calls 50
+"""
+
+import argparse
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+
+from ocs_ci.utility import command_telemetry, utils
+
+FAKE_OC = """#!{python}
+import sys
+sys.stdout.write("kind: List\\nitems: []\\n")
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    fake_oc = os.path.join(tmp_dir, "oc")
+    with open(fake_oc, "w") as fd:
+        fd.write(FAKE_OC.format(python=sys.executable))
+    os.chmod(fake_oc, os.stat(fake_oc).st_mode | stat.S_IEXEC)
+    os.environ["PATH"] = f"{tmp_dir}{os.pathsep}{os.environ['PATH']}"
+    utils._oc_plugin_list_cache = []
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        utils.exec_cmd("oc get pod -n openshift-storage")
+    oc_call = (time.perf_counter() - start) / args.calls
+
+    cmd = "oc get pod -n openshift-storage".split()
+    start = time.perf_counter()
+    for _ in range(args.records):
+        command_telemetry.record_command(
+            cmd, subprocess_time=0.01, parse_time=0.001, output_bytes=100
+        )
+    record = (time.perf_counter() - start) / args.records
+    print(
+        f"oc call {oc_call * 1e3:.2f}ms, record {record * 1e6:.2f}us "
+        f"({record / oc_call:.3%} of the call)"
+    )
+    shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark of the PVC provision times from the CSI logs.
+
+Compares the legacy matching of every log line with every PVC (the previous
+get_pvc_provision_times) with CsiLogTimeline on synthetic provisioner and
+CSI plugin logs of the --pvcs PVCs. The legacy matching is quadratic, it's
+measured for a sample of --sample PVCs and extrapolated to all of them.
+
+Usage:
+    python scripts/python/benchmarks/bench_csi_log_timeline.py --pvcs 5000
+"""
+
+import argparse
+import time
+
+from ocs_ci.framework import config
+from ocs_ci.helpers.performance_lib import CsiLogTimeline
+from ocs_ci.utility.tests.test_csi_log_timeline import (
+    legacy_provision_times,
+    recorded_logs,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pvcs", type=int, default=500)
+    parser.add_argument("--sample", type=int, default=50)
+    args = parser.parse_args()
+
+    config.ENV_DATA["ocs_version"] = "4.18"
+    pvcs, prov, csi = recorded_logs(args.pvcs)
+    lines = sum(len(sublog) for sublog in prov + csi)
+    sample = pvcs[:: max(args.pvcs // args.sample, 1)]
+    start = time.perf_counter()
+    legacy_provision_times(sample, prov, csi)
+    legacy_time = (time.perf_counter() - start) * len(pvcs) / len(sample)
+    start = time.perf_counter()
+    CsiLogTimeline(prov_logs=prov, csi_logs=csi).pvc_times(pvcs)
+    timeline_time = time.perf_counter() - start
+    print(
+        f"{args.pvcs} PVCs, {lines} log lines: legacy {legacy_time:.2f}s"
+        f"{' (extrapolated)' if len(sample) < len(pvcs) else ''}, "
+        f"timeline {timeline_time:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark of the preparation of the commands executed by exec_cmd.
+
+Compares the time spent before the fork of every command without caching
+(copy of os.environ with KUBECONFIG and shlex.split of the command string)
+with exec_env and the cached command splitting used by exec_cmd. The
+--env-vars option adds variables to os.environ to simulate a large
+environment.
+
+Usage:
+    python scripts/python/benchmarks/bench_exec_env.py --calls 20000 --env-vars 500
+"""
+
+import argparse
+import os
+import shlex
+import time
+
+from ocs_ci.utility import utils
+
+COMMAND = "oc -n openshift-storage get pod rook-ceph-tools -o yaml"
+KUBECONFIG = "/tmp/kubeconfig"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--env-vars", type=int, default=0)
+    args = parser.parse_args()
+
+    for i in range(args.env_vars):
+        os.environ[f"OCS_CI_BENCH_VAR_{i}"] = "x" * 50
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        env = os.environ.copy()
+        env["KUBECONFIG"] = KUBECONFIG
+        shlex.split(COMMAND)
+    uncached = (time.perf_counter() - start) / args.calls
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        utils.exec_env(KUBECONFIG)
+        list(utils._split_command(COMMAND))
+    cached = (time.perf_counter() - start) / args.calls
+    print(
+        f"pre-fork overhead per command: {uncached * 1e6:.1f}us uncached, "
+        f"{cached * 1e6:.1f}us cached"
+    )
+
+
+if __name__ == "__main__":
+    main()
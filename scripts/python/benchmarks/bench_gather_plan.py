@@ -0,0 +1,48 @@
+"""
+Benchmark of the concurrent log collection of one cluster.
+
+Runs a GatherPlan of gatherers sleeping like the log collection of a cluster
+(three must-gathers, the toolbox setup and the ceph commands waiting for the
+toolbox and the OCS must-gather) and compares the wall time with the time of
+running the gatherers one by one. The --scale option multiplies the delays.
+
+Usage:
+    python scripts/python/benchmarks/bench_gather_plan.py --scale 1 --concurrency 4
+"""
+
+import argparse
+import functools
+import time
+
+from ocs_ci.utility.gather_plan import GatherPlan
+
+# name: (delay in seconds, dependencies)
+GATHERERS = {
+    "ocs_must_gather": (1.0, []),
+    "ceph_toolbox": (0.5, []),
+    "external_ceph": (0.2, ["ceph_toolbox", "ocs_must_gather"]),
+    "ocp_must_gather": (1.0, []),
+    "ocp_service_logs": (1.0, []),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    plan = GatherPlan(concurrency=args.concurrency, poll_interval=0.05)
+    for name, (delay, depends) in GATHERERS.items():
+        plan.add(
+            name, functools.partial(time.sleep, delay * args.scale), depends=depends
+        )
+    start = time.perf_counter()
+    plan.run()
+    elapsed = time.perf_counter() - start
+    sequential = sum(delay for delay, _ in GATHERERS.values()) * args.scale
+    print(f"log collection {elapsed:.2f}s, {sequential:.2f}s when sequential")
+
+
+if __name__ == "__main__":
+    main()
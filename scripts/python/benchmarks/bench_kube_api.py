@@ -0,0 +1,124 @@
+"""
+Benchmark of OCP.exec_oc_cmd backends against a local fake API server.
+
+Compares the per call latency of 'oc get <kind> -o yaml' executed by the 'oc'
+subprocess backend and by the native kube_api backend. When there is no 'oc'
+binary in PATH, a fake 'oc' script is used which does the same work per call:
+starts new process, parses kubeconfig, opens new connection and serializes
+the output to YAML.
+
+Usage:
+    python scripts/python/benchmarks/bench_kube_api.py --pods 200 --calls 50
+"""
+
+import argparse
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import kube_api
+from ocs_ci.ocs.ocp import OCP
+from ocs_ci.ocs.tests.fake_kube_api import FakeKubeAPIServer
+
+FAKE_OC = """#!{python}
+import json, sys, urllib.request, yaml
+args = sys.argv[1:]
+kubeconfig = args[args.index("--kubeconfig") + 1]
+with open(kubeconfig) as fd:
+    kc = yaml.safe_load(fd)
+server = kc["clusters"][0]["cluster"]["server"]
+token = kc["users"][0]["user"]["token"]
+if "plugin" in args:
+    sys.exit(0)
+namespace = args[args.index("-n") + 1]
+kind = args[args.index("get") + 1]
+req = urllib.request.Request(
+    f"{{server}}/api/v1/namespaces/{{namespace}}/{{kind}}",
+    headers={{"Authorization": f"Bearer {{token}}"}},
+)
+data = json.loads(urllib.request.urlopen(req).read())
+data["kind"] = "List"
+sys.stdout.write(yaml.safe_dump(data))
+"""
+
+
+def measure(ocp_obj, calls):
+    """
+    Measure latency of OCP.get calls
+
+    Args:
+        ocp_obj (OCP): OCP object used for calls
+        calls (int): Number of calls
+
+    Returns:
+        list: Latency of each call in seconds
+
+    """
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        ocp_obj.get()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    avg = sum(latencies) / len(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:10} calls={len(latencies):5} avg={avg * 1000:8.2f}ms "
+        f"p95={p95 * 1000:8.2f}ms total={sum(latencies):7.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pods", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    with FakeKubeAPIServer() as server:
+        for i in range(args.pods):
+            server.add_object(
+                {
+                    "apiVersion": "v1",
+                    "kind": "Pod",
+                    "metadata": {
+                        "name": f"pod-{i}",
+                        "namespace": "bench",
+                        "labels": {"app": "bench"},
+                    },
+                    "spec": {"containers": [{"name": "c", "image": "busybox"}]},
+                    "status": {"phase": "Running"},
+                }
+            )
+        server.write_kubeconfig(os.path.join(tmp_dir, "kubeconfig"))
+        if not shutil.which("oc"):
+            fake_oc = os.path.join(tmp_dir, "oc")
+            with open(fake_oc, "w") as fd:
+                fd.write(FAKE_OC.format(python=sys.executable))
+            os.chmod(fake_oc, os.stat(fake_oc).st_mode | stat.S_IEXEC)
+            os.environ["PATH"] = f"{tmp_dir}{os.pathsep}{os.environ['PATH']}"
+            print("oc binary not found, using fake oc client")
+        config.ENV_DATA["cluster_path"] = tmp_dir
+        config.RUN["kubeconfig_location"] = "kubeconfig"
+        config.RUN["kubeconfig"] = os.path.join(tmp_dir, "kubeconfig")
+        ocp_obj = OCP(kind="pods", namespace="bench")
+
+        for backend in (kube_api.OC_BACKEND, kube_api.KUBE_API_BACKEND):
+            config.RUN["oc_backend"] = backend
+            # warm up (discovery, connection)
+            ocp_obj.get()
+            report(backend, measure(ocp_obj, args.calls))
+        print(f"API requests served: {len(server.requests)}")
+    shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark of the pod listing of the environment leak check.
+
+Compares environment_check.assign_get_values with the whole pod list
+('oc get pod -A -o json' parsed by json.loads) and with the metadata printed
+by the jsonpath of OCP.get_metadata. The oc calls are not executed, the
+outputs are generated for the --pods number of pods.
+
+Usage:
+    python scripts/python/benchmarks/bench_leak_check.py --pods 5000
+"""
+
+import argparse
+import json
+import time
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.ocp import METADATA_FIELDS, METADATA_JSON_FIELDS, OCP
+from ocs_ci.utility import environment_check
+
+
+def generate_pods(count):
+    """
+    Generate list of pods similar to 'oc get pod -A -o json' output
+
+    Args:
+        count (int): Number of the pods
+
+    Returns:
+        list: The pod dicts
+
+    """
+    container = {
+        "name": "web",
+        "image": "quay.io/ocsci/nginx:latest",
+        "env": [{"name": f"VAR_{i}", "value": "x" * 40} for i in range(20)],
+        "volumeMounts": [{"name": "data", "mountPath": "/var/lib/www"}],
+        "resources": {"limits": {"cpu": "1", "memory": "1Gi"}},
+    }
+    return [
+        {
+            "apiVersion": "v1",
+            "kind": constants.POD,
+            "metadata": {
+                "name": f"pod-{i}",
+                "namespace": f"namespace-{i % 50}",
+                "uid": f"uid-{i}",
+                "creationTimestamp": "2024-05-01T10:00:00Z",
+                "resourceVersion": "123456",
+                "labels": {"app": "web"},
+                "annotations": {"openshift.io/scc": "restricted-v2"},
+                "managedFields": [{"manager": "kubelet", "fieldsV1": {"f:status": {}}}],
+            },
+            "spec": {"containers": [container] * 2, "nodeName": "compute-0"},
+            "status": {
+                "phase": "Running",
+                "containerStatuses": [
+                    {"name": "web", "ready": True, "state": {"running": {}}}
+                ],
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def metadata_output(pods):
+    """
+    Output of 'oc get pod -A -o jsonpath=<ocp.metadata_jsonpath()>'
+
+    Args:
+        pods (list): The pod dicts
+
+    Returns:
+        str: One tab separated line of the metadata fields per pod
+
+    """
+    lines = []
+    for pod in pods:
+        values = [pod["kind"]]
+        for field in METADATA_FIELDS:
+            value = pod["metadata"].get(field, "")
+            if field in METADATA_JSON_FIELDS and value:
+                value = json.dumps(value, separators=(",", ":"))
+            values.append(str(value))
+        lines.append("\t".join(values) + "\n")
+    return "".join(lines)
+
+
+def best_of(runs, func):
+    """
+    Best time of the runs of the function, the first run pays for the warm-up
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pods", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    config.ENV_DATA["cluster_namespace"] = "openshift-storage"
+    pods = generate_pods(args.pods)
+    full = json.dumps({"apiVersion": "v1", "kind": "List", "items": pods})
+    metadata = metadata_output(pods)
+    ocp_obj = OCP(kind=constants.POD)
+
+    ocp_obj.get_metadata = lambda *args, **kwargs: json.loads(full)["items"]
+    full_time = best_of(
+        args.runs, lambda: environment_check.assign_get_values({}, "pod", ocp_obj)
+    )
+    del ocp_obj.get_metadata
+    ocp_obj.exec_oc_cmd = lambda *args, **kwargs: metadata
+    metadata_time = best_of(
+        args.runs, lambda: environment_check.assign_get_values({}, "pod", ocp_obj)
+    )
+    print(
+        f"{args.pods} pods: whole objects {len(full)} bytes in {full_time:.3f}s, "
+        f"metadata {len(metadata)} bytes in {metadata_time:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark of the exec_cmd log post-processing of large command outputs.
+
+Compares the previous pipeline (secrets replaced one by one, then
+truncate_long_lines and truncate_large_base64, each one a separate pass) with
+the one pass mask_secrets and sanitize_log_output used by exec_cmd now.
+Recorded output (e.g. 'oc get secrets -A -o yaml') can be provided by --input,
+otherwise a generated output with secrets, long lines and base64 blocks is used.
+
+Usage:
+    python scripts/python/benchmarks/bench_log_sanitizer.py --size-mb 20
+    python scripts/python/benchmarks/bench_log_sanitizer.py --input secrets.yaml
+"""
+
+import argparse
+import base64
+import os
+import time
+
+from ocs_ci.utility import utils
+
+SECRETS = [f"secret-token-{i:04d}" for i in range(20)]
+
+
+def generate_output(size):
+    """
+    Generate output similar to 'oc get secrets,pods -o yaml'
+
+    Args:
+        size (int): Approximate size of the output in bytes
+
+    Returns:
+        str: Generated output
+
+    """
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        blob = base64.b64encode(os.urandom(3000)).decode()
+        chunk = [
+            "- apiVersion: v1",
+            "  kind: Secret",
+            "  metadata:",
+            f"    name: secret-{i}",
+            f"    token: {SECRETS[i % len(SECRETS)]}",
+            f"  data:\n    tls.crt: {blob}",
+            f"    short: {blob[:40]}",
+            "  message: " + "pod restarted because of liveness probe " * 20,
+        ]
+        chunk.extend(f"    key-{j}: value-{j}" for j in range(20))
+        total += sum(len(line) + 1 for line in chunk)
+        lines.extend(chunk)
+        i += 1
+    return "\n".join(lines)
+
+
+def previous_pipeline(output, secrets):
+    for secret in secrets:
+        output = output.replace(secret, "*" * 5)
+    output = utils.truncate_long_lines(output)
+    return utils.truncate_large_base64(output)
+
+
+def new_pipeline(output, secrets):
+    return utils.sanitize_log_output(utils.mask_secrets(output, secrets))
+
+
+def timed(func, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=float, default=20)
+    parser.add_argument("--input", help="recorded command output")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input) as fd:
+            output = fd.read()
+    else:
+        output = generate_output(int(args.size_mb * 2**20))
+    print(f"output={len(output) / 2**20:.1f}MiB secrets={len(SECRETS)}")
+
+    old, old_time = timed(previous_pipeline, output, SECRETS)
+    new, new_time = timed(new_pipeline, output, SECRETS)
+    assert old == new, "log output differs"
+    print(f"previous  {old_time:7.3f}s")
+    print(f"one pass  {new_time:7.3f}s  speedup={old_time / new_time:.1f}x")
+    print("debug log disabled: output is not processed at all")
+
+
+if __name__ == "__main__":
+    main()
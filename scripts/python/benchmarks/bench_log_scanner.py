@@ -0,0 +1,99 @@
+"""
+Benchmark of scanning pod logs for error patterns.
+
+Compares the previous way of get_logs_with_errors (logs fetched one by one,
+kept whole in memory and searched pattern by pattern) with LogScanner
+streaming the logs of the pods concurrently. A fake 'oc logs' prints
+--lines lines of synthetic log after --latency seconds.
+
+Usage:
+    python scripts/python/benchmarks/bench_log_scanner.py --pods 24 --latency 0.2
+"""
+
+import argparse
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from ocs_ci.framework import config
+from ocs_ci.utility import utils
+from ocs_ci.utility.log_scanner import LogScanner, pod_log_source
+
+FAKE_OC = """#!/bin/sh
+sleep "$FETCH_DELAY"
+awk -v n="$LOG_LINES" 'BEGIN {
+    for (i = 1; i <= n; i++) {
+        if (i % 5000 == 0) print "2024-05-01T10:00:00Z E process core dumped " i;
+        else print "2024-05-01T10:00:00Z I reconciled the object " i;
+    }
+}'
+"""
+PATTERNS = ["core dumped"] + [f"unknown error {i}" for i in range(8)]
+
+
+def legacy_scan(names):
+    """
+    Fetch the logs one by one, keep them whole and match the patterns one by
+    one
+    """
+    found = dict()
+    for name in names:
+        content = subprocess.run(
+            ["oc", "logs", name], stdout=subprocess.PIPE, check=True
+        ).stdout.decode()
+        for pattern in PATTERNS:
+            if pattern in content:
+                found.setdefault(name, []).append(pattern)
+    return found
+
+
+def scanner_scan(names):
+    """
+    Stream the logs of the pods concurrently through the LogScanner
+    """
+    results = LogScanner(PATTERNS, regex=False).scan(
+        [pod_log_source(name) for name in names]
+    )
+    return {
+        name: sorted({p for hit in result.hits for p in hit.patterns})
+        for name, result in results.items()
+        if result.hits
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pods", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--lines", type=int, default=100000)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    fake_oc = os.path.join(tmp_dir, "oc")
+    with open(fake_oc, "w") as fd:
+        fd.write(FAKE_OC)
+    os.chmod(fake_oc, os.stat(fake_oc).st_mode | stat.S_IEXEC)
+    os.environ["PATH"] = f"{tmp_dir}{os.pathsep}{os.environ['PATH']}"
+    os.environ["FETCH_DELAY"] = str(args.latency)
+    os.environ["LOG_LINES"] = str(args.lines)
+    utils._oc_plugin_list_cache = []
+    config.ENV_DATA["cluster_namespace"] = "openshift-storage"
+
+    names = [f"pod-{i}" for i in range(args.pods)]
+    for kind, scan in (("legacy", legacy_scan), ("scanner", scanner_scan)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        scan(names)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{kind}: {elapsed:.2f}s, peak memory {peak / 1024 / 1024:.1f} MiB")
+    shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
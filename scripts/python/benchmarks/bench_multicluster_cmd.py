@@ -0,0 +1,65 @@
+"""
+Benchmark of running one command on multiple clusters at the same time.
+
+Runs a fake 'oc' script, sleeping for the delay configured in the kubeconfig
+file of each cluster, by run_cmd_multicluster_concurrently and compares the
+wall time with the slowest cluster and with the sum of the delays (the time
+of running the command on the clusters one by one).
+
+Usage:
+    python scripts/python/benchmarks/bench_multicluster_cmd.py --delays 1 1.5 1
+"""
+
+import argparse
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+
+from ocs_ci import framework
+from ocs_ci.utility import utils
+
+FAKE_OC = """#!{python}
+import sys, time
+if "--kubeconfig" in sys.argv:
+    with open(sys.argv[sys.argv.index("--kubeconfig") + 1]) as fd:
+        time.sleep(float(fd.read()))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--delays", type=float, nargs="+", default=[1.0, 1.5, 1.0])
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    fake_oc = os.path.join(tmp_dir, "oc")
+    with open(fake_oc, "w") as fd:
+        fd.write(FAKE_OC.format(python=sys.executable))
+    os.chmod(fake_oc, os.stat(fake_oc).st_mode | stat.S_IEXEC)
+    os.environ["PATH"] = f"{tmp_dir}{os.pathsep}{os.environ['PATH']}"
+    utils._oc_plugin_list_cache = []
+
+    framework.config.nclusters = len(args.delays)
+    framework.config.init_cluster_configs()
+    for index, delay in enumerate(args.delays):
+        kubeconfig = os.path.join(tmp_dir, f"kubeconfig{index}")
+        with open(kubeconfig, "w") as fd:
+            fd.write(str(delay))
+        framework.config.clusters[index].RUN["kubeconfig"] = kubeconfig
+        framework.config.clusters[index].ENV_DATA["cluster_name"] = f"c{index}"
+
+    start = time.perf_counter()
+    utils.run_cmd_multicluster_concurrently("oc whoami")
+    wall_time = time.perf_counter() - start
+    print(
+        f"wall time {wall_time:.2f}s, slowest cluster {max(args.delays):.2f}s, "
+        f"one by one {sum(args.delays):.2f}s"
+    )
+    shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
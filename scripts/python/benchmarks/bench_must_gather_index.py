@@ -0,0 +1,96 @@
+"""
+Benchmark of the must-gather path index.
+
+Compares the legacy path list of the members of a must-gather tarball (the
+parent directories added by a list lookup, quadratic in the number of the
+entries) and the path queries on it with PathIndex. Synthetic tarballs of
+the --entries sizes are generated, the legacy list is measured only up to
+--legacy-max entries.
+
+Usage:
+    python scripts/python/benchmarks/bench_must_gather_index.py --entries 1000 4000 200000
+"""
+
+import argparse
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+
+from ocs_ci.ocs.must_gather.path_index import PathIndex, tarball_members
+
+MG_DIR = "must-gather.local.1/quay-io-odf-must-gather-sha256-abc"
+
+
+def tarball_names(entries):
+    """
+    Member names of synthetic must-gather tarball
+
+    Args:
+        entries (int): Number of the entries
+
+    Returns:
+        list: Names of the pod log files
+
+    """
+    names = []
+    pod = 0
+    while len(names) < entries:
+        pod_dir = (
+            f"{MG_DIR}/namespaces/openshift-storage-{pod // 200}/pods/rook-pod-{pod}"
+        )
+        for container in range(3):
+            names.append(f"{pod_dir}/c-{container}/c-{container}/logs/current.log")
+        pod += 1
+    return names[:entries]
+
+
+def legacy_paths(names):
+    """
+    Path list of MustGather._get_paths_from_tarball before the path index
+    """
+    paths = []
+    for name in names:
+        paths.append(name)
+        parts = name.replace("\\", "/").split("/")
+        for i in range(1, len(parts)):
+            parent = "/".join(parts[:i])
+            if parent and parent not in paths:
+                paths.append(parent)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 4000, 20000])
+    parser.add_argument("--legacy-max", type=int, default=4000)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    for size in args.entries:
+        tarball_path = os.path.join(tmp_dir, f"mg-{size}.tar.gz")
+        with tarfile.open(tarball_path, "w:gz", compresslevel=1) as tar:
+            for name in tarball_names(size):
+                tar.addfile(tarfile.TarInfo(name))
+        start = time.perf_counter()
+        members = tarball_members(tarball_path)
+        read_time = time.perf_counter() - start
+        queries = [f"rook-pod-{i}/c-1" for i in range(0, size // 3, size // 60 or 1)]
+        result = f"{size} entries: tarball read {read_time:.3f}s"
+        if size <= args.legacy_max:
+            start = time.perf_counter()
+            legacy = legacy_paths(name for name, _ in members)
+            [query for query in queries if not any(query in path for path in legacy)]
+            result += f", legacy {time.perf_counter() - start:.3f}s"
+        start = time.perf_counter()
+        index = PathIndex()
+        index.add_members(members)
+        [query for query in queries if not index.contains_substring(query)]
+        result += f", index {time.perf_counter() - start:.3f}s"
+        print(result)
+    shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark of loading 'oc get' list outputs as YAML and as JSON.
+
+Compares the previous OCP.exec_oc_cmd path ('-o yaml' loaded by CSafeLoader
+plus the second yaml.safe_load of the log filter) with the JSON path ('-o json'
+loaded once by the JSON decoder and the log filter working on the loaded
+object). Recorded output of 'oc get pods -A -o yaml' can be provided by
+--input, otherwise list of generated pods is used.
+
+Usage:
+    python scripts/python/benchmarks/bench_oc_output.py --pods 10000
+    python scripts/python/benchmarks/bench_oc_output.py --input pods.yaml
+"""
+
+import argparse
+import json
+import time
+
+import yaml
+
+from ocs_ci.ocs.ocp import load_yaml_output
+from ocs_ci.utility.json import loads as json_loads, orjson
+from ocs_ci.utility.yaml_log_filter import filter_verbose_yaml
+
+
+def generate_pods(count):
+    """
+    Generate list of pods similar to 'oc get pods -A -o yaml' output
+
+    Args:
+        count (int): Number of pods
+
+    Returns:
+        dict: List of pods
+
+    """
+    items = []
+    for i in range(count):
+        items.append(
+            {
+                "apiVersion": "v1",
+                "kind": "Pod",
+                "metadata": {
+                    "name": f"pod-{i}",
+                    "namespace": f"namespace-{i % 50}",
+                    "uid": f"4f0c2f8e-1b9a-4c7e-9d0a-{i:012d}",
+                    "resourceVersion": str(100000 + i),
+                    "creationTimestamp": "2024-01-01T00:00:00Z",
+                    "labels": {"app": "bench", "pod-template-hash": "7d9f8c6b5"},
+                    "annotations": {"openshift.io/scc": "restricted-v2"},
+                    "ownerReferences": [
+                        {"apiVersion": "apps/v1", "kind": "ReplicaSet", "name": "rs"}
+                    ],
+                },
+                "spec": {
+                    "containers": [
+                        {
+                            "name": "app",
+                            "image": "quay.io/ocsci/nginx:latest",
+                            "args": ["--port", "8080"],
+                            "resources": {"requests": {"cpu": "10m"}},
+                            "volumeMounts": [
+                                {"mountPath": "/var/lib/www/html", "name": "data"}
+                            ],
+                        }
+                    ],
+                    "nodeName": f"worker-{i % 3}",
+                    "volumes": [
+                        {"name": "data", "persistentVolumeClaim": {"claimName": "pvc"}}
+                    ],
+                },
+                "status": {
+                    "phase": "Running",
+                    "podIP": f"10.128.{i // 250}.{i % 250}",
+                    "conditions": [
+                        {"type": "Ready", "status": "True"},
+                        {"type": "ContainersReady", "status": "True"},
+                    ],
+                    "containerStatuses": [
+                        {"name": "app", "ready": True, "restartCount": 0}
+                    ],
+                },
+            }
+        )
+    return {
+        "apiVersion": "v1",
+        "kind": "List",
+        "items": items,
+        "metadata": {"resourceVersion": ""},
+    }
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pods", type=int, default=10000)
+    parser.add_argument("--input", help="recorded 'oc get -o yaml' output")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input) as fd:
+            data = load_yaml_output(fd.read())
+    else:
+        data = generate_pods(args.pods)
+    yaml_out = yaml.safe_dump(data)
+    json_out = json.dumps(data, indent=4)
+    print(
+        f"items={len(data.get('items', [])):6} yaml={len(yaml_out) / 2**20:.1f}MiB "
+        f"json={len(json_out) / 2**20:.1f}MiB "
+        f"decoder={'orjson' if orjson is not None else 'json'}"
+    )
+
+    # previous path: log filter parsed the output once more for logging
+    _, filter_time = timed(yaml.safe_load, yaml_out)
+    from_yaml, load_time = timed(load_yaml_output, yaml_out)
+    print(
+        f"yaml  total={filter_time + load_time:7.2f}s "
+        f"(CSafeLoader={load_time:.2f}s, log filter={filter_time:.2f}s)"
+    )
+
+    from_json, load_time = timed(json_loads, json_out)
+    _, filter_time = timed(filter_verbose_yaml, json_out, data=from_json)
+    print(
+        f"json  total={filter_time + load_time:7.2f}s "
+        f"(decoder={load_time:.2f}s, log filter={filter_time:.2f}s)"
+    )
+    assert from_json == from_yaml
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark of short commands executed in pod exec sessions.
+
+Compares a new exec stream per command (what every 'oc rsh' does, without the
+cost of starting the 'oc' process and loading the kubeconfig) with the shared
+ExecSessionPool reusing one session. The fake API server runs the exec
+commands as local processes, the --latency option adds delay to every API
+request (exec handshake) to simulate a remote cluster.
+
+Usage:
+    python scripts/python/benchmarks/bench_pod_exec.py --commands 500 --latency 0.02
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from ocs_ci.ocs import pod_exec
+from ocs_ci.ocs.tests.fake_kube_api import FakeKubeAPIServer
+
+NAMESPACE = "openshift-storage"
+COMMAND = ["ceph", "health"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    # stand-in for the ceph CLI of the toolbox pod
+    ceph = os.path.join(tmpdir, "ceph")
+    with open(ceph, "w") as fd:
+        fd.write("#!/bin/sh\necho HEALTH_OK\n")
+    os.chmod(ceph, 0o755)
+    os.environ["PATH"] = f"{tmpdir}{os.pathsep}{os.environ['PATH']}"
+
+    with FakeKubeAPIServer(latency=args.latency) as server:
+        server.add_object(
+            {
+                "apiVersion": "v1",
+                "kind": "Pod",
+                "metadata": {"name": "rook-ceph-tools", "namespace": NAMESPACE},
+                "spec": {"containers": [{"name": "rook-ceph-tools"}]},
+            }
+        )
+        kubeconfig = server.write_kubeconfig(os.path.join(tmpdir, "kubeconfig"))
+
+        pool = pod_exec.ExecSessionPool(max_idle=0)
+        start = time.perf_counter()
+        for _ in range(args.commands):
+            pool.run(kubeconfig, "rook-ceph-tools", NAMESPACE, COMMAND)
+        per_command = time.perf_counter() - start
+
+        pool = pod_exec.ExecSessionPool()
+        start = time.perf_counter()
+        for _ in range(args.commands):
+            out, _, _ = pool.run(kubeconfig, "rook-ceph-tools", NAMESPACE, COMMAND)
+            assert out == b"HEALTH_OK\n"
+        pooled = time.perf_counter() - start
+        pool.close_all()
+
+    print(f"commands={args.commands} latency={args.latency * 1000:.0f}ms")
+    print(f"new session per command {per_command:7.2f}s")
+    print(
+        f"pooled session          {pooled:7.2f}s  "
+        f"speedup={per_command / pooled:.1f}x stats={pool.stats}"
+    )
+
+
+if __name__ == "__main__":
+    main()
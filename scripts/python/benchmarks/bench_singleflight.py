@@ -0,0 +1,94 @@
+"""
+Thread-storm benchmark of singleflight coalescing of oc read commands.
+
+Many threads execute the same 'oc get pods -o yaml' command at the same time,
+once with RUN['oc_singleflight'] disabled and once enabled. A fake 'oc'
+script which records every invocation and sleeps for the configured latency
+is used, so the benchmark doesn't need a cluster.
+
+Usage:
+    python scripts/python/benchmarks/bench_singleflight.py --threads 32 --rounds 5
+"""
+
+import argparse
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+import time
+
+from ocs_ci.framework import config
+from ocs_ci.utility import utils
+
+FAKE_OC = """#!{python}
+import os, sys, time
+with open(os.path.join(os.path.dirname(sys.argv[0]), "calls"), "a") as fd:
+    fd.write(" ".join(sys.argv[1:]) + "\\n")
+time.sleep({latency})
+sys.stdout.write("kind: List\\nitems: []\\n")
+"""
+
+
+def storm(threads, rounds):
+    """
+    Execute the same oc read command from many threads at once
+
+    Args:
+        threads (int): Number of concurrent threads
+        rounds (int): Number of storms
+
+    Returns:
+        float: Wall time of all the rounds in seconds
+
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        barrier = threading.Barrier(threads)
+
+        def worker():
+            barrier.wait()
+            utils.run_cmd("oc get pods -n openshift-storage -o yaml")
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    fake_oc = os.path.join(tmp_dir, "oc")
+    with open(fake_oc, "w") as fd:
+        fd.write(FAKE_OC.format(python=sys.executable, latency=args.latency))
+    os.chmod(fake_oc, os.stat(fake_oc).st_mode | stat.S_IEXEC)
+    os.environ["PATH"] = f"{tmp_dir}{os.pathsep}{os.environ['PATH']}"
+    calls_file = os.path.join(tmp_dir, "calls")
+
+    for enabled in (False, True):
+        config.RUN["oc_singleflight"] = enabled
+        utils.oc_read_singleflight.reset_stats()
+        if os.path.exists(calls_file):
+            os.remove(calls_file)
+        elapsed = storm(args.threads, args.rounds)
+        with open(calls_file) as fd:
+            forks = len(fd.readlines())
+        print(
+            f"singleflight={str(enabled):5} calls={args.threads * args.rounds:5} "
+            f"forks={forks:5} coalesced={utils.oc_read_singleflight.coalesced:5} "
+            f"wall={elapsed:6.2f}s"
+        )
+    shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()